@@ -0,0 +1,355 @@
+"""
+Fast Local Router for the Supervisor
+
+This module provides the `FastRouter` class which scores a query against the
+TWG agent domains locally (no LLM round-trip). It is consulted by
+`route_query_node` before the LLM Intent Parser; the parser is only invoked
+when the local confidence falls below `FAST_ROUTER_CONFIDENCE_THRESHOLD`.
+
+Two signals are combined:
+1. A precompiled keyword/phrase automaton (single regex alternation) over the
+   agent domain keywords and TWG names - one linear scan per query.
+2. An optional embedding-similarity classifier against per-agent exemplars
+   (enabled with `FAST_ROUTER_USE_EMBEDDINGS`).
+"""
+
+import asyncio
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from app.core.config import settings
+
+
+# Keyword domains per TWG agent (primary = 10 points, secondary = 3 points)
+AGENT_DOMAINS: Dict[str, Dict[str, List[str]]] = {
+    "energy": {
+        "primary": ["energy", "infrastructure", "power", "electricity", "renewable", "solar", "wind", "wapp"],
+        "secondary": ["grid", "transmission", "hydroelectric", "fuel", "petroleum"]
+    },
+    "agriculture": {
+        "primary": ["agriculture", "food system", "food security", "farming", "crop", "livestock", "agribusiness"],
+        "secondary": ["fertilizer", "irrigation", "harvest", "rural", "farmer", "food production"]
+    },
+    "minerals": {
+        "primary": ["mining", "mineral", "critical minerals", "industrialization", "cobalt", "lithium", "gold", "bauxite", "extraction"],
+        "secondary": ["value chain", "ore", "quarry", "geology"]
+    },
+    "digital": {
+        "primary": ["digital", "technology", "internet", "broadband", "fintech", "e-commerce", "e-government", "transformation"],
+        "secondary": ["cybersecurity", "ai", "software", "tech", "online", "platform"]
+    },
+    "protocol": {
+        "primary": ["meeting", "schedule", "logistics", "protocol", "venue", "registration", "invitation"],
+        "secondary": ["deadline", "agenda", "ceremony", "security", "vip"]
+    },
+    "resource_mobilization": {
+        "primary": ["investment", "financing", "deal room", "funding", "investor", "bankable", "resource mobilization"],
+        "secondary": ["finance", "capital", "donor", "partner", "budget"]
+    }
+}
+
+# Explicit TWG names - a direct reference to a TWG is a strong routing signal
+TWG_NAMES: Dict[str, List[str]] = {
+    "energy": ["energy twg", "energy & infrastructure", "energy and infrastructure"],
+    "agriculture": ["agriculture twg", "agriculture & food systems", "agriculture and food systems", "agriculture & food security"],
+    "minerals": ["minerals twg", "critical minerals & industrialization", "critical minerals and industrialization", "mineral industrialization"],
+    "digital": ["digital twg", "digital economy", "digital economy & transformation", "digital economy and transformation"],
+    "protocol": ["protocol twg", "protocol & logistics", "protocol and logistics"],
+    "resource_mobilization": ["resource mobilization twg", "resource mobilisation", "resource mobilization"]
+}
+
+# Per-agent exemplars for the (optional) embedding classifier
+AGENT_EXEMPLARS: Dict[str, List[str]] = {
+    "energy": [
+        "What is the status of the regional power interconnection projects?",
+        "Summarise the renewable energy targets for the summit declaration.",
+        "How much new generation capacity is planned for the WAPP grid?"
+    ],
+    "agriculture": [
+        "What are the key food security commitments for member states?",
+        "Summarise the agribusiness value chain proposals.",
+        "How will the summit support smallholder farmers and irrigation?"
+    ],
+    "minerals": [
+        "What is the strategy for local processing of critical minerals?",
+        "Summarise the lithium and cobalt industrialization proposals.",
+        "Which mining projects are ready for investment?"
+    ],
+    "digital": [
+        "What is the plan for regional broadband and data infrastructure?",
+        "Summarise the digital payments and fintech harmonisation agenda.",
+        "How will e-government services be rolled out across member states?"
+    ],
+    "protocol": [
+        "What are the logistics arrangements for heads of state arrivals?",
+        "Summarise the ceremony and seating protocol for the plenary.",
+        "Which delegates still need accreditation and venue access?"
+    ],
+    "resource_mobilization": [
+        "Which projects are bankable and ready for the deal room?",
+        "Summarise the financing commitments from development partners.",
+        "How much investment has been mobilised for the project pipeline?"
+    ]
+}
+
+# Any of these forces supervisor-only routing (the supervisor owns the scheduling tools)
+SCHEDULING_KEYWORDS = ["schedule", "book", "meeting", "calendar", "appointment"]
+
+PRIMARY_WEIGHT = 10
+SECONDARY_WEIGHT = 3
+TWG_NAME_WEIGHT = 20
+
+# Minimum keyword score for an agent to be considered relevant
+RELEVANT_THRESHOLD = 5
+
+# Keyword score at which an agent match is considered unambiguous on its own
+STRONG_SCORE = 20
+
+# Embedding classifier tuning
+EMBEDDING_MIN_SIMILARITY = 0.3
+EMBEDDING_MARGIN = 0.1
+
+
+class FastRouteDecision(BaseModel):
+    """Routing decision produced locally by the FastRouter."""
+
+    agents: List[str] = Field(
+        default_factory=list,
+        description="Relevant agent IDs, highest score first (empty = supervisor)"
+    )
+
+    confidence: float = Field(
+        0.0,
+        description="Confidence in the decision (0.0 - 1.0)"
+    )
+
+    method: str = Field(
+        "keyword",
+        description="Signal that produced the decision (keyword, embedding, scheduling, none)"
+    )
+
+    scores: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Raw per-agent scores from the winning signal"
+    )
+
+    def is_confident(self, threshold: Optional[float] = None) -> bool:
+        """True if the decision clears the configured confidence threshold."""
+        if threshold is None:
+            threshold = settings.FAST_ROUTER_CONFIDENCE_THRESHOLD
+        return self.confidence >= threshold
+
+
+class FastRouter:
+    """Scores queries against agent domains without calling an LLM."""
+
+    def __init__(self, use_embeddings: Optional[bool] = None):
+        """
+        Compile the keyword automaton.
+
+        Args:
+            use_embeddings: Enable the embedding classifier (defaults to settings)
+        """
+        self.use_embeddings = settings.FAST_ROUTER_USE_EMBEDDINGS if use_embeddings is None else use_embeddings
+
+        # phrase -> [(agent_id, weight)]; a phrase may belong to several agents
+        self._phrase_weights: Dict[str, List[Tuple[str, int]]] = {}
+        for agent_id, keywords in AGENT_DOMAINS.items():
+            for keyword in keywords.get("primary", []):
+                self._add_phrase(keyword, agent_id, PRIMARY_WEIGHT)
+            for keyword in keywords.get("secondary", []):
+                self._add_phrase(keyword, agent_id, SECONDARY_WEIGHT)
+        for agent_id, names in TWG_NAMES.items():
+            for name in names:
+                self._add_phrase(name, agent_id, TWG_NAME_WEIGHT)
+
+        # Longest phrases first so "critical minerals" wins over "mineral"
+        phrases = sorted(self._phrase_weights.keys(), key=len, reverse=True)
+        alternation = "|".join(re.escape(p) for p in phrases)
+        self._pattern = re.compile(rf"(?<![\w-])({alternation})(?:s|es)?(?![\w-])")
+
+        # Lazily computed exemplar embeddings: agent_id -> vectors
+        self._exemplar_vectors: Optional[Dict[str, List[List[float]]]] = None
+
+        logger.info(f"[FastRouter] Compiled automaton with {len(phrases)} phrases (embeddings={self.use_embeddings})")
+
+    def _add_phrase(self, phrase: str, agent_id: str, weight: int) -> None:
+        self._phrase_weights.setdefault(phrase.lower(), []).append((agent_id, weight))
+
+    # =========================================================================
+    # Keyword Scoring
+    # =========================================================================
+
+    def keyword_scores(self, query: str) -> Dict[str, int]:
+        """
+        Score each agent by the distinct phrases found in the query.
+
+        Args:
+            query: The user query
+
+        Returns:
+            Dict of agent_id -> score (agents without matches are omitted)
+        """
+        seen = set()
+        scores: Dict[str, int] = {}
+        for match in self._pattern.finditer(query.lower()):
+            phrase = match.group(1)
+            if phrase in seen:
+                continue
+            seen.add(phrase)
+            for agent_id, weight in self._phrase_weights[phrase]:
+                scores[agent_id] = scores.get(agent_id, 0) + weight
+        return scores
+
+    def _keyword_decision(self, query: str) -> FastRouteDecision:
+        scores = self.keyword_scores(query)
+        relevant = [a for a, s in scores.items() if s >= RELEVANT_THRESHOLD]
+        relevant.sort(key=lambda a: scores[a], reverse=True)
+
+        if not relevant:
+            return FastRouteDecision(agents=[], confidence=0.0, method="none", scores=scores)
+
+        # Strength: how strongly the weakest selected agent matched.
+        # Separation: how far that agent stands above the strongest unselected noise.
+        weakest = scores[relevant[-1]]
+        noise = max([s for a, s in scores.items() if a not in relevant], default=0)
+        strength = min(1.0, weakest / STRONG_SCORE)
+        separation = 1.0 - (noise / weakest)
+        confidence = round(strength * separation, 3)
+
+        return FastRouteDecision(agents=relevant, confidence=confidence, method="keyword", scores=scores)
+
+    # =========================================================================
+    # Embedding Classifier (optional)
+    # =========================================================================
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        from app.core.knowledge_base import get_knowledge_base
+        return get_knowledge_base().generate_embeddings(texts)
+
+    def _load_exemplars(self) -> Dict[str, List[List[float]]]:
+        if self._exemplar_vectors is None:
+            agent_ids, texts = [], []
+            for agent_id, exemplars in AGENT_EXEMPLARS.items():
+                for text in exemplars:
+                    agent_ids.append(agent_id)
+                    texts.append(text)
+
+            vectors = self._embed(texts)
+            exemplar_vectors: Dict[str, List[List[float]]] = {}
+            for agent_id, vector in zip(agent_ids, vectors):
+                exemplar_vectors.setdefault(agent_id, []).append(vector)
+            self._exemplar_vectors = exemplar_vectors
+            logger.info(f"[FastRouter] Embedded {len(texts)} agent exemplars")
+        return self._exemplar_vectors
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+    def _embedding_decision(self, query: str) -> FastRouteDecision:
+        exemplars = self._load_exemplars()
+        query_vector = self._embed([query])[0]
+
+        similarities = {
+            agent_id: max(self._cosine(query_vector, v) for v in vectors)
+            for agent_id, vectors in exemplars.items()
+        }
+        ranked = sorted(similarities, key=similarities.get, reverse=True)
+        top = similarities[ranked[0]]
+        second = similarities[ranked[1]] if len(ranked) > 1 else 0.0
+
+        if top < EMBEDDING_MIN_SIMILARITY:
+            return FastRouteDecision(agents=[], confidence=0.0, method="embedding", scores=similarities)
+
+        confidence = round(min(1.0, (top - second) / EMBEDDING_MARGIN), 3)
+        return FastRouteDecision(agents=[ranked[0]], confidence=confidence, method="embedding", scores=similarities)
+
+    # =========================================================================
+    # Routing
+    # =========================================================================
+
+    def _local_decision(self, query: str) -> FastRouteDecision:
+        """Scheduling override, then the keyword classifier (no I/O)."""
+        query_lower = query.lower()
+
+        # Scheduling requests always go to the supervisor, whatever the LLM says
+        if any(keyword in query_lower for keyword in SCHEDULING_KEYWORDS):
+            return FastRouteDecision(agents=[], confidence=1.0, method="scheduling")
+
+        return self._keyword_decision(query)
+
+    @staticmethod
+    def _merge(decision: FastRouteDecision, embedded: FastRouteDecision) -> FastRouteDecision:
+        """Combine the keyword and embedding decisions."""
+        # Only trust the embedding signal if it agrees with (or fills in for) the keywords
+        if embedded.agents and (not decision.agents or embedded.agents[0] in decision.agents):
+            if embedded.confidence > decision.confidence:
+                if decision.agents:
+                    embedded.agents = decision.agents
+                return embedded
+
+        return decision
+
+    def route(self, query: str) -> FastRouteDecision:
+        """
+        Produce a local routing decision for a query.
+
+        Blocks on the embeddings API when the keywords are inconclusive; use
+        aroute() from async code.
+
+        Args:
+            query: The user query
+
+        Returns:
+            FastRouteDecision with the selected agents and a confidence score
+        """
+        decision = self._local_decision(query)
+        if decision.is_confident() or not self.use_embeddings:
+            return decision
+
+        try:
+            embedded = self._embedding_decision(query)
+        except Exception as e:
+            logger.warning(f"[FastRouter] Embedding classifier unavailable: {e}")
+            return decision
+
+        return self._merge(decision, embedded)
+
+    async def aroute(self, query: str) -> FastRouteDecision:
+        """
+        Async route(): the keyword path runs inline, the embedding classifier
+        (a blocking embeddings request) runs in a worker thread.
+
+        Args:
+            query: The user query
+
+        Returns:
+            FastRouteDecision with the selected agents and a confidence score
+        """
+        decision = self._local_decision(query)
+        if decision.is_confident() or not self.use_embeddings:
+            return decision
+
+        try:
+            embedded = await asyncio.to_thread(self._embedding_decision, query)
+        except Exception as e:
+            logger.warning(f"[FastRouter] Embedding classifier unavailable: {e}")
+            return decision
+
+        return self._merge(decision, embedded)
+
+
+# Global instance
+_router_instance = None
+
+def get_fast_router() -> FastRouter:
+    global _router_instance
+    if _router_instance is None:
+        _router_instance = FastRouter()
+    return _router_instance
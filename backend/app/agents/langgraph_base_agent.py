@@ -20,6 +20,7 @@ from app.services.llm_service import get_llm_service
 from app.agents.prompts import get_prompt
 from app.core.knowledge_base import get_knowledge_base
 from app.agents.utils import get_twg_id_by_agent_id
+from app.agents.tracing import traced_node, span, add_span_attributes
 
 
 # Helper function for message accumulation
@@ -62,6 +63,9 @@ class AgentConversationState(TypedDict):
     
     # User's Timezone (e.g., "Africa/Lagos")
     user_timezone: Optional[str]
+    
+    # RAG results prefetched by the Supervisor (see retrieve_context)
+    prefetched_context: Optional[Dict]
 
 
 # =========================================================================
@@ -315,10 +319,10 @@ CRITICAL TOOL USAGE RULES:
         """
         workflow = StateGraph(AgentConversationState)
 
-        # Add nodes
-        workflow.add_node("process_query", self._process_query_node)
-        workflow.add_node("generate_response", self._generate_response_node)
-        workflow.add_node("execute_tools", self._execute_tools_node)
+        # Add nodes (each wrapped in a tracing span, a no-op outside a traced turn)
+        workflow.add_node("process_query", traced_node(f"{self.agent_id}.process_query", self._process_query_node))
+        workflow.add_node("generate_response", traced_node(f"{self.agent_id}.generate_response", self._generate_response_node))
+        workflow.add_node("execute_tools", traced_node(f"{self.agent_id}.execute_tools", self._execute_tools_node))
 
         # Set entry point
         workflow.set_entry_point("process_query")
@@ -366,6 +370,68 @@ CRITICAL TOOL USAGE RULES:
             
         return "end"
 
+    async def retrieve_context(self, query: str) -> Optional[Dict]:
+        """
+        Run RAG retrieval for this agent's TWG namespace (plus global broadcasts).
+
+        Safe to call ahead of time (e.g. speculatively by the Supervisor while
+        routing is still running); the result is plain data that can be handed
+        back into `chat(prefetched_context=...)`.
+
+        Returns:
+            Dict with query, namespace, context and citations, or None if RAG is unavailable
+        """
+        if not (self.twg_id and self.kb):
+            return None
+
+        namespace = f"twg-{self.twg_id}"
+        try:
+            import asyncio
+            # Search the TWG namespace and the Global Broadcast namespace concurrently
+            with span(f"{self.agent_id}.rag_retrieval", kind="retrieval", namespace=namespace):
+                twg_results, global_results = await asyncio.gather(
+                    asyncio.to_thread(self.kb.search, query=query, namespace=namespace, top_k=3),
+                    asyncio.to_thread(self.kb.search, query=query, namespace="global", top_k=2)
+                )
+                add_span_attributes(results=len(twg_results) + len(global_results))
+            
+            # Merge and Sort by Score
+            results = twg_results + global_results
+            results.sort(key=lambda x: x['score'], reverse=True)
+            results = results[:3] # Keep top 3 most relevant context pieces
+            
+            retrieval = {"query": query, "namespace": namespace, "context": None, "citations": []}
+            
+            # Format context
+            if results:
+                context_parts = []
+                for r in results:
+                    file_name = r['metadata'].get('file_name', 'Unknown')
+                    text = r['metadata'].get('text', '') or ''
+                    # Truncate text to 2000 chars (approx 500 tokens) to allow for more context while staying within limits
+                    truncated_text = text[:2000] + "..." if len(text) > 2000 else text
+                    context_parts.append(f"[{file_name}]\n{truncated_text}")
+
+                retrieval["context"] = {"retrieved_docs": "\n".join(context_parts), "source": namespace}
+                
+                # Also populate structured citations
+                for r in results:
+                     retrieval["citations"].append({
+                         "source": r['metadata'].get('file_name', 'Unknown'),
+                         "page": r['metadata'].get('page', 1),
+                         "relevance": r['score']
+                     })
+                
+                logger.info(f"[{self.agent_id}] Retrieved {len(results)} docs from {namespace}")
+            else:
+                logger.info(f"[{self.agent_id}] No relevant docs found in {namespace}")
+                
+            return retrieval
+                
+        except Exception as e:
+            logger.error(f"[{self.agent_id}] RAG Error: {e}")
+            return None
+
     async def _process_query_node(self, state: AgentConversationState) -> AgentConversationState:
         """Process incoming query."""
         query = state["query"]
@@ -376,65 +442,17 @@ CRITICAL TOOL USAGE RULES:
         if state.get("citations") is None:
             state["citations"] = []
 
-        # RAG Retrieval
-        if self.twg_id and self.kb:
-            try:
-                # Search KB restricted to TWG namespace
-                namespace = f"twg-{self.twg_id}"
-                # Use asyncio.to_thread if kb.search is blocking and slow
-                # Assuming kb.search is synchronous for now
-                import asyncio
-                twg_results = await asyncio.to_thread(self.kb.search, 
-                    query=query,
-                    namespace=namespace,
-                    top_k=3
-                )
-                
-                # Search Global Broadcast namespace
-                global_results = await asyncio.to_thread(self.kb.search,
-                    query=query,
-                    namespace="global",
-                    top_k=2
-                )
-                
-                # Merge and Sort by Score
-                results = twg_results + global_results
-                results.sort(key=lambda x: x['score'], reverse=True)
-                results = results[:3] # Keep top 3 most relevant context pieces
-                
-                # Format context
-                if results:
-                    # Format context with EXTREME truncation to prevent token errors
-                    # Limit to 500 chars per doc (~125 tokens) × 2 = 250 tokens total
-                    context_parts = []
-                    for r in results:
-                        file_name = r['metadata'].get('file_name', 'Unknown')
-                        text = r['metadata'].get('text', '') or ''
-                        # Truncate text to 2000 chars (approx 500 tokens) to allow for more context while staying within limits
-                        truncated_text = text[:2000] + "..." if len(text) > 2000 else text
-                        context_parts.append(f"[{file_name}]\n{truncated_text}")
-
-                    context_text = "\n".join(context_parts)
-
-                    # Store in state
-                    state['context'] = {"retrieved_docs": context_text, "source": namespace}
-                    
-                    # Also populate structured citations
-                    citations = []
-                    for r in results:
-                         citations.append({
-                             "source": r['metadata'].get('file_name', 'Unknown'),
-                             "page": r['metadata'].get('page', 1),
-                             "relevance": r['score']
-                         })
-                    state['citations'] = citations
-                    
-                    logger.info(f"[{self.agent_id}] Retrieved {len(results)} docs from {namespace}")
-                else:
-                    logger.info(f"[{self.agent_id}] No relevant docs found in {namespace}")
-                    
-            except Exception as e:
-                logger.error(f"[{self.agent_id}] RAG Error: {e}")
+        # RAG Retrieval - reuse a speculative prefetch from the supervisor if one was handed in
+        prefetched = state.get("prefetched_context")
+        if prefetched and prefetched.get("namespace") == f"twg-{self.twg_id}":
+            logger.info(f"[{self.agent_id}] Using speculatively prefetched context from {prefetched['namespace']}")
+            retrieval = prefetched
+        else:
+            retrieval = await self.retrieve_context(query)
+
+        if retrieval and retrieval.get("context"):
+            state['context'] = retrieval["context"]
+            state['citations'] = retrieval["citations"]
                 
         return state
 
@@ -546,12 +564,13 @@ CRITICAL TOOL USAGE RULES:
             # If self.llm.chat_with_history is SYNC, we wrap it.
             # Usually LLM calls are IO bound, so we use to_thread.
             import asyncio
-            response_obj = await asyncio.to_thread(
-                self.llm.chat_with_history,
-                messages=history,
-                system_prompt=sys_prompt,
-                tools=self.tools_def
-            )
+            with span(f"{self.agent_id}.llm", kind="llm", messages=len(history)):
+                response_obj = await asyncio.to_thread(
+                    self.llm.chat_with_history,
+                    messages=history,
+                    system_prompt=sys_prompt,
+                    tools=self.tools_def
+                )
             
             # DEBUG: Log the full system prompt to verify Timezone injection
             logger.info(f"[{self.agent_id}] System Prompt Context:\n{sys_prompt[-500:]}") # Log last 500 chars containing time context
@@ -644,12 +663,13 @@ CRITICAL TOOL USAGE RULES:
                         if tz_context and "user_timezone" not in tool_args:
                              tool_args["user_timezone"] = tz_context
                     
-                    if inspect.iscoroutinefunction(func):
-                        # Async function - await directly
-                        result = await func(**tool_args)
-                    else:
-                        # Sync function - run in thread to avoid blocking loop
-                        result = await asyncio.to_thread(func, **tool_args)
+                    with span(f"{self.agent_id}.tool.{tool_name}", kind="tool", tool=tool_name):
+                        if inspect.iscoroutinefunction(func):
+                            # Async function - await directly
+                            result = await func(**tool_args)
+                        else:
+                            # Sync function - run in thread to avoid blocking loop
+                            result = await asyncio.to_thread(func, **tool_args)
                         
                 else:
                     result = json.dumps({"error": f"Tool {tool_name} not found"})
@@ -720,9 +740,19 @@ CRITICAL TOOL USAGE RULES:
         state["messages"].extend(new_messages)
         return state
 
-    async def chat(self, message: str, thread_id: Optional[str] = None, user_timezone: Optional[str] = None) -> Dict[str, any]:
+    async def chat(
+        self,
+        message: str,
+        thread_id: Optional[str] = None,
+        user_timezone: Optional[str] = None,
+        prefetched_context: Optional[Dict] = None
+    ) -> Dict[str, any]:
         """
         Chat interface using LangGraph execution (Async).
+
+        Args:
+            prefetched_context: Result of a speculative `retrieve_context` call;
+                skips the RAG round-trip in process_query when it matches this agent
         """
         if not self.compiled_graph:
             raise ValueError(f"[{self.agent_id}] Graph not compiled")
@@ -784,7 +814,8 @@ CRITICAL TOOL USAGE RULES:
             "agent_id": self.agent_id,
             "session_id": thread_id,
             "citations": [],
-            "user_timezone": user_timezone
+            "user_timezone": user_timezone,
+            "prefetched_context": prefetched_context
         }
         
         try:
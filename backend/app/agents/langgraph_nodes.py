@@ -4,13 +4,15 @@ LangGraph Node Functions for Multi-Agent System
 Each function represents a node in the agent graph.
 """
 
-from typing import Dict, List
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
 from loguru import logger
 from langchain_core.messages import HumanMessage, AIMessage
 from langgraph.errors import GraphInterrupt
 
 from app.agents.langgraph_state import AgentState
 from app.agents.langgraph_base_agent import LangGraphBaseAgent
+from app.agents.tracing import span
 
 
 # =========================================================================
@@ -21,7 +23,9 @@ async def route_query_node(state: AgentState) -> AgentState:
     """
     Analyze the query and determine which TWG agents are relevant.
     
-    Uses LLM-based Intent Parser first, falls back to keyword matching.
+    Uses the local FastRouter first; the LLM-based Intent Parser is only
+    consulted when the local confidence is below the configured threshold,
+    with keyword matching as the final fallback.
     """
     query = state["query"]
     query_lower = query.lower()
@@ -88,113 +92,83 @@ async def route_query_node(state: AgentState) -> AgentState:
 
     relevant = []
     
-    # --- 1. LLM INTENT PARSING ---
-    from app.agents.intent_parser import get_intent_parser
+    # --- 1. FAST LOCAL ROUTING (skips the LLM when unambiguous) ---
+    from app.agents.fast_router import get_fast_router
+    from app.core.config import settings
     
-    try:
-        parser = get_intent_parser()
-        # Parse intent
-        intent = await parser.parse_directive(query, context)
-        
-        # Store intent in state
-        if intent:
-            state["directive_intent"] = intent.dict()
-            logger.info(f"[ROUTE] Intent Parsed: {intent.primary_action}, Targets: {intent.target_twgs}")
+    fast_route = None
+    if settings.FAST_ROUTER_ENABLED:
+        try:
+            fast_route = await get_fast_router().aroute(query)
+            state["routing_confidence"] = fast_route.confidence
+            state["routing_method"] = fast_route.method
             
-            # Use parsed targets if available and valid
-            if intent.target_twgs:
-                # Normalize TWG names (handle "ALL" or specific list)
-                if "ALL" in [t.upper() for t in intent.target_twgs]:
-                    # All agents
-                    agent_domains = ["energy", "agriculture", "minerals", "digital", "protocol", "resource_mobilization"]
-                    relevant = agent_domains
-                    logger.info("[ROUTE] Routing to ALL agents based on intent")
-                else:
-                    # Filter valid agents
-                    valid_agents = ["energy", "agriculture", "minerals", "digital", "protocol", "resource_mobilization"]
-                    for target in intent.target_twgs:
-                        target_clean = target.lower().strip()
-                        if target_clean in valid_agents:
-                            relevant.append(target_clean)
-                        # Handle mapping (e.g. 'finance' -> 'resource_mobilization') if needed, 
-                        # but keyword fallback catches most.
-                        
-                if relevant:
-                    logger.info(f"[ROUTE] Using LLM-routed agents: {relevant}")
+            if fast_route.is_confident():
+                relevant = fast_route.agents
+                logger.info(f"[ROUTE] Fast path ({fast_route.method}, confidence={fast_route.confidence}): {relevant or 'supervisor'}")
+            else:
+                logger.info(f"[ROUTE] Fast path inconclusive (confidence={fast_route.confidence}), consulting Intent Parser")
+        except Exception as e:
+            logger.error(f"[ROUTE] Fast routing failed: {e}")
+            fast_route = None
     
-    except Exception as e:
-        logger.error(f"[ROUTE] Intent parsing failed: {e}")
-        # Continue to fallback
+    # --- 2. LLM INTENT PARSING (only when the fast path is not confident) ---
+    if fast_route is None or not fast_route.is_confident():
+        from app.agents.intent_parser import get_intent_parser
         
-    # --- 2. KEYWORD FALLBACK (if LLM didn't find specific targets) ---
-    if not relevant:
-        logger.info("[ROUTE] Fallback to Keyword Routing")
+        try:
+            parser = get_intent_parser()
+            # Parse intent
+            with span("intent_parser.llm", kind="llm"):
+                intent = await parser.parse_directive(query, context)
+            
+            # Store intent in state
+            if intent:
+                state["directive_intent"] = intent.dict()
+                state["routing_method"] = "llm"
+                logger.info(f"[ROUTE] Intent Parsed: {intent.primary_action}, Targets: {intent.target_twgs}")
+                
+                # Use parsed targets if available and valid
+                if intent.target_twgs:
+                    valid_agents = ["energy", "agriculture", "minerals", "digital", "protocol", "resource_mobilization"]
+                    # Normalize TWG names (handle "ALL" or specific list)
+                    if "ALL" in [t.upper() for t in intent.target_twgs]:
+                        relevant = valid_agents
+                        logger.info("[ROUTE] Routing to ALL agents based on intent")
+                    else:
+                        # Filter valid agents
+                        for target in intent.target_twgs:
+                            target_clean = target.lower().strip()
+                            if target_clean in valid_agents:
+                                relevant.append(target_clean)
+                            
+                    if relevant:
+                        logger.info(f"[ROUTE] Using LLM-routed agents: {relevant}")
         
-        agent_domains = {
-            "energy": {
-                "primary": ["energy", "infrastructure", "power", "electricity", "renewable", "solar", "wind", "wapp"],
-                "secondary": ["grid", "transmission", "hydroelectric", "fuel", "petroleum"]
-            },
-            "agriculture": {
-                "primary": ["agriculture", "food system", "food security", "farming", "crop", "livestock", "agribusiness"],
-                "secondary": ["fertilizer", "irrigation", "harvest", "rural", "farmer", "food production"]
-            },
-            "minerals": {
-                "primary": ["mining", "mineral", "critical minerals", "industrialization", "cobalt", "lithium", "gold", "bauxite", "extraction"],
-                "secondary": ["value chain", "ore", "quarry", "geology"]
-            },
-            "digital": {
-                "primary": ["digital", "technology", "internet", "broadband", "fintech", "e-commerce", "e-government", "transformation"],
-                "secondary": ["cybersecurity", "ai", "software", "tech", "online", "platform"]
-            },
-            "protocol": {
-                "primary": ["meeting", "schedule", "logistics", "protocol", "venue", "registration", "invitation"],
-                "secondary": ["deadline", "agenda", "ceremony", "security", "vip"]
-            },
-            "resource_mobilization": {
-                "primary": ["investment", "financing", "deal room", "funding", "investor", "bankable", "resource mobilization"],
-                "secondary": ["finance", "capital", "donor", "partner", "budget"]
-            }
-        }
-
-        agent_scores = {}
-
-        # Score each agent based on keyword matches
-        for agent_id, keywords in agent_domains.items():
-            score = 0
-
-            # Check primary keywords (10 points each)
-            for keyword in keywords.get("primary", []):
-                if keyword in query_lower:
-                    score += 10
-                    logger.debug(f"Primary match '{keyword}' for {agent_id} (+10)")
-
-            # Check secondary keywords (3 points each)
-            for keyword in keywords.get("secondary", []):
-                if keyword in query_lower:
-                    score += 3
-                    logger.debug(f"Secondary match '{keyword}' for {agent_id} (+3)")
-
-            if score > 0:
-                agent_scores[agent_id] = score
-
-        # Filter agents that meet threshold (5 points minimum)
-        relevant_threshold = 5
-        relevant_keyword = [
-            agent_id for agent_id, score in agent_scores.items()
-            if score >= relevant_threshold
-        ]
-
-        # Sort by score (highest first)
-        relevant_keyword.sort(key=lambda x: agent_scores[x], reverse=True)
+        except Exception as e:
+            logger.error(f"[ROUTE] Intent parsing failed: {e}")
+            # Continue to fallback
         
-        relevant = relevant_keyword
-
-        if relevant:
-            scores_str = ", ".join([f"{a}({agent_scores[a]})" for a in relevant])
-            logger.info(f"[ROUTE] Relevant agents identified via keywords: {scores_str}")
-        else:
-            logger.info(f"[ROUTE] No specific TWG identified, will use supervisor")
+        # --- KEYWORD FALLBACK (if LLM didn't find specific targets) ---
+        if not relevant:
+            logger.info("[ROUTE] Fallback to Keyword Routing")
+            
+            from app.agents.fast_router import RELEVANT_THRESHOLD
+            agent_scores = get_fast_router().keyword_scores(query)
+            
+            # Filter agents that meet threshold, sorted by score (highest first)
+            relevant = [
+                agent_id for agent_id, score in agent_scores.items()
+                if score >= RELEVANT_THRESHOLD
+            ]
+            relevant.sort(key=lambda x: agent_scores[x], reverse=True)
+            state["routing_method"] = "keyword"
+
+            if relevant:
+                scores_str = ", ".join([f"{a}({agent_scores[a]})" for a in relevant])
+                logger.info(f"[ROUTE] Relevant agents identified via keywords: {scores_str}")
+            else:
+                logger.info(f"[ROUTE] No specific TWG identified, will use supervisor")
 
     # --- 3. SCHEDULING OVERRIDE ---
     # If this is a scheduling request, ALWAYS route to supervisor (it has the scheduling tools)
@@ -261,8 +235,9 @@ def create_twg_agent_node(agent_id: str, agent: LangGraphBaseAgent):
         logger.info(f"[{_agent_id.upper()}] Processing query")
 
         user_timezone = state.get("user_timezone")
+        prefetched = (state.get("prefetched_context") or {}).get(_agent_id)
         try:
-            response = await _agent.chat(query, user_timezone=user_timezone)
+            response = await _agent.chat(query, user_timezone=user_timezone, prefetched_context=prefetched)
             state["agent_responses"][_agent_id] = response
             logger.info(f"[{_agent_id.upper()}] Response generated")
         except GraphInterrupt:
@@ -281,6 +256,75 @@ def create_twg_agent_node(agent_id: str, agent: LangGraphBaseAgent):
 # SYNTHESIS NODE - Combine responses from multiple agents
 # =========================================================================
 
+def get_node_stream_writer():
+    """
+    Writer for LangGraph "custom" stream events from inside a node.
+
+    Events reach SSE clients via LangGraphSupervisor.stream_chat; outside a
+    streaming graph run (e.g. ainvoke or direct calls) writes are dropped.
+    """
+    try:
+        from langgraph.config import get_stream_writer
+        return get_stream_writer()
+    except Exception:
+        return lambda _chunk: None
+
+
+async def stream_llm_text(llm, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Iterate a (blocking) LLM token stream without blocking the event loop.
+
+    The provider's sync `stream_chat` generator runs in a worker thread and
+    hands chunks back through an asyncio queue.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def produce():
+        try:
+            for chunk in llm.stream_chat(prompt, system_prompt=system_prompt):
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    # to_thread copies the context, so token usage lands on the current trace span
+    producer = asyncio.create_task(asyncio.to_thread(produce))
+    while True:
+        item = await queue.get()
+        if item is done:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
+    await producer
+
+
+async def _detect_conflicts(truncated_responses: Dict[str, str], supervisor_agent: LangGraphBaseAgent) -> Optional[str]:
+    """Ask the supervisor whether TWG inputs contradict each other."""
+    conflict_prompt = f"""
+        Review these TWG inputs for any direct contradictions, schedule clashes, or resource conflicts:
+
+        {chr(10).join([f"{k}: {v[:500]}" for k, v in truncated_responses.items()])}
+
+        If a significant conflict exists, respond with "CONFLICT DETECTED" and a brief explanation.
+        Otherwise, respond "NO CONFLICT".
+        """
+
+    try:
+        with span("synthesis.conflict_check", kind="llm"):
+            conflict_check = await supervisor_agent.chat(conflict_prompt)
+        # Agent chat returns {"response", "citations"}
+        if isinstance(conflict_check, dict):
+            return conflict_check.get("response", "")
+        return str(conflict_check)
+    except Exception as e:
+        logger.error(f"Conflict detection failed: {e}")
+        return None
+
+
 async def synthesis_node(state: AgentState, supervisor_agent: LangGraphBaseAgent) -> AgentState:
     """
     Synthesize responses from multiple TWG agents into ONE unified professional memo.
@@ -328,39 +372,38 @@ The inputs may contain raw data or tool outputs - INTEGRATE this data directly i
 DO NOT append "Report Generated" sections or repeat the raw data at the end.
 Format: Executive Summary, Operational Briefing, Strategic Analysis, Recommendations, Technical Dispatch."""
 
-    # Get supervisor's unified memo
-    try:
-        unified_memo = await supervisor_agent.chat(synthesis_prompt)
-        output = unified_memo
-    except Exception as e:
-        logger.error(f"[SYNTHESIS] Synthesis generation failed: {e}")
-        output = f"Error generating unified memo: {str(e)}\n\nPlease review the request and try again."
+    writer = get_node_stream_writer()
 
     # --- CONFLICT DETECTION LAYER ---
-    # Check for conflicts between TWG responses
+    # Check for conflicts between TWG responses (runs concurrently with the memo stream)
+    conflict_task = None
     if len(responses) > 1:
         logger.info("[SYNTHESIS] Running Conflict Detection Layer...")
-        conflict_prompt = f"""
-        Review these TWG inputs for any direct contradictions, schedule clashes, or resource conflicts:
-
-        {chr(10).join([f"{k}: {v[:500]}" for k, v in truncated_responses.items()])}
-
-        If a significant conflict exists, respond with "CONFLICT DETECTED" and a brief explanation.
-        Otherwise, respond "NO CONFLICT".
-        """
+        conflict_task = asyncio.create_task(_detect_conflicts(truncated_responses, supervisor_agent))
 
-        try:
-            conflict_check = await supervisor_agent.chat(conflict_prompt)
+    # Stream the supervisor's unified memo token-by-token to the client
+    chunks = []
+    try:
+        with span("synthesis.llm", kind="llm"):
+            async for delta in stream_llm_text(supervisor_agent.llm, synthesis_prompt, system_prompt=supervisor_agent.system_prompt):
+                chunks.append(delta)
+                writer({"type": "synthesis_delta", "delta": delta})
+        output = "".join(chunks).strip()
+    except Exception as e:
+        logger.error(f"[SYNTHESIS] Synthesis generation failed: {e}")
+        output = f"Error generating unified memo: {str(e)}\n\nPlease review the request and try again."
+        writer({"type": "synthesis_reset", "content": output})
 
-            if "CONFLICT DETECTED" in conflict_check.upper():
-                output += f"\n\nCONFLICT ALERT:\n{conflict_check}"
-                logger.warning(f"Conflict Detected: {conflict_check}")
-                # Future: await save_conflict_to_db(...)
-        except Exception as e:
-            logger.error(f"Conflict detection failed: {e}")
+    if conflict_task:
+        conflict_check = await conflict_task
+        if conflict_check and "CONFLICT DETECTED" in conflict_check.upper():
+            alert = f"\n\nCONFLICT ALERT:\n{conflict_check}"
+            output += alert
+            writer({"type": "synthesis_delta", "delta": alert})
+            logger.warning(f"Conflict Detected: {conflict_check}")
+            # Future: await save_conflict_to_db(...)
 
     state["synthesized_response"] = output
-    state["final_response"] = output
     
     # Propagate combined citations
     unique_citations = []
@@ -374,6 +417,8 @@ Format: Executive Summary, Operational Briefing, Strategic Analysis, Recommendat
                 seen.add(key)
         state["citations"] = unique_citations
 
+    state["final_response"] = {"response": output, "citations": unique_citations}
+
     logger.info(f"[SYNTHESIS] Complete - Generated unified memo with {len(unique_citations)} unique citations")
 
     return state
@@ -50,5 +50,12 @@ class AgentState(TypedDict):
     # Structured Intent from LLM Parser
     directive_intent: Optional[Dict[str, any]]
     
+    # Routing diagnostics (fast path vs. LLM)
+    routing_confidence: Optional[float]
+    routing_method: Optional[str]
+    
+    # Speculative RAG results keyed by agent_id (filled while routing runs)
+    prefetched_context: Optional[Dict[str, Dict]]
+    
     # Structured Citations for frontend
     citations: Annotated[List[Dict], add]
@@ -5,6 +5,7 @@ This is the PROPER implementation using LangGraph's StateGraph.
 Replaces the manual delegation logic with LangGraph's orchestration.
 """
 
+import asyncio
 from typing import Dict, List, Optional, Any, Literal
 from loguru import logger
 
@@ -16,6 +17,7 @@ from langchain_core.messages import HumanMessage, AIMessage
 from app.agents.langgraph_base_agent import LangGraphBaseAgent
 from app.agents.langgraph_state import AgentState
 from app.agents.langgraph_nodes import (
+    get_node_stream_writer,
     route_query_node,
     supervisor_node,
     create_twg_agent_node,
@@ -24,6 +26,8 @@ from app.agents.langgraph_nodes import (
     negotiation_node
 )
 from app.services.supervisor_state_service import get_supervisor_state, SupervisorGlobalState
+from app.core.config import settings
+from app.agents.tracing import traced_node, traced_turn, span
 
 
 class LangGraphSupervisor:
@@ -696,6 +700,119 @@ class LangGraphSupervisor:
 
         logger.info(f"[SUPERVISOR] All {len(agents)} LangGraph TWG agents registered")
 
+    async def _predict_prefetch_agents(self, query: str, context: Optional[Dict]) -> List[str]:
+        """
+        Guess which TWG agents will handle a query, cheaply and without an LLM.
+
+        Args:
+            query: User query
+            context: Request context (may carry a twg_id)
+
+        Returns:
+            List of agent IDs worth prefetching RAG context for
+        """
+        twg_id = (context or {}).get("twg_id")
+        if twg_id:
+            # TWG-scoped chats almost always land on that TWG's agent
+            from app.agents.utils import get_agent_id_by_twg_id
+            agent_id = await asyncio.to_thread(get_agent_id_by_twg_id, twg_id)
+            predicted = [agent_id] if agent_id else []
+        else:
+            from app.agents.fast_router import get_fast_router, RELEVANT_THRESHOLD
+            scores = get_fast_router().keyword_scores(query)
+            predicted = [
+                a for a, score in sorted(scores.items(), key=lambda x: x[1], reverse=True)
+                if score >= RELEVANT_THRESHOLD
+            ]
+
+        predicted = [a for a in predicted if a in self._twg_agents]
+        return predicted[:settings.RAG_PREFETCH_MAX_AGENTS]
+
+    async def _prefetch_rag(self, query: str, agent_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Run RAG retrieval for several agents concurrently.
+
+        Args:
+            query: User query
+            agent_ids: Agents to retrieve context for
+
+        Returns:
+            Dict mapping agent_id to its retrieval result (failed/empty agents are omitted)
+        """
+        with span("rag_prefetch", kind="retrieval", agents=agent_ids):
+            results = await asyncio.gather(
+                *(self._twg_agents[a].retrieve_context(query) for a in agent_ids),
+                return_exceptions=True
+            )
+        return {
+            agent_id: result
+            for agent_id, result in zip(agent_ids, results)
+            if isinstance(result, dict)
+        }
+
+    async def _route_with_prefetch(self, state: AgentState) -> AgentState:
+        """
+        Run route_query_node while speculatively prefetching RAG context.
+
+        The vector search for the most likely agents overlaps with routing
+        (which may include an LLM intent-parser call). If routing disagrees
+        with the prediction the speculative work is cancelled and discarded.
+
+        Args:
+            state: Current graph state
+
+        Returns:
+            Routed state, with prefetched_context set for agents that matched
+        """
+        state["prefetched_context"] = None
+        if not settings.RAG_PREFETCH_ENABLED:
+            return await route_query_node(state)
+
+        query = state["query"]
+        prefetch_task = None
+        try:
+            predicted = await self._predict_prefetch_agents(query, state.get("context"))
+        except Exception as e:
+            logger.warning(f"[SUPERVISOR] Prefetch prediction failed: {e}")
+            predicted = []
+
+        if predicted:
+            logger.info(f"[SUPERVISOR] Speculatively prefetching RAG for: {predicted}")
+            prefetch_task = asyncio.create_task(self._prefetch_rag(query, predicted))
+
+        try:
+            state = await route_query_node(state)
+        except BaseException:
+            if prefetch_task:
+                prefetch_task.cancel()
+            raise
+
+        if not prefetch_task:
+            return state
+
+        routed = set(state.get("relevant_agents") or [])
+        hits = routed.intersection(predicted)
+        if not hits:
+            # Misprediction - don't pay for retrieval nobody will use
+            prefetch_task.cancel()
+            logger.info(f"[SUPERVISOR] Prefetch discarded (predicted {predicted}, routed {sorted(routed)})")
+            return state
+
+        try:
+            prefetched = await prefetch_task
+        except Exception as e:
+            logger.warning(f"[SUPERVISOR] Prefetch failed, agents will retrieve on demand: {e}")
+            return state
+
+        # Only hand over results for agents that were actually routed, and only if the
+        # query wasn't rewritten by routing (e.g. an explicit @agent prefix being stripped)
+        state["prefetched_context"] = {
+            agent_id: result
+            for agent_id, result in prefetched.items()
+            if agent_id in hits and result.get("query") == state["query"]
+        }
+        return state
+
     def build_graph(self) -> None:
         """
         Build the LangGraph StateGraph.
@@ -715,32 +832,36 @@ class LangGraphSupervisor:
         # =====================================================================
 
         # 1. Route query node - determines which agents to consult
-        workflow.add_node("route_query", route_query_node)
+        # RAG retrieval for the likely agents is started speculatively alongside it
+        async def call_route_query_node(state: AgentState) -> AgentState:
+            return await self._route_with_prefetch(state)
+
+        workflow.add_node("route_query", traced_node("route_query", call_route_query_node))
 
         # 2. Supervisor node - handles general queries
         async def call_supervisor_node(state: AgentState) -> AgentState:
             return await supervisor_node(state, self.supervisor_agent)
             
-        workflow.add_node("supervisor", call_supervisor_node)
+        workflow.add_node("supervisor", traced_node("supervisor", call_supervisor_node))
 
         # 3. TWG agent nodes - one for each registered agent
         for agent_id, agent in self._twg_agents.items():
             workflow.add_node(
                 agent_id,
-                create_twg_agent_node(agent_id, agent)
+                traced_node(agent_id, create_twg_agent_node(agent_id, agent))
             )
 
         # 4. Synthesis node - combines multiple agent responses
         async def call_synthesis_node(state: AgentState) -> AgentState:
             return await synthesis_node(state, self.supervisor_agent)
             
-        workflow.add_node("synthesis", call_synthesis_node)
+        workflow.add_node("synthesis", traced_node("synthesis", call_synthesis_node))
 
         # 5. Single agent response node - formats single agent response
-        workflow.add_node("single_agent_response", single_agent_response_node)
+        workflow.add_node("single_agent_response", traced_node("single_agent_response", single_agent_response_node))
 
         # 6. Negotiation node
-        workflow.add_node("negotiation", negotiation_node)
+        workflow.add_node("negotiation", traced_node("negotiation", negotiation_node))
 
         # =====================================================================
         # ADD EDGES AND CONDITIONAL ROUTING
@@ -752,36 +873,58 @@ class LangGraphSupervisor:
         # Add dispatch_multiple node for handling multiple agents
         async def dispatch_multiple_node(state: AgentState) -> AgentState:
             """
-            Dispatch query to multiple TWG agents sequentially (Async).
+            Dispatch query to multiple TWG agents concurrently (Async).
+
+            Each agent's answer is surfaced as an `agent_partial` stream event
+            as soon as it completes, before synthesis starts.
             """
-            relevant_agents = state["relevant_agents"]
+            relevant_agents = [a for a in state["relevant_agents"] if a in self._twg_agents]
             query = state["query"]
+            user_timezone = state.get("user_timezone")
+            prefetched_all = state.get("prefetched_context") or {}
+            writer = get_node_stream_writer()
 
             state["agent_responses"] = {}
 
-            for agent_id in relevant_agents:
-                if agent_id in self._twg_agents:
-                    logger.info(f"[DISPATCH] Querying {agent_id}...")
-                    try:
+            async def consult(agent_id: str):
+                logger.info(f"[DISPATCH] Querying {agent_id}...")
+                try:
+                    with span(agent_id, kind="node"):
                         agent = self._twg_agents[agent_id]
-                        # Await the async chat method
-                        user_timezone = state.get("user_timezone")
-                        response = await agent.chat(query, user_timezone=user_timezone)
-                        state["agent_responses"][agent_id] = response
-                    except GraphInterrupt:
-                        logger.info(f"[DISPATCH] Interrupt from {agent_id} detected in supervisor")
-                        raise
-                    except Exception as e:
-                        if type(e).__name__ == "GraphInterrupt":
-                            logger.info(f"[DISPATCH] GraphInterrupt caught as Exception from {agent_id}")
-                            raise e
-                            
-                        logger.error(f"[DISPATCH] Error with {agent_id}: {e}")
-                        state["agent_responses"][agent_id] = f"Error: {str(e)}"
+                        response = await agent.chat(query, user_timezone=user_timezone, prefetched_context=prefetched_all.get(agent_id))
+                except GraphInterrupt:
+                    logger.info(f"[DISPATCH] Interrupt from {agent_id} detected in supervisor")
+                    raise
+                except Exception as e:
+                    if type(e).__name__ == "GraphInterrupt":
+                        logger.info(f"[DISPATCH] GraphInterrupt caught as Exception from {agent_id}")
+                        raise e
+                        
+                    logger.error(f"[DISPATCH] Error with {agent_id}: {e}")
+                    response = f"Error: {str(e)}"
+                return agent_id, response
+
+            tasks = [asyncio.create_task(consult(agent_id)) for agent_id in relevant_agents]
+
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    agent_id, response = await next_done
+                    state["agent_responses"][agent_id] = response
+
+                    # Surface the partial answer as soon as this agent finishes
+                    if isinstance(response, dict):
+                        writer({"type": "agent_partial", "agent_id": agent_id, "content": response.get("response", ""), "citations": response.get("citations", [])})
+                    else:
+                        writer({"type": "agent_partial", "agent_id": agent_id, "content": str(response), "citations": []})
+            except BaseException:
+                # An interrupt (approval) or cancellation stops the remaining agents
+                for task in tasks:
+                    task.cancel()
+                raise
 
             return state
 
-        workflow.add_node("dispatch_multiple", dispatch_multiple_node)
+        workflow.add_node("dispatch_multiple", traced_node("dispatch_multiple", dispatch_multiple_node))
 
         # Conditional routing after route_query
         def route_to_agents(state: AgentState) -> str:
@@ -936,7 +1079,8 @@ class LangGraphSupervisor:
 
         try:
             # Use ainvoke for async execution (required since route_query_node is async)
-            result = await self.compiled_graph.ainvoke(initial_state, config)
+            async with traced_turn(thread_id, name="supervisor_turn", query=message[:200]):
+                result = await self.compiled_graph.ainvoke(initial_state, config)
 
             # CHECK FOR INTERRUPTS (same logic as LangGraphBaseAgent)
             # The Main Graph's invoke() might not re-raise exceptions from nodes
@@ -1005,20 +1149,35 @@ class LangGraphSupervisor:
             # We can infer which node just ran based on the keys in the chunk or explicit events if we used astream_events
             # For simplicity in this codebase, let's use astream and map output keys to "Thinking" steps.
             
-            async for chunk in self.compiled_graph.astream(initial_state, config):
-                # chunk is a dict where keys are node names and values are the state update
-                for node_name, state_update in chunk.items():
-                    yield {
-                        "type": "node_update",
-                        "node": node_name,
-                        "state": state_update # Be careful exposing full state
-                    }
-                    
-                    if "final_response" in state_update and state_update["final_response"]:
+            async with traced_turn(thread_id, name="supervisor_turn", query=message[:200]) as trace:
+                # "custom" carries events written from inside nodes (per-agent partial
+                # answers and synthesis tokens) as they happen
+                async for mode, chunk in self.compiled_graph.astream(initial_state, config, stream_mode=["updates", "custom"]):
+                    # Emit spans that finished during this step (node, RAG, LLM, tool timings)
+                    for finished in (trace.drain() if trace else []):
+                        yield {"type": "trace", "trace_id": trace.trace_id, "span": finished.model_dump()}
+
+                    if mode == "custom":
+                        yield chunk
+                        continue
+
+                    # chunk is a dict where keys are node names and values are the state update
+                    for node_name, state_update in chunk.items():
                         yield {
-                             "type": "final_response",
-                             "content": state_update["final_response"]
+                            "type": "node_update",
+                            "node": node_name,
+                            "state": state_update # Be careful exposing full state
                         }
+                        
+                        if "final_response" in state_update and state_update["final_response"]:
+                            yield {
+                                 "type": "final_response",
+                                 "content": state_update["final_response"]
+                            }
+
+            # Remaining spans, including the root "supervisor_turn" span with the total time
+            for finished in (trace.drain() if trace else []):
+                yield {"type": "trace", "trace_id": trace.trace_id, "span": finished.model_dump()}
 
             # CHECK FOR INTERRUPTS (After stream ends, check if it was paused)
             snapshot = await self.compiled_graph.aget_state(config)
@@ -0,0 +1,184 @@
+"""
+Per-node Execution Tracing for LangGraph Runs
+
+Records a span for every graph node (Supervisor and TWG agents) plus child
+spans for RAG retrieval, LLM calls and tool calls, so a slow chat turn can be
+broken down into a waterfall.
+
+The span model and context propagation live in app.core.tracing_context
+(re-exported here); this module adds the graph-level pieces: turn tracing,
+node wrapping and the per-thread trace store.
+
+Usage:
+    trace = start_trace(thread_id, name="supervisor_turn")
+    ...graph runs (nodes wrapped with traced_node)...
+    for span in trace.drain():   # finished spans, e.g. for SSE
+        ...
+    await finish_trace(trace)    # closes the root span and stores the trace
+"""
+
+import inspect
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.tracing_context import (
+    RunTrace,
+    TraceSpan,
+    add_span_attributes,
+    end_trace,
+    get_current_trace,
+    record_token_usage,
+    span,
+    start_trace,
+)
+
+__all__ = [
+    "RunTrace", "TraceSpan", "TraceStore",
+    "add_span_attributes", "end_trace", "finish_trace", "get_current_trace", "get_trace_store",
+    "record_token_usage", "span", "start_trace", "traced_node", "traced_turn",
+]
+
+
+async def finish_trace(trace: Optional[RunTrace], status: str = "ok", error: Optional[str] = None) -> None:
+    """Close the root span and persist the trace for its thread."""
+    if trace is None:
+        return
+    end_trace(trace, status=status, error=error)
+    await get_trace_store().save(trace)
+
+
+@asynccontextmanager
+async def traced_turn(thread_id: str, name: str = "run", **attributes):
+    """
+    Trace a whole conversation turn: start_trace on entry, finish_trace on exit
+    (marking the root span interrupted/error if the turn raised).
+
+    Yields:
+        The RunTrace (or None when tracing is disabled)
+    """
+    trace = start_trace(thread_id, name=name, **attributes)
+    try:
+        yield trace
+    except BaseException as e:
+        status = "interrupted" if type(e).__name__ == "GraphInterrupt" else "error"
+        await finish_trace(trace, status=status, error=None if status == "interrupted" else str(e)[:500])
+        raise
+    else:
+        await finish_trace(trace)
+
+
+def traced_node(name: str, fn: Callable, kind: str = "node") -> Callable:
+    """
+    Wrap a LangGraph node function (sync or async) in a span.
+
+    Args:
+        name: Span name (e.g. "route_query" or "energy.generate_response")
+        fn: Node callable taking the graph state
+        kind: Span kind
+
+    Returns:
+        Async node callable
+    """
+    @wraps(fn)
+    async def wrapper(state):
+        with span(name, kind=kind):
+            result = fn(state)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    return wrapper
+
+
+# =========================================================================
+# PER-THREAD STORAGE
+# =========================================================================
+
+class TraceStore:
+    """
+    Keeps the most recent traces per thread.
+
+    In-process LRU of threads (bounded by TRACE_MAX_THREADS) with the last
+    TRACE_MAX_TURNS_PER_THREAD waterfalls each, written through to the Redis
+    cache (when reachable) so traces survive restarts and are visible to
+    other workers.
+    """
+
+    def __init__(self, persist: Optional[bool] = None):
+        self.max_turns = settings.TRACE_MAX_TURNS_PER_THREAD
+        self.max_threads = settings.TRACE_MAX_THREADS
+        self.ttl = settings.TRACE_TTL_SECONDS
+        self.persist = settings.TRACE_PERSIST_REDIS if persist is None else persist
+        self._threads: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._redis_checked = False
+
+    @staticmethod
+    def _key(thread_id: str) -> str:
+        return f"trace:thread:{thread_id}"
+
+    async def _cache(self):
+        """Return the connected cache service, trying to connect only once."""
+        if not self.persist:
+            return None
+        from app.core.cache import cache_service
+        if cache_service.redis is None and not self._redis_checked:
+            self._redis_checked = True
+            await cache_service.connect()
+        return cache_service if cache_service.redis is not None else None
+
+    async def save(self, trace: RunTrace) -> None:
+        waterfall = trace.to_waterfall()
+        turns = self._threads.get(trace.thread_id)
+        if turns is None:
+            turns = deque(maxlen=self.max_turns)
+            self._threads[trace.thread_id] = turns
+        turns.append(waterfall)
+        self._threads.move_to_end(trace.thread_id)
+        while len(self._threads) > self.max_threads:
+            self._threads.popitem(last=False)
+
+        try:
+            cache = await self._cache()
+            if cache:
+                await cache.set(self._key(trace.thread_id), list(turns), ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"[TRACE] Failed to persist trace for {trace.thread_id}: {e}")
+
+    async def list_traces(self, thread_id: str) -> List[Dict[str, Any]]:
+        """All stored waterfalls for a thread, oldest first."""
+        turns = self._threads.get(thread_id)
+        if turns:
+            return list(turns)
+        try:
+            cache = await self._cache()
+            if cache:
+                return await cache.get(self._key(thread_id)) or []
+        except Exception as e:
+            logger.warning(f"[TRACE] Failed to load traces for {thread_id}: {e}")
+        return []
+
+    async def get_trace(self, thread_id: str, trace_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """A specific turn's waterfall, or the latest one if trace_id is omitted."""
+        traces = await self.list_traces(thread_id)
+        if not traces:
+            return None
+        if trace_id is None:
+            return traces[-1]
+        return next((t for t in traces if t["trace_id"] == trace_id), None)
+
+
+# Singleton instance
+_trace_store: Optional[TraceStore] = None
+
+
+def get_trace_store() -> TraceStore:
+    """Get or create the trace store singleton"""
+    global _trace_store
+    if _trace_store is None:
+        _trace_store = TraceStore()
+    return _trace_store
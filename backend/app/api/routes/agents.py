@@ -6,6 +6,7 @@ import uuid
 import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
 from langgraph.errors import GraphInterrupt
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,12 @@ from app.schemas.chat_messages import (
 from app.agents.supervisor_api_adapter import SupervisorWithTools
 from app.services.command_parser import CommandParser, MessageParseType
 from app.services.email_approval_service import get_email_approval_service
+from app.services.approval_store import (
+    ApprovalStateError,
+    STATUS_APPROVED,
+    STATUS_PENDING,
+    get_approval_store,
+)
 from app.services.resend_service import get_resend_service
 from app.schemas.email_approval import (
     EmailApprovalRequest,
@@ -33,6 +40,10 @@ from app.schemas.email_approval import (
     EmailApprovalResult
 )
 from app.services.audit_service import audit_service
+from app.services.chat_run_coordinator import get_chat_run_coordinator, ChatCapacityError
+from app.agents.tracing import get_trace_store
+from app.services.message_bus_factory import get_message_bus
+from redis.exceptions import RedisError
 from datetime import datetime
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
@@ -49,6 +60,33 @@ def get_supervisor() -> SupervisorWithTools:
     return supervisor_agent
 
 
+def _capacity_exception(retry_after: int, queued: int, detail: str) -> HTTPException:
+    """Build the 429 returned when chat admission control rejects a run."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={"message": detail, "queued": queued, "retry_after": retry_after},
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+@asynccontextmanager
+async def chat_run_slot(thread_id: str):
+    """
+    Hold a chat execution slot for a conversation thread.
+
+    Serialises runs on the same thread and enforces the global concurrency
+    limit; raises 429 with Retry-After when capacity is exhausted.
+    """
+    try:
+        ticket = await get_chat_run_coordinator().acquire(thread_id)
+    except ChatCapacityError as e:
+        raise _capacity_exception(e.retry_after, e.queued, str(e))
+    try:
+        yield ticket
+    finally:
+        ticket.release()
+
+
 def has_twg_access(user: User, twg_id: uuid.UUID) -> bool:
     """
     Check if user has access to the specified TWG.
@@ -182,7 +220,8 @@ async def chat_with_martin(
             supervisor = get_supervisor()
             twg_context = str(chat_in.twg_id) if chat_in.twg_id else None
             # Call supervisor (now returns dict or str)
-            raw_response = await supervisor.chat_with_tools(chat_in.message, twg_id=twg_context, thread_id=str(conv_id), user_timezone=user_timezone)
+            async with chat_run_slot(str(conv_id)):
+                raw_response = await supervisor.chat_with_tools(chat_in.message, twg_id=twg_context, thread_id=str(conv_id), user_timezone=user_timezone)
             agent_id = "supervisor_v1"
             
         elif current_user.role in [UserRole.TWG_FACILITATOR, UserRole.TWG_MEMBER]:
@@ -202,12 +241,13 @@ async def chat_with_martin(
             
             # Route to TWG-specific agent (using Supervisor with strict TWG context)
             supervisor = get_supervisor()
-            raw_response = await supervisor.chat_with_tools(
-                chat_in.message,
-                twg_id=str(chat_in.twg_id),
-                thread_id=str(conv_id),
-                user_timezone=user_timezone
-            )
+            async with chat_run_slot(str(conv_id)):
+                raw_response = await supervisor.chat_with_tools(
+                    chat_in.message,
+                    twg_id=str(chat_in.twg_id),
+                    thread_id=str(conv_id),
+                    user_timezone=user_timezone
+                )
             agent_id = f"twg_{chat_in.twg_id}_agent"
             
         else:
@@ -302,7 +342,9 @@ async def chat_with_martin(
             if "request_id" in interrupt_value:
                 req_id = interrupt_value["request_id"]
                 approval_service = get_email_approval_service()
-                if approval_service.update_approval_request_thread(req_id, str(conv_id)):
+                if await asyncio.to_thread(
+                    approval_service.update_approval_request_thread, req_id, str(conv_id), user_id=str(current_user.id)
+                ):
                     logger.info(f"[CHAT] Linked thread {conv_id} to approval request {req_id}")
         
         # Determine agent_id based on user role
@@ -363,23 +405,24 @@ async def enhanced_chat(
              if parsed["type"] == MessageParseType.MENTION:
                  parsed["type"] = MessageParseType.NATURAL
 
-        # Handle based on parse type
-        if parsed["type"] == MessageParseType.COMMAND:
-            # Command execution
-            response_text = await handle_command(supervisor, parsed, chat_in.message, twg_id=str(chat_in.twg_id) if chat_in.twg_id else None, thread_id=str(conv_id))
-            message_type = ChatMessageType.COMMAND_RESULT
-        elif parsed["type"] == MessageParseType.MENTION:
-            # Route to specific agent(s)
-            response_text = await handle_mention(supervisor, parsed, twg_id=str(chat_in.twg_id) if chat_in.twg_id else None, thread_id=str(conv_id))
-            message_type = ChatMessageType.AGENT_TEXT
-        elif parsed["type"] == MessageParseType.MIXED:
-            # Both command and mention - prioritize command
-            response_text = await handle_command(supervisor, parsed, chat_in.message, twg_id=str(chat_in.twg_id) if chat_in.twg_id else None, thread_id=str(conv_id))
-            message_type = ChatMessageType.COMMAND_RESULT
-        else:
-            # Natural language - regular chat
-            response_text = await supervisor.chat_with_tools(chat_in.message, thread_id=str(conv_id))
-            message_type = ChatMessageType.AGENT_TEXT
+        # Handle based on parse type (holding this conversation's execution slot)
+        async with chat_run_slot(str(conv_id)):
+            if parsed["type"] == MessageParseType.COMMAND:
+                # Command execution
+                response_text = await handle_command(supervisor, parsed, chat_in.message, twg_id=str(chat_in.twg_id) if chat_in.twg_id else None, thread_id=str(conv_id))
+                message_type = ChatMessageType.COMMAND_RESULT
+            elif parsed["type"] == MessageParseType.MENTION:
+                # Route to specific agent(s)
+                response_text = await handle_mention(supervisor, parsed, twg_id=str(chat_in.twg_id) if chat_in.twg_id else None, thread_id=str(conv_id))
+                message_type = ChatMessageType.AGENT_TEXT
+            elif parsed["type"] == MessageParseType.MIXED:
+                # Both command and mention - prioritize command
+                response_text = await handle_command(supervisor, parsed, chat_in.message, twg_id=str(chat_in.twg_id) if chat_in.twg_id else None, thread_id=str(conv_id))
+                message_type = ChatMessageType.COMMAND_RESULT
+            else:
+                # Natural language - regular chat
+                response_text = await supervisor.chat_with_tools(chat_in.message, thread_id=str(conv_id))
+                message_type = ChatMessageType.AGENT_TEXT
 
         # Create the agent response message
         agent_message = ChatMessage(
@@ -405,6 +448,9 @@ async def enhanced_chat(
             conversation_id=conv_id
         )
 
+    except HTTPException:
+        # Capacity (429) errors must reach the client as real HTTP errors
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -437,11 +483,18 @@ async def stream_chat(
     Streaming chat endpoint that provides real-time updates on agent thinking and tool execution.
 
     Returns Server-Sent Events (SSE) stream with:
+    - Queue position while waiting for a free execution slot
     - Agent thinking status
     - Tool execution progress
     - Intermediate results
     - Final response
     """
+    coordinator = get_chat_run_coordinator()
+
+    # Reject up-front with a real 429 when both slots and queue are exhausted
+    if coordinator.is_saturated():
+        stats = coordinator.get_stats()
+        raise _capacity_exception(coordinator.retry_after, stats.queued, "Chat capacity exceeded, please retry shortly")
 
     async def event_generator() -> AsyncGenerator[str, None]:
         """Generate SSE events for streaming."""
@@ -456,10 +509,16 @@ async def stream_chat(
         logger.info(f"[STREAM] Request - TWG ID: {chat_in.twg_id} (type: {type(chat_in.twg_id).__name__ if chat_in.twg_id else 'None'})")
         logger.info(f"[STREAM] Request - User Timezone: {user_timezone}")
 
+        ticket = None
         try:
             # Send initial event
             yield f"data: {json.dumps({'type': 'start', 'conversation_id': conv_id})}\n\n"
 
+            # Admission control: wait for a slot, reporting queue position meanwhile
+            ticket = coordinator.enqueue(conv_id)
+            async for position in coordinator.queue_updates(ticket):
+                yield f"data: {json.dumps({'type': 'queued', 'position': position, 'status': f'Waiting for a free agent slot (position {position})...'})}\n\n"
+
             # Use singleton supervisor to ensure memory persistence (MemorySaver)
             supervisor = get_supervisor()
 
@@ -546,7 +605,24 @@ async def stream_chat(
                 
                 # Stream events from LangGraph
                 async for event in supervisor.stream_chat_events(chat_in.message, twg_id=str(chat_in.twg_id) if chat_in.twg_id else None, thread_id=conv_id, user_timezone=user_timezone):
-                    if event["type"] == "node_update":
+                    if event["type"] == "trace":
+                        # Per-node timing span (see GET /agents/chat/{conversation_id}/trace)
+                        yield f"data: {json.dumps({'type': 'trace', 'trace_id': event['trace_id'], 'span': event['span']}, default=str)}\n\n"
+
+                    elif event["type"] == "agent_partial":
+                        # One TWG agent finished during multi-agent dispatch - show its answer right away
+                        agent_name = event["agent_id"].replace("_", " ").title()
+                        yield f"data: {json.dumps({'type': 'agent_partial', 'agent_id': event['agent_id'], 'content': event['content'], 'citations': event.get('citations', []), 'status': f'{agent_name} TWG Agent responded'}, default=str)}\n\n"
+
+                    elif event["type"] == "synthesis_delta":
+                        # Unified memo tokens as they are generated
+                        yield f"data: {json.dumps({'type': 'token', 'delta': event['delta']})}\n\n"
+
+                    elif event["type"] == "synthesis_reset":
+                        # Streaming failed midway - replace whatever was streamed so far
+                        yield f"data: {json.dumps({'type': 'token_reset', 'content': event['content']})}\n\n"
+
+                    elif event["type"] == "node_update":
                         node = event["node"]
                         status_msg = f"Processing step: {node}"
                         
@@ -605,7 +681,9 @@ async def stream_chat(
                 if interrupt_payload.get("type") == "email_approval_required" and "request_id" in interrupt_payload:
                     req_id = interrupt_payload["request_id"]
                     approval_service = get_email_approval_service()
-                    if approval_service.update_approval_request_thread(req_id, conv_id):
+                    if await asyncio.to_thread(
+                        approval_service.update_approval_request_thread, req_id, conv_id, user_id=str(current_user.id)
+                    ):
                         logger.info(f"[STREAM] Linked thread {conv_id} to approval request {req_id}")
                     else:
                         logger.warning(f"[STREAM] Failed to link thread {conv_id} to approval request {req_id}")
@@ -628,6 +706,11 @@ async def stream_chat(
             # End stream gracefully so client doesn't retry immediately or show error
             yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
+        except ChatCapacityError as e:
+            logger.warning(f"[STREAM] Chat capacity exceeded for thread {conv_id}: {e}")
+            yield f"data: {json.dumps({'type': 'error', 'status': 429, 'retry_after': e.retry_after, 'queued': e.queued, 'error': str(e), 'message': 'The assistant is busy right now. Please try again in a few seconds.'})}\n\n"
+            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -640,6 +723,10 @@ async def stream_chat(
             }
             yield f"data: {json.dumps(error_data)}\n\n"
 
+        finally:
+            if ticket:
+                ticket.release()
+
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
@@ -684,6 +771,159 @@ async def get_agent_swarm_status(
     }
 
 
+@router.get("/chat/{conversation_id}/traces")
+async def list_conversation_traces(
+    conversation_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    List the recorded turn traces for a conversation (most recent last).
+
+    Admin only - traces expose internal routing and timing details.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view execution traces")
+
+    traces = await get_trace_store().list_traces(conversation_id)
+    return [
+        {
+            "trace_id": t["trace_id"],
+            "started_at": t["started_at"],
+            "total_ms": t["total_ms"],
+            "status": t["status"],
+            "tokens": t["tokens"],
+            "span_count": len(t["spans"])
+        }
+        for t in traces
+    ]
+
+
+@router.get("/chat/{conversation_id}/trace")
+async def get_conversation_trace(
+    conversation_id: str,
+    trace_id: str = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the execution waterfall for a conversation turn.
+
+    Args:
+        conversation_id: Conversation/thread ID
+        trace_id: Specific turn (defaults to the latest turn)
+
+    Returns:
+        Spans (routing, RAG, LLM, tools, synthesis, negotiation) with depth,
+        offsets and durations, plus token totals
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view execution traces")
+
+    trace = await get_trace_store().get_trace(conversation_id, trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="No trace recorded for this conversation turn")
+    return trace
+
+
+@router.get("/chat/metrics")
+async def get_chat_run_metrics(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get chat admission-control metrics (active and queued runs, waits, rejections).
+    """
+    return get_chat_run_coordinator().get_stats().model_dump()
+
+
+# Agent message bus: backpressure, retries and dead letters (admin only)
+
+def _get_bus_for_admin(current_user: User):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can inspect the message bus")
+    try:
+        return get_message_bus()
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Message bus unavailable: {e}")
+
+
+@router.get("/bus/metrics")
+async def get_bus_metrics(
+    window_minutes: int = 5,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get message bus gauges: per-agent queue depth, lag, throughput, retries and dead letters.
+
+    Args:
+        window_minutes: Throughput averaging window (1-60)
+    """
+    bus = _get_bus_for_admin(current_user)
+
+    def collect():
+        stats = bus.get_bus_stats()
+        agent_ids = set(stats.get("queue_stats", {})) | set(stats.get("dead_letter_stats", {}))
+        stats["agents"] = {
+            agent_id: bus.get_agent_metrics(agent_id, window_minutes=window_minutes)
+            for agent_id in sorted(agent_ids)
+        }
+        return stats
+
+    # Sync Redis calls - keep them off the event loop
+    return await asyncio.to_thread(collect)
+
+
+@router.get("/bus/dead-letters/{agent_id}")
+async def list_dead_letters(
+    agent_id: str,
+    limit: int = 50,
+    offset: int = 0,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    List an agent's dead-lettered messages, newest first, with the last error and attempt count.
+    """
+    bus = _get_bus_for_admin(current_user)
+    entries, total = await asyncio.gather(
+        asyncio.to_thread(bus.get_dead_letters, agent_id, min(max(limit, 1), 500), max(offset, 0)),
+        asyncio.to_thread(bus.get_dead_letter_count, agent_id)
+    )
+    return {"agent_id": agent_id, "total": total, "entries": entries}
+
+
+@router.post("/bus/dead-letters/{agent_id}/replay")
+async def replay_dead_letters(
+    agent_id: str,
+    count: int = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Re-send an agent's dead letters (oldest first) with a fresh retry budget.
+
+    Stops early if the agent's queue fills up; the rest stay dead-lettered.
+    """
+    bus = _get_bus_for_admin(current_user)
+    try:
+        replayed = await asyncio.to_thread(bus.replay_dead_letters, agent_id, count)
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Message bus unavailable: {e}")
+    remaining = await asyncio.to_thread(bus.get_dead_letter_count, agent_id)
+    logger.info(f"Admin {current_user.email} replayed {replayed} dead letters for '{agent_id}'")
+    return {"agent_id": agent_id, "replayed": replayed, "remaining": remaining}
+
+
+@router.delete("/bus/dead-letters/{agent_id}")
+async def purge_dead_letters(
+    agent_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Delete all of an agent's dead letters.
+    """
+    bus = _get_bus_for_admin(current_user)
+    purged = await asyncio.to_thread(bus.purge_dead_letters, agent_id)
+    logger.info(f"Admin {current_user.email} purged {purged} dead letters for '{agent_id}'")
+    return {"agent_id": agent_id, "purged": purged}
+
+
 # Phase 2: Command Autocomplete Endpoints
 
 @router.get("/commands/autocomplete")
@@ -759,14 +999,14 @@ async def get_pending_email_approvals(
     """
     Get all pending email approvals for the current user.
 
+    Admins see every pending request; other users see the ones linked to them.
+
     Returns:
-        List of pending email approval requests
+        List of pending email approval requests (newest first)
     """
     approval_service = get_email_approval_service()
-    # Clean up old requests first
-    approval_service.cleanup_old_requests()
-
-    pending = list(approval_service.pending_approvals.values())
+    user_id = None if current_user.role == UserRole.ADMIN else str(current_user.id)
+    pending = await asyncio.to_thread(approval_service.list_pending_approvals, user_id=user_id)
     return {"pending_approvals": pending}
 
 
@@ -785,7 +1025,7 @@ async def get_email_approval(
         EmailApprovalRequest details
     """
     approval_service = get_email_approval_service()
-    approval_request = approval_service.get_approval_request(request_id)
+    approval_request = await asyncio.to_thread(approval_service.get_approval_request, request_id)
 
     if not approval_request:
         raise HTTPException(
@@ -814,11 +1054,18 @@ async def approve_email(
         Result of email sending operation
     """
     approval_service = get_email_approval_service()
-    approval_request = approval_service.get_approval_request(request_id)
-    
+
     # Initialize audit service
     from app.services.audit_service import audit_service
 
+    # Claim the request atomically so concurrent approvals can't send twice
+    try:
+        approval_request = await asyncio.to_thread(
+            approval_service.decide_approval_request,
+            request_id, approved=approval_response.approved, decided_by=str(current_user.id)
+        )
+    except ApprovalStateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
     if not approval_request:
         raise HTTPException(
@@ -827,8 +1074,6 @@ async def approve_email(
         )
 
     if not approval_response.approved:
-        # User declined - remove the request
-        approval_service.remove_approval_request(request_id)
         return EmailApprovalResult(
             success=True,
             message="Email sending cancelled by user",
@@ -838,6 +1083,7 @@ async def approve_email(
     # Use modified draft if provided, otherwise use original
     draft = approval_response.modifications or approval_request.draft
 
+    result = None
     try:
         # Send the email using Resend service
         resend_service = get_resend_service()
@@ -851,9 +1097,6 @@ async def approve_email(
             attachments=draft.attachments
         )
 
-        # Remove the approval request
-        approval_service.remove_approval_request(request_id)
-
         # RESUME AGENT EXECUTION
         thread_id = approval_request.thread_id
         if thread_id:
@@ -867,7 +1110,9 @@ async def approve_email(
             }
             try:
                 supervisor = get_supervisor()
-                agent_response = await supervisor.resume_chat(thread_id, resume_value)
+                # Serialise with any chat still running on this thread
+                async with get_chat_run_coordinator().run(thread_id):
+                    agent_response = await supervisor.resume_chat(thread_id, resume_value)
                 logger.info(f"Agent resumed successfully. Response: {agent_response}")
             except Exception as e:
                 logger.error(f"Failed to resume agent: {e}")
@@ -894,8 +1139,10 @@ async def approve_email(
              await db.commit()
 
     except Exception as e:
-        # Revert/Log
+        # Revert so the user can retry (only if nothing was sent), and log
         logger.error(f"Failed to send email: {e}")
+        if result is None:
+            await asyncio.to_thread(approval_service.reopen_approval_request, request_id)
         return EmailApprovalResult(
             success=False,
             message=f"Failed to send email: {str(e)}",
@@ -920,10 +1167,24 @@ async def approve_document(
 ):
     """
     Approve and save a document.
+
+    The draft is claimed atomically in the approval store first, so a
+    double-submitted approval can't save the document twice. Drafts the
+    store doesn't know (expired or created before it existed) are saved as before.
     """
     from app.services.agent_service import AgentService
     agent_service = AgentService(db)
-    
+
+    approval_store = get_approval_store()
+    try:
+        claimed = await asyncio.to_thread(
+            approval_store.transition,
+            "document", request_id, expected=STATUS_PENDING,
+            new_status=STATUS_APPROVED, decided_by=str(current_user.id)
+        )
+    except ApprovalStateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
     try:
         result = await agent_service.approve_document_creation(
             approval_request_id=request_id,
@@ -945,6 +1206,12 @@ async def approve_document(
         
     except Exception as e:
         logger.error(f"Failed to approve document: {e}")
+        if claimed:
+            # Let the user retry
+            await asyncio.to_thread(
+                approval_store.transition,
+                "document", request_id, expected=STATUS_APPROVED, new_status=STATUS_PENDING
+            )
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -967,7 +1234,13 @@ async def decline_email(
         Result of the decline operation
     """
     approval_service = get_email_approval_service()
-    approval_request = approval_service.get_approval_request(request_id)
+    try:
+        approval_request = await asyncio.to_thread(
+            approval_service.decide_approval_request,
+            request_id, approved=False, decided_by=str(current_user.id)
+        )
+    except ApprovalStateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
     if not approval_request:
         raise HTTPException(
@@ -975,9 +1248,6 @@ async def decline_email(
             detail=f"Approval request {request_id} not found"
         )
 
-    # Remove the approval request
-    approval_service.remove_approval_request(request_id)
-
     return EmailApprovalResult(
         success=True,
         message=f"Email declined: {reason}" if reason else "Email sending cancelled",
@@ -1058,7 +1328,7 @@ async def send_project_memo_email(
 
             # Auto-approve for this endpoint since user already initiated the send
             approval_service = get_email_approval_service()
-            approval_request = approval_service.get_approval_request(approval_id)
+            approval_request = await asyncio.to_thread(approval_service.get_approval_request, approval_id)
 
             if approval_request:
                 # Send the email directly
@@ -1071,7 +1341,7 @@ async def send_project_memo_email(
                 )
 
                 # Remove the approval request
-                approval_service.remove_approval_request(approval_id)
+                await asyncio.to_thread(approval_service.remove_approval_request, approval_id)
 
                 logger.info(f"Project memo email sent successfully to {request.to_email}")
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, Body
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc, or_, and_
@@ -12,7 +12,8 @@ from app.models.models import User, Meeting, ActionItem, Document, TWG, Project,
 from app.api.deps import get_current_active_user
 from sqlalchemy.orm import selectinload
 from app.core.ws_manager import ws_manager
-from app.utils.security import verify_token
+from app.core.ws_framing import negotiate_framing
+from app.core.ws_session import AuthenticatedSocket, authenticate_token
 
 from app.schemas.schemas import ConflictRead, ManualConflictResolution
 from app.core.cache import cache_service
@@ -916,43 +917,32 @@ async def force_reconciliation(
 
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
-    import asyncio
+async def websocket_endpoint(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    wire_format: Optional[str] = Query(None, alias="format")
+):
+    # Authenticate once per connection (anonymous sockets are allowed;
+    # authenticated ones are closed when their token expires)
+    identity = authenticate_token(token)
+    user_id = identity.user_id if identity else "anonymous"
     
-    # Authenticate
-    user_id = "anonymous"
-    if token:
-        payload = verify_token(token, "access")
-        if payload:
-            user_id = payload.get("sub")
+    # Everything sent to this client goes through its outbound queue, in the
+    # negotiated framing (msgpack binary frames or JSON text)
+    framing, subprotocol = negotiate_framing(websocket, wire_format)
+    out = await ws_manager.connect(websocket, user_id, framing=framing, subprotocol=subprotocol)
+    session = AuthenticatedSocket(websocket, identity, out)
     
-    await ws_manager.connect(websocket, user_id)
+    async def on_message(data: str):
+        # Echo or handle other messages
+        out.send({"type": "ack", "message": data})
     
     try:
         # Send initial connection confirmation
-        await websocket.send_json({"type": "connected", "user_id": user_id})
+        out.send({"type": "connected", "user_id": user_id, "framing": framing})
         
-        while True:
-            try:
-                # Wait for message with timeout (heartbeat every 30 seconds)
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                
-                # Handle ping/pong
-                if data == "ping":
-                    await websocket.send_text("pong")
-                else:
-                    # Echo or handle other messages
-                    await websocket.send_json({"type": "ack", "message": data})
-                    
-            except asyncio.TimeoutError:
-                # Send heartbeat ping to keep connection alive
-                try:
-                    await websocket.send_json({"type": "heartbeat", "status": "alive"})
-                except Exception:
-                    break
-                    
-    except WebSocketDisconnect:
-        pass
+        # Pings, re-auth and heartbeats are handled by the session (shared heartbeat wheel)
+        await session.serve(on_message)
     except Exception as e:
         # Log but don't crash
         print(f"WebSocket error for {user_id}: {e}")
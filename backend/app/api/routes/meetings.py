@@ -1,13 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, WebSocket, WebSocketDisconnect, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, WebSocket, Query
 from app.services.audit_service import audit_service
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text, and_, or_
 from typing import List, Optional
 import uuid
 from datetime import datetime, timedelta, timezone
-import asyncio
 import json
-import redis
 import logging
 import traceback
 
@@ -24,10 +22,12 @@ from app.schemas.schemas import (
 from app.api.deps import get_current_active_user, require_facilitator, require_twg_access, has_twg_access
 from app.services.email_service import email_service
 from app.core.config import settings
+from app.services.live_meeting_hub import LiveSocket, get_live_meeting_hub
+from app.core.ws_framing import deflate_offered, negotiate_framing
 from sqlalchemy.orm import selectinload
 from app.services.document_synthesizer import DocumentSynthesizer
 from app.services.llm_service import llm_service
-from app.utils.security import verify_token
+from app.core.ws_session import AuthenticatedSocket, authenticate_token
 from app.core.ws_manager import ws_manager
 from app.services.vexa_service import VexaService
 from app.core.database import get_db, get_db_session_context
@@ -527,10 +527,9 @@ async def generate_minutes(
     # 4. Generate Minutes
     synthesizer = DocumentSynthesizer(llm_client=llm_service)
     try:
-        minutes_result = synthesizer.synthesize_minutes(
-            transcript_text=db_meeting.transcript,
-            meeting_context=meeting_context
-        )
+        # Live draft consolidation when available, otherwise full synthesis
+        from app.services.live_minutes_builder import build_minutes
+        minutes_result = await build_minutes(str(meeting_id), db_meeting.transcript, meeting_context, synthesizer)
         generated_content = minutes_result["content"]
         
         # 5. Save to DB (Upsert)
@@ -1700,11 +1699,28 @@ async def generate_minutes(
     if not has_twg_access(current_user, db_meeting.twg_id):
         raise HTTPException(status_code=403, detail="Access denied")
     
+    pillar_name = db_meeting.twg.pillar.value if db_meeting.twg else "Unspecified"
+    
+    # Minutes drafted live during the meeting only need a short consolidation pass
+    if settings.LIVE_MINUTES_ENABLED and db_meeting.transcript:
+        from app.services.live_minutes_builder import get_live_minutes_builder
+        live_result = await get_live_minutes_builder().finalize(
+            str(meeting_id),
+            {
+                "meeting_title": db_meeting.title,
+                "meeting_date": db_meeting.scheduled_at.strftime('%Y-%m-%d') if db_meeting.scheduled_at else "TBD",
+                "pillar_name": pillar_name,
+                "agenda_content": db_meeting.agenda.content if db_meeting.agenda else "Not provided"
+            },
+            db_meeting.transcript
+        )
+        if live_result is not None:
+            await _save_generated_minutes(db, meeting_id, live_result["content"])
+            return {"generated_minutes": live_result["content"]}
+    
     # Use Supervisor Agent ("Secretariat AI")
     agent = create_langgraph_agent(agent_id="supervisor", session_id=str(meeting_id))
     
-    pillar_name = db_meeting.twg.pillar.value if db_meeting.twg else "Unspecified"
-    
     # Use transcript if available, otherwise use agenda
     context = db_meeting.transcript if db_meeting.transcript else ""
     agenda_content = db_meeting.agenda.content if db_meeting.agenda else ""
@@ -1786,25 +1802,28 @@ STRUCTURE:
 [Closing remarks]"""
 
     generated_content = agent.chat(prompt)
+    await _save_generated_minutes(db, meeting_id, generated_content)
     
-    # Persist headers
+    return {"generated_minutes": generated_content}
+
+
+async def _save_generated_minutes(db: AsyncSession, meeting_id: uuid.UUID, content: str):
+    """Store generated minutes as the meeting's DRAFT (creating the record if needed)."""
     result_min = await db.execute(select(Minutes).where(Minutes.meeting_id == meeting_id))
     existing_minutes = result_min.scalar_one_or_none()
     
     if existing_minutes:
-        existing_minutes.content = generated_content
+        existing_minutes.content = content
         existing_minutes.status = MinutesStatus.DRAFT
     else:
         new_minutes = Minutes(
             meeting_id=meeting_id,
-            content=generated_content,
+            content=content,
             status=MinutesStatus.DRAFT
         )
         db.add(new_minutes)
     
     await db.commit()
-    
-    return {"generated_minutes": generated_content}
 
 
 @router.post("/{meeting_id}/minutes/submit-for-approval")
@@ -2937,157 +2956,85 @@ Example: "Energy TWG Session 2: Infrastructure Assessment Review"
 async def live_meeting_websocket(
     websocket: WebSocket,
     meeting_id: str,
-    token: Optional[str] = Query(None)
+    token: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Query(None),
+    wire_format: Optional[str] = Query(None, alias="format")
 ):
-    # 1. ALWAYS ACCEPT FIRST
+    # 1. ALWAYS ACCEPT FIRST (with the negotiated framing: msgpack binary
+    # frames via subprotocol or ?format=msgpack, JSON text otherwise)
     # This prevents the browser from thinking the connection was rejected
-    await websocket.accept()
+    framing, subprotocol = negotiate_framing(websocket, wire_format)
+    await websocket.accept(subprotocol=subprotocol)
     
-    # 2. Authenticate
-    user_id = "anonymous"
-    ws_token = token or websocket.query_params.get("token")
-    
-    if ws_token:
-        try:
-            payload = verify_token(ws_token, "access")
-            if payload:
-                user_id = payload.get("sub", "anonymous")
-        except Exception:
-            pass
+    # 2. Authenticate once per connection (cached; the session closes the
+    # socket when the token expires unless the client re-authenticates)
+    identity = authenticate_token(token or websocket.query_params.get("token"))
+    user_id = identity.user_id if identity else "anonymous"
     
     print(f"WS LIVE: user={user_id} meeting={meeting_id}")
     
-    # Register connection
-    if user_id not in ws_manager.active_connections:
-        ws_manager.active_connections[user_id] = []
-    ws_manager.active_connections[user_id].append(websocket)
-    
-    # 2. Setup Redis Subscription
-    r = None
-    pubsub = None
+    # 2. Join the meeting's room on the process-wide live hub (one upstream
+    # subscription per meeting per worker; updates arrive via this socket's send queue)
+    live_hub = get_live_meeting_hub()
+    live = LiveSocket(websocket, str(meeting_id), user_id, framing=framing)
+
+    # Register connection (dashboard broadcasts and notifications, from any
+    # worker, share the live socket's outbound queue)
+    await ws_manager.register(websocket, user_id, outbound=live)
+    session = AuthenticatedSocket(websocket, identity, live)
     try:
-        # Connect to Redis for real-time stream
-        try:
-            if settings.REDIS_URL:
-                r = redis.from_url(settings.REDIS_URL)
-            elif settings.REDIS_HOST:
-                r = redis.Redis(
-                    host=settings.REDIS_HOST, 
-                    port=settings.REDIS_PORT, 
-                    db=settings.REDIS_DB, 
-                    password=settings.REDIS_PASSWORD
-                )
-        except Exception as re:
-            print(f"WS REDIS CONNECTION FAILED: {re}")
-        
-        if r:
-            pubsub = r.pubsub()
-            pubsub.subscribe("live_meeting_stream")
-            
         # 3. Handle connection
-        await websocket.send_json({
+        live.send({
             "type": "connected", 
             "meeting_id": str(meeting_id),
-            "status": "ready"
+            "status": "ready",
+            "resumed": bool(last_event_id),
+            "framing": framing,
+            "compression": "permessage-deflate" if deflate_offered(websocket) else None
         })
 
-        # 4. Load History from Redis
-        if r:
-            try:
-                # lrange returns bytes, reversed to send oldest first
-                history_bytes = r.lrange(f"live_updates:{meeting_id}", 0, -1)
-                for msg_bytes in reversed(history_bytes):
-                    try:
-                        await websocket.send_json(json.loads(msg_bytes.decode('utf-8')))
-                    except Exception as je:
-                        print(f"WS History Parse error: {je}")
-            except Exception as he:
-                print(f"WS History load error: {he}")
-        
-        # Start a background task to listen to Redis
-        async def redis_listener():
-            if not pubsub:
-                return
+        # 4. Replay history (only the missed events when resuming), then live updates
+        resume = await live_hub.join(live, last_event_id=last_event_id)
+        if resume["truncated"]:
+            # Some events after last_event_id were already trimmed: client should refetch
+            live.send({
+                "type": "history_truncated",
+                "meeting_id": str(meeting_id),
+                "last_event_id": last_event_id
+            })
+
+        async def on_message(raw_data: str):
+            # Handle JSON commands from Martin Command Center
             try:
-                # Use a separate thread for the synchronous pubsub blocking calls
-                def get_redis_msg():
-                    try:
-                        return pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                    except Exception:
-                        return None
-
-                while True:
-                    message = await asyncio.to_thread(get_redis_msg)
-                    if message:
-                        try:
-                            data = json.loads(message['data'])
-                            # Filter by meeting_id to ensure privacy
-                            if data.get("meeting_id") == str(meeting_id):
-                                await websocket.send_json(data)
-                        except Exception as je:
-                            print(f"Error parsing Redis message: {je}")
-                    await asyncio.sleep(0.1)
-            except asyncio.CancelledError:
+                msg_json = json.loads(raw_data)
+                if msg_json.get("type") == "live_command":
+                    question = msg_json.get("command")
+                    print(f"Manual command received for {meeting_id}: {question}")
+                    async with get_db_session_context() as db:
+                        await VexaService()._handle_live_command(str(meeting_id), question, db)
+                
+                elif msg_json.get("type") == "request_insight":
+                    print(f"Manual insight request for {meeting_id}")
+                    # Trigger a proactive scan using current transcript
+                    async with get_db_session_context() as db:
+                        res_m = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+                        meeting_obj = res_m.scalar_one_or_none()
+                        transcript = meeting_obj.transcript if meeting_obj else None
+                    if transcript:
+                        # Immediate scan of the recent transcript; supersedes any pending batch
+                        from app.services.live_analysis_worker import get_live_analysis_worker
+                        await get_live_analysis_worker().request_insight(str(meeting_id), transcript)
+            except Exception as je:
+                # Not a valid JSON or other parse error, ignore or log
                 pass
-            except Exception as e:
-                print(f"Redis listener error for {meeting_id}: {e}")
-
-        listener_task = asyncio.create_task(redis_listener())
-        
-        try:
-            while True:
-                # Keep connection alive and receive incoming pings/commands
-                try:
-                    raw_data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                    if raw_data == "ping":
-                        await websocket.send_text("pong")
-                        continue
-                    
-                    # Handle JSON commands from Martin Command Center
-                    try:
-                        msg_json = json.loads(raw_data)
-                        if msg_json.get("type") == "live_command":
-                            question = msg_json.get("command")
-                            print(f"Manual command received for {meeting_id}: {question}")
-                            async with get_db_session_context() as db:
-                                await VexaService()._handle_live_command(str(meeting_id), question, db)
-                        
-                        elif msg_json.get("type") == "request_insight":
-                            print(f"Manual insight request for {meeting_id}")
-                            # Trigger a proactive scan using current transcript
-                            async with get_db_session_context() as db:
-                                res_m = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-                                meeting_obj = res_m.scalar_one_or_none()
-                                if meeting_obj and meeting_obj.transcript:
-                                    # Use analyze_live_chunk on the existing transcript (or just a fresh scan)
-                                    # For manual, we can treat the whole transcript as a 'chunk' or just the last bit.
-                                    # Let's use the last 2000 chars for a quick manual scan.
-                                    chunk = meeting_obj.transcript[-2000:]
-                                    await VexaService().analyze_live_chunk(str(meeting_id), chunk, db)
-                    except Exception as je:
-                        # Not a valid JSON or other parse error, ignore or log
-                        pass
 
-                except asyncio.TimeoutError:
-                    # Heartbeat
-                    try:
-                        await websocket.send_json({"type": "heartbeat", "status": "alive"})
-                    except:
-                        break
-        except WebSocketDisconnect:
-            pass
-        finally:
-            listener_task.cancel()
-            if pubsub:
-                try:
-                    pubsub.unsubscribe("live_meeting_stream")
-                    pubsub.close()
-                except:
-                    pass
+        # Pings, re-auth and heartbeats are handled by the session (shared heartbeat wheel)
+        await session.serve(on_message)
                 
     except Exception as e:
         print(f"WebSocket error for meeting {meeting_id}: {e}")
     finally:
+        await live_hub.leave(live)
         ws_manager.disconnect(websocket, user_id)
 # Add these endpoints after upsert_minutes in meetings.py
 
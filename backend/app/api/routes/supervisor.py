@@ -3,16 +3,32 @@ Supervisor API Routes
 
 Endpoints for accessing supervisor global state.
 Admin-only access with real-time WebSocket updates.
+
+REST endpoints reuse a snapshot younger than SUPERVISOR_STATE_MAX_AGE_SECONDS;
+/supervisor/ws/state streams the snapshot once and JSON-patch diffs after it
+(the state is rebuilt every SUPERVISOR_STATE_MAX_AGE_SECONDS while anyone is subscribed).
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+
+from loguru import logger
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_session_context
 from app.api.deps import get_current_active_user
 from app.models.models import User, UserRole
+from app.core.ws_framing import negotiate_framing
+from app.core.ws_queue import OutboundSocket
+from app.core.ws_session import (
+    CLOSE_FORBIDDEN,
+    AuthenticatedSocket,
+    SocketIdentity,
+    authenticate_token,
+    get_socket_user_role
+)
 from app.services.supervisor_state_service import get_supervisor_state
 from app.schemas.supervisor import (
     SupervisorStateSnapshot,
@@ -55,8 +71,8 @@ async def get_global_state(
     """
     state_service = get_supervisor_state()
     
-    # Refresh state from database (real-time)
-    state = await state_service.refresh_state(db)
+    # Reuse a recent snapshot (concurrent requests share one rebuild)
+    state = await state_service.ensure_fresh(db)
     
     return state
 
@@ -76,7 +92,7 @@ async def get_global_calendar(
     state_service = get_supervisor_state()
     
     # Ensure state is fresh
-    await state_service.refresh_state(db)
+    await state_service.ensure_fresh(db)
     
     return state_service.get_global_calendar()
 
@@ -96,7 +112,7 @@ async def get_document_registry(
     state_service = get_supervisor_state()
     
     # Ensure state is fresh
-    await state_service.refresh_state(db)
+    await state_service.ensure_fresh(db)
     
     return state_service.get_document_registry()
 
@@ -116,7 +132,7 @@ async def get_project_pipeline(
     state_service = get_supervisor_state()
     
     # Ensure state is fresh
-    await state_service.refresh_state(db)
+    await state_service.ensure_fresh(db)
     
     return state_service.get_project_pipeline()
 
@@ -137,7 +153,7 @@ async def get_twg_summary(
     state_service = get_supervisor_state()
     
     # Ensure state is fresh
-    await state_service.refresh_state(db)
+    await state_service.ensure_fresh(db)
     
     # RBAC: Check if user has access to this TWG
     is_admin = current_user.role in [UserRole.ADMIN, UserRole.SECRETARIAT_LEAD]
@@ -200,3 +216,76 @@ async def force_state_refresh(
             "active_conflicts": len(state.active_conflicts)
         }
     }
+
+
+async def _socket_admin(token: Optional[str]) -> Optional[SocketIdentity]:
+    """Identity for an Admin/Secretariat WebSocket access token, or None."""
+    identity = authenticate_token(token)
+    if identity is None:
+        return None
+    role = await get_socket_user_role(identity.user_id)
+    if role not in (UserRole.ADMIN.value, UserRole.SECRETARIAT_LEAD.value):
+        return None
+    return identity
+
+
+@router.websocket("/ws/state")
+async def supervisor_state_socket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    since: Optional[int] = Query(None, description="Version the client already holds (reconnect)"),
+    epoch: Optional[str] = Query(None, description="Epoch of that version"),
+    wire_format: Optional[str] = Query(None, alias="format")
+):
+    """
+    Subscribe to supervisor state changes.
+    
+    **Admin Only**
+    
+    Messages:
+    - supervisor_state_subscribed: {epoch, version, resumed}
+    - supervisor_state_snapshot: {epoch, version, state} (full state)
+    - supervisor_state_patch: {epoch, version, base_version, patch} (RFC 6902 ops)
+    
+    Apply a patch only if base_version is the version you hold; otherwise send
+    {"type": "resync"} for a fresh snapshot. Reconnect with ?since=<version>&epoch=<epoch>
+    to receive just the missed patches.
+    """
+    identity = await _socket_admin(token)
+    if identity is None:
+        await websocket.close(code=CLOSE_FORBIDDEN)
+        return
+
+    state_service = get_supervisor_state()
+    framing, subprotocol = negotiate_framing(websocket, wire_format)
+    await websocket.accept(subprotocol=subprotocol)
+
+    async def on_close(closed: OutboundSocket) -> None:
+        state_service.unsubscribe(closed)
+
+    out = OutboundSocket(websocket, name=f"supervisor:{identity.user_id}", framing=framing, on_close=on_close)
+    session = AuthenticatedSocket(websocket, identity, out)
+
+    async def on_message(data: str) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if isinstance(message, dict) and message.get("type") == "resync":
+            state_service.send_snapshot(out)
+
+    try:
+        if state_service.get_state() is None:
+            async with get_db_session_context() as db:
+                await state_service.ensure_fresh(db)
+        state_service.subscribe(out, since=since, epoch=epoch)
+
+        # Pings, re-auth, heartbeats and token expiry are handled by the session
+        await session.serve(on_message)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Supervisor state WebSocket error for {identity.user_id}: {e}")
+    finally:
+        state_service.unsubscribe(out)
+        await out.close()
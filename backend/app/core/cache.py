@@ -5,6 +5,7 @@ from functools import wraps
 import json
 import hashlib
 from app.core.config import settings
+from app.core.redis_pool import get_redis_registry
 from loguru import logger
 from fastapi import Request, Response
 
@@ -15,10 +16,15 @@ class CacheService:
 
     async def connect(self):
         if not self.redis:
+            if get_redis_registry().resolve_backend() == "memory":
+                # Single node / no Redis: bounded in-process LRU with TTL
+                from app.services.inprocess_backend import InProcessCacheClient
+                self.redis = InProcessCacheClient(max_entries=settings.INPROCESS_MAX_ENTRIES)
+                logger.info("Using in-process cache")
+                return
             try:
-                # Use REDIS_URL from settings
-                url = settings.REDIS_URL or f"redis://:{settings.REDIS_PASSWORD}@{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
-                self.redis = redis.from_url(url, encoding="utf-8", decode_responses=True)
+                # Shared pool from the registry (configured from settings)
+                self.redis = get_redis_registry().get_async_client(decode_responses=True)
                 await self.redis.ping()
                 logger.info("Connected to Redis Cache")
             except Exception as e:
@@ -27,7 +33,8 @@ class CacheService:
 
     async def close(self):
         if self.redis:
-            await self.redis.close()
+            # Releases the client only; the registry closes the pool on shutdown
+            await self.redis.aclose()
             self.redis = None
 
     async def get(self, key: str) -> Optional[Any]:
@@ -11,14 +11,12 @@ Production-ready task queue for background jobs with:
 from celery import Celery
 from celery.schedules import crontab
 from app.core.config import settings
+from app.core.redis_pool import build_redis_url
 
-# Build broker URL
-if settings.REDIS_URL:
-    broker_url = settings.REDIS_URL
-    result_backend = settings.REDIS_URL
-else:
-    broker_url = f"redis://:{settings.REDIS_PASSWORD}@{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
-    result_backend = broker_url
+# Build broker URL (same URL as the app's pool registry; Celery runs in its
+# own worker processes, so it keeps its own pools, sized from the same setting)
+broker_url = build_redis_url()
+result_backend = broker_url
 
 # Initialize Celery app
 celery_app = Celery(
@@ -50,6 +48,13 @@ celery_app.conf.update(
     
     # Result backend
     result_expires=3600,  # Results expire after 1 hour
+
+    # Redis connection pools (bounded like the app's registry pools)
+    broker_pool_limit=settings.REDIS_MAX_CONNECTIONS,
+    redis_max_connections=settings.REDIS_MAX_CONNECTIONS,
+    broker_transport_options={"max_connections": settings.REDIS_MAX_CONNECTIONS},
+    redis_socket_keepalive=True,
+    redis_backend_health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
     
     # Worker configuration
     worker_prefetch_multiplier=1,  # Fetch one task at a time (fair distribution)
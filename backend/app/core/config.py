@@ -4,7 +4,7 @@ Configuration Management
 Centralized configuration using Pydantic Settings for environment variables.
 """
 
-from typing import Optional, List, Union, Any
+from typing import Optional, List, Union, Any, Dict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 from pathlib import Path
@@ -40,11 +40,31 @@ class Settings(BaseSettings):
         default=None,
         description="Redis connection URL (overrides individual settings)"
     )
-    REDIS_HOST: str = Field(default="localhost", description="Redis server host")
+    REDIS_HOST: Optional[str] = Field(
+        default=None,
+        description="Redis server host (unset together with REDIS_URL = no Redis configured)"
+    )
     REDIS_PORT: int = Field(default=6379, description="Redis server port")
     REDIS_DB: int = Field(default=0, description="Redis database number")
     REDIS_PASSWORD: Optional[str] = Field(default=None, description="Redis password")
-    REDIS_MAX_CONNECTIONS: int = Field(default=10, description="Redis max connections")
+    REDIS_MAX_CONNECTIONS: int = Field(default=50, description="Redis max connections per pool")
+    REDIS_POOL_TIMEOUT: float = Field(
+        default=5.0,
+        description="Seconds to wait for a free pooled Redis connection before failing"
+    )
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(
+        default=30,
+        description="PING pooled Redis connections idle longer than this many seconds"
+    )
+    REDIS_BACKEND: str = Field(
+        default="auto",
+        description="'redis', 'memory' (in-process bus/memory/cache, single node only) "
+                    "or 'auto' (memory only when neither REDIS_URL nor REDIS_HOST is set)"
+    )
+    INPROCESS_MAX_ENTRIES: int = Field(
+        default=10000,
+        description="LRU bound for each in-process store (cache, memory, message status, approvals)"
+    )
     REDIS_MEMORY_TTL: int = Field(
         default=86400,
         description="Default TTL for Redis keys in seconds (24 hours)"
@@ -117,6 +137,184 @@ class Settings(BaseSettings):
         default=3600,
         description="Message TTL in seconds (1 hour)"
     )
+    MESSAGE_BUS_TRANSPORT: str = Field(
+        default="list",
+        description="Message bus transport: 'list' (LPUSH/BRPOP) or 'streams' (consumer groups, at-least-once)"
+    )
+    MESSAGE_BUS_CONSUMER_GROUP: str = Field(
+        default="agent-workers",
+        description="Consumer group shared by all workers of an agent (streams transport)"
+    )
+    MESSAGE_BUS_CLAIM_IDLE_MS: int = Field(
+        default=60000,
+        description="Reclaim unacknowledged messages idle longer than this (streams transport)"
+    )
+    MESSAGE_BUS_ACK_BATCH_SIZE: int = Field(
+        default=50,
+        description="Flush buffered acknowledgements at this many entries (streams transport)"
+    )
+    MESSAGE_BUS_ACK_FLUSH_INTERVAL: float = Field(
+        default=1.0,
+        description="Flush buffered acknowledgements at least this often, in seconds (streams transport)"
+    )
+    MESSAGE_BUS_MAX_RETRIES: int = Field(
+        default=3,
+        description="Retry a failed message this many times (exponential backoff) before dead-lettering it"
+    )
+    MESSAGE_BUS_RETRY_BACKOFF_BASE: float = Field(
+        default=1.0,
+        description="First retry delay in seconds; doubles with each attempt"
+    )
+    MESSAGE_BUS_RETRY_BACKOFF_MAX: float = Field(
+        default=300.0,
+        description="Maximum retry delay and queue-full retry_after hint (seconds)"
+    )
+    MESSAGE_BUS_DEAD_LETTER_MAX: int = Field(
+        default=1000,
+        description="Dead letters kept per agent (oldest trimmed)"
+    )
+    MESSAGE_BUS_RETRY_POLL_INTERVAL: float = Field(
+        default=1.0,
+        description="Minimum seconds between retry-schedule polls per worker"
+    )
+    CODEC_DEFAULT_FORMAT: str = Field(
+        default="msgpack",
+        description="Payload encoding for bus queues and memory entries: msgpack, orjson or json"
+    )
+    CODEC_NAMESPACES: Dict[str, str] = Field(
+        default_factory=dict,
+        description='Per-namespace encoding overrides, e.g. {"memory": "orjson"} (namespaces: bus, memory)'
+    )
+    CODEC_COMPRESS_THRESHOLD_BYTES: int = Field(
+        default=1024,
+        description="zstd-compress encoded payloads at least this large (0 disables compression)"
+    )
+    CODEC_COMPRESSION_LEVEL: int = Field(
+        default=3,
+        description="zstd compression level for payloads"
+    )
+    PUBSUB_SUBSCRIBER_QUEUE_SIZE: int = Field(
+        default=1000,
+        description="Per-subscriber queue size in the shared pub/sub hub (oldest dropped when full)"
+    )
+    PUBSUB_RECONNECT_MAX_BACKOFF: float = Field(
+        default=30.0,
+        description="Maximum delay between pub/sub reconnect attempts (seconds)"
+    )
+    WS_SEND_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        description="Per-socket send timeout for dashboard/notification WebSockets (slower sockets are evicted)"
+    )
+    WS_SEND_QUEUE_SIZE: int = Field(
+        default=256,
+        description="Droppable messages queued per WebSocket before the oldest is dropped"
+    )
+    WS_NEVER_DROP_LIMIT: int = Field(
+        default=1000,
+        description="Undelivered must-deliver messages (approvals, notifications) before a WebSocket is disconnected"
+    )
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = Field(
+        default=30.0,
+        description="Heartbeat interval per WebSocket (driven by one timer wheel per process)"
+    )
+    WS_HEARTBEAT_TICK_SECONDS: float = Field(
+        default=1.0,
+        description="Heartbeat wheel resolution; also the precision of token-expiry disconnects"
+    )
+    WS_AUTH_CACHE_SIZE: int = Field(
+        default=10000,
+        description="Verified WebSocket access tokens cached per process (until they expire)"
+    )
+    WS_AUTH_ROLE_TTL_SECONDS: int = Field(
+        default=60,
+        description="How long a user's role is cached for WebSocket authorization"
+    )
+    SUPERVISOR_STATE_MAX_AGE_SECONDS: float = Field(
+        default=30.0,
+        description="Supervisor state REST endpoints reuse a snapshot younger than this instead of rebuilding it"
+    )
+    SUPERVISOR_STATE_PATCH_HISTORY: int = Field(
+        default=50,
+        description="Supervisor state patches kept for clients resuming with ?since= (older versions get a snapshot)"
+    )
+    LIVE_SOCKET_QUEUE_SIZE: int = Field(
+        default=256,
+        description="Outbound queue per live-meeting WebSocket (oldest updates dropped when full)"
+    )
+    LIVE_ANALYSIS_ENABLED: bool = Field(
+        default=True,
+        description="Run batched conflict/agenda analysis on live meeting transcripts"
+    )
+    LIVE_ANALYSIS_MODEL: Optional[str] = Field(
+        default=None,
+        description="Fast model for live analysis on the configured provider (default: the main model)"
+    )
+    LIVE_ANALYSIS_DEBOUNCE_SECONDS: float = Field(
+        default=15.0,
+        description="Quiet period after the last transcript chunk before a batch is analyzed"
+    )
+    LIVE_ANALYSIS_MAX_WAIT_SECONDS: float = Field(
+        default=60.0,
+        description="Analyze a batch at least this often while chunks keep arriving"
+    )
+    LIVE_ANALYSIS_MAX_CHARS: int = Field(
+        default=6000,
+        description="Transcript characters sent per analysis (most recent kept)"
+    )
+    LIVE_ANALYSIS_MAX_BATCHES_PER_HOUR: int = Field(
+        default=60,
+        description="Analyses per meeting per rolling hour (2 LLM calls each); later text waits for budget"
+    )
+    LIVE_ANALYSIS_CONTEXT_TTL_SECONDS: int = Field(
+        default=600,
+        description="How long a meeting's title/TWG/agenda stay cached during a live session"
+    )
+    LIVE_ANALYSIS_IDLE_SECONDS: int = Field(
+        default=1800,
+        description="Drop a meeting's live analysis session after this long without transcript"
+    )
+    LIVE_MINUTES_ENABLED: bool = Field(
+        default=True,
+        description="Build minutes incrementally from the live transcript and consolidate them at meeting end"
+    )
+    LIVE_MINUTES_SEGMENT_CHARS: int = Field(
+        default=4000,
+        description="Transcript characters folded into the live minutes draft per LLM call"
+    )
+    LIVE_MINUTES_DEBOUNCE_SECONDS: float = Field(
+        default=30.0,
+        description="Fold a partial segment after this long without new transcript"
+    )
+    LIVE_MINUTES_MIN_COVERAGE: float = Field(
+        default=0.6,
+        description="Share of the final transcript the live draft must cover; below it minutes use full synthesis"
+    )
+    LIVE_MINUTES_STATE_TTL_SECONDS: int = Field(
+        default=86400,
+        description="How long live minutes drafts are kept in the cache"
+    )
+    LIVE_HISTORY_MAX_EVENTS: int = Field(
+        default=500,
+        description="Live updates kept per meeting for replay and resume (approximate)"
+    )
+    LIVE_HISTORY_MAX_AGE_SECONDS: int = Field(
+        default=86400,
+        description="Live updates older than this are trimmed from a meeting's history (0 = no age limit)"
+    )
+    LIVE_HISTORY_REPLAY_COUNT: int = Field(
+        default=50,
+        description="Recent live updates sent to a client connecting without last_event_id"
+    )
+
+    # Human-in-the-loop approvals (email/document drafts)
+    APPROVAL_TTL_SECONDS: int = Field(
+        default=86400,
+        description="How long a pending approval request stays available (seconds)"
+    )
+    APPROVAL_DECIDED_TTL_SECONDS: int = Field(
+        default=3600,
+        description="How long approved/declined requests are kept for repeat-call answers (seconds)"
+    )
 
     # Enhanced Routing Settings
     AGENT_USE_ENHANCED_ROUTING: bool = Field(
@@ -142,6 +340,82 @@ class Settings(BaseSettings):
         description="Maximum agents to consult in parallel"
     )
 
+    # Fast Local Routing Settings
+    FAST_ROUTER_ENABLED: bool = Field(
+        default=True,
+        description="Route unambiguous queries locally, skipping the LLM intent parser"
+    )
+    FAST_ROUTER_CONFIDENCE_THRESHOLD: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="Minimum local routing confidence to skip the LLM intent parser"
+    )
+    FAST_ROUTER_USE_EMBEDDINGS: bool = Field(
+        default=False,
+        description="Use embedding similarity against agent exemplars when keywords are inconclusive"
+    )
+    RAG_PREFETCH_ENABLED: bool = Field(
+        default=True,
+        description="Speculatively start RAG retrieval for likely agents while routing runs"
+    )
+    RAG_PREFETCH_MAX_AGENTS: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum number of agents to prefetch RAG context for per query"
+    )
+
+    # Chat Admission Control (shared Supervisor singleton)
+    CHAT_MAX_CONCURRENT_RUNS: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum agent chat runs executing at once across all users"
+    )
+    CHAT_MAX_QUEUED_RUNS: int = Field(
+        default=32,
+        ge=0,
+        description="Maximum chat runs waiting for a slot before new requests get 429"
+    )
+    CHAT_QUEUE_TIMEOUT_SECONDS: float = Field(
+        default=60.0,
+        gt=0,
+        description="How long a queued chat run waits for a slot before giving up"
+    )
+    CHAT_RETRY_AFTER_SECONDS: int = Field(
+        default=5,
+        ge=1,
+        description="Retry-After hint returned when chat capacity is exceeded"
+    )
+    CHAT_QUEUE_UPDATE_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        gt=0,
+        description="How often queued SSE streams receive a queue position update"
+    )
+
+    # Execution Tracing
+    TRACING_ENABLED: bool = Field(
+        default=True,
+        description="Record per-node spans for agent chat runs"
+    )
+    TRACE_MAX_TURNS_PER_THREAD: int = Field(
+        default=20,
+        ge=1,
+        description="Number of recent turn traces kept per conversation thread"
+    )
+    TRACE_MAX_THREADS: int = Field(
+        default=1000,
+        ge=1,
+        description="Number of conversation threads whose traces are kept in memory"
+    )
+    TRACE_TTL_SECONDS: int = Field(
+        default=86400,
+        description="TTL for traces persisted to Redis"
+    )
+    TRACE_PERSIST_REDIS: bool = Field(
+        default=True,
+        description="Write traces through to the Redis cache when it is reachable"
+    )
+
     # Peer Delegation Settings
     AGENT_PEER_DELEGATION_ENABLED: bool = Field(
         default=False,
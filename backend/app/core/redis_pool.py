@@ -0,0 +1,355 @@
+"""
+Redis Connection Pool Registry
+
+One place that owns every Redis connection pool in the process. Cache,
+memory, message bus, pub/sub hub, broadcasts and the live-meeting
+WebSockets all take clients from here instead of creating their own, so:
+- Connection counts are bounded (BlockingConnectionPool, sized from config)
+- No per-request connection setup (clients share long-lived pools)
+- Pools are health-checked, reported in metrics and closed on shutdown
+
+Pools are keyed by (sync/async, URL, decode_responses). Clients are cheap
+wrappers around a pool and can be created freely.
+
+resolve_backend() decides (once per process, from REDIS_BACKEND) whether the
+bus, memory and cache use Redis or their in-process implementations.
+
+Usage:
+    from app.core.redis_pool import get_redis_registry
+
+    client = get_redis_registry().get_async_client(decode_responses=True)
+    await client.get("key")
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+
+import redis
+import redis.asyncio as redis_async
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+PoolKey = Tuple[str, str, bool]  # (mode, url, decode_responses)
+
+
+class PoolStats(BaseModel):
+    """Usage snapshot of one connection pool"""
+    mode: str  # sync | async
+    url: str  # password masked
+    decode_responses: bool
+    max_connections: int
+    created: int
+    in_use: int
+    idle: int
+
+
+def build_redis_url(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    db: Optional[int] = None,
+    password: Optional[str] = None
+) -> str:
+    """
+    Build a redis:// URL, defaulting to REDIS_URL or the REDIS_* settings.
+
+    Args:
+        host: Redis host (overrides settings)
+        port: Redis port (overrides settings)
+        db: Database number (overrides settings)
+        password: Password (overrides settings)
+
+    Returns:
+        str: Connection URL
+    """
+    if settings.REDIS_URL and host is None and port is None and db is None and password is None:
+        return settings.REDIS_URL
+    host = host or settings.REDIS_HOST or "localhost"
+    port = port or settings.REDIS_PORT
+    db = settings.REDIS_DB if db is None else db
+    password = password if password is not None else settings.REDIS_PASSWORD
+    auth = f":{password}@" if password else ""
+    return f"redis://{auth}{host}:{port}/{db}"
+
+
+def _mask(url: str) -> str:
+    """Hide the password in a redis URL for logs and metrics."""
+    if "@" not in url:
+        return url
+    scheme, rest = url.split("://", 1)
+    return f"{scheme}://***@{rest.split('@', 1)[1]}"
+
+
+class RedisPoolRegistry:
+    """
+    Process-wide registry of sync and async Redis connection pools.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        health_check_interval: Optional[int] = None,
+        sync_connection_class: Optional[Type] = None,
+        async_connection_class: Optional[Type] = None,
+        connection_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the registry. Pools are created lazily on first use.
+
+        Args:
+            max_connections: Connections per pool (default: REDIS_MAX_CONNECTIONS)
+            pool_timeout: Seconds to wait for a free connection (default: REDIS_POOL_TIMEOUT)
+            health_check_interval: Seconds idle before a connection is PINGed on checkout
+            sync_connection_class: Override the sync connection class (e.g. for tests)
+            async_connection_class: Override the async connection class (e.g. for tests)
+            connection_kwargs: Extra keyword arguments for every connection
+        """
+        self.max_connections = max_connections or settings.REDIS_MAX_CONNECTIONS
+        self.pool_timeout = pool_timeout if pool_timeout is not None else settings.REDIS_POOL_TIMEOUT
+        self.health_check_interval = (
+            health_check_interval if health_check_interval is not None
+            else settings.REDIS_HEALTH_CHECK_INTERVAL
+        )
+        self.sync_connection_class = sync_connection_class
+        self.async_connection_class = async_connection_class
+        self.connection_kwargs = connection_kwargs or {}
+
+        self._sync_pools: Dict[PoolKey, redis.BlockingConnectionPool] = {}
+        self._async_pools: Dict[PoolKey, redis_async.BlockingConnectionPool] = {}
+        self._last_health: Dict[str, Any] = {}
+        self._backend: Optional[str] = None
+
+    # =========================================================================
+    # POOLS & CLIENTS
+    # =========================================================================
+
+    def _pool_kwargs(self, connection_class: Optional[Type], decode_responses: bool) -> Dict[str, Any]:
+        kwargs = {
+            "max_connections": self.max_connections,
+            "timeout": self.pool_timeout,
+            "decode_responses": decode_responses,
+            "socket_connect_timeout": 5,
+            "socket_keepalive": True,
+            "health_check_interval": self.health_check_interval,
+            **self.connection_kwargs
+        }
+        if connection_class is not None:
+            kwargs["connection_class"] = connection_class
+        return kwargs
+
+    def get_sync_pool(self, url: Optional[str] = None, decode_responses: bool = False) -> redis.BlockingConnectionPool:
+        """Get (or create) the sync pool for a URL."""
+        url = url or build_redis_url()
+        key = ("sync", url, decode_responses)
+        pool = self._sync_pools.get(key)
+        if pool is None:
+            kwargs = self._pool_kwargs(self.sync_connection_class, decode_responses)
+            if self.sync_connection_class is None:
+                pool = redis.BlockingConnectionPool.from_url(url, **kwargs)
+            else:
+                pool = redis.BlockingConnectionPool(**kwargs)
+            self._sync_pools[key] = pool
+            logger.info(f"[REDIS] Created sync pool for {_mask(url)} (max {self.max_connections})")
+        return pool
+
+    def get_async_pool(self, url: Optional[str] = None, decode_responses: bool = False) -> redis_async.BlockingConnectionPool:
+        """Get (or create) the async pool for a URL."""
+        url = url or build_redis_url()
+        key = ("async", url, decode_responses)
+        pool = self._async_pools.get(key)
+        if pool is None:
+            kwargs = self._pool_kwargs(self.async_connection_class, decode_responses)
+            if self.async_connection_class is None:
+                pool = redis_async.BlockingConnectionPool.from_url(url, **kwargs)
+            else:
+                pool = redis_async.BlockingConnectionPool(**kwargs)
+            self._async_pools[key] = pool
+            logger.info(f"[REDIS] Created async pool for {_mask(url)} (max {self.max_connections})")
+        return pool
+
+    def get_sync_client(self, url: Optional[str] = None, decode_responses: bool = False) -> redis.Redis:
+        """
+        Get a sync client backed by the shared pool.
+
+        Args:
+            url: Redis URL (default: from settings)
+            decode_responses: Return str instead of bytes
+
+        Returns:
+            redis.Redis: Client (closing it does not close the pool)
+        """
+        return redis.Redis(connection_pool=self.get_sync_pool(url, decode_responses))
+
+    def get_async_client(self, url: Optional[str] = None, decode_responses: bool = False) -> redis_async.Redis:
+        """
+        Get an async client backed by the shared pool.
+
+        Args:
+            url: Redis URL (default: from settings)
+            decode_responses: Return str instead of bytes
+
+        Returns:
+            redis.asyncio.Redis: Client (closing it does not close the pool)
+        """
+        return redis_async.Redis(connection_pool=self.get_async_pool(url, decode_responses))
+
+    # =========================================================================
+    # BACKEND SELECTION
+    # =========================================================================
+
+    def resolve_backend(self) -> str:
+        """
+        Decide whether Redis-backed services run on Redis or in-process.
+
+        REDIS_BACKEND="redis" or "memory" forces the choice. "auto" picks
+        "memory" only when no Redis is configured (neither REDIS_URL nor
+        REDIS_HOST); a configured Redis is always used, even if it is down at
+        startup, so workers never silently split into separate in-process
+        buses, caches and approval stores. Callers degrade or retry on their
+        own while Redis is unreachable. Configuration-only, so it is safe to
+        call from async code; the result is cached for the life of the process.
+
+        Returns:
+            str: "redis" or "memory"
+        """
+        if self._backend is not None:
+            return self._backend
+
+        mode = settings.REDIS_BACKEND
+        if mode in ("redis", "memory"):
+            self._backend = mode
+        elif not settings.REDIS_URL and not settings.REDIS_HOST:
+            self._backend = "memory"
+            logger.info("[REDIS] No Redis configured; using in-process backends")
+        else:
+            self._backend = "redis"
+        return self._backend
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    async def initialize(self) -> bool:
+        """
+        Create the default pools and check connectivity (application startup).
+
+        Failures are logged, not raised: Redis-backed features degrade on
+        their own when Redis is unreachable.
+
+        Returns:
+            bool: True if Redis answered (False with in-process backends)
+        """
+        if self.resolve_backend() == "memory":
+            logger.info("[REDIS] In-process backends selected; no Redis pools opened")
+            return False
+        self.get_sync_pool()
+        self.get_async_pool(decode_responses=True)
+        health = await self.health_check()
+        if health["healthy"]:
+            logger.info(f"[REDIS] Pool registry ready ({health['latency_ms']} ms)")
+        else:
+            logger.warning(f"[REDIS] Pool registry started but Redis is unreachable: {health.get('error')}")
+        return health["healthy"]
+
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        PING through the default async pool.
+
+        Returns:
+            Dict with healthy, latency_ms and (on failure) error
+        """
+        started = time.perf_counter()
+        try:
+            await self.get_async_client(decode_responses=True).ping()
+            result = {"healthy": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+        except Exception as e:
+            result = {"healthy": False, "latency_ms": None, "error": str(e)}
+        self._last_health = {**result, "checked_at": time.time()}
+        return result
+
+    async def close(self) -> None:
+        """Disconnect every pool (application shutdown)."""
+        for pool in self._async_pools.values():
+            try:
+                await pool.disconnect()
+            except Exception as e:
+                logger.warning(f"[REDIS] Error closing async pool: {e}")
+        for pool in self._sync_pools.values():
+            try:
+                pool.disconnect()
+            except Exception as e:
+                logger.warning(f"[REDIS] Error closing sync pool: {e}")
+        count = len(self._async_pools) + len(self._sync_pools)
+        self._async_pools.clear()
+        self._sync_pools.clear()
+        logger.info(f"[REDIS] Closed {count} connection pools")
+
+    # =========================================================================
+    # METRICS
+    # =========================================================================
+
+    @staticmethod
+    def _sync_usage(pool: redis.BlockingConnectionPool) -> Tuple[int, int]:
+        created = len(pool._connections)
+        # The free-slot queue holds idle connections and None placeholders
+        idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        return created, created - idle
+
+    @staticmethod
+    def _async_usage(pool: redis_async.BlockingConnectionPool) -> Tuple[int, int]:
+        in_use = len(pool._in_use_connections)
+        return in_use + len(pool._available_connections), in_use
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Pool usage metrics.
+
+        Returns:
+            Dict with per-pool stats, totals and the last health check
+        """
+        pools = []
+        for (mode, url, decode), pool in self._sync_pools.items():
+            created, in_use = self._sync_usage(pool)
+            pools.append(PoolStats(
+                mode=mode, url=_mask(url), decode_responses=decode,
+                max_connections=pool.max_connections, created=created,
+                in_use=in_use, idle=created - in_use
+            ))
+        for (mode, url, decode), pool in self._async_pools.items():
+            created, in_use = self._async_usage(pool)
+            pools.append(PoolStats(
+                mode=mode, url=_mask(url), decode_responses=decode,
+                max_connections=pool.max_connections, created=created,
+                in_use=in_use, idle=created - in_use
+            ))
+
+        return {
+            "pools": [p.model_dump() for p in pools],
+            "total_connections": sum(p.created for p in pools),
+            "total_in_use": sum(p.in_use for p in pools),
+            "connection_limit": sum(p.max_connections for p in pools),
+            "last_health_check": self._last_health or None
+        }
+
+
+# Singleton instance
+_registry: Optional[RedisPoolRegistry] = None
+
+
+def get_redis_registry() -> RedisPoolRegistry:
+    """Get or create the Redis pool registry singleton"""
+    global _registry
+    if _registry is None:
+        _registry = RedisPoolRegistry()
+    return _registry
+
+
+async def close_redis_registry() -> None:
+    """Close all pools if the registry was created (application shutdown)."""
+    global _registry
+    if _registry is not None:
+        await _registry.close()
+        _registry = None
@@ -0,0 +1,215 @@
+"""
+Trace Context for Chat Turns
+
+The span model and the contextvars that carry the current trace, shared by
+the agent graph (app.agents.tracing) and the layers below it: LLM services
+record token usage on the current span and tools read the current trace's
+thread_id. Kept in app.core so services and tools don't depend on the
+agents package.
+
+Propagation uses contextvars: LangGraph runs nodes in tasks that copy the
+caller's context and `asyncio.to_thread` copies it into worker threads, so
+spans opened anywhere under a traced turn nest correctly without threading
+a tracer through every call. Outside a traced turn all helpers are no-ops.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, UTC
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+class TraceSpan(BaseModel):
+    """A timed unit of work within a traced chat turn"""
+    span_id: str
+    parent_id: Optional[str] = None
+    trace_id: str
+    name: str
+    kind: str = "internal"  # run | node | retrieval | llm | tool | internal
+    start_ms: float  # Offset from trace start
+    end_ms: Optional[float] = None
+    duration_ms: Optional[float] = None
+    status: str = "running"  # running | ok | error | interrupted | cancelled
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+
+class RunTrace:
+    """
+    All spans recorded for one conversation turn.
+
+    Finished spans are buffered in `_pending` so streaming callers can emit
+    them incrementally via drain().
+    """
+
+    def __init__(self, thread_id: str, name: str = "run"):
+        self.trace_id = str(uuid.uuid4())
+        self.thread_id = thread_id
+        self.started_at = datetime.now(UTC)
+        self._t0 = time.perf_counter()
+        self.spans: List[TraceSpan] = []
+        self._pending: Deque[TraceSpan] = deque()
+        self.root = self.open_span(name, kind="run", parent_id=None)
+
+    def now_ms(self) -> float:
+        return round((time.perf_counter() - self._t0) * 1000, 2)
+
+    def open_span(self, name: str, kind: str, parent_id: Optional[str], **attributes) -> TraceSpan:
+        span = TraceSpan(
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent_id,
+            trace_id=self.trace_id,
+            name=name,
+            kind=kind,
+            start_ms=self.now_ms(),
+            attributes=attributes
+        )
+        self.spans.append(span)
+        return span
+
+    def close_span(self, span: TraceSpan, status: str = "ok", error: Optional[str] = None) -> None:
+        if span.end_ms is not None:
+            return
+        span.end_ms = self.now_ms()
+        span.duration_ms = round(span.end_ms - span.start_ms, 2)
+        span.status = status
+        span.error = error
+        self._pending.append(span)
+
+    def drain(self) -> List[TraceSpan]:
+        """Return and clear the spans finished since the last drain."""
+        drained = list(self._pending)
+        self._pending.clear()
+        return drained
+
+    def token_totals(self) -> Dict[str, int]:
+        totals = {"prompt_tokens": 0, "completion_tokens": 0}
+        for span in self.spans:
+            for key in totals:
+                totals[key] += int(span.attributes.get(key, 0) or 0)
+        totals["total_tokens"] = totals["prompt_tokens"] + totals["completion_tokens"]
+        return totals
+
+    def to_waterfall(self) -> Dict[str, Any]:
+        """
+        Render the trace as a waterfall: spans in start order with depth and
+        relative offsets/widths (percent of total) for plotting.
+        """
+        total_ms = self.root.duration_ms if self.root.duration_ms is not None else self.now_ms()
+        depths: Dict[Optional[str], int] = {None: -1}
+        rows = []
+        for span in sorted(self.spans, key=lambda s: s.start_ms):
+            depth = depths.get(span.parent_id, -1) + 1
+            depths[span.span_id] = depth
+            duration = span.duration_ms if span.duration_ms is not None else total_ms - span.start_ms
+            rows.append({
+                **span.model_dump(),
+                "depth": depth,
+                "offset_pct": round(span.start_ms / total_ms * 100, 2) if total_ms else 0.0,
+                "width_pct": round(duration / total_ms * 100, 2) if total_ms else 0.0
+            })
+
+        return {
+            "trace_id": self.trace_id,
+            "thread_id": self.thread_id,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": total_ms,
+            "status": self.root.status,
+            "tokens": self.token_totals(),
+            "spans": rows
+        }
+
+
+# Context propagation
+_current_trace: ContextVar[Optional[RunTrace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[TraceSpan]] = ContextVar("current_span", default=None)
+
+
+def get_current_trace() -> Optional[RunTrace]:
+    return _current_trace.get()
+
+
+def start_trace(thread_id: str, name: str = "run", **attributes) -> Optional[RunTrace]:
+    """
+    Begin tracing a turn in the current context.
+
+    Returns:
+        The new trace, or None if tracing is disabled
+    """
+    if not settings.TRACING_ENABLED:
+        return None
+    trace = RunTrace(thread_id, name=name)
+    trace.root.attributes.update(attributes)
+    _current_trace.set(trace)
+    _current_span.set(trace.root)
+    return trace
+
+
+def end_trace(trace: RunTrace, status: str = "ok", error: Optional[str] = None) -> None:
+    """Close the root span and, if it is the current trace, clear the context."""
+    trace.close_span(trace.root, status=status, error=error)
+    if _current_trace.get() is trace:
+        _current_trace.set(None)
+        _current_span.set(None)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """
+    Record a child span of the current span. No-op outside a traced turn.
+
+    Yields:
+        The TraceSpan (or None when not tracing)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = trace.open_span(name, kind=kind, parent_id=parent.span_id if parent else None, **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except asyncio.CancelledError:
+        # e.g. a discarded speculative prefetch
+        trace.close_span(current, status="cancelled")
+        raise
+    except BaseException as e:
+        # GraphInterrupt is control flow (human approval), not a failure
+        status = "interrupted" if type(e).__name__ == "GraphInterrupt" else "error"
+        trace.close_span(current, status=status, error=None if status == "interrupted" else str(e)[:500])
+        raise
+    finally:
+        _current_span.reset(token)
+        trace.close_span(current)
+
+
+def add_span_attributes(**attributes) -> None:
+    """Attach attributes to the current span (no-op outside a traced turn)."""
+    current = _current_span.get()
+    if current is not None and _current_trace.get() is not None:
+        current.attributes.update(attributes)
+
+
+def record_token_usage(prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """
+    Add LLM token counts to the current span.
+
+    Called from inside the LLM services (which run in worker threads under
+    asyncio.to_thread, with the caller's context copied in).
+    """
+    current = _current_span.get()
+    if current is None or _current_trace.get() is None:
+        return
+    attrs = current.attributes
+    attrs["prompt_tokens"] = attrs.get("prompt_tokens", 0) + int(prompt_tokens or 0)
+    attrs["completion_tokens"] = attrs.get("completion_tokens", 0) + int(completion_tokens or 0)
@@ -0,0 +1,238 @@
+"""
+WebSocket Framing and Delta Encoding
+
+Cuts what live meeting and dashboard sockets put on the wire:
+
+- Framing negotiation: clients offer a subprotocol ("ecowas.v1.msgpack" or
+  "ecowas.v1.json") or pass ?format=msgpack; msgpack clients get binary
+  frames, everyone else keeps JSON text frames. permessage-deflate is
+  negotiated by the ASGI server (uvicorn --ws-per-message-deflate) on top
+  of either.
+- Encode once: a Frame encodes one message at most once per framing, and is
+  shared by every socket it fans out to.
+- Delta encoding: live state streams (transcript lines, agenda items) carry
+  both the full snapshot and the delta from the previous one. Each
+  connection's writer sends the delta only when the client holds exactly
+  that previous version (so drops and coalescing can't corrupt its copy),
+  the full snapshot otherwise.
+
+Delta format (see diff_snapshot / apply_delta):
+    {"set": {field: value},                       # changed scalars / replaced values
+     "append": {field: [new lines]},              # append-only lists of lines
+     "items": {field: {"upsert": [{"id": .., changed fields}],
+                       "remove": [ids], "order": [ids]}},   # lists keyed by "id"
+     "unset": [fields]}
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from fastapi import WebSocket
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
+
+FRAMING_JSON = "json"
+FRAMING_MSGPACK = "msgpack"
+
+# Subprotocol -> framing, in server preference order
+WS_SUBPROTOCOLS = {
+    "ecowas.v1.msgpack": FRAMING_MSGPACK,
+    "ecowas.v1.json": FRAMING_JSON,
+}
+
+
+def msgpack_available() -> bool:
+    return ormsgpack is not None
+
+
+def negotiate_framing(websocket: WebSocket, requested: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    Pick a socket's framing before accepting it.
+
+    Args:
+        websocket: Not yet accepted WebSocket
+        requested: ?format= query value, for clients that can't set subprotocols
+
+    Returns:
+        (framing, subprotocol to pass to websocket.accept or None)
+    """
+    offered = websocket.scope.get("subprotocols") or []
+    for subprotocol, framing in WS_SUBPROTOCOLS.items():
+        if subprotocol in offered and (framing != FRAMING_MSGPACK or msgpack_available()):
+            return framing, subprotocol
+    if requested == FRAMING_MSGPACK and msgpack_available():
+        return FRAMING_MSGPACK, None
+    return FRAMING_JSON, None
+
+
+def deflate_offered(websocket: WebSocket) -> bool:
+    """Whether the client offered permessage-deflate (the server enables it by default)."""
+    return "permessage-deflate" in (websocket.headers.get("sec-websocket-extensions") or "")
+
+
+class Frame:
+    """
+    One outbound message, encoded lazily and at most once per framing.
+
+    Build it from the message or from its JSON text (whichever the producer
+    has); the other form is derived on demand.
+    """
+
+    __slots__ = ("_message", "_text", "_binary")
+
+    def __init__(self, message: Optional[Dict[str, Any]] = None, text: Optional[str] = None):
+        self._message = message
+        self._text = text
+        self._binary: Optional[bytes] = None
+
+    @property
+    def message(self) -> Dict[str, Any]:
+        if self._message is None:
+            self._message = json.loads(self._text)
+        return self._message
+
+    def encode(self, framing: str = FRAMING_JSON) -> Union[str, bytes]:
+        if framing == FRAMING_MSGPACK and ormsgpack is not None:
+            if self._binary is None:
+                self._binary = ormsgpack.packb(self.message, option=ormsgpack.OPT_NON_STR_KEYS)
+            return self._binary
+        if self._text is None:
+            self._text = json.dumps(self._message, default=str)
+        return self._text
+
+
+class DeltaFrame:
+    """
+    A live state update in two forms: the full snapshot and, when the
+    publisher had a previous one, the delta from it.
+    """
+
+    __slots__ = ("key", "version", "base_version", "full", "delta")
+
+    def __init__(
+        self,
+        key: str,
+        version: str,
+        full: Frame,
+        delta: Optional[Frame] = None,
+        base_version: Optional[str] = None
+    ):
+        self.key = key
+        self.version = version
+        self.full = full
+        self.delta = delta
+        self.base_version = base_version
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> Optional["DeltaFrame"]:
+        """Split a published live_state message (snapshot + delta) into its wire forms."""
+        if "snapshot" not in message or "version" not in message:
+            return None
+        key = f"{message.get('meeting_id', '')}:{message.get('stream', '')}"
+        full = {k: v for k, v in message.items() if k not in ("delta", "base_version")}
+        if "delta" not in message:
+            return cls(key, message["version"], Frame(full))
+        delta = {k: v for k, v in message.items() if k != "snapshot"}
+        return cls(key, message["version"], Frame(full), Frame(delta), message.get("base_version"))
+
+
+# =============================================================================
+# SNAPSHOT DELTAS
+# =============================================================================
+
+def snapshot_version(snapshot: Dict[str, Any]) -> str:
+    """Content hash identifying a snapshot (same on every worker)."""
+    data = json.dumps(snapshot, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _is_lines(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _is_items(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, dict) and "id" in v for v in value)
+
+
+def _diff_items(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+    before = {item["id"]: item for item in previous}
+    upsert = []
+    for item in current:
+        old = before.get(item["id"])
+        if old is None:
+            upsert.append(item)
+            continue
+        changed = {k: v for k, v in item.items() if old.get(k) != v or k not in old}
+        removed = [k for k in old if k not in item]
+        if changed or removed:
+            entry = {"id": item["id"], **changed}
+            if removed:
+                entry["_unset"] = removed
+            upsert.append(entry)
+    ids = [item["id"] for item in current]
+    diff: Dict[str, Any] = {}
+    if upsert:
+        diff["upsert"] = upsert
+    removed_ids = [i for i in before if i not in set(ids)]
+    if removed_ids:
+        diff["remove"] = removed_ids
+    if [i for i in before if i in set(ids)] + [i for i in ids if i not in before] != ids:
+        diff["order"] = ids
+    return diff
+
+
+def diff_snapshot(previous: Dict[str, Any], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Delta turning `previous` into `current`.
+
+    Lists of strings that only grew become "append", lists of {"id": ...}
+    dicts become per-item "items" changes, anything else is "set" whole.
+
+    Returns:
+        The delta, or None if it wouldn't be smaller than the snapshot
+    """
+    delta: Dict[str, Any] = {}
+    for field, value in current.items():
+        old = previous.get(field)
+        if field in previous and old == value:
+            continue
+        if _is_lines(old) and _is_lines(value) and value[:len(old)] == old:
+            delta.setdefault("append", {})[field] = value[len(old):]
+        elif _is_items(old) and _is_items(value):
+            delta.setdefault("items", {})[field] = _diff_items(old, value)
+        else:
+            delta.setdefault("set", {})[field] = value
+    unset = [field for field in previous if field not in current]
+    if unset:
+        delta["unset"] = unset
+
+    if len(json.dumps(delta, default=str)) >= len(json.dumps(current, default=str)):
+        return None
+    return delta
+
+
+def apply_delta(previous: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Reference implementation of what clients do with a delta."""
+    current = {k: v for k, v in previous.items() if k not in delta.get("unset", ())}
+    current.update(delta.get("set", {}))
+    for field, lines in delta.get("append", {}).items():
+        current[field] = list(current.get(field, [])) + lines
+    for field, changes in delta.get("items", {}).items():
+        items = {item["id"]: dict(item) for item in current.get(field, [])}
+        for gone in changes.get("remove", ()):
+            items.pop(gone, None)
+        order = [i for i in items]
+        for change in changes.get("upsert", ()):
+            item = items.setdefault(change["id"], {})
+            if change["id"] not in order:
+                order.append(change["id"])
+            for k in change.get("_unset", ()):
+                item.pop(k, None)
+            item.update({k: v for k, v in change.items() if k != "_unset"})
+        current[field] = [items[i] for i in changes.get("order", order)]
+    return current
@@ -1,37 +1,349 @@
-from fastapi import WebSocket, WebSocketDisconnect
-from typing import List, Dict, Any
+"""
+WebSocket Connection Manager
+
+Delivers dashboard and notification messages to WebSocket clients on every
+worker, not just the one the sender happens to run on.
+
+Messages are addressed to a user, a topic or everyone and published once on
+the shared delivery channel (WS_DELIVERY_CHANNEL). Each worker holds one
+subscription to it through the process-wide pub/sub hub and fans the message
+out to its own matching sockets:
+- JSON is encoded (and its send policy picked) once by the sender, not once
+  per socket
+- Each socket has its own bounded outbound queue and writer task (see
+  ws_queue), so delivery never awaits a client and one slow client never
+  delays the others; superseded updates are coalesced, insights dropped
+  oldest-first and approvals/notifications never dropped
+- A socket whose send fails or exceeds WS_SEND_TIMEOUT_SECONDS is evicted
+  (and closed), so dead connections don't accumulate
+
+Without Redis (REDIS_BACKEND=memory) the same path runs on the in-process
+pub/sub hub.
+
+Usage:
+    out = await ws_manager.connect(websocket, user_id, topics=["meeting:123"])
+    out.send({"type": "connected"})        # this socket only, queued
+    ...
+    await ws_manager.send_personal_message({"type": "NEW_NOTIFICATION", ...}, user_id)
+    await ws_manager.publish_topic({"type": "..."}, "meeting:123")
+    await ws_manager.broadcast({"type": "conflict_resolved", ...})
+    ...
+    ws_manager.disconnect(websocket, user_id)
+"""
+
+import asyncio
 import json
+import os
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from fastapi import WebSocket
+from loguru import logger
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.ws_framing import FRAMING_JSON, Frame
+from app.core.ws_queue import OutboundSocket, SendPolicy, classify_message
+
+# Channel carrying addressed envelopes to every worker
+WS_DELIVERY_CHANNEL = "ws:delivery"
+
+
+class ConnectionManagerStats(BaseModel):
+    """Snapshot of WebSocket delivery state for monitoring"""
+    worker_id: str
+    users: int
+    sockets: int
+    topics: int
+    subscribed: bool
+    published: int
+    received: int
+    queued: int
+    evicted: int
+    delivered: int
+    dropped: int
+    coalesced: int
+    bytes_sent: int
+    queue_depth: int
+    peak_queue_depth: int
+
 
 class ConnectionManager:
-    def __init__(self):
+    """
+    Per-process registry of WebSocket clients with cross-worker delivery.
+
+    active_connections maps user ID -> sockets; topics maps topic -> sockets.
+    Every registered socket has an OutboundSocket that all sends go through.
+    """
+
+    def __init__(
+        self,
+        pubsub_hub=None,
+        redis_client=None,
+        send_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            pubsub_hub: PubSubHub (or LocalPubSubHub) delivering envelopes to this
+                worker (default: the process-wide one)
+            redis_client: redis.asyncio client to publish with (default: the shared pool;
+                unused when the hub is in-process)
+            send_timeout: Per-send timeout before a socket is evicted (default: WS_SEND_TIMEOUT_SECONDS)
+        """
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.topics: Dict[str, Set[WebSocket]] = {}
+        self.outbound: Dict[WebSocket, OutboundSocket] = {}
+        # Outbound queues created (and so closed) by the manager, not by an endpoint
+        self._owned: Set[WebSocket] = set()
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT_SECONDS
+        self._pubsub_hub = pubsub_hub
+        self._redis_client = redis_client
+        self._subscription = None
+        self._subscribe_lock: Optional[asyncio.Lock] = None
+        self._stats = {"published": 0, "received": 0, "queued": 0, "evicted": 0}
+        self._closed_totals = {"delivered": 0, "dropped": 0, "coalesced": 0, "bytes_sent": 0}
+
+    @property
+    def pubsub_hub(self):
+        if self._pubsub_hub is None:
+            from app.services.pubsub_hub import get_pubsub_hub
+            self._pubsub_hub = get_pubsub_hub()
+        return self._pubsub_hub
+
+    # =========================================================================
+    # CONNECTIONS
+    # =========================================================================
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        topics: Optional[Iterable[str]] = None,
+        framing: str = FRAMING_JSON,
+        subprotocol: Optional[str] = None
+    ) -> OutboundSocket:
+        """Accept a WebSocket (with its negotiated subprotocol) and register it (see register)."""
+        await websocket.accept(subprotocol=subprotocol)
+        return await self.register(websocket, user_id, topics, framing=framing)
 
-    async def connect(self, websocket: WebSocket, user_id: str):
-        await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
+    async def register(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        topics: Optional[Iterable[str]] = None,
+        outbound: Optional[OutboundSocket] = None,
+        framing: str = FRAMING_JSON
+    ) -> OutboundSocket:
+        """
+        Register an already-accepted WebSocket for delivery.
+
+        Args:
+            websocket: Accepted WebSocket
+            user_id: User the socket belongs to (target of send_personal_message)
+            topics: Topics to subscribe the socket to
+            outbound: Existing outbound queue for the socket (e.g. a LiveSocket), so
+                every message to it shares one writer; the caller keeps closing it
+            framing: Wire framing negotiated for the socket (see ws_framing)
+
+        Returns:
+            The socket's outbound queue, for the endpoint's own messages
+        """
+        if outbound is None:
+            outbound = OutboundSocket(
+                websocket,
+                name=f"ws:{user_id}",
+                send_timeout=self.send_timeout,
+                on_close=self._on_writer_closed,
+                framing=framing
+            )
+            self._owned.add(websocket)
+        self.outbound[websocket] = outbound
+        self.active_connections.setdefault(user_id, []).append(websocket)
+        for topic in topics or ():
+            self.subscribe(websocket, topic)
+        await self._ensure_subscribed()
+        return outbound
 
     def disconnect(self, websocket: WebSocket, user_id: str):
-        if user_id in self.active_connections:
-            self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
+        """Unregister a socket (no-op if it was already evicted)."""
+        connections = self.active_connections.get(user_id)
+        if connections is not None and websocket in connections:
+            connections.remove(websocket)
+            if not connections:
                 del self.active_connections[user_id]
+        for topic in [t for t, sockets in self.topics.items() if websocket in sockets]:
+            self.unsubscribe(websocket, topic)
+        if any(websocket in connections for connections in self.active_connections.values()):
+            return
+        outbound = self.outbound.pop(websocket, None)
+        if outbound is not None:
+            for field in self._closed_totals:
+                self._closed_totals[field] += getattr(outbound, field)
+            if websocket in self._owned:
+                self._owned.discard(websocket)
+                # A closed writer is already stopping (possibly this very call's caller)
+                if not outbound.closed:
+                    outbound.discard()
 
-    async def send_personal_message(self, message: dict, user_id: str):
-        if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
+    def subscribe(self, websocket: WebSocket, topic: str) -> None:
+        """Add a registered socket to a topic."""
+        self.topics.setdefault(topic, set()).add(websocket)
+
+    def unsubscribe(self, websocket: WebSocket, topic: str) -> None:
+        sockets = self.topics.get(topic)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.topics[topic]
+
+    async def _ensure_subscribed(self) -> None:
+        # One subscription per worker, opened with the first connection
+        if self._subscription is not None:
+            return
+        if self._subscribe_lock is None:
+            self._subscribe_lock = asyncio.Lock()
+        async with self._subscribe_lock:
+            if self._subscription is None:
                 try:
-                    await connection.send_json(message)
-                except Exception:
-                    pass
+                    self._subscription = await self.pubsub_hub.subscribe(WS_DELIVERY_CHANNEL, self._on_envelope)
+                    logger.debug(f"[WS] Worker {self.worker_id} subscribed to {WS_DELIVERY_CHANNEL}")
+                except Exception as e:
+                    logger.error(f"[WS] Delivery subscription failed (local sends only): {e}")
+
+    # =========================================================================
+    # SENDING (all workers)
+    # =========================================================================
+
+    async def send_personal_message(self, message: dict, user_id: str):
+        """Deliver a message to every socket of a user, on any worker."""
+        await self._publish({"user": str(user_id)}, message)
+
+    async def publish_topic(self, message: dict, topic: str):
+        """Deliver a message to every socket subscribed to a topic, on any worker."""
+        await self._publish({"topic": topic}, message)
 
     async def broadcast(self, message: dict):
-        for user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    pass
+        """Deliver a message to every connected socket, on every worker."""
+        await self._publish({"all": True}, message)
+
+    async def _publish(self, target: Dict[str, Any], message: dict) -> None:
+        policy, key = classify_message(message)
+        envelope = {
+            **target,
+            "origin": self.worker_id,
+            "policy": policy.value,
+            "key": key,
+            "text": json.dumps(message, default=str)
+        }
+        data = json.dumps(envelope)
+
+        from app.services.inprocess_backend import LocalPubSubHub
+        hub = self.pubsub_hub
+        try:
+            if isinstance(hub, LocalPubSubHub):
+                hub.publish(WS_DELIVERY_CHANNEL, data)
+            else:
+                from app.core.redis_pool import get_redis_registry
+                client = self._redis_client or get_redis_registry().get_async_client(decode_responses=True)
+                await client.publish(WS_DELIVERY_CHANNEL, data)
+            self._stats["published"] += 1
+        except (RedisError, OSError) as e:
+            # Other workers miss this one; still reach the clients connected here
+            logger.warning(f"[WS] Delivery publish failed, sending locally only: {e}")
+            await self.deliver_local(envelope)
+
+    async def _on_envelope(self, channel: str, data: str) -> None:
+        self._stats["received"] += 1
+        try:
+            envelope = json.loads(data)
+        except ValueError:
+            logger.warning(f"[WS] Ignoring malformed delivery envelope on {channel}")
+            return
+        await self.deliver_local(envelope)
+
+    # =========================================================================
+    # SENDING (this worker)
+    # =========================================================================
+
+    async def deliver_local(self, envelope: Dict[str, Any]) -> int:
+        """
+        Queue an envelope's message for the matching sockets on this worker.
+
+        Never waits for a client: each socket's writer sends it.
+
+        Args:
+            envelope: {"user": id} | {"topic": name} | {"all": True}, plus "text"
+                and optionally "policy" and "key" (see ws_queue)
+
+        Returns:
+            Number of sockets the message was queued for
+        """
+        if envelope.get("all"):
+            sockets = [ws for connections in self.active_connections.values() for ws in connections]
+        elif "user" in envelope:
+            sockets = list(self.active_connections.get(envelope["user"], ()))
+        elif "topic" in envelope:
+            sockets = list(self.topics.get(envelope["topic"], ()))
+        else:
+            return 0
+
+        policy = SendPolicy(envelope.get("policy", SendPolicy.DROP_OLDEST.value))
+        # Encoded at most once per framing, however many sockets it goes to
+        frame, key = Frame(text=envelope["text"]), envelope.get("key")
+        queued = 0
+        for ws in sockets:
+            outbound = self.outbound.get(ws)
+            if outbound is None or outbound.closed:
+                continue
+            outbound.send_frame(frame, policy, key)
+            queued += 1
+        self._stats["queued"] += queued
+        return queued
+
+    async def _on_writer_closed(self, outbound: OutboundSocket) -> None:
+        # Send failed or timed out (or the client let must-deliver messages pile up)
+        await self._evict(outbound.websocket)
+
+    async def _evict(self, websocket: WebSocket) -> None:
+        for user_id in [u for u, connections in self.active_connections.items() if websocket in connections]:
+            self.disconnect(websocket, user_id)
+        self._stats["evicted"] += 1
+        try:
+            await asyncio.wait_for(websocket.close(code=1011), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    def get_stats(self) -> ConnectionManagerStats:
+        outbound = list(self.outbound.values())
+        return ConnectionManagerStats(
+            worker_id=self.worker_id,
+            users=len(self.active_connections),
+            sockets=len(outbound),
+            topics=len(self.topics),
+            subscribed=self._subscription is not None,
+            delivered=self._closed_totals["delivered"] + sum(o.delivered for o in outbound),
+            dropped=self._closed_totals["dropped"] + sum(o.dropped for o in outbound),
+            coalesced=self._closed_totals["coalesced"] + sum(o.coalesced for o in outbound),
+            bytes_sent=self._closed_totals["bytes_sent"] + sum(o.bytes_sent for o in outbound),
+            queue_depth=sum(o.depth for o in outbound),
+            peak_queue_depth=max((o.peak_depth for o in outbound), default=0),
+            **self._stats
+        )
+
+    async def close(self) -> None:
+        """Stop the manager's writers and drop the delivery subscription (application shutdown)."""
+        for websocket in list(self._owned):
+            await self.outbound.pop(websocket).close()
+        self._owned.clear()
+        if self._subscription is not None:
+            await self._subscription.close()
+            self._subscription = None
+
 
 ws_manager = ConnectionManager()
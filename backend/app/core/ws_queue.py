@@ -0,0 +1,355 @@
+"""
+WebSocket Outbound Queues
+
+Producers never await a client: everything sent to a WebSocket goes through
+that connection's bounded outbound queue, drained by one writer task. What
+happens when a client falls behind depends on the message:
+
+- COALESCE: superseded updates (state snapshots, current focus, heartbeats)
+  replace the queued one with the same key in place, so a slow client
+  skips straight to the latest value
+- DROP_OLDEST: streams of insights; when the queue is full the oldest
+  droppable message makes room
+- NEVER_DROP: approvals, notifications and other messages the user must
+  see. They are never dropped; a client that lets WS_NEVER_DROP_LIMIT of
+  them pile up is disconnected instead (it resynchronises on reconnect)
+
+Usage:
+    out = OutboundSocket(websocket, name="dashboard:alice")
+    out.send({"type": "supervisor_state_updated", ...})   # coalesced
+    out.send({"type": "NEW_NOTIFICATION", ...})            # never dropped
+    ...
+    await out.close()
+"""
+
+import asyncio
+import itertools
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from fastapi import WebSocket
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.ws_framing import FRAMING_JSON, DeltaFrame, Frame
+
+OutboundFrame = Union[str, Frame, DeltaFrame]
+
+
+class SendPolicy(str, Enum):
+    """What to do with a message when its connection falls behind"""
+    COALESCE = "coalesce"
+    DROP_OLDEST = "drop_oldest"
+    NEVER_DROP = "never_drop"
+
+
+# Message types whose newest value supersedes older ones
+COALESCE_TYPES = {"heartbeat", "supervisor_state_updated", "supervisor_state", "current_focus", "live_state"}
+
+# Live meeting update sources that report current state rather than new events
+COALESCE_SOURCES = {"agenda_monitor", "current_focus"}
+
+# Message types a client must receive
+NEVER_DROP_TYPES = {
+    "connected", "NEW_NOTIFICATION", "transcript_processed", "history_truncated",
+    # Versioned supervisor state feed: a lost patch would leave the client behind
+    "supervisor_state_subscribed", "supervisor_state_snapshot", "supervisor_state_patch"
+}
+
+# Live meeting update sources answering something a user asked for
+NEVER_DROP_SOURCES = {"live_command", "transcript_processed"}
+
+
+def classify_message(message: Dict[str, Any]) -> Tuple[SendPolicy, Optional[str]]:
+    """
+    Pick the send policy (and coalescing key) for a message.
+
+    Args:
+        message: Decoded message with a "type" (and, for live updates, a "source")
+
+    Returns:
+        (policy, key) - key identifies which queued message a COALESCE message replaces
+    """
+    msg_type = str(message.get("type", ""))
+    source = str(message.get("source") or "")
+    scope = message.get("meeting_id") or ""
+
+    if "approval" in msg_type.lower() or "approval" in source.lower():
+        return SendPolicy.NEVER_DROP, None
+    if msg_type in NEVER_DROP_TYPES or source in NEVER_DROP_SOURCES:
+        return SendPolicy.NEVER_DROP, None
+    if msg_type in COALESCE_TYPES:
+        stream = message.get("stream")
+        return SendPolicy.COALESCE, f"{msg_type}:{scope}" + (f":{stream}" if stream else "")
+    if source in COALESCE_SOURCES:
+        return SendPolicy.COALESCE, f"{msg_type}:{source}:{scope}"
+    return SendPolicy.DROP_OLDEST, None
+
+
+class OutboundStats(BaseModel):
+    """Snapshot of one connection's outbound queue"""
+    depth: int
+    peak_depth: int
+    delivered: int
+    dropped: int
+    coalesced: int
+    deltas: int
+    bytes_sent: int
+    framing: str
+    closed: bool
+
+
+class OutboundSocket:
+    """
+    Bounded outbound queue plus writer task for one WebSocket.
+
+    Send methods never block and may be called from any coroutine on the
+    socket's event loop. Frames are written in the order they were queued
+    (a coalesced update keeps its original place).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue: Optional[int] = None,
+        name: Optional[str] = None,
+        send_timeout: Optional[float] = None,
+        never_drop_limit: Optional[int] = None,
+        on_close: Optional[Callable[["OutboundSocket"], Awaitable[None]]] = None,
+        framing: str = FRAMING_JSON
+    ):
+        """
+        Args:
+            websocket: Accepted WebSocket
+            max_queue: Droppable messages queued before the oldest is dropped
+                (default: WS_SEND_QUEUE_SIZE)
+            name: Label for logs
+            send_timeout: A single send taking longer closes the connection
+                (default: WS_SEND_TIMEOUT_SECONDS)
+            never_drop_limit: NEVER_DROP messages queued before the connection is
+                given up on (default: WS_NEVER_DROP_LIMIT)
+            on_close: Awaited once when the writer stops because the client failed
+            framing: Wire framing negotiated for the socket (see ws_framing)
+        """
+        self.id = next(self._ids)
+        self.websocket = websocket
+        self.name = name or f"socket-{self.id}"
+        self.max_queue = max_queue or settings.WS_SEND_QUEUE_SIZE
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT_SECONDS
+        self.never_drop_limit = never_drop_limit or settings.WS_NEVER_DROP_LIMIT
+        self.on_close = on_close
+        self.framing = framing
+        # Live state version this client holds, per stream (for delta frames)
+        self._versions: Dict[str, str] = {}
+        # Entries are [frame, coalesce key, policy]; frame None marks a dropped entry the writer skips
+        self._queue: Deque[List[Any]] = deque()
+        self._droppable: Deque[List[Any]] = deque()
+        self._coalesce: Dict[str, List[Any]] = {}
+        self._depth = 0
+        self._droppable_depth = 0
+        self._never_drop_depth = 0
+        self.peak_depth = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.deltas = 0
+        self.bytes_sent = 0
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.create_task(self._write(), name=f"ws-writer-{self.id}")
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    # =========================================================================
+    # PRODUCERS
+    # =========================================================================
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """Queue a message; its policy comes from classify_message."""
+        policy, key = classify_message(message)
+        self.send_frame(Frame(message), policy, key)
+
+    def send_text(
+        self,
+        text: str,
+        policy: SendPolicy = SendPolicy.DROP_OLDEST,
+        key: Optional[str] = None
+    ) -> None:
+        """Queue an already-encoded JSON (or plain text) frame without blocking."""
+        self.send_frame(text, policy, key)
+
+    def send_frame(
+        self,
+        frame: OutboundFrame,
+        policy: SendPolicy = SendPolicy.DROP_OLDEST,
+        key: Optional[str] = None
+    ) -> None:
+        """
+        Queue a frame without blocking.
+
+        Args:
+            frame: JSON text, a Frame (encoded in this socket's framing when written)
+                or a DeltaFrame (delta or full snapshot, picked when written)
+            policy: Behaviour when the client falls behind
+            key: Coalescing key (COALESCE only)
+        """
+        if self.closed:
+            return
+
+        if policy == SendPolicy.COALESCE and key is not None:
+            entry = self._coalesce.get(key)
+            if entry is not None and entry[0] is not None:
+                entry[0] = frame
+                self.coalesced += 1
+                return
+
+        entry = [frame, key if policy == SendPolicy.COALESCE else None, policy]
+        if policy == SendPolicy.NEVER_DROP:
+            if self._never_drop_depth >= self.never_drop_limit:
+                logger.warning(
+                    f"[WS] {self.name} has {self._never_drop_depth} undelivered messages it must not lose; "
+                    "disconnecting it"
+                )
+                asyncio.get_running_loop().create_task(self._abandon())
+                self.closed = True
+                return
+            self._never_drop_depth += 1
+        else:
+            if self._droppable_depth >= self.max_queue:
+                self._drop_oldest()
+            self._droppable.append(entry)
+            self._droppable_depth += 1
+            if entry[1] is not None:
+                self._coalesce[entry[1]] = entry
+
+        self._queue.append(entry)
+        self._depth += 1
+        self.peak_depth = max(self.peak_depth, self._depth)
+        self._wakeup.set()
+
+    def _drop_oldest(self) -> None:
+        while self._droppable:
+            entry = self._droppable.popleft()
+            if entry[0] is None:
+                continue
+            self._forget(entry)
+            entry[0] = None
+            self._depth -= 1
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logger.warning(f"[WS] {self.name} is falling behind ({self.dropped} messages dropped)")
+            return
+
+    def _forget(self, entry: List[Any]) -> None:
+        if entry[1] is not None and self._coalesce.get(entry[1]) is entry:
+            del self._coalesce[entry[1]]
+        if entry[2] == SendPolicy.NEVER_DROP:
+            self._never_drop_depth -= 1
+        else:
+            self._droppable_depth -= 1
+
+    # =========================================================================
+    # WRITER
+    # =========================================================================
+
+    async def _write(self) -> None:
+        # Also stops on `closed`: on Python < 3.12, wait_for can swallow the
+        # cancellation from discard() when it races with a send completing
+        while not self.closed:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            entry = self._queue.popleft()
+            frame = entry[0]
+            if frame is None:
+                continue
+            self._forget(entry)
+            entry[0] = None
+            self._depth -= 1
+            while self._droppable and self._droppable[0][0] is None:
+                self._droppable.popleft()
+            try:
+                data = self._encode(frame)
+                if isinstance(data, bytes):
+                    await asyncio.wait_for(self.websocket.send_bytes(data), timeout=self.send_timeout)
+                else:
+                    await asyncio.wait_for(self.websocket.send_text(data), timeout=self.send_timeout)
+                self.delivered += 1
+                self.bytes_sent += len(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Client went away or stalled; its endpoint notices and cleans up
+                logger.debug(f"[WS] {self.name} send failed ({type(e).__name__}): {e}")
+                self.closed = True
+                await self._notify_closed()
+                return
+
+    def _encode(self, frame: OutboundFrame) -> Union[str, bytes]:
+        if isinstance(frame, DeltaFrame):
+            # Delta only if this client holds exactly the version it applies to
+            use_delta = frame.delta is not None and self._versions.get(frame.key) == frame.base_version
+            self._versions[frame.key] = frame.version
+            if use_delta:
+                self.deltas += 1
+            frame = frame.delta if use_delta else frame.full
+        if isinstance(frame, Frame):
+            return frame.encode(self.framing)
+        if self.framing != FRAMING_JSON and frame[:1] in ("{", "["):
+            return Frame(text=frame).encode(self.framing)
+        return frame
+
+    async def _abandon(self) -> None:
+        self._writer.cancel()
+        try:
+            await asyncio.wait_for(self.websocket.close(code=1013), timeout=self.send_timeout)
+        except Exception:
+            pass
+        await self._notify_closed()
+
+    async def _notify_closed(self) -> None:
+        if self.on_close is not None:
+            callback, self.on_close = self.on_close, None
+            try:
+                await callback(self)
+            except Exception as e:
+                logger.error(f"[WS] {self.name} close callback failed: {e}")
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    def get_stats(self) -> OutboundStats:
+        return OutboundStats(
+            depth=self._depth,
+            peak_depth=self.peak_depth,
+            delivered=self.delivered,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            deltas=self.deltas,
+            bytes_sent=self.bytes_sent,
+            framing=self.framing,
+            closed=self.closed
+        )
+
+    def discard(self) -> None:
+        """Stop the writer without waiting (queued messages are discarded)."""
+        self.closed = True
+        self.on_close = None
+        self._wakeup.set()
+        self._writer.cancel()
+
+    async def close(self) -> None:
+        """Stop the writer (queued messages are discarded)."""
+        self.discard()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,373 @@
+"""
+Authenticated WebSocket Sessions
+
+Shared plumbing for the dashboard, live meeting and supervisor sockets:
+
+- Connection-level authentication: an access token is verified once per
+  connection (decoded tokens are cached, so reconnect storms don't re-verify
+  the same JWT) and the session remembers when it expires. Clients can send
+  {"type": "auth", "token": ...} to extend a session in place; otherwise the
+  socket is closed with code 4401 when the token expires.
+- One heartbeat timer wheel per process: instead of every socket running its
+  own receive timeout, a single task ticks every WS_HEARTBEAT_TICK_SECONDS and
+  handles only the sockets due in that slot (heartbeat, token expiry, or a
+  writer that already gave up on the client).
+- AuthenticatedSocket: the receive loop ("ping" -> "pong", re-auth, then the
+  endpoint's own handler), driven by the wheel.
+
+Usage:
+    identity = authenticate_token(token)            # None if missing/invalid
+    out = await ws_manager.connect(websocket, user_id)
+    session = AuthenticatedSocket(websocket, identity, out)
+    await session.serve(handle_message)             # returns when the socket closes
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.ws_framing import Frame
+from app.core.ws_queue import OutboundSocket, SendPolicy
+from app.utils.security import verify_token
+
+
+# Close codes (4000-4999 are application-defined)
+CLOSE_TOKEN_EXPIRED = 4401
+CLOSE_FORBIDDEN = 1008
+CLOSE_CLIENT_GONE = 1011
+
+HEARTBEAT = Frame({"type": "heartbeat", "status": "alive"})
+
+
+class SocketIdentity(BaseModel):
+    """Who a WebSocket belongs to, established once per connection"""
+    user_id: str
+    expires_at: Optional[float] = None  # JWT exp (epoch seconds)
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+
+# =============================================================================
+# AUTHENTICATION CACHE
+# =============================================================================
+
+_identities: "OrderedDict[str, SocketIdentity]" = OrderedDict()
+_roles: Dict[str, Tuple[Optional[str], float]] = {}
+
+
+def authenticate_token(token: Optional[str]) -> Optional[SocketIdentity]:
+    """
+    Identity for an access token (cached until the token expires).
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        SocketIdentity, or None if the token is missing, invalid or expired
+    """
+    if not token:
+        return None
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    identity = _identities.get(key)
+    if identity is not None:
+        if not identity.expired():
+            _identities.move_to_end(key)
+            return identity
+        del _identities[key]
+
+    payload = verify_token(token, "access")
+    if not payload or not payload.get("sub"):
+        return None
+    exp = payload.get("exp")
+    identity = SocketIdentity(user_id=str(payload["sub"]), expires_at=float(exp) if exp else None)
+    _identities[key] = identity
+    while len(_identities) > settings.WS_AUTH_CACHE_SIZE:
+        _identities.popitem(last=False)
+    return identity
+
+
+async def get_socket_user_role(user_id: str) -> Optional[str]:
+    """
+    Role of an active user (cached for WS_AUTH_ROLE_TTL_SECONDS).
+
+    Returns:
+        The role value, or None if the user doesn't exist or is inactive
+    """
+    cached = _roles.get(user_id)
+    if cached is not None and time.monotonic() - cached[1] < settings.WS_AUTH_ROLE_TTL_SECONDS:
+        return cached[0]
+
+    import uuid
+    from sqlalchemy import select
+    from app.core.database import get_db_session_context
+    from app.models.models import User
+
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        return None
+    async with get_db_session_context() as db:
+        result = await db.execute(select(User.role, User.is_active).where(User.id == user_uuid))
+        row = result.first()
+    role = None
+    if row is not None and row.is_active:
+        role = row.role.value if hasattr(row.role, "value") else str(row.role)
+    _roles[user_id] = (role, time.monotonic())
+    return role
+
+
+def clear_auth_cache() -> None:
+    """Forget cached identities and roles (tests, role changes)."""
+    _identities.clear()
+    _roles.clear()
+
+
+# =============================================================================
+# HEARTBEAT WHEEL
+# =============================================================================
+
+class HeartbeatStats(BaseModel):
+    """Heartbeat wheel counters for this process"""
+    sockets: int
+    ticks: int
+    heartbeats: int
+    expired: int
+    dead: int
+
+
+class HeartbeatWheel:
+    """
+    Hashed timer wheel with one slot per tick, covering one heartbeat interval.
+
+    Each socket sits in the slot of its next deadline (heartbeat or token
+    expiry, whichever is sooner); a tick touches only that slot's sockets.
+    """
+
+    def __init__(self, interval: Optional[float] = None, tick: Optional[float] = None):
+        """
+        Args:
+            interval: Seconds between heartbeats per socket (default: WS_HEARTBEAT_INTERVAL_SECONDS)
+            tick: Wheel resolution in seconds (default: WS_HEARTBEAT_TICK_SECONDS)
+        """
+        self.interval = interval or settings.WS_HEARTBEAT_INTERVAL_SECONDS
+        self.tick = tick or settings.WS_HEARTBEAT_TICK_SECONDS
+        self._slots: List[Set["AuthenticatedSocket"]] = [set() for _ in range(math.ceil(self.interval / self.tick) + 1)]
+        self._where: Dict["AuthenticatedSocket", int] = {}
+        self._position = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"ticks": 0, "heartbeats": 0, "expired": 0, "dead": 0}
+
+    def add(self, session: "AuthenticatedSocket") -> None:
+        session.next_heartbeat = time.monotonic() + self.interval
+        self._schedule(session)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="ws-heartbeat-wheel")
+
+    def remove(self, session: "AuthenticatedSocket") -> None:
+        slot = self._where.pop(session, None)
+        if slot is not None:
+            self._slots[slot].discard(session)
+
+    def reschedule(self, session: "AuthenticatedSocket") -> None:
+        """Re-slot a socket whose deadline changed (e.g. re-authenticated)."""
+        if session in self._where:
+            self.remove(session)
+            self._schedule(session)
+
+    def _schedule(self, session: "AuthenticatedSocket") -> None:
+        now = time.monotonic()
+        due = session.next_heartbeat
+        if session.identity is not None and session.identity.expires_at is not None:
+            due = min(due, now + session.identity.expires_at - time.time())
+        # Never early: a socket is handled on the first tick at or after its deadline
+        ticks = min(max(1, math.ceil((due - now) / self.tick)), len(self._slots) - 1)
+        slot = (self._position + ticks) % len(self._slots)
+        self._slots[slot].add(session)
+        self._where[session] = slot
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self._where:
+            next_tick += self.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            self._position = (self._position + 1) % len(self._slots)
+            due, self._slots[self._position] = self._slots[self._position], set()
+            self._stats["ticks"] += 1
+            for session in due:
+                self._where.pop(session, None)
+                try:
+                    self._handle(session)
+                except Exception as e:
+                    logger.error(f"[WS] Heartbeat failed for {session.outbound.name}: {e}")
+
+    def _handle(self, session: "AuthenticatedSocket") -> None:
+        if session.closing:
+            return
+        if session.outbound.closed:
+            # The writer already gave up on this client (send failed or timed out)
+            self._stats["dead"] += 1
+            session.close(CLOSE_CLIENT_GONE, "client unreachable")
+            return
+        if session.identity is not None and session.identity.expired():
+            self._stats["expired"] += 1
+            session.close(CLOSE_TOKEN_EXPIRED, "token expired")
+            return
+        now = time.monotonic()
+        if now >= session.next_heartbeat:
+            session.outbound.send_frame(HEARTBEAT, SendPolicy.COALESCE, "heartbeat")
+            session.next_heartbeat = now + self.interval
+            self._stats["heartbeats"] += 1
+        self._schedule(session)
+
+    def get_stats(self) -> HeartbeatStats:
+        return HeartbeatStats(sockets=len(self._where), **self._stats)
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+# =============================================================================
+# AUTHENTICATED SOCKET
+# =============================================================================
+
+MessageHandler = Callable[[str], Awaitable[None]]
+
+
+class AuthenticatedSocket:
+    """
+    An accepted WebSocket, its identity and outbound queue, driven by the heartbeat wheel.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        identity: Optional[SocketIdentity],
+        outbound: OutboundSocket,
+        wheel: Optional[HeartbeatWheel] = None
+    ):
+        """
+        Args:
+            websocket: Accepted WebSocket
+            identity: Authenticated identity, or None for anonymous sockets (never expire)
+            outbound: The socket's outbound queue
+            wheel: Heartbeat wheel (default: the process-wide one)
+        """
+        self.websocket = websocket
+        self.identity = identity
+        self.outbound = outbound
+        self.wheel = wheel or get_heartbeat_wheel()
+        self.next_heartbeat = 0.0
+        self.closing = False
+        self.close_code: Optional[int] = None
+        self._receiver: Optional[asyncio.Task] = None
+
+    @property
+    def user_id(self) -> str:
+        return self.identity.user_id if self.identity else "anonymous"
+
+    async def serve(self, on_message: Optional[MessageHandler] = None) -> Optional[int]:
+        """
+        Receive until the client disconnects or the session is closed.
+
+        Args:
+            on_message: Awaited with each text message other than "ping" and re-auth
+
+        Returns:
+            The close code if the server closed the socket (expiry, dead client), else None
+        """
+        self.wheel.add(self)
+        self._receiver = asyncio.create_task(self._receive(on_message), name=f"ws-receive-{self.outbound.name}")
+        try:
+            await asyncio.wait({self._receiver})
+        finally:
+            self.wheel.remove(self)
+            if not self._receiver.done():
+                self._receiver.cancel()
+        if not self._receiver.cancelled():
+            error = self._receiver.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+        return self.close_code
+
+    async def _receive(self, on_message: Optional[MessageHandler]) -> None:
+        while True:
+            text = await self.websocket.receive_text()
+            if text == "ping":
+                self.outbound.send_text("pong")
+                continue
+            if text.startswith("{") and '"auth"' in text and self._reauthenticate(text):
+                continue
+            if on_message is not None:
+                await on_message(text)
+
+    def _reauthenticate(self, text: str) -> bool:
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return False
+        if not isinstance(message, dict) or message.get("type") != "auth":
+            return False
+        identity = authenticate_token(message.get("token"))
+        if identity is None or self.identity is None or identity.user_id != self.identity.user_id:
+            self.outbound.send({"type": "auth_failed"})
+            return True
+        self.identity = identity
+        self.wheel.reschedule(self)
+        self.outbound.send({"type": "auth_ok", "expires_at": identity.expires_at})
+        return True
+
+    def close(self, code: int, reason: str = "") -> None:
+        """Close the socket from the server side; serve() returns with this code."""
+        if self.closing:
+            return
+        self.closing = True
+        self.close_code = code
+        if self._receiver is not None and not self._receiver.done():
+            self._receiver.cancel()
+        asyncio.get_running_loop().create_task(self._close_websocket(code, reason))
+
+    async def _close_websocket(self, code: int, reason: str) -> None:
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(code=code, reason=reason),
+                timeout=settings.WS_SEND_TIMEOUT_SECONDS
+            )
+        except Exception:
+            pass
+
+
+# Singleton instance
+_heartbeat_wheel: Optional[HeartbeatWheel] = None
+
+
+def get_heartbeat_wheel() -> HeartbeatWheel:
+    """Get or create the process-wide heartbeat wheel"""
+    global _heartbeat_wheel
+    if _heartbeat_wheel is None:
+        _heartbeat_wheel = HeartbeatWheel()
+    return _heartbeat_wheel
+
+
+async def close_heartbeat_wheel() -> None:
+    """Stop the wheel if it was ever created (application shutdown)."""
+    global _heartbeat_wheel
+    if _heartbeat_wheel is not None:
+        await _heartbeat_wheel.close()
+        _heartbeat_wheel = None
@@ -89,6 +89,13 @@ async def startup_event():
     for route in url_list:
         logger.info(f"  {route['path']} ({route['name']})")
 
+    # Open the shared Redis pools (non-fatal: Redis features degrade on their own)
+    from app.core.redis_pool import get_redis_registry
+    try:
+        await get_redis_registry().initialize()
+    except Exception as e:
+        logger.error(f"Redis pool registry initialization failed: {e}")
+
     # Start Scheduler
     from app.services.scheduler import scheduler_service
     scheduler_service.start()
@@ -166,6 +173,30 @@ async def shutdown_event():
         from app.services.continuous_monitor import get_continuous_monitor
         get_continuous_monitor().stop()
 
+    # Drop pending live transcript analysis batches (live minutes drafts stay cached)
+    from app.services.live_analysis_worker import close_live_analysis_worker
+    await close_live_analysis_worker()
+    from app.services.live_minutes_builder import close_live_minutes_builder
+    await close_live_minutes_builder()
+
+    # Stop live meeting and dashboard fan-out, then close the shared pub/sub connection
+    from app.services.live_meeting_hub import close_live_meeting_hub
+    await close_live_meeting_hub()
+    from app.core.ws_manager import ws_manager
+    await ws_manager.close()
+    from app.core.ws_session import close_heartbeat_wheel
+    await close_heartbeat_wheel()
+    from app.services.supervisor_state_service import get_supervisor_state
+    await get_supervisor_state().close()
+    from app.services.pubsub_hub import close_pubsub_hub
+    await close_pubsub_hub()
+
+    # Close the shared Redis pools last (the hub and cache use them)
+    from app.core.cache import cache_service
+    await cache_service.close()
+    from app.core.redis_pool import close_redis_registry
+    await close_redis_registry()
+
 # Register routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}")
 app.include_router(twgs.router, prefix=f"{settings.API_V1_STR}")
@@ -194,3 +225,23 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/redis")
+async def redis_health_check():
+    """Redis connectivity and connection pool usage."""
+    from app.core.redis_pool import get_redis_registry
+    registry = get_redis_registry()
+    health = await registry.health_check()
+    return {**health, **registry.get_stats()}
+
+@app.get("/health/websockets")
+async def websocket_health_check():
+    """WebSocket fan-out on this worker: connections, outbound queue depth, drops, evictions and heartbeats."""
+    from app.core.ws_manager import ws_manager
+    from app.core.ws_session import get_heartbeat_wheel
+    from app.services.live_meeting_hub import get_live_meeting_hub
+    return {
+        "connections": ws_manager.get_stats().model_dump(),
+        "live_meetings": get_live_meeting_hub().get_stats().model_dump(),
+        "heartbeats": get_heartbeat_wheel().get_stats().model_dump()
+    }
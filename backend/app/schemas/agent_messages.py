@@ -60,6 +60,7 @@ class MessageMetadata(BaseModel):
         trace_id: Trace ID for tracking delegation chains
         correlation_id: ID linking request/response pairs
         delegation_depth: Current depth in delegation chain (0 = original)
+        attempts: Failed processing attempts so far (drives bus retries)
     """
     message_id: UUID = Field(default_factory=uuid4, description="Unique message identifier")
     timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC), description="Message creation time")
@@ -69,6 +70,7 @@ class MessageMetadata(BaseModel):
     trace_id: UUID = Field(default_factory=uuid4, description="Delegation chain trace ID")
     correlation_id: Optional[UUID] = Field(None, description="Correlates request/response")
     delegation_depth: int = Field(default=0, ge=0, description="Delegation chain depth")
+    attempts: int = Field(default=0, ge=0, description="Failed processing attempts so far")
 
     model_config = ConfigDict(
         json_encoders={
@@ -29,6 +29,8 @@ class EmailApprovalRequest(BaseModel):
     draft: EmailDraft = Field(..., description="Email draft awaiting approval")
     message: str = Field(default="Please review and approve this email before sending", description="Request message to user")
     thread_id: Optional[str] = Field(None, description="LangGraph thread ID for resuming execution")
+    user_id: Optional[str] = Field(None, description="User who owns this request")
+    status: str = Field(default="pending", description="pending, approved or declined")
 
 
 class EmailApprovalResponse(BaseModel):
@@ -5,11 +5,18 @@ External integrations and shared services for the ECOWAS Summit system.
 """
 
 from app.services.llm_service import OllamaLLMService, get_llm_service
-from app.services.redis_memory import RedisMemoryService, get_redis_memory
+from app.services.redis_memory import (
+    RedisMemoryService,
+    AsyncRedisMemoryService,
+    get_redis_memory,
+    get_async_redis_memory,
+)
 
 __all__ = [
     "OllamaLLMService",
     "get_llm_service",
     "RedisMemoryService",
     "get_redis_memory",
+    "AsyncRedisMemoryService",
+    "get_async_redis_memory",
 ]
@@ -0,0 +1,581 @@
+"""
+Approval Store
+
+Shared storage for human-in-the-loop approval requests (email drafts,
+document drafts), so any API worker can list, approve or decline a request
+created on another one.
+
+Redis Key Structure (per kind, e.g. "email"):
+- Request: ecowas:approval:{kind}:{request_id} (HASH: status, user_id,
+  thread_id, created_at, decided_at, decided_by, payload)
+- Pending index: ecowas:approvals:{kind}:pending (ZSET, score = created_at)
+- Per-user index: ecowas:approvals:{kind}:user:{user_id} (ZSET)
+- Per-thread index: ecowas:approvals:{kind}:thread:{thread_id} (ZSET)
+
+Requests expire after APPROVAL_TTL_SECONDS; decided ones are kept for
+APPROVAL_DECIDED_TTL_SECONDS so repeated approve/decline calls get a clear
+answer. Indexes only hold pending requests and are pruned on every create
+and list.
+
+Status transitions (pending -> approved/declined, and back to pending if
+sending fails) are WATCH/MULTI transactions: of two concurrent approvals,
+exactly one wins.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+from app.core.redis_pool import get_redis_registry
+
+
+STATUS_PENDING = "pending"
+STATUS_APPROVED = "approved"
+STATUS_DECLINED = "declined"
+
+
+class ApprovalStateError(ValueError):
+    """Raised when a request is not in the status a transition expects"""
+
+    def __init__(self, request_id: str, status: str):
+        self.request_id = request_id
+        self.status = status
+        super().__init__(f"Approval request {request_id} is already {status}")
+
+
+class ApprovalStore:
+    """Redis-backed approval request store."""
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        namespace: str = "ecowas",
+        ttl: int = 86400,
+        decided_ttl: int = 3600
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            client: Sync Redis client with decode_responses=True (default: shared pool)
+            namespace: Key prefix
+            ttl: Seconds a pending request stays available
+            decided_ttl: Seconds a decided request is kept
+        """
+        self.client = client or get_redis_registry().get_sync_client(decode_responses=True)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.decided_ttl = decided_ttl
+
+    # =========================================================================
+    # Key Generation
+    # =========================================================================
+
+    def _request_key(self, kind: str, request_id: str) -> str:
+        return f"{self.namespace}:approval:{kind}:{request_id}"
+
+    def _pending_key(self, kind: str) -> str:
+        return f"{self.namespace}:approvals:{kind}:pending"
+
+    def _user_key(self, kind: str, user_id: str) -> str:
+        return f"{self.namespace}:approvals:{kind}:user:{user_id}"
+
+    def _thread_key(self, kind: str, thread_id: str) -> str:
+        return f"{self.namespace}:approvals:{kind}:thread:{thread_id}"
+
+    def _index_keys(self, kind: str, user_id: Optional[str], thread_id: Optional[str]) -> List[str]:
+        keys = [self._pending_key(kind)]
+        if user_id:
+            keys.append(self._user_key(kind, user_id))
+        if thread_id:
+            keys.append(self._thread_key(kind, thread_id))
+        return keys
+
+    @staticmethod
+    def _record(request_id: str, kind: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "request_id": request_id,
+            "kind": kind,
+            "status": fields.get("status"),
+            "user_id": fields.get("user_id") or None,
+            "thread_id": fields.get("thread_id") or None,
+            "created_at": float(fields.get("created_at") or 0),
+            "decided_at": float(fields["decided_at"]) if fields.get("decided_at") else None,
+            "decided_by": fields.get("decided_by") or None,
+            "payload": json.loads(fields["payload"]) if fields.get("payload") else {}
+        }
+
+    # =========================================================================
+    # Create / Read
+    # =========================================================================
+
+    def create(
+        self,
+        kind: str,
+        request_id: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        thread_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a new pending request and index it.
+
+        Args:
+            kind: Request kind ("email", "document")
+            request_id: Unique request ID
+            payload: JSON-serializable request body
+            user_id: Owning user (optional, can be linked later)
+            thread_id: Conversation thread (optional, can be linked later)
+
+        Returns:
+            The stored record
+        """
+        created_at = time.time()
+        fields = {
+            "status": STATUS_PENDING,
+            "user_id": user_id or "",
+            "thread_id": thread_id or "",
+            "created_at": created_at,
+            "payload": json.dumps(payload, default=str)
+        }
+        key = self._request_key(kind, request_id)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.ttl)
+        for index_key in self._index_keys(kind, user_id, thread_id):
+            # Prune on write too: kinds that are never listed would otherwise grow
+            pipe.zremrangebyscore(index_key, "-inf", created_at - self.ttl)
+            pipe.zadd(index_key, {request_id: created_at})
+            pipe.expire(index_key, self.ttl)
+        pipe.execute()
+        return self._record(request_id, kind, fields)
+
+    def get(self, kind: str, request_id: str) -> Optional[Dict[str, Any]]:
+        """Get a request in any status (None if unknown or expired)."""
+        fields = self.client.hgetall(self._request_key(kind, request_id))
+        return self._record(request_id, kind, fields) if fields else None
+
+    def list_pending(
+        self,
+        kind: str,
+        user_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        List pending requests, newest first.
+
+        Args:
+            kind: Request kind
+            user_id: Only this user's requests
+            thread_id: Only this thread's requests (ignored if user_id is given)
+            limit: Maximum number of requests
+
+        Returns:
+            List of records
+        """
+        if user_id:
+            index_key = self._user_key(kind, user_id)
+        elif thread_id:
+            index_key = self._thread_key(kind, thread_id)
+        else:
+            index_key = self._pending_key(kind)
+
+        # Drop index entries older than the request TTL before reading
+        self.client.zremrangebyscore(index_key, "-inf", time.time() - self.ttl)
+        request_ids = self.client.zrevrange(index_key, 0, limit - 1)
+        if not request_ids:
+            return []
+
+        pipe = self.client.pipeline(transaction=False)
+        for request_id in request_ids:
+            pipe.hgetall(self._request_key(kind, request_id))
+        results = pipe.execute()
+
+        records, stale = [], []
+        for request_id, fields in zip(request_ids, results):
+            if fields and fields.get("status") == STATUS_PENDING:
+                records.append(self._record(request_id, kind, fields))
+            else:
+                stale.append(request_id)
+        if stale:
+            self.client.zrem(index_key, *stale)
+        return records
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def link(
+        self,
+        kind: str,
+        request_id: str,
+        thread_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> bool:
+        """
+        Attach a thread and/or owner to a pending request and index it.
+
+        Returns:
+            True if linked, False if the request isn't pending
+        """
+        key = self._request_key(kind, request_id)
+
+        def _link(pipe) -> bool:
+            status, created_at = pipe.hmget(key, "status", "created_at")
+            if status != STATUS_PENDING:
+                pipe.unwatch()
+                return False
+            pipe.multi()
+            updates = {}
+            if thread_id:
+                updates["thread_id"] = thread_id
+            if user_id:
+                updates["user_id"] = user_id
+            if updates:
+                pipe.hset(key, mapping=updates)
+            for index_key in self._index_keys(kind, user_id, thread_id)[1:]:
+                pipe.zadd(index_key, {request_id: float(created_at)})
+                pipe.expire(index_key, self.ttl)
+            pipe.execute()
+            return True
+
+        return self._watched(key, _link)
+
+    def transition(
+        self,
+        kind: str,
+        request_id: str,
+        expected: str,
+        new_status: str,
+        decided_by: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move a request from one status to another.
+
+        Leaving "pending" removes it from the indexes and shortens its TTL to
+        decided_ttl; returning to "pending" restores both.
+
+        Args:
+            kind: Request kind
+            request_id: Request ID
+            expected: Status the request must currently have
+            new_status: Status to set
+            decided_by: User making the decision
+
+        Returns:
+            The updated record, or None if the request doesn't exist
+
+        Raises:
+            ApprovalStateError: If the request is in another status
+        """
+        key = self._request_key(kind, request_id)
+
+        def _transition(pipe) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+            fields = pipe.hgetall(key)
+            if not fields:
+                pipe.unwatch()
+                return None, None
+            if fields.get("status") != expected:
+                pipe.unwatch()
+                return None, fields.get("status")
+
+            fields["status"] = new_status
+            index_keys = self._index_keys(kind, fields.get("user_id"), fields.get("thread_id"))
+            pipe.multi()
+            if new_status == STATUS_PENDING:
+                created_at = float(fields.get("created_at") or time.time())
+                pipe.hset(key, mapping={"status": new_status, "decided_at": "", "decided_by": ""})
+                pipe.expire(key, max(int(created_at + self.ttl - time.time()), 1))
+                for index_key in index_keys:
+                    pipe.zadd(index_key, {request_id: created_at})
+            else:
+                fields["decided_at"] = time.time()
+                fields["decided_by"] = decided_by or ""
+                pipe.hset(key, mapping={
+                    "status": new_status,
+                    "decided_at": fields["decided_at"],
+                    "decided_by": fields["decided_by"]
+                })
+                pipe.expire(key, self.decided_ttl)
+                for index_key in index_keys:
+                    pipe.zrem(index_key, request_id)
+            pipe.execute()
+            return self._record(request_id, kind, fields), None
+
+        record, conflict = self._watched(key, _transition)
+        if conflict:
+            raise ApprovalStateError(request_id, conflict)
+        return record
+
+    def delete(self, kind: str, request_id: str) -> bool:
+        """Remove a request and its index entries."""
+        key = self._request_key(kind, request_id)
+        user_id, thread_id = self.client.hmget(key, "user_id", "thread_id")
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(key)
+        for index_key in self._index_keys(kind, user_id, thread_id):
+            pipe.zrem(index_key, request_id)
+        return bool(pipe.execute()[0])
+
+    def prune(self, kind: str, max_age_seconds: Optional[int] = None) -> int:
+        """
+        Drop expired entries from the global pending index.
+
+        Request hashes expire on their own; this only keeps the index small.
+
+        Returns:
+            Number of index entries removed
+        """
+        max_age = max_age_seconds or self.ttl
+        return self.client.zremrangebyscore(self._pending_key(kind), "-inf", time.time() - max_age)
+
+    def _watched(self, key: str, fn, retries: int = 5):
+        """Run fn(pipe) under WATCH key, retrying if another client changed it."""
+        for _ in range(retries):
+            try:
+                with self.client.pipeline() as pipe:
+                    pipe.watch(key)
+                    return fn(pipe)
+            except redis.WatchError:
+                continue
+        raise redis.WatchError(f"Too much contention on {key}")
+
+
+class InProcessApprovalStore(ApprovalStore):
+    """
+    Same interface without Redis (single-node mode, see REDIS_BACKEND).
+    A lock makes transitions atomic within the process. Expired requests are
+    swept on create and the store is LRU-bounded like the other in-process stores.
+    """
+
+    SWEEP_INTERVAL_SECONDS = 60
+
+    def __init__(
+        self,
+        namespace: str = "ecowas",
+        ttl: int = 86400,
+        decided_ttl: int = 3600,
+        max_entries: int = 10000
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            namespace: Kept for interface parity (no keys are built)
+            ttl: Seconds a pending request stays available
+            decided_ttl: Seconds a decided request is kept
+            max_entries: Maximum number of requests held; the oldest are evicted first
+        """
+        self.client = None
+        self.namespace = namespace
+        self.ttl = ttl
+        self.decided_ttl = decided_ttl
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        # (kind, request_id) -> (fields, expires_at), oldest first
+        self._requests: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._next_sweep = 0.0
+
+    def _fields(self, kind: str, request_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._requests.get((kind, request_id))
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            del self._requests[(kind, request_id)]
+            return None
+        return entry[0]
+
+    def _sweep(self, now: float) -> None:
+        """Drop expired requests of every kind (at most once per SWEEP_INTERVAL_SECONDS)."""
+        if now < self._next_sweep and len(self._requests) < self.max_entries:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL_SECONDS
+        for key in [key for key, (_, expires_at) in self._requests.items() if expires_at <= now]:
+            del self._requests[key]
+
+    def create(
+        self,
+        kind: str,
+        request_id: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        thread_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a new pending request, sweeping expired ones and evicting the
+        oldest beyond max_entries.
+
+        Args:
+            kind: Request kind ("email", "document")
+            request_id: Unique request ID
+            payload: JSON-serializable request body
+            user_id: Owning user (optional, can be linked later)
+            thread_id: Conversation thread (optional, can be linked later)
+
+        Returns:
+            The stored record
+        """
+        fields = {
+            "status": STATUS_PENDING,
+            "user_id": user_id or "",
+            "thread_id": thread_id or "",
+            "created_at": time.time(),
+            "payload": json.dumps(payload, default=str)
+        }
+        with self._lock:
+            self._sweep(fields["created_at"])
+            self._requests[(kind, request_id)] = (fields, fields["created_at"] + self.ttl)
+            self._requests.move_to_end((kind, request_id))
+            while len(self._requests) > self.max_entries:
+                self._requests.popitem(last=False)
+        return self._record(request_id, kind, fields)
+
+    def get(self, kind: str, request_id: str) -> Optional[Dict[str, Any]]:
+        """Get a request in any status (None if unknown or expired)."""
+        with self._lock:
+            fields = self._fields(kind, request_id)
+            return self._record(request_id, kind, dict(fields)) if fields else None
+
+    def list_pending(
+        self,
+        kind: str,
+        user_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        List pending requests, newest first.
+
+        Args:
+            kind: Request kind
+            user_id: Only this user's requests
+            thread_id: Only this thread's requests (ignored if user_id is given)
+            limit: Maximum number of requests
+
+        Returns:
+            List of records
+        """
+        with self._lock:
+            records = []
+            for (k, request_id) in list(self._requests):
+                fields = self._fields(k, request_id) if k == kind else None
+                if not fields or fields["status"] != STATUS_PENDING:
+                    continue
+                if user_id and fields["user_id"] != user_id:
+                    continue
+                if not user_id and thread_id and fields["thread_id"] != thread_id:
+                    continue
+                records.append(self._record(request_id, kind, dict(fields)))
+        records.sort(key=lambda r: r["created_at"], reverse=True)
+        return records[:limit]
+
+    def link(
+        self,
+        kind: str,
+        request_id: str,
+        thread_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> bool:
+        """
+        Attach a thread and/or owner to a pending request.
+
+        Returns:
+            True if linked, False if the request isn't pending
+        """
+        with self._lock:
+            fields = self._fields(kind, request_id)
+            if not fields or fields["status"] != STATUS_PENDING:
+                return False
+            if thread_id:
+                fields["thread_id"] = thread_id
+            if user_id:
+                fields["user_id"] = user_id
+            return True
+
+    def transition(
+        self,
+        kind: str,
+        request_id: str,
+        expected: str,
+        new_status: str,
+        decided_by: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move a request from one status to another.
+
+        Args:
+            kind: Request kind
+            request_id: Request ID
+            expected: Status the request must currently have
+            new_status: Status to set
+            decided_by: User making the decision
+
+        Returns:
+            The updated record, or None if the request doesn't exist
+
+        Raises:
+            ApprovalStateError: If the request isn't in the expected status
+        """
+        with self._lock:
+            fields = self._fields(kind, request_id)
+            if not fields:
+                return None
+            if fields["status"] != expected:
+                raise ApprovalStateError(request_id, fields["status"])
+            fields["status"] = new_status
+            if new_status == STATUS_PENDING:
+                fields["decided_at"] = fields["decided_by"] = ""
+                expires_at = fields["created_at"] + self.ttl
+            else:
+                fields["decided_at"] = time.time()
+                fields["decided_by"] = decided_by or ""
+                expires_at = time.time() + self.decided_ttl
+            self._requests[(kind, request_id)] = (fields, expires_at)
+            return self._record(request_id, kind, dict(fields))
+
+    def delete(self, kind: str, request_id: str) -> bool:
+        """Remove a request."""
+        with self._lock:
+            return self._requests.pop((kind, request_id), None) is not None
+
+    def prune(self, kind: str, max_age_seconds: Optional[int] = None) -> int:
+        """
+        Drop expired requests of a kind, and pending ones older than max_age_seconds.
+
+        Returns:
+            Number of requests removed
+        """
+        now = time.time()
+        cutoff = now - (max_age_seconds or self.ttl)
+        with self._lock:
+            expired = [
+                key for key, (fields, expires_at) in self._requests.items()
+                if key[0] == kind and (expires_at <= now or fields["created_at"] < cutoff)
+            ]
+            for key in expired:
+                del self._requests[key]
+        return len(expired)
+
+
+# Singleton instance
+_approval_store: Optional[ApprovalStore] = None
+
+
+def get_approval_store() -> ApprovalStore:
+    """Get or create the approval store (in-process when Redis isn't used)"""
+    global _approval_store
+    if _approval_store is None:
+        kwargs = dict(ttl=settings.APPROVAL_TTL_SECONDS, decided_ttl=settings.APPROVAL_DECIDED_TTL_SECONDS)
+        if get_redis_registry().resolve_backend() == "memory":
+            _approval_store = InProcessApprovalStore(max_entries=settings.INPROCESS_MAX_ENTRIES, **kwargs)
+        else:
+            _approval_store = ApprovalStore(**kwargs)
+        logger.info(f"{type(_approval_store).__name__} initialized")
+    return _approval_store
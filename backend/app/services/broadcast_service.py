@@ -7,9 +7,9 @@ Implements the "Knowledge Broadcasting" phase of the Supervisor architecture.
 
 from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
+import asyncio
 import json
 import logging
-import redis
 from pydantic import BaseModel
 
 # Use loguru for consistency if available, else standard logging
@@ -20,7 +20,9 @@ except ImportError:
 
 from app.models.models import Document
 from app.core.config import settings
+from app.core.redis_pool import get_redis_registry
 from app.core.knowledge_base import get_knowledge_base
+from app.services.live_meeting_hub import get_live_event_publisher
 
 class BroadcastService:
     """
@@ -36,23 +38,27 @@ class BroadcastService:
         self.redis_client = None
         # Try connecting to Redis
         try:
-            if settings.REDIS_URL:
-                self.redis_client = redis.Redis.from_url(settings.REDIS_URL)
-                logger.debug(f"BroadcastService connected to Redis at {settings.REDIS_URL}")
-            elif settings.REDIS_HOST:
-                self.redis_client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=settings.REDIS_PASSWORD
-                )
-                logger.debug(f"BroadcastService connected to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+            if settings.REDIS_URL or settings.REDIS_HOST:
+                # Shared sync pool from the registry
+                self.redis_client = get_redis_registry().get_sync_client()
+                logger.debug("BroadcastService using shared Redis pool")
             else:
                 logger.warning("No Redis configuration found. Broadcasts will not be sent to agents.")
         except Exception as e:
             logger.error(f"BroadcastService failed to connect to Redis: {e}")
 
-        self.knowledge_base = get_knowledge_base()
+        # Opened on first document broadcast; live notifications don't need it
+        self._knowledge_base = None
+
+    @property
+    def knowledge_base(self):
+        if self._knowledge_base is None:
+            self._knowledge_base = get_knowledge_base()
+        return self._knowledge_base
+
+    @knowledge_base.setter
+    def knowledge_base(self, value):
+        self._knowledge_base = value
 
     async def broadcast_document(
         self,
@@ -165,11 +171,11 @@ class BroadcastService:
     ):
         """
         Notify the live meeting dashboard of a new insight or response.
-        """
-        if not self.redis_client:
-            logger.warning("Redis client not initialized, skipping live notification")
-            return
 
+        The update is appended to the meeting's event stream and published on
+        its live:{meeting_id} channel (see live_meeting_hub), so reconnecting
+        clients can resume from their last event_id.
+        """
         payload = {
             "type": "live_meeting_update",
             "meeting_id": str(meeting_id),
@@ -179,19 +185,30 @@ class BroadcastService:
             "metadata": metadata,
             "timestamp": datetime.utcnow().isoformat()
         }
-        
+
         try:
-            # 1. Push to a list for persistence/polling
-            queue_key = f"live_updates:{meeting_id}"
-            self.redis_client.lpush(queue_key, json.dumps(payload))
-            self.redis_client.ltrim(queue_key, 0, 49) # Keep last 50 updates
-            
-            # 2. Publish for real-time WebSocket clients
-            self.redis_client.publish("live_meeting_stream", json.dumps(payload))
-            
-            logger.info(f"✓ Post LIVE UPDATE for meeting {meeting_id} from {source}")
+            event_id = await asyncio.to_thread(get_live_event_publisher().publish, meeting_id, payload)
+            logger.info(f"✓ Post LIVE UPDATE {event_id} for meeting {meeting_id} from {source}")
         except Exception as e:
-            logger.error(f"Failed to push live update to Redis: {e}")
+            logger.error(f"Failed to publish live update: {e}")
+
+    async def notify_live_state(
+        self,
+        meeting_id: str,
+        stream: str,
+        snapshot: Dict[str, Any]
+    ):
+        """
+        Push the current state of a live stream (e.g. "transcript" lines or
+        "agenda" items) to the live meeting dashboard.
+
+        Clients already holding the previous version receive only the delta
+        (new transcript lines, changed agenda-item fields).
+        """
+        try:
+            await asyncio.to_thread(get_live_event_publisher().publish_snapshot, meeting_id, stream, snapshot)
+        except Exception as e:
+            logger.error(f"Failed to publish live {stream} state: {e}")
 
     async def notify_meeting_update(
         self,
@@ -222,20 +239,19 @@ class BroadcastService:
         except Exception as e:
             logger.error(f"WebSocket broadcast failed: {e}")
 
-        # 2. Also publish to Redis for live meeting WebSocket subscribers
-        if self.redis_client:
-            try:
-                payload = {
-                    "type": "live_meeting_update",
-                    "meeting_id": str(meeting_id),
-                    "source": "transcript_processed",
-                    "content": "Transcript and minutes are now available.",
-                    "metadata": update_data,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                self.redis_client.publish("live_meeting_stream", json.dumps(payload))
-            except Exception as e:
-                logger.error(f"Redis publish failed for meeting update: {e}")
+        # 2. Also publish to the meeting's live channel (and resumable history)
+        try:
+            payload = {
+                "type": "live_meeting_update",
+                "meeting_id": str(meeting_id),
+                "source": "transcript_processed",
+                "content": "Transcript and minutes are now available.",
+                "metadata": update_data,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            await asyncio.to_thread(get_live_event_publisher().publish, meeting_id, payload)
+        except Exception as e:
+            logger.error(f"Live publish failed for meeting update: {e}")
 
     def _log_broadcast(self, doc_id: str, recipients: List[str]):
         """Log the broadcast event."""
@@ -0,0 +1,320 @@
+"""
+Chat Run Coordinator
+
+Admission control for agent chat runs on the shared Supervisor singleton.
+
+- Per-thread serialisation: two messages on the same conversation never run
+  concurrently (they share LangGraph checkpoints in MemorySaver).
+- Global concurrency limit: at most CHAT_MAX_CONCURRENT_RUNS graphs execute at once.
+- Bounded FIFO wait queue: overflow is rejected with a retry-after hint instead
+  of piling up unbounded work during load spikes.
+
+Everything runs on the event loop, so no thread locks are needed.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Deque, Dict, Optional, Set
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+class ChatCapacityError(Exception):
+    """Raised when a chat run cannot be admitted (queue full or wait timed out)."""
+
+    def __init__(self, message: str, retry_after: int, queued: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.queued = queued
+
+
+class ChatRunStats(BaseModel):
+    """Snapshot of coordinator metrics"""
+    active: int
+    queued: int
+    active_threads: int
+    max_concurrent: int
+    max_queue: int
+    total_admitted: int
+    total_rejected: int
+    total_timed_out: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class ChatRunTicket:
+    """
+    A single chat run waiting for (or holding) an execution slot.
+
+    Obtain via ChatRunCoordinator.enqueue() and always call release().
+    """
+
+    def __init__(self, coordinator: "ChatRunCoordinator", thread_id: str):
+        self.coordinator = coordinator
+        self.thread_id = thread_id
+        self.enqueued_at = time.monotonic()
+        self.granted_at: Optional[float] = None
+        self._granted = asyncio.Event()
+        self._released = False
+
+    @property
+    def granted(self) -> bool:
+        return self._granted.is_set()
+
+    def position(self) -> int:
+        """1-based position in the wait queue (0 once granted)."""
+        return self.coordinator._position(self)
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the run is admitted.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+
+        Returns:
+            True if admitted, False if the timeout elapsed first (still queued)
+        """
+        if self.granted:
+            return True
+        try:
+            await asyncio.wait_for(self._granted.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self.granted
+
+    def release(self) -> None:
+        """Free the slot (or leave the queue). Safe to call more than once."""
+        if self._released:
+            return
+        self._released = True
+        self.coordinator._release(self)
+
+
+class ChatRunCoordinator:
+    """
+    FIFO admission controller with per-thread locking.
+
+    A queued run is granted when a global slot is free AND no other run on the
+    same thread is active. Runs for busy threads don't block runs for other
+    threads queued behind them.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        retry_after: Optional[int] = None
+    ):
+        self.max_concurrent = max_concurrent or settings.CHAT_MAX_CONCURRENT_RUNS
+        self.max_queue = max_queue if max_queue is not None else settings.CHAT_MAX_QUEUED_RUNS
+        self.queue_timeout = queue_timeout if queue_timeout is not None else settings.CHAT_QUEUE_TIMEOUT_SECONDS
+        self.retry_after = retry_after or settings.CHAT_RETRY_AFTER_SECONDS
+
+        self._waiters: Deque[ChatRunTicket] = deque()
+        self._active: Set[ChatRunTicket] = set()
+        self._active_threads: Dict[str, ChatRunTicket] = {}
+
+        # Metrics
+        self._total_admitted = 0
+        self._total_rejected = 0
+        self._total_timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    # =========================================================================
+    # ADMISSION
+    # =========================================================================
+
+    def is_saturated(self) -> bool:
+        """True if a new run would be rejected right now."""
+        return len(self._active) >= self.max_concurrent and len(self._waiters) >= self.max_queue
+
+    def enqueue(self, thread_id: str) -> ChatRunTicket:
+        """
+        Register a run for a thread. Granted immediately if capacity allows.
+
+        Args:
+            thread_id: Conversation/thread identifier
+
+        Returns:
+            Ticket to wait on
+
+        Raises:
+            ChatCapacityError: If the wait queue is full
+        """
+        ticket = ChatRunTicket(self, thread_id)
+        # Waiters are dispatched eagerly, so anyone still queued is blocked on a busy
+        # thread or on the global limit - granting here never jumps a grantable waiter
+        if self._can_grant(ticket):
+            self._grant(ticket)
+            return ticket
+
+        if len(self._waiters) >= self.max_queue:
+            self._total_rejected += 1
+            logger.warning(f"[CHAT_QUEUE] Rejecting run for thread {thread_id}: queue full ({len(self._waiters)})")
+            raise ChatCapacityError(
+                "Chat capacity exceeded, please retry shortly",
+                retry_after=self.retry_after,
+                queued=len(self._waiters)
+            )
+
+        self._waiters.append(ticket)
+        logger.info(f"[CHAT_QUEUE] Thread {thread_id} queued at position {len(self._waiters)}")
+        return ticket
+
+    async def acquire(self, thread_id: str) -> ChatRunTicket:
+        """
+        Enqueue and wait for admission, up to the configured queue timeout.
+
+        Raises:
+            ChatCapacityError: If the queue is full or the wait timed out
+        """
+        ticket = self.enqueue(thread_id)
+        try:
+            admitted = await ticket.wait(timeout=self.queue_timeout)
+        except BaseException:
+            ticket.release()
+            raise
+        if not admitted:
+            self.time_out(ticket)
+        return ticket
+
+    def time_out(self, ticket: ChatRunTicket) -> None:
+        """
+        Give up on a queued ticket and raise the capacity error.
+
+        Raises:
+            ChatCapacityError: Always
+        """
+        position = ticket.position()
+        ticket.release()
+        self._total_timed_out += 1
+        raise ChatCapacityError(
+            "Timed out waiting for a free chat slot",
+            retry_after=self.retry_after,
+            queued=position
+        )
+
+    async def queue_updates(self, ticket: ChatRunTicket, interval: Optional[float] = None) -> AsyncGenerator[int, None]:
+        """
+        Wait for admission while periodically yielding the queue position.
+
+        Used by SSE endpoints to keep the client informed while queued.
+        Yields nothing if the ticket was granted immediately.
+
+        Raises:
+            ChatCapacityError: If the wait exceeds the queue timeout
+        """
+        interval = interval or settings.CHAT_QUEUE_UPDATE_INTERVAL_SECONDS
+        deadline = ticket.enqueued_at + self.queue_timeout
+        while not ticket.granted:
+            yield ticket.position()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.time_out(ticket)
+            await ticket.wait(timeout=min(interval, remaining))
+
+    @asynccontextmanager
+    async def run(self, thread_id: str):
+        """
+        Context manager holding an execution slot for the duration of a run.
+
+        Usage:
+            async with coordinator.run(thread_id):
+                await supervisor.chat_with_tools(...)
+        """
+        ticket = await self.acquire(thread_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    # =========================================================================
+    # METRICS
+    # =========================================================================
+
+    def get_stats(self) -> ChatRunStats:
+        """Current active/queued counts and admission metrics"""
+        return ChatRunStats(
+            active=len(self._active),
+            queued=len(self._waiters),
+            active_threads=len(self._active_threads),
+            max_concurrent=self.max_concurrent,
+            max_queue=self.max_queue,
+            total_admitted=self._total_admitted,
+            total_rejected=self._total_rejected,
+            total_timed_out=self._total_timed_out,
+            avg_wait_ms=round(self._total_wait / self._total_admitted * 1000, 2) if self._total_admitted else 0.0,
+            max_wait_ms=round(self._max_wait * 1000, 2)
+        )
+
+    # =========================================================================
+    # INTERNALS
+    # =========================================================================
+
+    def _can_grant(self, ticket: ChatRunTicket) -> bool:
+        return len(self._active) < self.max_concurrent and ticket.thread_id not in self._active_threads
+
+    def _grant(self, ticket: ChatRunTicket) -> None:
+        ticket.granted_at = time.monotonic()
+        self._active.add(ticket)
+        self._active_threads[ticket.thread_id] = ticket
+
+        waited = ticket.granted_at - ticket.enqueued_at
+        self._total_admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+        ticket._granted.set()
+
+    def _position(self, ticket: ChatRunTicket) -> int:
+        if ticket.granted:
+            return 0
+        try:
+            return self._waiters.index(ticket) + 1
+        except ValueError:
+            return 0
+
+    def _release(self, ticket: ChatRunTicket) -> None:
+        if ticket in self._active:
+            self._active.discard(ticket)
+            if self._active_threads.get(ticket.thread_id) is ticket:
+                del self._active_threads[ticket.thread_id]
+        else:
+            try:
+                self._waiters.remove(ticket)
+            except ValueError:
+                pass
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant queued tickets in FIFO order, skipping threads that are busy."""
+        if not self._waiters:
+            return
+        remaining: Deque[ChatRunTicket] = deque()
+        while self._waiters:
+            ticket = self._waiters.popleft()
+            if self._can_grant(ticket):
+                self._grant(ticket)
+            else:
+                remaining.append(ticket)
+        self._waiters = remaining
+
+
+# Singleton instance
+_coordinator: Optional[ChatRunCoordinator] = None
+
+
+def get_chat_run_coordinator() -> ChatRunCoordinator:
+    """Get or create the chat run coordinator singleton"""
+    global _coordinator
+    if _coordinator is None:
+        _coordinator = ChatRunCoordinator()
+    return _coordinator
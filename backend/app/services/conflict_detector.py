@@ -8,6 +8,7 @@ Triggers automated negotiation or escalation as needed.
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, UTC
 from loguru import logger
+import asyncio
 import re
 import json
 
@@ -770,8 +771,8 @@ If no conflicts, respond with: NO CONFLICT
         """
         
         try:
-            # Note: We should ideally use a very fast model here
-            response_str = self.llm.chat(prompt, max_tokens=200)
+            # Off the event loop, so live checks can run concurrently
+            response_str = await asyncio.to_thread(self.llm.chat, prompt, max_tokens=200)
             
             # Clean json
             if "```json" in response_str:
@@ -820,7 +821,7 @@ If no conflicts, respond with: NO CONFLICT
         """
 
         try:
-            response_str = self.llm.chat(prompt, max_tokens=300)
+            response_str = await asyncio.to_thread(self.llm.chat, prompt, max_tokens=300)
             
             # Clean json
             if "```json" in response_str:
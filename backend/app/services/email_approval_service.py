@@ -2,27 +2,52 @@
 Email Approval Service
 
 Manages pending email approvals requiring human-in-the-loop confirmation.
+
+Requests live in the shared ApprovalStore (Redis, or in-process in
+single-node mode), so every API worker sees the same requests, they expire
+on their own, and approve/decline is an atomic status transition.
 """
 
 import uuid
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from typing import List, Optional
 from app.schemas.email_approval import EmailDraft, EmailApprovalRequest
+from app.services.approval_store import (
+    ApprovalStateError,
+    ApprovalStore,
+    STATUS_APPROVED,
+    STATUS_DECLINED,
+    STATUS_PENDING,
+    get_approval_store,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+APPROVAL_KIND = "email"
+
 
 class EmailApprovalService:
     """Service for managing email approval requests."""
 
-    def __init__(self):
-        """Initialize the email approval service."""
-        # In-memory storage for pending approvals
-        # In production, this should be Redis or a database
-        self.pending_approvals: Dict[str, EmailApprovalRequest] = {}
+    def __init__(self, store: Optional[ApprovalStore] = None):
+        """
+        Initialize the email approval service.
+
+        Args:
+            store: Approval store (default: the shared one)
+        """
+        self.store = store or get_approval_store()
         logger.info("Email Approval Service initialized")
 
+    @staticmethod
+    def _to_request(record: dict) -> EmailApprovalRequest:
+        return EmailApprovalRequest(
+            **record["payload"],
+            thread_id=record["thread_id"],
+            user_id=record["user_id"],
+            status=record["status"]
+        )
+
     def create_approval_request(
         self,
         to: list,
@@ -33,7 +58,8 @@ class EmailApprovalService:
         bcc: Optional[list] = None,
         attachments: Optional[list] = None,
         context: Optional[str] = None,
-        thread_id: Optional[str] = None
+        thread_id: Optional[str] = None,
+        user_id: Optional[str] = None
     ) -> EmailApprovalRequest:
         """
         Create a new email approval request.
@@ -48,6 +74,7 @@ class EmailApprovalService:
             attachments: Optional file attachments
             context: Optional context about why this email is being sent
             thread_id: LangGraph thread ID for resuming execution
+            user_id: Owning user (can also be linked later)
 
         Returns:
             EmailApprovalRequest object
@@ -71,11 +98,18 @@ class EmailApprovalService:
             request_id=request_id,
             draft=draft,
             message="Please review and approve this email before sending",
-            thread_id=thread_id
+            thread_id=thread_id,
+            user_id=user_id
         )
 
-        # Store the pending approval
-        self.pending_approvals[request_id] = approval_request
+        # Store the pending approval (thread/owner are indexed separately)
+        self.store.create(
+            APPROVAL_KIND,
+            request_id,
+            approval_request.model_dump(mode="json", include={"request_id", "draft", "message"}),
+            user_id=user_id,
+            thread_id=thread_id
+        )
 
         logger.info(f"Created email approval request {request_id} for draft {draft_id}")
         return approval_request
@@ -88,9 +122,88 @@ class EmailApprovalService:
             request_id: The request ID
 
         Returns:
-            EmailApprovalRequest if found, None otherwise
+            EmailApprovalRequest if found and still pending, None otherwise
+        """
+        record = self.store.get(APPROVAL_KIND, request_id)
+        if record is None or record["status"] != STATUS_PENDING:
+            return None
+        return self._to_request(record)
+
+    def get_approval_status(self, request_id: str) -> Optional[str]:
+        """
+        Current status of a request (pending/approved/declined), None if unknown or expired.
+        """
+        record = self.store.get(APPROVAL_KIND, request_id)
+        return record["status"] if record else None
+
+    def list_pending_approvals(
+        self,
+        user_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[EmailApprovalRequest]:
+        """
+        List pending requests, newest first.
+
+        Args:
+            user_id: Only this user's requests (per-user index)
+            thread_id: Only this conversation's requests (per-thread index)
+            limit: Maximum number of requests
+
+        Returns:
+            List of EmailApprovalRequest
         """
-        return self.pending_approvals.get(request_id)
+        records = self.store.list_pending(APPROVAL_KIND, user_id=user_id, thread_id=thread_id, limit=limit)
+        return [self._to_request(r) for r in records]
+
+    def decide_approval_request(
+        self,
+        request_id: str,
+        approved: bool,
+        decided_by: Optional[str] = None
+    ) -> Optional[EmailApprovalRequest]:
+        """
+        Atomically approve or decline a pending request.
+
+        Only one caller can win: a concurrent or repeated decision raises
+        ApprovalStateError instead of sending the email twice.
+
+        Args:
+            request_id: The request ID
+            approved: True to approve, False to decline
+            decided_by: User making the decision
+
+        Returns:
+            The request as it was decided, or None if not found
+
+        Raises:
+            ApprovalStateError: If the request was already decided
+        """
+        record = self.store.transition(
+            APPROVAL_KIND,
+            request_id,
+            expected=STATUS_PENDING,
+            new_status=STATUS_APPROVED if approved else STATUS_DECLINED,
+            decided_by=decided_by
+        )
+        if record is None:
+            return None
+        logger.info(f"Email approval request {request_id} {record['status']}")
+        return self._to_request(record)
+
+    def reopen_approval_request(self, request_id: str) -> bool:
+        """
+        Put an approved request back to pending (e.g. sending failed) so it can be retried.
+
+        Returns:
+            True if reopened, False if not found or not approved
+        """
+        try:
+            return self.store.transition(
+                APPROVAL_KIND, request_id, expected=STATUS_APPROVED, new_status=STATUS_PENDING
+            ) is not None
+        except ApprovalStateError:
+            return False
 
     def remove_approval_request(self, request_id: str) -> bool:
         """
@@ -102,47 +215,42 @@ class EmailApprovalService:
         Returns:
             True if removed, False if not found
         """
-        if request_id in self.pending_approvals:
-            del self.pending_approvals[request_id]
+        if self.store.delete(APPROVAL_KIND, request_id):
             logger.info(f"Removed approval request {request_id}")
             return True
         return False
 
-    def update_approval_request_thread(self, request_id: str, thread_id: str) -> bool:
+    def update_approval_request_thread(
+        self,
+        request_id: str,
+        thread_id: str,
+        user_id: Optional[str] = None
+    ) -> bool:
         """
         Update an existing approval request with the LangGraph thread ID.
-        
+
         Args:
             request_id: The request ID
             thread_id: The thread ID to associate
-            
+            user_id: Owning user to associate (optional)
+
         Returns:
             True if updated, False if not found
         """
-        if request_id in self.pending_approvals:
-            self.pending_approvals[request_id].thread_id = thread_id
-            return True
-        return False
+        return self.store.link(APPROVAL_KIND, request_id, thread_id=thread_id, user_id=user_id)
 
     def cleanup_old_requests(self, max_age_hours: int = 24):
         """
-        Clean up old approval requests that haven't been responded to.
+        Prune index entries for expired requests.
+
+        Requests themselves expire via TTL; this only keeps the pending index small.
 
         Args:
             max_age_hours: Maximum age in hours before cleanup
         """
-        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
-        expired_ids = [
-            req_id for req_id, req in self.pending_approvals.items()
-            if req.draft.created_at < cutoff_time
-        ]
-
-        for req_id in expired_ids:
-            del self.pending_approvals[req_id]
-            logger.info(f"Cleaned up expired approval request {req_id}")
-
-        if expired_ids:
-            logger.info(f"Cleaned up {len(expired_ids)} expired approval requests")
+        removed = self.store.prune(APPROVAL_KIND, max_age_seconds=max_age_hours * 3600)
+        if removed:
+            logger.info(f"Cleaned up {removed} expired approval requests")
 
 
 # Singleton instance
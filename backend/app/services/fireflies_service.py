@@ -7,7 +7,6 @@ Provides methods to fetch transcripts, list meetings, and manage transcription d
 
 import aiohttp
 import logging
-import asyncio
 import os
 import time
 import aiofiles
@@ -312,8 +311,14 @@ class FirefliesService:
                  "attendees_list": "See transcript (Fireflies)"
              }
              
-             # Blocking call in thread
-             res = await asyncio.to_thread(synthesizer.synthesize_minutes, transcript_text, minutes_ctx)
+             # The meeting is over: stop its live analysis so no batch runs after minutes
+             from app.services.live_analysis_worker import get_live_analysis_worker
+             await get_live_analysis_worker().end_session(str(meeting.id))
+
+             # Consolidate the live draft if one was built during the meeting,
+             # otherwise full synthesis over the transcript (blocking call in thread)
+             from app.services.live_minutes_builder import build_minutes
+             res = await build_minutes(str(meeting.id), transcript_text, minutes_ctx, synthesizer)
              
              new_minutes = Minutes(
                 meeting_id=meeting.id,
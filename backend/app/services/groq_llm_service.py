@@ -11,6 +11,8 @@ from loguru import logger
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from app.services.llm_service import record_openai_usage
+
 # Load environment variables
 load_dotenv()
 
@@ -124,6 +126,7 @@ class GitHubModelsLLMService:
                 kwargs["tool_choice"] = "auto"
 
             response = self.client.chat.completions.create(**kwargs)
+            record_openai_usage(response)
 
             # If tools were passed, return the full message object to handle tool_calls
             if tools:
@@ -191,6 +194,7 @@ class GitHubModelsLLMService:
                 kwargs["tool_choice"] = "auto"
 
             response = self.client.chat.completions.create(**kwargs)
+            record_openai_usage(response)
 
             if tools:
                 return response.choices[0].message
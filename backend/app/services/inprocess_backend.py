@@ -0,0 +1,1002 @@
+"""
+In-Process Backends (No Redis)
+
+Drop-in replacements for the Redis-backed services, for single-node
+deployments and hermetic test runs:
+- InProcessMessageBus: RedisMessageBus interface on in-memory queues
+- InProcessMemoryService / InProcessAsyncMemoryService: memory service
+  interfaces on a bounded LRU store with per-entry TTL
+- InProcessCacheClient: the redis.asyncio subset CacheService uses
+- LocalPubSubHub: PubSubHub interface with in-process fan-out
+
+They are selected automatically by the factories when
+get_redis_registry().resolve_backend() returns "memory" (REDIS_BACKEND).
+State lives in this process only: nothing is shared between workers and
+everything is lost on restart.
+"""
+
+import asyncio
+import copy
+import fnmatch
+import json
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.config import settings
+from app.schemas.agent_messages import AgentEvent, AgentMessage, MessageStatus
+from app.services.pubsub_hub import PubSubHubStats, Subscription, SubscriberCallback
+from app.services.redis_memory import AsyncRedisMemoryService, RedisMemoryService
+from app.services.redis_message_bus import RedisMessageBus
+
+
+def _lrange(items: List[Any], start: int, end: int) -> List[Any]:
+    """Slice with Redis LRANGE semantics (inclusive end, negative from the tail)."""
+    n = len(items)
+    if start < 0:
+        start = max(n + start, 0)
+    if end < 0:
+        end = n + end
+    return items[start:end + 1] if start <= end else []
+
+
+class TTLStore:
+    """
+    Thread-safe bounded LRU dict with optional per-entry TTL.
+
+    Expired entries are dropped lazily on access; when the store is full the
+    least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Args:
+            max_entries: Maximum number of live entries
+        """
+        self.max_entries = max_entries
+        self.lock = threading.RLock()
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.evictions = 0
+
+    def _live(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.lock:
+            entry = self._live(key)
+            if entry is None:
+                return default
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        with self.lock:
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> int:
+        with self.lock:
+            deleted = 0
+            for key in keys:
+                if self._live(key) is not None:
+                    del self._data[key]
+                    deleted += 1
+            return deleted
+
+    def exists(self, key: str) -> bool:
+        with self.lock:
+            return self._live(key) is not None
+
+    def expire(self, key: str, ttl: int) -> bool:
+        with self.lock:
+            entry = self._live(key)
+            if entry is None:
+                return False
+            self._data[key] = (entry[0], time.monotonic() + ttl)
+            return True
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """Live keys starting with prefix (O(n) - for listings, not hot paths)."""
+        with self.lock:
+            return [k for k in list(self._data) if k.startswith(prefix) and self._live(k) is not None]
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._data)
+
+
+# =============================================================================
+# PUB/SUB
+# =============================================================================
+
+class LocalPubSubHub:
+    """
+    In-process PubSubHub: same subscribe/psubscribe/unsubscribe API and
+    Subscription handles, plus publish() for in-process publishers.
+
+    publish() may be called from any thread; delivery is handed to each
+    subscriber's event loop.
+    """
+
+    def __init__(self, max_queue: int = 1000):
+        """
+        Args:
+            max_queue: Default per-subscriber queue size
+        """
+        self.max_queue = max_queue
+        self._channels: Dict[str, Set[Subscription]] = {}
+        self._patterns: Dict[str, Set[Subscription]] = {}
+        # Blocking (thread) listeners: (target, is_pattern) -> queues
+        self._listeners: Dict[Tuple[str, bool], List[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self._closed_subscriber_totals = {"delivered": 0, "dropped": 0}
+
+    async def subscribe(
+        self,
+        channel: str,
+        callback: SubscriberCallback,
+        max_queue: Optional[int] = None
+    ) -> Subscription:
+        """Subscribe a callback to a channel (see PubSubHub.subscribe)."""
+        return self._add(channel, callback, False, max_queue)
+
+    async def psubscribe(
+        self,
+        pattern: str,
+        callback: SubscriberCallback,
+        max_queue: Optional[int] = None
+    ) -> Subscription:
+        """Subscribe a callback to a glob-style pattern (see PubSubHub.psubscribe)."""
+        return self._add(pattern, callback, True, max_queue)
+
+    def _add(
+        self,
+        target: str,
+        callback: SubscriberCallback,
+        is_pattern: bool,
+        max_queue: Optional[int]
+    ) -> Subscription:
+        subscription = Subscription(self, target, callback, is_pattern, max_queue or self.max_queue)
+        registry = self._patterns if is_pattern else self._channels
+        with self._lock:
+            registry.setdefault(target, set()).add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber and stop its dispatch task."""
+        registry = self._patterns if subscription.is_pattern else self._channels
+        with self._lock:
+            subscribers = registry.get(subscription.target)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del registry[subscription.target]
+        self._closed_subscriber_totals["delivered"] += subscription.delivered
+        self._closed_subscriber_totals["dropped"] += subscription.dropped
+        await subscription._stop()
+
+    def add_listener(self, target: str, is_pattern: bool = False) -> queue.Queue:
+        """Register a thread-safe queue receiving (channel, data) for blocking consumers."""
+        listener: queue.Queue = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._listeners.setdefault((target, is_pattern), []).append(listener)
+        return listener
+
+    def remove_listener(self, target: str, listener: queue.Queue, is_pattern: bool = False) -> None:
+        with self._lock:
+            listeners = self._listeners.get((target, is_pattern), [])
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                self._listeners.pop((target, is_pattern), None)
+
+    def publish(self, channel: str, data: str) -> int:
+        """
+        Deliver a message to every matching subscriber and listener.
+
+        Args:
+            channel: Channel name
+            data: Message payload (text)
+
+        Returns:
+            int: Number of receivers (like Redis PUBLISH)
+        """
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+            for pattern, subs in self._patterns.items():
+                if fnmatch.fnmatchcase(channel, pattern):
+                    subscribers.extend(subs)
+            listeners = [
+                q for (target, is_pattern), qs in self._listeners.items()
+                if (fnmatch.fnmatchcase(channel, target) if is_pattern else target == channel)
+                for q in qs
+            ]
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        for subscription in subscribers:
+            if subscription.loop is running:
+                subscription.offer(channel, data)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription.offer, channel, data)
+
+        for listener in listeners:
+            try:
+                listener.put_nowait((channel, data))
+            except queue.Full:
+                # Drop the oldest, like Subscription.offer
+                try:
+                    listener.get_nowait()
+                except queue.Empty:
+                    pass
+                listener.put_nowait((channel, data))
+
+        return len(subscribers) + len(listeners)
+
+    def get_stats(self) -> PubSubHubStats:
+        subscribers = [s for subs in (*self._channels.values(), *self._patterns.values()) for s in subs]
+        return PubSubHubStats(
+            connected=True,
+            channels=len(self._channels),
+            patterns=len(self._patterns),
+            subscribers=len(subscribers),
+            delivered=self._closed_subscriber_totals["delivered"] + sum(s.delivered for s in subscribers),
+            dropped=self._closed_subscriber_totals["dropped"] + sum(s.dropped for s in subscribers),
+            reconnects=0
+        )
+
+    async def close(self) -> None:
+        """Stop all subscribers (the hub can be reused afterwards)."""
+        for subs in (*self._channels.values(), *self._patterns.values()):
+            for subscription in list(subs):
+                await subscription._stop()
+        with self._lock:
+            self._channels.clear()
+            self._patterns.clear()
+            self._listeners.clear()
+        logger.info("[PUBSUB] Local hub closed")
+
+
+# =============================================================================
+# MESSAGE BUS
+# =============================================================================
+
+class InProcessMessageBus(RedisMessageBus):
+    """
+    RedisMessageBus interface on in-process queues.
+
+    Queues are deques guarded by one condition variable (receive_message
+    blocks like BRPOP and can be called from worker threads). Messages are
+    stored as dicts and rebuilt on receive, so senders and receivers never
+    share model instances. Events fan out through the LocalPubSubHub.
+    Retries, dead letters and metrics use the Redis bus logic on local
+    dicts and deques.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "ecowas",
+        default_timeout: int = 30,
+        max_queue_size: int = 1000,
+        message_ttl: int = 3600,
+        max_status_entries: int = 10000,
+        hub: Optional[LocalPubSubHub] = None,
+        max_retries: int = 3,
+        retry_backoff_base: float = 1.0,
+        retry_backoff_max: float = 300.0,
+        dead_letter_max: int = 1000,
+        retry_poll_interval: float = 1.0
+    ):
+        """
+        Initialize the bus.
+
+        Args:
+            namespace: Namespace prefix for channel names
+            default_timeout: Default timeout for blocking receives (seconds)
+            max_queue_size: Maximum messages per agent queue
+            message_ttl: Message status TTL in seconds
+            max_status_entries: LRU bound for tracked message statuses
+            hub: Local pub/sub hub (default: the process-wide one)
+            max_retries: Failed messages are retried this many times, then dead-lettered
+            retry_backoff_base: First retry delay in seconds (doubles per attempt)
+            retry_backoff_max: Upper bound for retry delays and retry_after hints
+            dead_letter_max: Dead letters kept per agent (oldest dropped)
+            retry_poll_interval: Minimum seconds between retry-schedule polls
+        """
+        self.client = None
+        self.codec = None
+        self.namespace = namespace
+        self.default_timeout = default_timeout
+        self.max_queue_size = max_queue_size
+        self.message_ttl = message_ttl
+        self.hub = hub or get_local_pubsub_hub()
+
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._ready = threading.Condition()
+        self._statuses = TTLStore(max_status_entries)
+        self._events: Dict[str, Deque[str]] = {}
+        # message_id -> message dict, from receive until ack/fail
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        # message_id -> (due wall-clock time, message dict)
+        self._retries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._dead_letters: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._counters: Dict[str, Counter] = {}
+        # (agent_id, minute) -> counters, pruned after THROUGHPUT_BUCKET_TTL
+        self._buckets: Dict[Tuple[str, int], Counter] = {}
+        self._configure_retries(
+            max_retries, retry_backoff_base, retry_backoff_max, dead_letter_max, retry_poll_interval
+        )
+
+        logger.info(
+            f"InProcessMessageBus initialized with namespace '{namespace}', "
+            f"timeout={default_timeout}s, ttl={message_ttl}s"
+        )
+
+    # =========================================================================
+    # Message Queuing
+    # =========================================================================
+
+    def send_many(self, messages: List[AgentMessage]) -> List[UUID]:
+        """
+        Send a batch of messages (all-or-nothing, like the Redis bus).
+
+        Raises:
+            QueueFullError: If a recipient queue is full
+        """
+        if not messages:
+            return []
+
+        rejected = None
+        with self._ready:
+            projected: Dict[str, int] = {}
+            for message in messages:
+                recipient_id = message.metadata.recipient_id
+                size = projected.get(recipient_id, len(self._queues.get(recipient_id, ())))
+                if size >= self.max_queue_size:
+                    rejected = (recipient_id, size)
+                    break
+                projected[recipient_id] = size + 1
+
+            if rejected is None:
+                for message in messages:
+                    recipient_id = message.metadata.recipient_id
+                    # appendleft + pop mirrors LPUSH + BRPOP (FIFO, newest first in listings)
+                    self._queues.setdefault(recipient_id, deque()).appendleft(message.to_dict())
+                    self._update_message_status(
+                        message.metadata.message_id, MessageStatus.DELIVERED, recipient_id
+                    )
+                    self._record_metrics(recipient_id, enqueued=1)
+                self._ready.notify_all()
+
+        if rejected is not None:
+            raise self._queue_full(*rejected)
+        return [message.metadata.message_id for message in messages]
+
+    def receive_message(
+        self,
+        agent_id: str,
+        timeout: Optional[int] = None
+    ) -> Optional[AgentMessage]:
+        """
+        Receive a message from an agent's queue (blocking; 0 waits forever).
+
+        Returns:
+            AgentMessage if available, None if timeout
+        """
+        timeout = timeout if timeout is not None else self.default_timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        first = True
+        while True:
+            wait = self._receive_wait(deadline, first)
+            if wait is None:
+                return None
+            first = False
+            with self._ready:
+                # Also wake when a new retry is scheduled, to recompute the wait
+                next_retry_at = self._next_retry_at
+                self._ready.wait_for(
+                    lambda: bool(self._queues.get(agent_id)) or self._next_retry_at != next_retry_at,
+                    timeout=wait or None
+                )
+                if self._queues.get(agent_id):
+                    message_dict = self._queues[agent_id].pop()
+                    self._inflight[message_dict["metadata"]["message_id"]] = message_dict
+                    break
+
+        message = self._deserialize_message(message_dict)
+        self._update_message_status(message.metadata.message_id, MessageStatus.PROCESSING, agent_id)
+        self._record_metrics(agent_id, dequeued=1)
+        return message
+
+    def get_pending_messages(self, agent_id: str) -> List[AgentMessage]:
+        with self._ready:
+            pending = list(self._queues.get(agent_id, ()))
+        return [self._deserialize_message(m) for m in pending]
+
+    def clear_agent_queue(self, agent_id: str) -> int:
+        with self._ready:
+            cleared = self._queues.pop(agent_id, None)
+        count = len(cleared) if cleared else 0
+        logger.info(f"Cleared {count} messages from agent '{agent_id}' queue")
+        return count
+
+    def get_queue_size(self, agent_id: str) -> int:
+        with self._ready:
+            return len(self._queues.get(agent_id, ()))
+
+    # =========================================================================
+    # Pub/Sub
+    # =========================================================================
+
+    def publish_event(self, event: AgentEvent) -> int:
+        """Publish an event to local subscribers and keep the last 1000 per type."""
+        event_json = json.dumps(event.to_dict())
+        channel_key = self._make_event_stream_key(event.event_type)
+        with self._ready:
+            self._events.setdefault(event.event_type, deque(maxlen=1000)).append(event_json)
+        return self.hub.publish(channel_key, event_json)
+
+    def _listen(self, target: str, callback: Callable[[AgentEvent], None]) -> None:
+        """Blocking loop delivering events on a channel to callback (runs until interrupted)."""
+        listener = self.hub.add_listener(target)
+        try:
+            while True:
+                _, data = listener.get()
+                event = self._deserialize_message(json.loads(data))
+                if isinstance(event, AgentEvent):
+                    callback(event)
+        finally:
+            self.hub.remove_listener(target, listener)
+
+    def subscribe_to_channel(self, agent_id: str, callback: Callable[[AgentEvent], None]) -> None:
+        self._listen(self._make_channel_key(agent_id), callback)
+
+    def subscribe_to_event_type(self, event_type: str, callback: Callable[[AgentEvent], None]) -> None:
+        self._listen(self._make_event_stream_key(event_type), callback)
+
+    async def subscribe_to_channel_async(
+        self,
+        agent_id: str,
+        callback: Callable[[AgentEvent], Any]
+    ) -> Subscription:
+        return await self.hub.subscribe(
+            self._make_channel_key(agent_id), self._event_dispatcher(callback)
+        )
+
+    async def subscribe_to_event_type_async(
+        self,
+        event_type: str,
+        callback: Callable[[AgentEvent], Any]
+    ) -> Subscription:
+        channel_key = self._make_event_stream_key(event_type)
+        subscribe = self.hub.psubscribe if "*" in event_type else self.hub.subscribe
+        return await subscribe(channel_key, self._event_dispatcher(callback))
+
+    # =========================================================================
+    # Message Status Tracking
+    # =========================================================================
+
+    def acknowledge_message(self, message_id: UUID, agent_id: str) -> bool:
+        with self._ready:
+            self._inflight.pop(str(message_id), None)
+        self._update_message_status(message_id, MessageStatus.COMPLETED, agent_id)
+        self._record_metrics(agent_id, acked=1)
+        return True
+
+    def get_message_status(self, message_id: UUID) -> Optional[Dict[str, Any]]:
+        status = self._statuses.get(str(message_id))
+        return dict(status) if status else None
+
+    def _update_message_status(
+        self,
+        message_id: UUID,
+        status: MessageStatus,
+        agent_id: str,
+        error: Optional[str] = None
+    ) -> None:
+        status_data = {
+            "message_id": str(message_id),
+            "status": status.value,
+            "agent_id": agent_id,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        if error:
+            status_data["error"] = error
+        self._statuses.set(str(message_id), status_data, ttl=self.message_ttl)
+
+    # =========================================================================
+    # Retries and Dead Letters
+    # =========================================================================
+
+    def _take_inflight(self, message_id: UUID) -> Optional[AgentMessage]:
+        with self._ready:
+            message_dict = self._inflight.pop(str(message_id), None)
+        return self._deserialize_message(message_dict) if message_dict else None
+
+    def _schedule_retry(
+        self,
+        message: AgentMessage,
+        delay: float,
+        error: Optional[str] = None,
+        counter: str = "retried"
+    ) -> None:
+        message_id = str(message.metadata.message_id)
+        agent_id = message.metadata.recipient_id
+        due = time.time() + delay
+        with self._ready:
+            self._retries[message_id] = (due, message.to_dict())
+            if self._next_retry_at is None or due < self._next_retry_at:
+                self._next_retry_at = due
+                self._ready.notify_all()
+
+        status_data = {
+            "message_id": message_id,
+            "status": MessageStatus.PENDING.value,
+            "agent_id": agent_id,
+            "attempts": message.metadata.attempts,
+            "next_attempt_at": datetime.utcfromtimestamp(due).isoformat(),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        if error:
+            status_data["error"] = error
+        self._statuses.set(message_id, status_data, ttl=self.message_ttl + int(delay))
+        self._record_metrics(agent_id, **{counter: 1})
+
+    def _claim_due_retries(self, limit: int) -> Tuple[List[Tuple[str, AgentMessage]], Optional[float]]:
+        """Lease due retries, like the Redis claim script."""
+        now = time.time()
+        with self._ready:
+            due = sorted(
+                (entry for entry in self._retries.items() if entry[1][0] <= now),
+                key=lambda entry: entry[1][0]
+            )[:limit]
+            for message_id, (_, message_dict) in due:
+                self._retries[message_id] = (now + self.RETRY_LEASE_SECONDS, message_dict)
+            next_due = min((d for d, _ in self._retries.values()), default=None)
+        claimed = [(message_id, self._deserialize_message(m)) for message_id, (_, m) in due]
+        return claimed, next_due
+
+    def _reschedule_retry(self, message_id: str, delay: float) -> None:
+        with self._ready:
+            entry = self._retries.get(message_id)
+            if entry is not None:
+                self._retries[message_id] = (time.time() + delay, entry[1])
+
+    def _finish_retry(self, message_id: str) -> None:
+        with self._ready:
+            self._retries.pop(message_id, None)
+
+    def _dead_letter(self, message: AgentMessage, agent_id: str, error: str) -> None:
+        owner = message.metadata.recipient_id
+        with self._ready:
+            self._dead_letters.setdefault(owner, deque(maxlen=self.dead_letter_max)).appendleft(
+                self._dead_letter_entry(message, agent_id, error)
+            )
+        self._statuses.set(str(message.metadata.message_id), {
+            "message_id": str(message.metadata.message_id),
+            "status": MessageStatus.FAILED.value,
+            "agent_id": agent_id,
+            "error": error,
+            "attempts": message.metadata.attempts,
+            "dead_lettered": 1,
+            "updated_at": datetime.utcnow().isoformat()
+        }, ttl=self.message_ttl)
+        self._record_metrics(owner, failed=1, dead_lettered=1)
+
+    def get_dead_letters(self, agent_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        with self._ready:
+            entries = list(self._dead_letters.get(agent_id, ()))[offset:offset + limit]
+        return copy.deepcopy(entries)
+
+    def get_dead_letter_count(self, agent_id: str) -> int:
+        with self._ready:
+            return len(self._dead_letters.get(agent_id, ()))
+
+    def _oldest_dead_letters(self, agent_id: str, count: int) -> List[Tuple[Any, Dict[str, Any]]]:
+        with self._ready:
+            entries = list(self._dead_letters.get(agent_id, ()))[-count:]
+        return [(entry, entry) for entry in reversed(entries)]
+
+    def _claim_dead_letter(self, agent_id: str, handle: Any) -> bool:
+        with self._ready:
+            letters = self._dead_letters.get(agent_id)
+            if letters is None or handle not in letters:
+                return False
+            letters.remove(handle)
+            return True
+
+    def _restore_dead_letter(self, agent_id: str, handle: Any) -> None:
+        with self._ready:
+            self._dead_letters.setdefault(agent_id, deque(maxlen=self.dead_letter_max)).append(handle)
+
+    def purge_dead_letters(self, agent_id: str) -> int:
+        with self._ready:
+            letters = self._dead_letters.pop(agent_id, None)
+        count = len(letters) if letters else 0
+        logger.info(f"Purged {count} dead letters for '{agent_id}'")
+        return count
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def _record_metrics(self, agent_id: str, **counts: int) -> None:
+        minute = self._current_minute()
+        with self._ready:
+            self._counters.setdefault(agent_id, Counter()).update(counts)
+            self._buckets.setdefault((agent_id, minute), Counter()).update(counts)
+            oldest = minute - self.THROUGHPUT_BUCKET_TTL // 60
+            for key in [k for k in self._buckets if k[1] < oldest]:
+                del self._buckets[key]
+
+    def _read_metrics(self, agent_id: str, window_minutes: int) -> Tuple[Dict[str, int], Dict[str, int]]:
+        minute = self._current_minute()
+        recent: Counter = Counter()
+        with self._ready:
+            totals = dict(self._counters.get(agent_id, {}))
+            for m in range(minute - window_minutes + 1, minute + 1):
+                recent.update(self._buckets.get((agent_id, m), {}))
+        return totals, dict(recent)
+
+    def _oldest_enqueued_at(self, agent_id: str) -> Optional[datetime]:
+        with self._ready:
+            queue_ = self._queues.get(agent_id)
+            oldest = queue_[-1] if queue_ else None
+        return self._deserialize_message(oldest).metadata.timestamp if oldest else None
+
+    # =========================================================================
+    # Utility Methods
+    # =========================================================================
+
+    def health_check(self) -> bool:
+        return True
+
+    def get_bus_stats(self) -> Dict[str, Any]:
+        with self._ready:
+            queue_stats = {agent_id: len(q) for agent_id, q in sorted(self._queues.items()) if q}
+            dead_letter_stats = {
+                agent_id: len(q) for agent_id, q in sorted(self._dead_letters.items()) if q
+            }
+            retry_scheduled = len(self._retries)
+        return {
+            "transport": "inprocess",
+            "total_agents": len(queue_stats),
+            "total_messages": sum(queue_stats.values()),
+            "queue_stats": queue_stats,
+            "lag_seconds": {agent_id: round(self.get_queue_lag(agent_id), 3) for agent_id in queue_stats},
+            "dead_letter_stats": dead_letter_stats,
+            "retry_scheduled": retry_scheduled,
+            "max_queue_size": self.max_queue_size,
+            "healthy": True
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<InProcessMessageBus namespace='{self.namespace}' "
+            f"timeout={self.default_timeout}s>"
+        )
+
+
+# =============================================================================
+# MEMORY
+# =============================================================================
+
+class InProcessMemoryService(RedisMemoryService):
+    """
+    RedisMemoryService interface on a TTLStore.
+
+    Uses the same key layout as the Redis service. Values are deep-copied on
+    the way in and out, so callers can't mutate stored state by accident.
+    """
+
+    def __init__(
+        self,
+        default_ttl: int = 86400,
+        max_entries: int = 10000,
+        store: Optional[TTLStore] = None
+    ):
+        """
+        Initialize the in-process memory service.
+
+        Args:
+            default_ttl: Default time-to-live for entries in seconds (default: 24h)
+            max_entries: LRU bound for the store (ignored if store is given)
+            store: Pre-built store (optional)
+        """
+        self.client = None
+        self.codec = None
+        self.default_ttl = default_ttl
+        self.store = store or TTLStore(max_entries)
+        logger.info("In-process memory service initialized")
+
+    def _history_key(self, agent_id: str, session_id: str) -> str:
+        return self._make_key("history", f"{agent_id}:{session_id}")
+
+    def save_conversation_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        history: List[Dict[str, str]],
+        ttl: Optional[int] = None
+    ) -> bool:
+        key = self._history_key(agent_id, session_id)
+        if history:
+            self.store.set(key, copy.deepcopy(list(history)), ttl=ttl or self.default_ttl)
+        else:
+            self.store.delete(key)
+        return True
+
+    def get_conversation_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        start: int = 0,
+        end: int = -1
+    ) -> List[Dict[str, str]]:
+        with self.store.lock:
+            history = self.store.get(self._history_key(agent_id, session_id)) or []
+            return copy.deepcopy(_lrange(history, start, end))
+
+    def append_many_to_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        messages: List[Dict[str, str]],
+        max_history: Optional[int] = None,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Append several messages at once (the async service's batch append)."""
+        key = self._history_key(agent_id, session_id)
+        with self.store.lock:
+            history = self.store.get(key) or []
+            history.extend(copy.deepcopy(messages))
+            if max_history:
+                del history[:-max_history]
+            self.store.set(key, history, ttl=ttl or self.default_ttl)
+        return True
+
+    def append_to_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        message: Dict[str, str],
+        max_history: Optional[int] = None,
+        ttl: Optional[int] = None
+    ) -> bool:
+        return self.append_many_to_history(agent_id, session_id, [message], max_history, ttl)
+
+    def get_history_length(self, agent_id: str, session_id: str) -> int:
+        return len(self.store.get(self._history_key(agent_id, session_id)) or [])
+
+    def clear_conversation_history(self, agent_id: str, session_id: str) -> bool:
+        self.store.delete(self._history_key(agent_id, session_id))
+        return True
+
+    def save_agent_state(self, agent_id: str, state: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        self.store.set(self._make_key("state", agent_id), copy.deepcopy(state), ttl=ttl or self.default_ttl)
+        return True
+
+    def get_agent_state(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self.store.get(self._make_key("state", agent_id)))
+
+    def set_session_data(self, session_id: str, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        self.store.set(
+            self._make_key("session", f"{session_id}:{key}"), copy.deepcopy(value), ttl=ttl or self.default_ttl
+        )
+        return True
+
+    def get_session_data(self, session_id: str, key: str) -> Optional[Any]:
+        return copy.deepcopy(self.store.get(self._make_key("session", f"{session_id}:{key}")))
+
+    def get_all_sessions_for_agent(self, agent_id: str) -> List[str]:
+        prefix = self._make_key("history", f"{agent_id}:")
+        return sorted(key[len(prefix):] for key in self.store.keys(prefix))
+
+    def extend_ttl(self, agent_id: str, session_id: str, ttl: Optional[int] = None) -> bool:
+        return self.store.expire(self._history_key(agent_id, session_id), ttl or self.default_ttl)
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "inprocess",
+            "total_keys": len(self.store),
+            "max_entries": self.store.max_entries,
+            "evictions": self.store.evictions,
+            "connected": True
+        }
+
+    def clear_all_agent_data(self, agent_id: str) -> int:
+        keys = self.store.keys(self._make_key("history", f"{agent_id}:"))
+        keys.append(self._make_key("state", agent_id))
+        deleted = self.store.delete(*keys)
+        logger.info(f"Cleared {deleted} keys for agent {agent_id}")
+        return deleted
+
+    def health_check(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+class InProcessAsyncMemoryService(AsyncRedisMemoryService):
+    """
+    AsyncRedisMemoryService interface over an InProcessMemoryService.
+
+    Every operation is a local dict access, so the sync implementation is
+    called directly; sharing it keeps sync and async callers consistent.
+    """
+
+    def __init__(self, memory: Optional[InProcessMemoryService] = None):
+        """
+        Args:
+            memory: Backing sync service (default: the process-wide one)
+        """
+        self.memory = memory or get_inprocess_memory()
+        self.client = None
+        self.codec = None
+
+    @property
+    def default_ttl(self) -> int:
+        return self.memory.default_ttl
+
+    @default_ttl.setter
+    def default_ttl(self, value: int) -> None:
+        self.memory.default_ttl = value
+
+    async def save_conversation_history(self, agent_id: str, session_id: str, history: List[Dict[str, str]], ttl: Optional[int] = None) -> bool:
+        return self.memory.save_conversation_history(agent_id, session_id, history, ttl)
+
+    async def append_to_history(self, agent_id: str, session_id: str, message: Dict[str, str], max_history: Optional[int] = None, ttl: Optional[int] = None) -> bool:
+        return self.memory.append_to_history(agent_id, session_id, message, max_history, ttl)
+
+    async def append_many_to_history(self, agent_id: str, session_id: str, messages: List[Dict[str, str]], max_history: Optional[int] = None, ttl: Optional[int] = None) -> bool:
+        return self.memory.append_many_to_history(agent_id, session_id, messages, max_history, ttl)
+
+    async def get_conversation_history(self, agent_id: str, session_id: str, start: int = 0, end: int = -1) -> List[Dict[str, str]]:
+        return self.memory.get_conversation_history(agent_id, session_id, start, end)
+
+    async def get_history_page(self, agent_id: str, session_id: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        with self.memory.store.lock:
+            total = self.memory.get_history_length(agent_id, session_id)
+            start = max(total - offset - limit, 0)
+            end = total - offset - 1
+            messages = self.memory.get_conversation_history(agent_id, session_id, start, end) if end >= 0 else []
+        return {
+            "messages": messages,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "has_more": offset + limit < total
+        }
+
+    async def get_history_length(self, agent_id: str, session_id: str) -> int:
+        return self.memory.get_history_length(agent_id, session_id)
+
+    async def clear_conversation_history(self, agent_id: str, session_id: str) -> bool:
+        return self.memory.clear_conversation_history(agent_id, session_id)
+
+    async def extend_ttl(self, agent_id: str, session_id: str, ttl: Optional[int] = None) -> bool:
+        return self.memory.extend_ttl(agent_id, session_id, ttl)
+
+    async def save_agent_state(self, agent_id: str, state: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        return self.memory.save_agent_state(agent_id, state, ttl)
+
+    async def get_agent_state(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        return self.memory.get_agent_state(agent_id)
+
+    async def set_session_data(self, session_id: str, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        return self.memory.set_session_data(session_id, key, value, ttl)
+
+    async def get_session_data(self, session_id: str, key: str) -> Optional[Any]:
+        return self.memory.get_session_data(session_id, key)
+
+    async def set_session_data_many(self, session_id: str, values: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        for key, value in values.items():
+            self.memory.set_session_data(session_id, key, value, ttl)
+        return True
+
+    async def get_session_data_many(self, session_id: str, keys: List[str]) -> Dict[str, Any]:
+        found = {key: self.memory.get_session_data(session_id, key) for key in keys}
+        return {key: value for key, value in found.items() if value is not None}
+
+    async def get_all_sessions_for_agent(self, agent_id: str) -> List[str]:
+        return self.memory.get_all_sessions_for_agent(agent_id)
+
+    async def clear_all_agent_data(self, agent_id: str) -> int:
+        return self.memory.clear_all_agent_data(agent_id)
+
+    async def get_memory_stats(self) -> Dict[str, Any]:
+        return self.memory.get_memory_stats()
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def close(self):
+        pass
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class InProcessCacheClient:
+    """
+    The subset of the redis.asyncio client CacheService uses
+    (get / set / setex / delete / ping / aclose), on a TTLStore.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.store = TTLStore(max_entries)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        self.store.set(key, value, ttl=ex)
+        return True
+
+    async def setex(self, key: str, ttl: int, value: str) -> bool:
+        self.store.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return self.store.delete(*keys)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        pass
+
+
+# Singleton instances
+_local_pubsub_hub: Optional[LocalPubSubHub] = None
+_inprocess_memory: Optional[InProcessMemoryService] = None
+_inprocess_async_memory: Optional[InProcessAsyncMemoryService] = None
+
+
+def get_local_pubsub_hub() -> LocalPubSubHub:
+    """Get or create the process-wide local pub/sub hub"""
+    global _local_pubsub_hub
+    if _local_pubsub_hub is None:
+        _local_pubsub_hub = LocalPubSubHub(max_queue=settings.PUBSUB_SUBSCRIBER_QUEUE_SIZE)
+    return _local_pubsub_hub
+
+
+def get_inprocess_memory() -> InProcessMemoryService:
+    """Get or create the in-process memory service singleton"""
+    global _inprocess_memory
+    if _inprocess_memory is None:
+        _inprocess_memory = InProcessMemoryService(
+            default_ttl=settings.REDIS_MEMORY_TTL,
+            max_entries=settings.INPROCESS_MAX_ENTRIES
+        )
+    return _inprocess_memory
+
+
+def get_inprocess_async_memory() -> InProcessAsyncMemoryService:
+    """Get or create the async view of the in-process memory service"""
+    global _inprocess_async_memory
+    if _inprocess_async_memory is None:
+        _inprocess_async_memory = InProcessAsyncMemoryService(get_inprocess_memory())
+    return _inprocess_async_memory
@@ -0,0 +1,394 @@
+"""
+Live Transcript Analysis Worker
+
+Batched, debounced conflict and agenda analysis for live meetings.
+
+Instead of analyzing every transcript chunk on its own, each live meeting
+gets a session that:
+- Accumulates chunks and analyzes them once the transcript goes quiet for
+  LIVE_ANALYSIS_DEBOUNCE_SECONDS (or at least every
+  LIVE_ANALYSIS_MAX_WAIT_SECONDS while people keep talking)
+- Loads the meeting title, TWG and agenda once per session (refreshed after
+  LIVE_ANALYSIS_CONTEXT_TTL_SECONDS) instead of on every chunk
+- Runs conflict detection and agenda tracking concurrently on the live
+  model (LIVE_ANALYSIS_MODEL)
+- Cancels an in-flight analysis when a newer batch supersedes it; the newer
+  batch includes its text, so nothing is skipped, and stale insights are
+  never published
+- Caps analyses at LIVE_ANALYSIS_MAX_BATCHES_PER_HOUR per meeting (two LLM
+  calls each); text arriving over budget waits for the next allowed batch
+
+LLM spend per meeting-hour is therefore bounded and predictable however
+fast transcript arrives.
+
+Usage:
+    worker = get_live_analysis_worker()
+    worker.submit(meeting_id, chunk_text)          # from the transcript feed
+    await worker.request_insight(meeting_id, text)   # manual "scan now"
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+
+
+class LiveMeetingContext(BaseModel):
+    """Meeting details the live prompts need, cached for the session"""
+    meeting_id: str
+    meeting_title: str
+    twg_name: str = "General"
+    agenda_content: Optional[str] = None
+
+
+class LiveAnalysisStats(BaseModel):
+    """Counters across all live analysis sessions in this process"""
+    sessions: int
+    chunks: int
+    batches: int
+    cancelled: int
+    over_budget: int
+    llm_calls: int
+    context_loads: int
+    conflicts: int
+    agenda_updates: int
+    errors: int
+
+
+ContextLoader = Callable[[str], Awaitable[Optional[LiveMeetingContext]]]
+
+
+async def load_meeting_context(meeting_id: str) -> Optional[LiveMeetingContext]:
+    """Load a meeting's title, TWG and agenda from the database."""
+    from app.core.database import get_db_session_context
+    from app.models.models import Meeting
+
+    async with get_db_session_context() as db:
+        result = await db.execute(
+            select(Meeting).where(Meeting.id == meeting_id).options(
+                selectinload(Meeting.twg),
+                selectinload(Meeting.agenda)
+            )
+        )
+        meeting = result.scalar_one_or_none()
+        if meeting is None:
+            return None
+        return LiveMeetingContext(
+            meeting_id=str(meeting_id),
+            meeting_title=meeting.title,
+            twg_name=meeting.twg.name if meeting.twg else "General",
+            agenda_content=meeting.agenda.content if meeting.agenda else None
+        )
+
+
+class LiveAnalysisSession:
+    """
+    One live meeting's buffer, debounce timer, cached context and in-flight analysis.
+    """
+
+    def __init__(self, meeting_id: str, worker: "LiveAnalysisWorker"):
+        self.meeting_id = meeting_id
+        self.worker = worker
+        self._buffer: List[str] = []
+        self._first_chunk_at: Optional[float] = None
+        self.last_chunk_at = time.monotonic()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self._inflight_text = ""
+        self._batch_times: Deque[float] = deque()
+        self._context: Optional[LiveMeetingContext] = None
+        self._context_loaded_at = 0.0
+
+    # =========================================================================
+    # BATCHING
+    # =========================================================================
+
+    def add(self, text: str) -> None:
+        """Buffer a chunk and (re)arm the debounce timer."""
+        now = time.monotonic()
+        self.last_chunk_at = now
+        if not self._buffer:
+            self._first_chunk_at = now
+        self._buffer.append(text)
+
+        # Debounce, but never hold a batch longer than max_wait
+        delay = min(
+            self.worker.debounce,
+            max(0.0, self._first_chunk_at + self.worker.max_wait - now)
+        )
+        self._arm(delay)
+
+    def _arm(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self.flush)
+
+    def flush(self) -> Optional[asyncio.Task]:
+        """
+        Start analyzing everything buffered so far.
+
+        A running analysis is cancelled and its text carried into this
+        batch. Over budget, the text stays buffered until budget frees up.
+
+        Returns:
+            The analysis task, or None if there was nothing to do
+        """
+        self._timer = None
+        if not self._buffer and not (self._inflight is not None and not self._inflight.done()):
+            return None
+
+        wait = self._budget_wait()
+        if wait > 0:
+            self.worker._stats["over_budget"] += 1
+            logger.info(
+                f"[LIVE-ANALYSIS] Meeting {self.meeting_id} is over its analysis budget; "
+                f"next batch in {wait:.0f}s"
+            )
+            self._arm(wait)
+            return None
+
+        text = "\n".join(self._buffer)
+        self._buffer = []
+        self._first_chunk_at = None
+        if self._inflight is not None and not self._inflight.done():
+            # Superseded: the new batch covers its text too
+            self._inflight.cancel()
+            self.worker._stats["cancelled"] += 1
+            text = f"{self._inflight_text}\n{text}" if text else self._inflight_text
+
+        text = text[-self.worker.max_chars:].strip()
+        if not text:
+            return None
+        self._batch_times.append(time.monotonic())
+        self._inflight_text = text
+        self._inflight = asyncio.create_task(self._analyze(text), name=f"live-analysis-{self.meeting_id}")
+        return self._inflight
+
+    def _budget_wait(self) -> float:
+        now = time.monotonic()
+        while self._batch_times and self._batch_times[0] <= now - 3600:
+            self._batch_times.popleft()
+        if len(self._batch_times) < self.worker.max_batches_per_hour:
+            return 0.0
+        return self._batch_times[0] + 3600 - now
+
+    # =========================================================================
+    # ANALYSIS
+    # =========================================================================
+
+    async def context(self) -> Optional[LiveMeetingContext]:
+        if self._context is None or time.monotonic() - self._context_loaded_at > self.worker.context_ttl:
+            self._context = await self.worker.context_loader(self.meeting_id)
+            self._context_loaded_at = time.monotonic()
+            self.worker._stats["context_loads"] += 1
+        return self._context
+
+    async def _analyze(self, text: str) -> None:
+        worker = self.worker
+        try:
+            context = await self.context()
+            if context is None:
+                logger.warning(f"[LIVE-ANALYSIS] Meeting {self.meeting_id} not found; skipping batch")
+                return
+            prompt_context = {"twg_name": context.twg_name, "meeting_title": context.meeting_title}
+            worker._stats["batches"] += 1
+
+            checks = [worker.detector.detect_live_conflict(text, prompt_context)]
+            if context.agenda_content:
+                checks.append(worker.detector.analyze_live_agenda(
+                    chunk_text=text,
+                    agenda_content=context.agenda_content,
+                    context=prompt_context
+                ))
+            worker._stats["llm_calls"] += len(checks)
+            results = await asyncio.gather(*checks)
+
+            conflict = results[0]
+            agenda_insight = results[1] if len(results) > 1 else None
+            if conflict:
+                worker._stats["conflicts"] += 1
+                logger.warning(f"⚠️ LIVE CONFLICT DETECTED: {conflict.get('reason')}")
+                await worker.notify(
+                    meeting_id=self.meeting_id,
+                    content=f"**POTENTIAL CONFLICT:** {conflict.get('reason')}\n\n*Suggestion:* {conflict.get('suggestion')}",
+                    source="live_conflict_detector",
+                    metadata=conflict
+                )
+            if agenda_insight and (agenda_insight.get("decisions") or agenda_insight.get("current_focus")):
+                worker._stats["agenda_updates"] += 1
+                await worker.notify(
+                    meeting_id=self.meeting_id,
+                    content=agenda_insight.get("insight_summary") or "Progress update",
+                    source="agenda_monitor",
+                    metadata=agenda_insight
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            worker._stats["errors"] += 1
+            logger.error(f"[LIVE-ANALYSIS] Batch failed for meeting {self.meeting_id}: {e}")
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._inflight is not None and not self._inflight.done():
+            self._inflight.cancel()
+            try:
+                await self._inflight
+            except asyncio.CancelledError:
+                pass
+
+
+class LiveAnalysisWorker:
+    """
+    Process-wide registry of live analysis sessions (one per meeting).
+    """
+
+    def __init__(
+        self,
+        detector: Optional[Any] = None,
+        context_loader: Optional[ContextLoader] = None,
+        notify: Optional[Callable[..., Awaitable[None]]] = None,
+        debounce: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        max_chars: Optional[int] = None,
+        max_batches_per_hour: Optional[int] = None,
+        context_ttl: Optional[float] = None,
+        idle_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            detector: Object with async detect_live_conflict / analyze_live_agenda
+                (default: ConflictDetector on the live LLM service)
+            context_loader: Async meeting_id -> LiveMeetingContext (default: database)
+            notify: Async publisher for insights (default: BroadcastService.notify_live_meeting)
+            debounce: Seconds of quiet before a batch runs
+            max_wait: Maximum seconds a chunk waits while chunks keep arriving
+            max_chars: Transcript characters per analysis (most recent kept)
+            max_batches_per_hour: Analyses per meeting per rolling hour
+            context_ttl: Seconds a meeting's context stays cached
+            idle_timeout: Seconds without chunks before a session is dropped
+        """
+        self._detector = detector
+        self.context_loader = context_loader or load_meeting_context
+        self._notify = notify
+        self.debounce = settings.LIVE_ANALYSIS_DEBOUNCE_SECONDS if debounce is None else debounce
+        self.max_wait = settings.LIVE_ANALYSIS_MAX_WAIT_SECONDS if max_wait is None else max_wait
+        self.max_chars = max_chars or settings.LIVE_ANALYSIS_MAX_CHARS
+        self.max_batches_per_hour = max_batches_per_hour or settings.LIVE_ANALYSIS_MAX_BATCHES_PER_HOUR
+        self.context_ttl = settings.LIVE_ANALYSIS_CONTEXT_TTL_SECONDS if context_ttl is None else context_ttl
+        self.idle_timeout = idle_timeout or settings.LIVE_ANALYSIS_IDLE_SECONDS
+        self.sessions: Dict[str, LiveAnalysisSession] = {}
+        self._stats = {
+            "chunks": 0, "batches": 0, "cancelled": 0, "over_budget": 0, "llm_calls": 0,
+            "context_loads": 0, "conflicts": 0, "agenda_updates": 0, "errors": 0
+        }
+
+    @property
+    def detector(self):
+        if self._detector is None:
+            from app.services.conflict_detector import ConflictDetector
+            from app.services.llm_service import get_live_llm_service
+            self._detector = ConflictDetector(llm_client=get_live_llm_service())
+        return self._detector
+
+    async def notify(self, **kwargs: Any) -> None:
+        if self._notify is None:
+            from app.services.broadcast_service import get_broadcast_service
+            self._notify = get_broadcast_service().notify_live_meeting
+        await self._notify(**kwargs)
+
+    def session(self, meeting_id: str) -> LiveAnalysisSession:
+        meeting_id = str(meeting_id)
+        session = self.sessions.get(meeting_id)
+        if session is None:
+            self._evict_idle()
+            session = self.sessions[meeting_id] = LiveAnalysisSession(meeting_id, self)
+        return session
+
+    def submit(self, meeting_id: str, chunk_text: str) -> None:
+        """
+        Queue a live transcript chunk for the meeting's next batch (never blocks).
+
+        Args:
+            meeting_id: Meeting ID
+            chunk_text: New transcript text
+        """
+        if not chunk_text or not chunk_text.strip():
+            return
+        self._stats["chunks"] += 1
+        self.session(meeting_id).add(chunk_text)
+
+    async def request_insight(self, meeting_id: str, transcript: str) -> None:
+        """
+        Analyze now (manual request), superseding any pending or running batch.
+
+        Args:
+            meeting_id: Meeting ID
+            transcript: Transcript so far; the most recent max_chars are analyzed
+        """
+        session = self.session(meeting_id)
+        session._buffer.append(transcript[-self.max_chars:])
+        task = session.flush()
+        if task is not None:
+            try:
+                await task
+            except asyncio.CancelledError:
+                # Superseded by an even newer batch, which covers this text
+                pass
+
+    async def end_session(self, meeting_id: str) -> None:
+        """
+        Stop a meeting's session once it has ended (final transcript processed).
+
+        Args:
+            meeting_id: Meeting ID
+        """
+        session = self.sessions.pop(str(meeting_id), None)
+        if session is not None:
+            await session.close()
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        for meeting_id, session in list(self.sessions.items()):
+            if session.last_chunk_at < cutoff and (session._inflight is None or session._inflight.done()):
+                if session._timer is not None:
+                    session._timer.cancel()
+                del self.sessions[meeting_id]
+
+    def get_stats(self) -> LiveAnalysisStats:
+        return LiveAnalysisStats(sessions=len(self.sessions), **self._stats)
+
+    async def close(self) -> None:
+        """Stop every session (application shutdown)."""
+        sessions, self.sessions = list(self.sessions.values()), {}
+        for session in sessions:
+            await session.close()
+
+
+# Singleton instance
+_live_analysis_worker: Optional[LiveAnalysisWorker] = None
+
+
+def get_live_analysis_worker() -> LiveAnalysisWorker:
+    """Get or create the process-wide live analysis worker"""
+    global _live_analysis_worker
+    if _live_analysis_worker is None:
+        _live_analysis_worker = LiveAnalysisWorker()
+    return _live_analysis_worker
+
+
+async def close_live_analysis_worker() -> None:
+    """Close the worker if it was ever created (application shutdown)."""
+    global _live_analysis_worker
+    if _live_analysis_worker is not None:
+        await _live_analysis_worker.close()
+        _live_analysis_worker = None
@@ -0,0 +1,626 @@
+"""
+Live Meeting Fan-Out
+
+Process-wide delivery of live meeting updates to WebSocket clients.
+
+Every meeting has its own pub/sub channel and its own event stream:
+- Channel: live:{meeting_id} (PUB/SUB, frames carry their "event_id")
+- History: live:{meeting_id}:events (STREAM, trimmed by count and age)
+
+Publishing appends to the stream and publishes in one Lua script, so the
+stream order and the live order agree and every frame has a monotonic
+event_id (the stream entry ID). A client that reconnects with
+last_event_id gets exactly the events it missed (O(missed), not
+O(history)) and then the live feed, without gaps or duplicates.
+
+Instead of each socket holding its own Redis pub/sub connection, this hub
+keeps ONE subscription per meeting with watchers in this process, on the
+shared pub/sub hub, and hands each frame to the sockets in that meeting's
+room. Each socket gets a bounded outbound queue and a writer task (see ws_queue),
+so a slow client only loses its own superseded or oldest updates and never
+delays the others.
+
+State streams (transcript lines, agenda items) are published as snapshots
+with a delta from the previous version; each socket is sent the delta
+when its client holds that version and the full snapshot otherwise, in
+JSON text or msgpack binary frames as negotiated (see ws_framing).
+
+Without Redis (REDIS_BACKEND=memory) the same API runs on an in-process
+log and the local pub/sub hub.
+
+Usage:
+    # Publisher (sync; call via asyncio.to_thread from async code)
+    event_id = get_live_event_publisher().publish(meeting_id, payload)
+    get_live_event_publisher().publish_snapshot(meeting_id, "agenda", {"items": [...]})
+
+    # WebSocket endpoint
+    hub = get_live_meeting_hub()
+    live = LiveSocket(websocket, meeting_id, user_id)
+    await hub.join(live, last_event_id=last_event_id)
+    ...
+    await hub.leave(live)
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import redis
+from fastapi import WebSocket
+from loguru import logger
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_pool import get_redis_registry
+from app.core.ws_framing import FRAMING_JSON, DeltaFrame, Frame, diff_snapshot, snapshot_version
+from app.core.ws_queue import OutboundFrame, OutboundSocket, SendPolicy, classify_message
+from app.services.pubsub_hub import Subscription, get_pubsub_hub
+
+
+def live_channel(meeting_id: str) -> str:
+    """Pub/sub channel for a meeting's live updates"""
+    return f"live:{meeting_id}"
+
+
+def live_stream_key(meeting_id: str) -> str:
+    """Redis STREAM holding a meeting's recent updates"""
+    return f"live:{meeting_id}:events"
+
+
+def with_event_id(data: str, event_id: str) -> str:
+    """Add "event_id" to an encoded JSON object without re-encoding it."""
+    body = data.rstrip()[:-1].rstrip()
+    separator = "" if body.endswith("{") else ","
+    return f'{body}{separator}"event_id":"{event_id}"}}'
+
+
+def parse_event_id(event_id: Any) -> Tuple[int, int]:
+    """Stream ID "ms-seq" -> (ms, seq) for ordering; malformed IDs sort first."""
+    try:
+        ms, _, seq = str(event_id).partition("-")
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return 0, 0
+
+
+def _live_frame(data: str) -> Tuple[OutboundFrame, SendPolicy, Optional[str], Optional[str]]:
+    """
+    Encoded update -> (frame, send policy, coalescing key, event_id).
+
+    Decoded once per process; the frame is then shared by every socket in
+    the room and encoded at most once per framing.
+    """
+    try:
+        message = json.loads(data)
+        policy, key = classify_message(message)
+    except (TypeError, ValueError, AttributeError):
+        return data, SendPolicy.DROP_OLDEST, None, None
+    frame = DeltaFrame.from_message(message) if message.get("type") == "live_state" else None
+    return frame or Frame(message, data), policy, key, message.get("event_id")
+
+
+# Append to a meeting's stream, trim by count and age, and publish the frame
+# (with its event_id) - atomically, so live order always matches stream order.
+#
+# KEYS[1] = meeting stream
+# ARGV = payload (JSON object), max_events, min_id ('' = no age trim), ttl, channel
+# Returns the new entry ID
+_PUBLISH_LIVE_LUA = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[2], '*', 'data', ARGV[1])
+if ARGV[3] ~= '' then
+    redis.call('XTRIM', KEYS[1], 'MINID', '~', ARGV[3])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+local body = string.sub(ARGV[1], 1, -2)
+local separator = ','
+if string.sub(body, -1) == '{' then
+    separator = ''
+end
+redis.call('PUBLISH', ARGV[5], body .. separator .. '"event_id":"' .. id .. '"}')
+return id
+"""
+
+
+# =============================================================================
+# EVENT LOG
+# =============================================================================
+
+class LocalLiveEventLog:
+    """
+    In-process stand-in for the per-meeting streams (single-node mode).
+
+    IDs follow the Redis "ms-seq" format and are monotonic per process.
+    """
+
+    def __init__(self, max_events: int = 500, max_age: int = 86400):
+        self.max_events = max_events
+        self.max_age = max_age
+        self._events: Dict[str, Deque[Tuple[str, str, float]]] = {}
+        self._lock = threading.Lock()
+        self._last_id: Tuple[int, int] = (0, 0)
+
+    def append(self, meeting_id: str, data: str) -> str:
+        now = time.time()
+        with self._lock:
+            ms = int(now * 1000)
+            last_ms, last_seq = self._last_id
+            self._last_id = (ms, 0) if ms > last_ms else (last_ms, last_seq + 1)
+            event_id = f"{self._last_id[0]}-{self._last_id[1]}"
+            events = self._events.setdefault(meeting_id, deque(maxlen=self.max_events))
+            events.append((event_id, data, now))
+            if self.max_age:
+                while events and events[0][2] < now - self.max_age:
+                    events.popleft()
+        return event_id
+
+    def read(
+        self,
+        meeting_id: str,
+        after: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Returns:
+            ([(event_id, data)] oldest first, oldest retained event_id or None)
+        """
+        with self._lock:
+            events = list(self._events.get(meeting_id, ()))
+        oldest = events[0][0] if events else None
+        if after is not None:
+            cutoff = parse_event_id(after)
+            selected = [(i, d) for i, d, _ in events if parse_event_id(i) > cutoff][:limit]
+        else:
+            selected = [(i, d) for i, d, _ in events[-limit:]] if limit else []
+        return selected, oldest
+
+
+_local_event_log: Optional[LocalLiveEventLog] = None
+
+
+def get_local_live_event_log() -> LocalLiveEventLog:
+    """Get or create the process-wide in-process live event log"""
+    global _local_event_log
+    if _local_event_log is None:
+        _local_event_log = LocalLiveEventLog(
+            max_events=settings.LIVE_HISTORY_MAX_EVENTS,
+            max_age=settings.LIVE_HISTORY_MAX_AGE_SECONDS
+        )
+    return _local_event_log
+
+
+class LiveEventPublisher:
+    """
+    Appends live updates to a meeting's stream and publishes them.
+
+    Sync, so it works from any thread or event loop (call it via
+    asyncio.to_thread from async code).
+    """
+
+    MAX_TRACKED_SNAPSHOTS = 1000
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        max_events: Optional[int] = None,
+        max_age: Optional[int] = None
+    ):
+        """
+        Args:
+            client: Sync Redis client; None publishes in-process (single-node mode)
+            max_events: Events kept per meeting (approximate trim)
+            max_age: Events older than this many seconds are trimmed (0 = no age limit)
+        """
+        self.client = client
+        self.max_events = max_events or settings.LIVE_HISTORY_MAX_EVENTS
+        self.max_age = settings.LIVE_HISTORY_MAX_AGE_SECONDS if max_age is None else max_age
+        self._script = client.register_script(_PUBLISH_LIVE_LUA) if client is not None else None
+        # Last snapshot published per (meeting, stream), the base for the next delta
+        self._snapshots: "OrderedDict[Tuple[str, str], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._snapshots_lock = threading.Lock()
+
+    def publish(self, meeting_id: str, payload: Dict[str, Any]) -> str:
+        """
+        Record and broadcast one update.
+
+        Args:
+            meeting_id: Meeting ID
+            payload: JSON-serializable dict (gets an "event_id" on the wire)
+
+        Returns:
+            The update's event_id
+
+        Raises:
+            RedisError: If Redis fails
+        """
+        meeting_id = str(meeting_id)
+        data = json.dumps(payload, default=str)
+
+        if self._script is None:
+            from app.services.inprocess_backend import get_local_pubsub_hub
+            event_id = get_local_live_event_log().append(meeting_id, data)
+            get_local_pubsub_hub().publish(live_channel(meeting_id), with_event_id(data, event_id))
+            return event_id
+
+        min_id = f"{int((time.time() - self.max_age) * 1000)}-0" if self.max_age else ""
+        event_id = self._script(
+            keys=[live_stream_key(meeting_id)],
+            args=[data, self.max_events, min_id, self.max_age or 7 * 86400, live_channel(meeting_id)]
+        )
+        return event_id.decode("utf-8") if isinstance(event_id, bytes) else event_id
+
+    def publish_snapshot(
+        self,
+        meeting_id: str,
+        stream: str,
+        snapshot: Dict[str, Any],
+        **fields: Any
+    ) -> Optional[str]:
+        """
+        Publish the current state of a live stream (transcript, agenda, ...).
+
+        The update carries the full snapshot plus, when this process published
+        the stream before, the delta from that version; each socket's writer
+        sends whichever its client can apply (see ws_framing).
+
+        Args:
+            meeting_id: Meeting ID
+            stream: Stream name, e.g. "transcript" or "agenda"
+            snapshot: Current state (JSON-serializable dict)
+            **fields: Extra top-level message fields
+
+        Returns:
+            The update's event_id, or None if the snapshot didn't change
+        """
+        meeting_id = str(meeting_id)
+        version = snapshot_version(snapshot)
+        with self._snapshots_lock:
+            previous = self._snapshots.get((meeting_id, stream))
+            if previous is not None and previous[0] == version:
+                return None
+            self._snapshots[(meeting_id, stream)] = (version, snapshot)
+            self._snapshots.move_to_end((meeting_id, stream))
+            while len(self._snapshots) > self.MAX_TRACKED_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+
+        payload = {
+            "type": "live_state",
+            "meeting_id": meeting_id,
+            "stream": stream,
+            "version": version,
+            **fields,
+            "snapshot": snapshot
+        }
+        if previous is not None:
+            delta = diff_snapshot(previous[1], snapshot)
+            if delta is not None:
+                payload["base_version"] = previous[0]
+                payload["delta"] = delta
+        return self.publish(meeting_id, payload)
+
+
+_live_event_publisher: Optional[LiveEventPublisher] = None
+
+
+def get_live_event_publisher() -> LiveEventPublisher:
+    """Get or create the live event publisher (in-process when Redis isn't used)"""
+    global _live_event_publisher
+    if _live_event_publisher is None:
+        registry = get_redis_registry()
+        client = None if registry.resolve_backend() == "memory" else registry.get_sync_client()
+        _live_event_publisher = LiveEventPublisher(client)
+    return _live_event_publisher
+
+
+# =============================================================================
+# SOCKETS
+# =============================================================================
+
+class LiveHubStats(BaseModel):
+    """Snapshot of live fan-out state for monitoring"""
+    rooms: int
+    sockets: int
+    received: int
+    delivered: int
+    dropped: int
+    coalesced: int
+    deltas: int
+    bytes_sent: int
+    queue_depth: int
+    peak_queue_depth: int
+    resumed: int
+    replayed: int
+
+
+class LiveSocket(OutboundSocket):
+    """
+    One WebSocket watching a meeting.
+
+    Everything sent to the client goes through the connection's outbound
+    queue (see ws_queue), so room fan-out never awaits a slow client. While
+    history is being replayed, live frames are held back and released
+    afterwards minus any the replay already covered.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        meeting_id: str,
+        user_id: str = "anonymous",
+        max_queue: Optional[int] = None,
+        framing: str = FRAMING_JSON
+    ):
+        """
+        Args:
+            websocket: Accepted WebSocket
+            meeting_id: Meeting (room) this socket watches
+            user_id: Authenticated user, for logging
+            max_queue: Droppable updates queued (default: LIVE_SOCKET_QUEUE_SIZE)
+            framing: Wire framing negotiated for the socket (see ws_framing)
+        """
+        super().__init__(
+            websocket,
+            max_queue=max_queue or settings.LIVE_SOCKET_QUEUE_SIZE,
+            name=f"live:{meeting_id}:{user_id}",
+            framing=framing
+        )
+        self.meeting_id = str(meeting_id)
+        self.user_id = user_id
+        # Live frames received while history is replayed (None = not replaying)
+        self._held: Optional[List[Tuple[OutboundFrame, SendPolicy, Optional[str], Optional[str]]]] = None
+
+    def deliver(
+        self,
+        frame: OutboundFrame,
+        policy: SendPolicy = SendPolicy.DROP_OLDEST,
+        key: Optional[str] = None,
+        event_id: Optional[str] = None
+    ) -> None:
+        """Live frame from the room: held back during replay, queued otherwise."""
+        if self._held is not None:
+            self._held.append((frame, policy, key, event_id))
+        else:
+            self.send_frame(frame, policy, key)
+
+    def hold(self) -> None:
+        self._held = []
+
+    def release(self, replayed_up_to: Optional[str]) -> None:
+        """Queue held live frames that are newer than the replayed history."""
+        held, self._held = self._held or [], None
+        cutoff = parse_event_id(replayed_up_to) if replayed_up_to else None
+        for frame, policy, key, event_id in held:
+            if cutoff is not None and event_id is not None and parse_event_id(event_id) <= cutoff:
+                continue
+            self.send_frame(frame, policy, key)
+
+
+# =============================================================================
+# HUB
+# =============================================================================
+
+class LiveMeetingHub:
+    """
+    Room registry plus one upstream subscription per room.
+
+    A meeting's channel is subscribed when its first socket joins and
+    unsubscribed when its last one leaves, so this process only receives
+    (and never decodes) traffic for meetings someone here is watching.
+    """
+
+    def __init__(self, pubsub_hub=None, history_client=None, event_log: Optional[LocalLiveEventLog] = None):
+        """
+        Args:
+            pubsub_hub: PubSubHub (or LocalPubSubHub) to subscribe through
+                (default: the process-wide one)
+            history_client: redis.asyncio client for stream reads
+                (default: the shared pool; unused in single-node mode)
+            event_log: In-process log to read instead of Redis (single-node mode)
+        """
+        self._pubsub_hub = pubsub_hub
+        self._history_client = history_client
+        self._event_log = event_log
+        self.rooms: Dict[str, Set[LiveSocket]] = {}
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._lock = asyncio.Lock()
+        self._received = 0
+        self._resumed = 0
+        self._replayed = 0
+        self._closed_socket_totals = {"delivered": 0, "dropped": 0, "coalesced": 0, "deltas": 0, "bytes_sent": 0}
+
+    @property
+    def pubsub_hub(self):
+        if self._pubsub_hub is None:
+            self._pubsub_hub = get_pubsub_hub()
+        return self._pubsub_hub
+
+    # =========================================================================
+    # ROOMS
+    # =========================================================================
+
+    async def join(
+        self,
+        live: LiveSocket,
+        last_event_id: Optional[str] = None,
+        replay: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Register a socket in its meeting's room and replay history.
+
+        The socket starts receiving live frames before history is read (held
+        back, then de-duplicated), so nothing published in between is lost.
+
+        Args:
+            live: Socket to register
+            last_event_id: Resume after this event (only missed events are sent)
+            replay: Recent events to send on a fresh connect (default: LIVE_HISTORY_REPLAY_COUNT)
+
+        Returns:
+            {"replayed": n, "last_event_id": ..., "truncated": bool} - truncated
+            means events after last_event_id were already trimmed away
+        """
+        meeting_id = live.meeting_id
+        live.hold()
+        async with self._lock:
+            self.rooms.setdefault(meeting_id, set()).add(live)
+            if meeting_id not in self._subscriptions:
+                self._subscriptions[meeting_id] = await self.pubsub_hub.subscribe(
+                    live_channel(meeting_id), self._router(meeting_id)
+                )
+
+        replay = settings.LIVE_HISTORY_REPLAY_COUNT if replay is None else replay
+        limit = settings.LIVE_HISTORY_MAX_EVENTS if last_event_id else replay
+        events, oldest = await self.read_history(meeting_id, last_event_id, limit)
+        for event_id, data in events:
+            frame, policy, key, _ = _live_frame(with_event_id(data, event_id))
+            live.send_frame(frame, policy, key)
+        newest = events[-1][0] if events else last_event_id
+        live.release(newest)
+
+        truncated = bool(
+            last_event_id and oldest and parse_event_id(oldest) > parse_event_id(last_event_id)
+            and (not events or events[0][0] == oldest)
+        )
+        if last_event_id:
+            self._resumed += 1
+        self._replayed += len(events)
+        logger.debug(
+            f"[LIVE] Socket {live.id} joined meeting {meeting_id} "
+            f"(replayed {len(events)}{', resumed' if last_event_id else ''})"
+        )
+        return {"replayed": len(events), "last_event_id": newest, "truncated": truncated}
+
+    async def leave(self, live: LiveSocket) -> None:
+        """Unregister a socket and stop its writer; the room's last socket unsubscribes."""
+        subscription = None
+        async with self._lock:
+            room = self.rooms.get(live.meeting_id)
+            if room is not None and live in room:
+                room.discard(live)
+                for field in self._closed_socket_totals:
+                    self._closed_socket_totals[field] += getattr(live, field)
+                if not room:
+                    del self.rooms[live.meeting_id]
+                    subscription = self._subscriptions.pop(live.meeting_id, None)
+        await live.close()
+        if subscription is not None:
+            await subscription.close()
+        logger.debug(f"[LIVE] Socket {live.id} left meeting {live.meeting_id}")
+
+    def _router(self, meeting_id: str):
+        def route(channel: str, data: str) -> None:
+            # The channel identifies the room; the frame is decoded once (for
+            # its send policy), however many sockets are watching
+            self._received += 1
+            frame, policy, key, event_id = _live_frame(data)
+            for live in list(self.rooms.get(meeting_id, ())):
+                live.deliver(frame, policy, key, event_id)
+        return route
+
+    # =========================================================================
+    # HISTORY
+    # =========================================================================
+
+    async def read_history(
+        self,
+        meeting_id: str,
+        after: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Read a meeting's events.
+
+        Args:
+            meeting_id: Meeting ID
+            after: Only events after this event_id (XRANGE with an exclusive start)
+            limit: Maximum events (the newest `limit` when `after` is None)
+
+        Returns:
+            ([(event_id, data)] oldest first, oldest retained event_id or None)
+        """
+        event_log = self._event_log
+        if event_log is None and self._history_client is None \
+                and get_redis_registry().resolve_backend() == "memory":
+            event_log = get_local_live_event_log()
+        if event_log is not None:
+            return event_log.read(meeting_id, after, limit)
+
+        try:
+            client = self._history_client or get_redis_registry().get_async_client(decode_responses=True)
+            key = live_stream_key(meeting_id)
+            pipe = client.pipeline(transaction=False)
+            if after is not None:
+                pipe.xrange(key, min=f"({after}", count=limit)
+            else:
+                pipe.xrevrange(key, count=limit)
+            pipe.xrange(key, count=1)
+            entries, first = await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"[LIVE] History load failed for meeting {meeting_id}: {e}")
+            return [], None
+
+        if after is None:
+            entries = list(reversed(entries))
+        events = [(self._str(entry_id), self._str(fields.get("data") or fields.get(b"data"))) for entry_id, fields in entries]
+        return events, (self._str(first[0][0]) if first else None)
+
+    @staticmethod
+    def _str(value: Any) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    def get_stats(self) -> LiveHubStats:
+        sockets = [live for room in self.rooms.values() for live in room]
+        return LiveHubStats(
+            rooms=len(self.rooms),
+            sockets=len(sockets),
+            received=self._received,
+            delivered=self._closed_socket_totals["delivered"] + sum(s.delivered for s in sockets),
+            dropped=self._closed_socket_totals["dropped"] + sum(s.dropped for s in sockets),
+            coalesced=self._closed_socket_totals["coalesced"] + sum(s.coalesced for s in sockets),
+            deltas=self._closed_socket_totals["deltas"] + sum(s.deltas for s in sockets),
+            bytes_sent=self._closed_socket_totals["bytes_sent"] + sum(s.bytes_sent for s in sockets),
+            queue_depth=sum(s.depth for s in sockets),
+            peak_queue_depth=max((s.peak_depth for s in sockets), default=0),
+            resumed=self._resumed,
+            replayed=self._replayed
+        )
+
+    async def close(self) -> None:
+        """Stop every writer and upstream subscription."""
+        async with self._lock:
+            sockets = [live for room in self.rooms.values() for live in room]
+            self.rooms.clear()
+            subscriptions = list(self._subscriptions.values())
+            self._subscriptions.clear()
+        for live in sockets:
+            await live.close()
+        for subscription in subscriptions:
+            await subscription.close()
+        logger.info("[LIVE] Live meeting hub closed")
+
+
+# Singleton instance
+_live_meeting_hub: Optional[LiveMeetingHub] = None
+
+
+def get_live_meeting_hub() -> LiveMeetingHub:
+    """Get or create the process-wide live meeting hub"""
+    global _live_meeting_hub
+    if _live_meeting_hub is None:
+        _live_meeting_hub = LiveMeetingHub()
+    return _live_meeting_hub
+
+
+async def close_live_meeting_hub() -> None:
+    """Close the hub if it was ever created (application shutdown)."""
+    global _live_meeting_hub
+    if _live_meeting_hub is not None:
+        await _live_meeting_hub.close()
+        _live_meeting_hub = None
@@ -0,0 +1,585 @@
+"""
+Live Minutes Builder
+
+Builds meeting minutes incrementally while the meeting is running, so the
+end-of-meeting step is a short consolidation instead of one huge LLM call
+over the full transcript.
+
+- Transcript chunks are buffered per meeting and folded into a structured
+  draft once LIVE_MINUTES_SEGMENT_CHARS have accumulated (or after
+  LIVE_MINUTES_DEBOUNCE_SECONDS of quiet). Each fold sends only the current
+  draft plus the new segment, so prompt size stays flat for long plenaries.
+- The draft holds rolling section summaries, decisions and action items.
+  After every fold it is saved to the cache (shared across workers) and
+  pushed to the live dashboard as the "minutes" state stream.
+- finalize() folds whatever is still buffered and runs one consolidation
+  call over the draft (not the transcript) to produce the minutes markdown.
+  If the draft doesn't cover enough of the final transcript (bot joined
+  late, worker restarted), it returns None and callers fall back to full
+  synthesis.
+
+Usage:
+    builder = get_live_minutes_builder()
+    builder.submit(meeting_id, chunk_text)                 # live feed
+    res = await builder.finalize(meeting_id, minutes_ctx, transcript_text)
+    if res is None:
+        res = synthesizer.synthesize_minutes(transcript_text, minutes_ctx)
+"""
+
+import asyncio
+import json
+import re
+import time
+from datetime import datetime, UTC
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+FOLD_PROMPT = """You are the Digital Rapporteur keeping running minutes of a live ECOWAS meeting.
+
+Meeting: {meeting_title}
+
+CURRENT DRAFT (JSON):
+{draft}
+
+NEW TRANSCRIPT SEGMENT:
+{segment}
+
+Update the draft with the new segment only. Rely EXCLUSIVELY on the transcript; do not invent details.
+Respond ONLY with JSON in this format:
+{{
+    "sections": [{{"title": "Agenda item or topic", "summary": "Updated 2-4 sentence summary of this topic so far"}}],
+    "decisions": ["New formal decision taken in this segment"],
+    "action_items": [{{"owner": "Name/Role or TBD", "task": "Specific task", "due": "Date or TBD"}}]
+}}
+List only sections touched by this segment (reuse the existing title to update one), and only NEW decisions and action items.
+"""
+
+CONSOLIDATE_PROMPT = """You are the Digital Rapporteur for an ECOWAS Technical Working Group meeting.
+Turn the structured notes taken during the meeting into the official "Zero Draft" minutes.
+Rely EXCLUSIVELY on the notes; do not invent details. Merge duplicate points and tidy the wording.
+
+MEETING DETAILS:
+- Title: {meeting_title}
+- Date: {meeting_date}
+- Pillar/TWG: {pillar_name}
+
+ATTENDEES:
+{attendees_list}
+
+AGENDA:
+{agenda_content}
+
+MEETING NOTES (JSON):
+{draft}
+
+OUTPUT FORMAT (pure markdown):
+
+# Minutes: {meeting_title}
+
+**Date:** {meeting_date}
+**TWG:** {pillar_name}
+
+## 1. Attendance
+## 2. Agenda Summary
+## 3. Key Discussion Points
+## 4. Decisions Taken
+## 5. Action Items
+- [ ] **[Owner Name/Role]**: [Task Description] (Due: [Date/TBD])
+## 6. Next Steps
+"""
+
+
+class MinutesSection(BaseModel):
+    """Rolling summary of one agenda item or topic"""
+    id: str
+    title: str
+    summary: str
+
+
+class LiveActionItem(BaseModel):
+    """Action item picked up during the meeting"""
+    id: str
+    owner: str = "TBD"
+    task: str
+    due: str = "TBD"
+
+
+class LiveMinutesDraft(BaseModel):
+    """Minutes built so far for one live meeting"""
+    meeting_id: str
+    sections: List[MinutesSection] = Field(default_factory=list)
+    decisions: List[str] = Field(default_factory=list)
+    action_items: List[LiveActionItem] = Field(default_factory=list)
+    folded_chars: int = 0
+    folds: int = 0
+    updated_at: Optional[str] = None
+
+    def notes(self) -> Dict[str, Any]:
+        """The content the LLM sees (no bookkeeping fields)."""
+        return {
+            "sections": [{"title": s.title, "summary": s.summary} for s in self.sections],
+            "decisions": self.decisions,
+            "action_items": [{"owner": a.owner, "task": a.task, "due": a.due} for a in self.action_items]
+        }
+
+
+class LiveMinutesStats(BaseModel):
+    """Counters across all live minutes sessions in this process"""
+    sessions: int
+    chunks: int
+    folds: int
+    fold_errors: int
+    finalized: int
+    consolidated: int
+    fallbacks: int
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "section"
+
+
+def _parse_json(response: str) -> Optional[Dict[str, Any]]:
+    if "```json" in response:
+        response = response.split("```json")[1].split("```")[0]
+    elif "```" in response:
+        response = response.split("```")[1].split("```")[0]
+    try:
+        data = json.loads(response.strip())
+    except (json.JSONDecodeError, IndexError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def merge_fold(draft: LiveMinutesDraft, update: Dict[str, Any]) -> LiveMinutesDraft:
+    """
+    Merge one fold's output into the draft.
+
+    Sections are matched by title (updated in place, new ones appended),
+    decisions and action items are de-duplicated by their normalized text.
+
+    Args:
+        draft: Current draft (modified in place)
+        update: Parsed fold response
+
+    Returns:
+        The draft
+    """
+    sections = {s.id: s for s in draft.sections}
+    for section in update.get("sections") or []:
+        if not isinstance(section, dict) or not section.get("title") or not section.get("summary"):
+            continue
+        section_id = _slug(str(section["title"]))
+        if section_id in sections:
+            sections[section_id].summary = str(section["summary"])
+        else:
+            sections[section_id] = MinutesSection(
+                id=section_id, title=str(section["title"]), summary=str(section["summary"])
+            )
+            draft.sections.append(sections[section_id])
+
+    known_decisions = {_slug(d) for d in draft.decisions}
+    for decision in update.get("decisions") or []:
+        if isinstance(decision, str) and decision.strip() and _slug(decision) not in known_decisions:
+            known_decisions.add(_slug(decision))
+            draft.decisions.append(decision.strip())
+
+    known_actions = {a.id for a in draft.action_items}
+    for action in update.get("action_items") or []:
+        if not isinstance(action, dict) or not action.get("task"):
+            continue
+        owner = str(action.get("owner") or "TBD")
+        action_id = _slug(f"{owner} {action['task']}")
+        if action_id in known_actions:
+            continue
+        known_actions.add(action_id)
+        draft.action_items.append(LiveActionItem(
+            id=action_id, owner=owner, task=str(action["task"]), due=str(action.get("due") or "TBD")
+        ))
+    return draft
+
+
+def render_minutes(draft: LiveMinutesDraft, meeting_context: Dict[str, Any]) -> str:
+    """Markdown minutes straight from the draft (used if consolidation fails)."""
+    title = meeting_context.get("meeting_title", "Untitled Meeting")
+    lines = [
+        f"# Minutes: {title}",
+        "",
+        f"**Date:** {meeting_context.get('meeting_date', 'Unknown Date')}",
+        f"**TWG:** {meeting_context.get('pillar_name', 'General')}",
+        "",
+        "## 1. Attendance",
+        meeting_context.get("attendees_list", "Not recorded"),
+        "",
+        "## 2. Key Discussion Points"
+    ]
+    for section in draft.sections:
+        lines += [f"### {section.title}", section.summary, ""]
+    lines.append("## 3. Decisions Taken")
+    lines += [f"{i}. **[DECISION]** {d}" for i, d in enumerate(draft.decisions, 1)] or ["None recorded."]
+    lines += ["", "## 4. Action Items"]
+    lines += [f"- [ ] **{a.owner}**: {a.task} (Due: {a.due})" for a in draft.action_items] or ["None recorded."]
+    return "\n".join(lines) + "\n"
+
+
+class LiveMinutesSession:
+    """One live meeting's transcript buffer and serialized folds."""
+
+    def __init__(self, meeting_id: str, builder: "LiveMinutesBuilder"):
+        self.meeting_id = meeting_id
+        self.builder = builder
+        self.draft: Optional[LiveMinutesDraft] = None
+        self.meeting_title = ""
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._folding: Optional[asyncio.Task] = None
+        self.last_chunk_at = time.monotonic()
+
+    def add(self, text: str) -> None:
+        self.last_chunk_at = time.monotonic()
+        self._buffer.append(text)
+        self._buffered_chars += len(text)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffered_chars >= self.builder.segment_chars:
+            self.schedule_fold()
+        else:
+            self._timer = asyncio.get_running_loop().call_later(self.builder.debounce, self.schedule_fold)
+
+    def schedule_fold(self) -> asyncio.Task:
+        """Fold the buffer once the running fold (if any) is done; folds never overlap."""
+        self._timer = None
+        if self._folding is None or self._folding.done():
+            self._folding = asyncio.create_task(self._fold_pending(), name=f"live-minutes-{self.meeting_id}")
+        return self._folding
+
+    async def _fold_pending(self) -> None:
+        # Text that arrives during a fold is picked up by the next loop
+        while self._buffer:
+            segment, self._buffer, self._buffered_chars = "\n".join(self._buffer), [], 0
+            await self.fold(segment)
+
+    async def load(self) -> LiveMinutesDraft:
+        if self.draft is None:
+            saved = await self.builder.store_get(self.builder.state_key(self.meeting_id))
+            self.draft = LiveMinutesDraft(**saved) if saved else LiveMinutesDraft(meeting_id=self.meeting_id)
+        return self.draft
+
+    async def fold(self, segment: str) -> None:
+        builder = self.builder
+        draft = await self.load()
+        prompt = FOLD_PROMPT.format(
+            meeting_title=self.meeting_title or "Live meeting",
+            draft=json.dumps(draft.notes(), ensure_ascii=False),
+            segment=segment
+        )
+        try:
+            response = await asyncio.to_thread(builder.fold_llm.chat, prompt, max_tokens=builder.fold_max_tokens)
+        except Exception as e:
+            builder._stats["fold_errors"] += 1
+            logger.error(f"[LIVE-MINUTES] Fold failed for meeting {self.meeting_id}: {e}")
+            return
+        update = _parse_json(response or "")
+        if update is None:
+            builder._stats["fold_errors"] += 1
+            logger.warning(f"[LIVE-MINUTES] Unparseable fold response for meeting {self.meeting_id}")
+            return
+
+        merge_fold(draft, update)
+        draft.folded_chars += len(segment)
+        draft.folds += 1
+        draft.updated_at = datetime.now(UTC).isoformat()
+        builder._stats["folds"] += 1
+        await builder.store_set(builder.state_key(self.meeting_id), draft.model_dump(), builder.state_ttl)
+        await builder.notify(self.meeting_id, "minutes", draft.model_dump(exclude={"meeting_id"}))
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer or (self._folding is not None and not self._folding.done()):
+            await self.schedule_fold()
+
+    def cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._folding is not None and not self._folding.done():
+            self._folding.cancel()
+
+
+class LiveMinutesBuilder:
+    """
+    Per-meeting incremental minutes for live meetings.
+    """
+
+    def __init__(
+        self,
+        fold_llm: Optional[Any] = None,
+        consolidation_llm: Optional[Any] = None,
+        store_get: Optional[Callable[[str], Awaitable[Any]]] = None,
+        store_set: Optional[Callable[..., Awaitable[None]]] = None,
+        notify: Optional[Callable[[str, str, Dict[str, Any]], Awaitable[None]]] = None,
+        segment_chars: Optional[int] = None,
+        debounce: Optional[float] = None,
+        min_coverage: Optional[float] = None,
+        state_ttl: Optional[int] = None,
+        idle_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            fold_llm: LLM for per-segment folds (default: the live LLM service)
+            consolidation_llm: LLM for the final pass (default: the main LLM service)
+            store_get: Async draft loader (default: cache_service.get)
+            store_set: Async draft saver (default: cache_service.set)
+            notify: Async (meeting_id, stream, snapshot) publisher
+                (default: BroadcastService.notify_live_state)
+            segment_chars: Buffered transcript characters that trigger a fold
+            debounce: Seconds of quiet after which a partial segment is folded
+            min_coverage: Share of the final transcript the draft must cover to be used
+            state_ttl: Seconds the draft is kept in the cache
+            idle_timeout: Seconds without chunks before an unfinished session is dropped
+        """
+        self._fold_llm = fold_llm
+        self._consolidation_llm = consolidation_llm
+        self._store_get = store_get
+        self._store_set = store_set
+        self._notify = notify
+        self.segment_chars = segment_chars or settings.LIVE_MINUTES_SEGMENT_CHARS
+        self.debounce = settings.LIVE_MINUTES_DEBOUNCE_SECONDS if debounce is None else debounce
+        self.min_coverage = settings.LIVE_MINUTES_MIN_COVERAGE if min_coverage is None else min_coverage
+        self.state_ttl = state_ttl or settings.LIVE_MINUTES_STATE_TTL_SECONDS
+        self.idle_timeout = idle_timeout or settings.LIVE_ANALYSIS_IDLE_SECONDS
+        self.fold_max_tokens = 800
+        self.sessions: Dict[str, LiveMinutesSession] = {}
+        self._stats = {"chunks": 0, "folds": 0, "fold_errors": 0, "finalized": 0, "consolidated": 0, "fallbacks": 0}
+
+    # =========================================================================
+    # DEPENDENCIES (resolved lazily so importing this module stays cheap)
+    # =========================================================================
+
+    @property
+    def fold_llm(self):
+        if self._fold_llm is None:
+            from app.services.llm_service import get_live_llm_service
+            self._fold_llm = get_live_llm_service()
+        return self._fold_llm
+
+    @property
+    def consolidation_llm(self):
+        if self._consolidation_llm is None:
+            from app.services.llm_service import get_llm_service
+            self._consolidation_llm = get_llm_service()
+        return self._consolidation_llm
+
+    @staticmethod
+    def state_key(meeting_id: str) -> str:
+        return f"live_minutes:{meeting_id}"
+
+    async def store_get(self, key: str) -> Any:
+        if self._store_get is None:
+            from app.core.cache import cache_service
+            await cache_service.connect()
+            return await cache_service.get(key)
+        return await self._store_get(key)
+
+    async def store_set(self, key: str, value: Any, ttl: int) -> None:
+        if self._store_set is None:
+            from app.core.cache import cache_service
+            await cache_service.connect()
+            await cache_service.set(key, value, ttl=ttl)
+        else:
+            await self._store_set(key, value, ttl)
+
+    async def notify(self, meeting_id: str, stream: str, snapshot: Dict[str, Any]) -> None:
+        if self._notify is None:
+            from app.services.broadcast_service import get_broadcast_service
+            self._notify = get_broadcast_service().notify_live_state
+        await self._notify(meeting_id, stream, snapshot)
+
+    # =========================================================================
+    # LIVE FEED
+    # =========================================================================
+
+    def submit(self, meeting_id: str, chunk_text: str, meeting_title: Optional[str] = None) -> None:
+        """
+        Queue a live transcript chunk (never blocks).
+
+        Args:
+            meeting_id: Meeting ID
+            chunk_text: New transcript text
+            meeting_title: Title for the fold prompt, if known
+        """
+        if not chunk_text or not chunk_text.strip():
+            return
+        meeting_id = str(meeting_id)
+        session = self.sessions.get(meeting_id)
+        if session is None:
+            self._evict_idle()
+            session = self.sessions[meeting_id] = LiveMinutesSession(meeting_id, self)
+        if meeting_title:
+            session.meeting_title = meeting_title
+        self._stats["chunks"] += 1
+        session.add(chunk_text)
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        for meeting_id, session in list(self.sessions.items()):
+            if session.last_chunk_at < cutoff:
+                session.cancel()
+                del self.sessions[meeting_id]
+
+    async def get_draft(self, meeting_id: str) -> Optional[LiveMinutesDraft]:
+        """The draft so far (from this process or the shared cache)."""
+        session = self.sessions.get(str(meeting_id))
+        if session is not None and session.draft is not None:
+            return session.draft
+        saved = await self.store_get(self.state_key(str(meeting_id)))
+        return LiveMinutesDraft(**saved) if saved else None
+
+    # =========================================================================
+    # MEETING END
+    # =========================================================================
+
+    async def finalize(
+        self,
+        meeting_id: str,
+        meeting_context: Dict[str, Any],
+        transcript_text: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Produce minutes from the live draft.
+
+        Args:
+            meeting_id: Meeting ID
+            meeting_context: Same keys as DocumentSynthesizer.synthesize_minutes
+            transcript_text: Final transcript, to check the draft covers it
+
+        Returns:
+            {"content", "metadata"} like synthesize_minutes, or None if there
+            is no usable live draft (callers fall back to full synthesis)
+        """
+        meeting_id = str(meeting_id)
+        session = self.sessions.pop(meeting_id, None)
+        if session is not None:
+            if meeting_context.get("meeting_title"):
+                session.meeting_title = meeting_context["meeting_title"]
+            await session.flush()
+            draft = session.draft
+        else:
+            draft = None
+        if draft is None:
+            draft = await self.get_draft(meeting_id)
+
+        transcript_chars = len(transcript_text.strip()) if transcript_text else 0
+        if draft is None or draft.folds == 0 or (
+            transcript_chars and draft.folded_chars < self.min_coverage * transcript_chars
+        ):
+            self._stats["fallbacks"] += 1
+            if draft is not None:
+                logger.info(
+                    f"[LIVE-MINUTES] Draft for {meeting_id} covers {draft.folded_chars}/{transcript_chars} chars; "
+                    "using full synthesis"
+                )
+            return None
+
+        started = time.monotonic()
+        prompt = CONSOLIDATE_PROMPT.format(
+            meeting_title=meeting_context.get("meeting_title", "Untitled Meeting"),
+            meeting_date=meeting_context.get("meeting_date", "Unknown Date"),
+            pillar_name=meeting_context.get("pillar_name", "General"),
+            attendees_list=meeting_context.get("attendees_list", "Not recorded"),
+            agenda_content=meeting_context.get("agenda_content", "Not provided"),
+            draft=json.dumps(draft.notes(), ensure_ascii=False, indent=1)
+        )
+        consolidated = True
+        try:
+            content = await asyncio.to_thread(self.consolidation_llm.chat, prompt)
+            if not content or not content.strip():
+                raise ValueError("empty consolidation response")
+            self._stats["consolidated"] += 1
+        except Exception as e:
+            logger.error(f"[LIVE-MINUTES] Consolidation failed for {meeting_id}, rendering draft directly: {e}")
+            content = render_minutes(draft, meeting_context)
+            consolidated = False
+
+        self._stats["finalized"] += 1
+        logger.info(
+            f"[LIVE-MINUTES] Minutes for {meeting_id} ready in {time.monotonic() - started:.1f}s "
+            f"from {draft.folds} live folds"
+        )
+        return {
+            "content": content,
+            "metadata": {
+                "source_transcript_length": transcript_chars or draft.folded_chars,
+                "generated_at": datetime.now(UTC).isoformat(),
+                "source": "live_minutes",
+                "live_folds": draft.folds,
+                "consolidated": consolidated,
+                "key_decisions": draft.decisions
+            }
+        }
+
+    def get_stats(self) -> LiveMinutesStats:
+        return LiveMinutesStats(sessions=len(self.sessions), **self._stats)
+
+    async def close(self) -> None:
+        """Stop all sessions (application shutdown); saved drafts stay in the cache."""
+        sessions, self.sessions = list(self.sessions.values()), {}
+        for session in sessions:
+            session.cancel()
+
+
+# Singleton instance
+_live_minutes_builder: Optional[LiveMinutesBuilder] = None
+
+
+def get_live_minutes_builder() -> LiveMinutesBuilder:
+    """Get or create the process-wide live minutes builder"""
+    global _live_minutes_builder
+    if _live_minutes_builder is None:
+        _live_minutes_builder = LiveMinutesBuilder()
+    return _live_minutes_builder
+
+
+async def close_live_minutes_builder() -> None:
+    """Close the builder if it was ever created (application shutdown)."""
+    global _live_minutes_builder
+    if _live_minutes_builder is not None:
+        await _live_minutes_builder.close()
+        _live_minutes_builder = None
+
+
+async def build_minutes(
+    meeting_id: str,
+    transcript_text: str,
+    meeting_context: Dict[str, Any],
+    synthesizer: Any
+) -> Dict[str, Any]:
+    """
+    Minutes for a finished meeting: from the live draft when it covers the
+    transcript, otherwise full synthesis over the transcript.
+
+    Args:
+        meeting_id: Meeting ID
+        transcript_text: Final transcript
+        meeting_context: Context for synthesize_minutes
+        synthesizer: DocumentSynthesizer for the fallback
+
+    Returns:
+        {"content", "metadata"}
+    """
+    if settings.LIVE_MINUTES_ENABLED:
+        try:
+            result = await get_live_minutes_builder().finalize(meeting_id, meeting_context, transcript_text)
+            if result is not None:
+                return result
+        except Exception as e:
+            logger.error(f"[LIVE-MINUTES] Live draft unavailable for {meeting_id}: {e}")
+    return await asyncio.to_thread(synthesizer.synthesize_minutes, transcript_text, meeting_context)
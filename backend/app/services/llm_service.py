@@ -7,9 +7,10 @@ or OpenAI-compatible APIs (OpenAI, GitHub Models, Custom vLLM).
 
 import requests
 import json
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator
 from loguru import logger
 from app.core.config import settings
+from app.core.tracing_context import record_token_usage
 
 try:
     from openai import OpenAI
@@ -17,6 +18,13 @@ except ImportError:
     OpenAI = None
 
 
+def record_openai_usage(response: Any) -> None:
+    """Attach token counts from an OpenAI-style completion to the current trace span."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        record_token_usage(getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0))
+
+
 class LLMService:
     """Base interface for LLM services"""
     def chat(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
@@ -25,6 +33,10 @@ class LLMService:
     def chat_with_history(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None, **kwargs) -> str:
         raise NotImplementedError
 
+    def stream_chat(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """Yield the response in text chunks as it is generated (default: one chunk)."""
+        yield self.chat(prompt, system_prompt=system_prompt, **kwargs)
+
     def transcribe_audio(self, file_path: str, **kwargs) -> str:
         raise NotImplementedError
 
@@ -65,11 +77,44 @@ class OllamaLLMService(LLMService):
         try:
             response = requests.post(self.api_endpoint, json=payload, timeout=self.timeout)
             response.raise_for_status()
-            return response.json().get("response", "").strip()
+            data = response.json()
+            record_token_usage(data.get("prompt_eval_count"), data.get("eval_count"))
+            return data.get("response", "").strip()
         except Exception as e:
             logger.error(f"Ollama API error: {e}")
             raise Exception(f"Ollama Error: {str(e)}")
 
+    def stream_chat(self, prompt: str, system_prompt: Optional[str] = None, temperature: Optional[float] = None, max_tokens: int = 1000) -> Iterator[str]:
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\nUser: {prompt}\n\nAssistant:"
+
+        payload = {
+            "model": self.model,
+            "prompt": full_prompt,
+            "stream": True,
+            "options": {
+                "temperature": temperature if temperature is not None else self.temperature,
+                "num_predict": max_tokens
+            }
+        }
+
+        try:
+            with requests.post(self.api_endpoint, json=payload, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                # Ollama streams one JSON object per line; the last one carries the token counts
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        record_token_usage(data.get("prompt_eval_count"), data.get("eval_count"))
+        except Exception as e:
+            logger.error(f"Ollama stream error: {e}")
+            raise Exception(f"Ollama Error: {str(e)}")
+
     def chat_with_history(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None, temperature: Optional[float] = None) -> str:
         conversation = ""
         if system_prompt:
@@ -94,7 +139,9 @@ class OllamaLLMService(LLMService):
         try:
             response = requests.post(self.api_endpoint, json=payload, timeout=self.timeout)
             response.raise_for_status()
-            return response.json().get("response", "").strip()
+            data = response.json()
+            record_token_usage(data.get("prompt_eval_count"), data.get("eval_count"))
+            return data.get("response", "").strip()
         except Exception as e:
             logger.error(f"Ollama History error: {e}")
             raise Exception(f"Ollama Error: {str(e)}")
@@ -133,6 +180,7 @@ class OpenAILLMService(LLMService):
 
         try:
             response = self.client.chat.completions.create(**create_kwargs)
+            record_openai_usage(response)
             message = response.choices[0].message
             
             if message.tool_calls:
@@ -143,6 +191,30 @@ class OpenAILLMService(LLMService):
             logger.error(f"OpenAI API error: {e}")
             raise Exception(f"OpenAI Error: {str(e)}")
 
+    def stream_chat(self, prompt: str, system_prompt: Optional[str] = None, temperature: Optional[float] = None, max_tokens: int = 2000) -> Iterator[str]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature if temperature is not None else self.temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            for chunk in stream:
+                # Some providers send a final usage-only chunk with no choices
+                if getattr(chunk, "usage", None):
+                    record_openai_usage(chunk)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"OpenAI stream error: {e}")
+            raise Exception(f"OpenAI Error: {str(e)}")
+
     def chat_with_history(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None, temperature: Optional[float] = None, tools: Optional[List[Dict]] = None) -> Any:
         full_messages = []
         if system_prompt:
@@ -179,6 +251,7 @@ class OpenAILLMService(LLMService):
 
         try:
             response = self.client.chat.completions.create(**create_kwargs)
+            record_openai_usage(response)
             message = response.choices[0].message
             
             if message.tool_calls:
@@ -208,8 +281,52 @@ class OpenAILLMService(LLMService):
             raise Exception(f"OpenAI Transcription Error: {str(e)}")
 
 
-# Singleton instance
+# Singleton instances
 _llm_service = None
+_live_llm_service = None
+
+
+def _build_llm_service(model: Optional[str] = None) -> LLMService:
+    """
+    Build an LLM service for the configured provider.
+
+    Args:
+        model: Model override (default: the provider's configured model)
+    """
+    provider = getattr(settings, "LLM_PROVIDER", "ollama").lower()
+    logger.info(f"Selecting LLM Provider: {provider}")
+
+    if provider == "openai" and getattr(settings, "OPENAI_API_KEY", None):
+        return OpenAILLMService(
+            api_key=settings.OPENAI_API_KEY,
+            model=model or getattr(settings, "OPENAI_MODEL", "gpt-4-turbo-preview"),
+            temperature=settings.LLM_TEMPERATURE
+        )
+    elif provider == "custom" and getattr(settings, "CUSTOM_LLM_BASE_URL", None):
+        logger.info(f"[CUSTOM] Connecting to vLLM at: {settings.CUSTOM_LLM_BASE_URL} (Model: {model or settings.CUSTOM_LLM_MODEL})")
+        return OpenAILLMService(
+            api_key=settings.CUSTOM_LLM_API_KEY,
+            model=model or settings.CUSTOM_LLM_MODEL,
+            temperature=settings.LLM_TEMPERATURE,
+            base_url=settings.CUSTOM_LLM_BASE_URL
+        )
+    elif provider == "github" and getattr(settings, "GITHUB_TOKEN", None):
+        return OpenAILLMService(
+            api_key=settings.GITHUB_TOKEN,
+            model=(model or getattr(settings, "GITHUB_MODEL", "gpt-4o-mini")).replace("openai/", ""),
+            temperature=settings.LLM_TEMPERATURE,
+            base_url=settings.GITHUB_BASE_URL
+        )
+
+    if provider != "ollama":
+        logger.warning(f"Provider '{provider}' selected but not configured or unsupported. Falling back to Ollama.")
+
+    return OllamaLLMService(
+        base_url=settings.OLLAMA_BASE_URL,
+        model=model or settings.OLLAMA_MODEL,
+        temperature=settings.LLM_TEMPERATURE,
+        timeout=settings.LLM_TIMEOUT
+    )
 
 
 def get_llm_service() -> LLMService:
@@ -218,42 +335,23 @@ def get_llm_service() -> LLMService:
     """
     global _llm_service
     if _llm_service is None:
-        provider = getattr(settings, "LLM_PROVIDER", "ollama").lower()
-        logger.info(f"Selecting LLM Provider: {provider}")
-        
-        if provider == "openai" and getattr(settings, "OPENAI_API_KEY", None):
-            _llm_service = OpenAILLMService(
-                api_key=settings.OPENAI_API_KEY,
-                model=getattr(settings, "OPENAI_MODEL", "gpt-4-turbo-preview"),
-                temperature=settings.LLM_TEMPERATURE
-            )
-        elif provider == "custom" and getattr(settings, "CUSTOM_LLM_BASE_URL", None):
-             logger.info(f"[CUSTOM] Connecting to vLLM at: {settings.CUSTOM_LLM_BASE_URL} (Model: {settings.CUSTOM_LLM_MODEL})")
-             _llm_service = OpenAILLMService(
-                api_key=settings.CUSTOM_LLM_API_KEY,
-                model=settings.CUSTOM_LLM_MODEL,
-                temperature=settings.LLM_TEMPERATURE,
-                base_url=settings.CUSTOM_LLM_BASE_URL
-            )
-        elif provider == "github" and getattr(settings, "GITHUB_TOKEN", None):
-             _llm_service = OpenAILLMService(
-                api_key=settings.GITHUB_TOKEN,
-                model=getattr(settings, "GITHUB_MODEL", "gpt-4o-mini").replace("openai/", ""),
-                temperature=settings.LLM_TEMPERATURE,
-                base_url=settings.GITHUB_BASE_URL
-            )
-        else:
-            if provider != "ollama":
-                logger.warning(f"Provider '{provider}' selected but not configured or unsupported. Falling back to Ollama.")
-            
-            _llm_service = OllamaLLMService(
-                base_url=settings.OLLAMA_BASE_URL,
-                model=settings.OLLAMA_MODEL,
-                temperature=settings.LLM_TEMPERATURE,
-                timeout=settings.LLM_TIMEOUT
-            )
+        _llm_service = _build_llm_service()
     return _llm_service
 
 
+def get_live_llm_service() -> LLMService:
+    """
+    Get the LLM service for latency-sensitive live meeting analysis.
+
+    Uses LIVE_ANALYSIS_MODEL (a small, fast model on the same provider) when
+    set, otherwise the main service.
+    """
+    global _live_llm_service
+    if _live_llm_service is None:
+        model = settings.LIVE_ANALYSIS_MODEL
+        _live_llm_service = _build_llm_service(model) if model else get_llm_service()
+    return _live_llm_service
+
+
 # Create singleton instance for import
 llm_service = get_llm_service()
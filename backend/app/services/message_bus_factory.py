@@ -2,7 +2,12 @@
 Message Bus Factory
 
 Provides singleton factory function for creating and accessing the
-RedisMessageBus instance with configuration from app settings.
+message bus instance with configuration from app settings.
+
+MESSAGE_BUS_TRANSPORT selects the implementation: "list" (RedisMessageBus,
+LPUSH/BRPOP) or "streams" (RedisStreamMessageBus, consumer groups). When the
+registry resolves to in-process backends (REDIS_BACKEND), InProcessMessageBus
+is used instead and no Redis connection is made.
 
 Usage:
     from app.services.message_bus_factory import get_message_bus
@@ -14,10 +19,11 @@ Usage:
 from typing import Optional
 from loguru import logger
 
-import redis
 from redis.exceptions import ConnectionError
 
+from app.core.redis_pool import get_redis_registry
 from app.services.redis_message_bus import RedisMessageBus
+from app.services.redis_stream_bus import RedisStreamMessageBus
 from app.core.config import get_settings
 
 
@@ -25,9 +31,20 @@ from app.core.config import get_settings
 _message_bus_instance: Optional[RedisMessageBus] = None
 
 
+def _retry_kwargs(settings) -> dict:
+    """Retry / dead-letter settings shared by every transport."""
+    return dict(
+        max_retries=settings.MESSAGE_BUS_MAX_RETRIES,
+        retry_backoff_base=settings.MESSAGE_BUS_RETRY_BACKOFF_BASE,
+        retry_backoff_max=settings.MESSAGE_BUS_RETRY_BACKOFF_MAX,
+        dead_letter_max=settings.MESSAGE_BUS_DEAD_LETTER_MAX,
+        retry_poll_interval=settings.MESSAGE_BUS_RETRY_POLL_INTERVAL
+    )
+
+
 def get_message_bus(force_new: bool = False) -> RedisMessageBus:
     """
-    Get the singleton RedisMessageBus instance.
+    Get the singleton message bus instance.
 
     Creates a new instance on first call, then returns the same instance
     on subsequent calls. Loads configuration from app settings.
@@ -36,7 +53,8 @@ def get_message_bus(force_new: bool = False) -> RedisMessageBus:
         force_new: If True, create a new instance even if one exists
 
     Returns:
-        RedisMessageBus instance
+        RedisMessageBus instance (RedisStreamMessageBus for the streams transport,
+        InProcessMessageBus without Redis)
 
     Raises:
         ConnectionError: If Redis connection fails
@@ -50,25 +68,21 @@ def get_message_bus(force_new: bool = False) -> RedisMessageBus:
     if _message_bus_instance is None or force_new:
         settings = get_settings()
 
-        # Create Redis client
+        if get_redis_registry().resolve_backend() == "memory":
+            from app.services.inprocess_backend import InProcessMessageBus
+            _message_bus_instance = InProcessMessageBus(
+                namespace="ecowas",
+                default_timeout=settings.MESSAGE_BUS_DEFAULT_TIMEOUT,
+                max_queue_size=settings.MESSAGE_BUS_MAX_QUEUE_SIZE,
+                message_ttl=settings.MESSAGE_BUS_MESSAGE_TTL,
+                max_status_entries=settings.INPROCESS_MAX_ENTRIES,
+                **_retry_kwargs(settings)
+            )
+            return _message_bus_instance
+
+        # Client on the shared sync pool (we handle decoding ourselves)
         try:
-            if settings.REDIS_URL:
-                # Use URL if provided
-                redis_client = redis.from_url(
-                    settings.REDIS_URL,
-                    decode_responses=False,  # We handle decoding ourselves
-                    max_connections=settings.REDIS_MAX_CONNECTIONS
-                )
-            else:
-                # Use individual settings
-                redis_client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
-                    decode_responses=False,
-                    max_connections=settings.REDIS_MAX_CONNECTIONS
-                )
+            redis_client = get_redis_registry().get_sync_client(decode_responses=False)
 
             # Test connection
             redis_client.ping()
@@ -85,15 +99,26 @@ def get_message_bus(force_new: bool = False) -> RedisMessageBus:
             ) from e
 
         # Create message bus instance
-        _message_bus_instance = RedisMessageBus(
+        bus_kwargs = dict(
             redis_client=redis_client,
             namespace="ecowas",
             default_timeout=settings.MESSAGE_BUS_DEFAULT_TIMEOUT,
             max_queue_size=settings.MESSAGE_BUS_MAX_QUEUE_SIZE,
-            message_ttl=settings.MESSAGE_BUS_MESSAGE_TTL
+            message_ttl=settings.MESSAGE_BUS_MESSAGE_TTL,
+            **_retry_kwargs(settings)
         )
+        if settings.MESSAGE_BUS_TRANSPORT == "streams":
+            _message_bus_instance = RedisStreamMessageBus(
+                **bus_kwargs,
+                consumer_group=settings.MESSAGE_BUS_CONSUMER_GROUP,
+                claim_idle_ms=settings.MESSAGE_BUS_CLAIM_IDLE_MS,
+                ack_batch_size=settings.MESSAGE_BUS_ACK_BATCH_SIZE,
+                ack_flush_interval=settings.MESSAGE_BUS_ACK_FLUSH_INTERVAL
+            )
+        else:
+            _message_bus_instance = RedisMessageBus(**bus_kwargs)
 
-        logger.info("RedisMessageBus singleton instance created")
+        logger.info(f"{type(_message_bus_instance).__name__} singleton instance created")
 
     return _message_bus_instance
 
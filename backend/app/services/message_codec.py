@@ -0,0 +1,205 @@
+"""
+Payload Codecs for Redis-stored Messages
+
+Pluggable serialization for message bus payloads and memory entries:
+- msgpack (ormsgpack) or orjson encoding instead of json.dumps
+- A small versioned binary envelope so formats can evolve
+- Optional zstd compression for payloads above a size threshold
+- Per-namespace codec selection (e.g. "bus", "memory") from settings
+- Backward-compatible reads: anything without the envelope header is
+  treated as the legacy JSON text written before codecs existed
+
+Envelope layout (4-byte header + body):
+    0xC1 | envelope version | format id | flags (bit 0 = zstd)
+
+0xC1 is never emitted by msgpack and can't start UTF-8/JSON text, so
+enveloped and legacy payloads can't be confused.
+
+The Redis clients reading these payloads must use decode_responses=False.
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+from loguru import logger
+
+from app.core.config import settings
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+ENVELOPE_MAGIC = 0xC1
+ENVELOPE_VERSION = 1
+FLAG_ZSTD = 0x01
+
+FORMAT_JSON = 1
+FORMAT_ORJSON = 2
+FORMAT_MSGPACK = 3
+
+
+class CodecError(ValueError):
+    """Raised when a payload can't be decoded"""
+
+
+class MessageCodec:
+    """
+    Encodes Python values (dicts, lists, scalars) to bytes and back.
+
+    decode() accepts any format this module has ever written plus legacy
+    JSON, so the encoding can be changed without migrating stored data.
+    """
+
+    def __init__(
+        self,
+        encoding: str = "msgpack",
+        compress_threshold: Optional[int] = 1024,
+        compression_level: int = 3
+    ):
+        """
+        Initialize a codec.
+
+        Args:
+            encoding: "msgpack", "orjson" or "json" (falls back to the next
+                available one if the library isn't installed)
+            compress_threshold: zstd-compress bodies at least this many bytes
+                (None disables compression)
+            compression_level: zstd level
+        """
+        self.format = self._resolve_format(encoding)
+        self.compress_threshold = compress_threshold if zstandard is not None else None
+        self.compression_level = compression_level
+        if self.compress_threshold is not None:
+            self._compressor = zstandard.ZstdCompressor(level=compression_level)
+
+    @staticmethod
+    def _resolve_format(requested: str) -> str:
+        if requested == "msgpack" and ormsgpack is None:
+            logger.warning("ormsgpack not installed; falling back to orjson codec")
+            requested = "orjson"
+        if requested == "orjson" and orjson is None:
+            logger.warning("orjson not installed; falling back to json codec")
+            requested = "json"
+        if requested not in ("msgpack", "orjson", "json"):
+            raise ValueError(f"Unknown codec format '{requested}'")
+        return requested
+
+    # =========================================================================
+    # ENCODE
+    # =========================================================================
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serialize a value into an enveloped payload.
+
+        Args:
+            value: JSON-compatible value (use model_dump(mode="json") for models)
+
+        Returns:
+            bytes: Envelope header + (possibly compressed) body
+        """
+        if self.format == "msgpack":
+            format_id, body = FORMAT_MSGPACK, ormsgpack.packb(value)
+        elif self.format == "orjson":
+            format_id, body = FORMAT_ORJSON, orjson.dumps(value)
+        else:
+            format_id, body = FORMAT_JSON, json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+        flags = 0
+        if self.compress_threshold is not None and len(body) >= self.compress_threshold:
+            compressed = self._compressor.compress(body)
+            if len(compressed) < len(body):
+                body, flags = compressed, flags | FLAG_ZSTD
+
+        return bytes((ENVELOPE_MAGIC, ENVELOPE_VERSION, format_id, flags)) + body
+
+    # =========================================================================
+    # DECODE
+    # =========================================================================
+
+    @staticmethod
+    def decode(payload: Union[bytes, str, None]) -> Any:
+        """
+        Deserialize an enveloped or legacy JSON payload.
+
+        Args:
+            payload: Raw value from Redis
+
+        Returns:
+            The decoded value (None for a None payload)
+
+        Raises:
+            CodecError: If the payload is malformed or uses an unknown format
+        """
+        if payload is None:
+            return None
+        if isinstance(payload, str):
+            return json.loads(payload)
+        if not payload or payload[0] != ENVELOPE_MAGIC:
+            # Written before codecs existed
+            return json.loads(payload)
+
+        if len(payload) < 4:
+            raise CodecError("Truncated payload envelope")
+        version, format_id, flags = payload[1], payload[2], payload[3]
+        if version > ENVELOPE_VERSION:
+            raise CodecError(f"Unsupported envelope version {version}")
+
+        body = payload[4:]
+        if flags & FLAG_ZSTD:
+            if zstandard is None:
+                raise CodecError("Payload is zstd-compressed but zstandard is not installed")
+            body = zstandard.ZstdDecompressor().decompress(body)
+
+        if format_id == FORMAT_MSGPACK:
+            if ormsgpack is None:
+                raise CodecError("Payload is msgpack but ormsgpack is not installed")
+            return ormsgpack.unpackb(body)
+        if format_id == FORMAT_ORJSON:
+            return orjson.loads(body) if orjson is not None else json.loads(body)
+        if format_id == FORMAT_JSON:
+            return json.loads(body)
+        raise CodecError(f"Unknown payload format id {format_id}")
+
+    def __repr__(self) -> str:
+        return f"<MessageCodec format='{self.format}' compress_threshold={self.compress_threshold}>"
+
+
+# Codec per namespace, built lazily from settings
+_codecs: Dict[str, MessageCodec] = {}
+
+
+def get_codec(namespace: str = "default") -> MessageCodec:
+    """
+    Get the codec configured for a namespace.
+
+    CODEC_NAMESPACES maps namespace -> format (e.g. {"bus": "msgpack",
+    "memory": "orjson"}); other namespaces use CODEC_DEFAULT_FORMAT.
+
+    Args:
+        namespace: Logical payload namespace ("bus", "memory", ...)
+
+    Returns:
+        MessageCodec: The shared codec instance
+    """
+    codec = _codecs.get(namespace)
+    if codec is None:
+        codec = MessageCodec(
+            encoding=settings.CODEC_NAMESPACES.get(namespace, settings.CODEC_DEFAULT_FORMAT),
+            compress_threshold=settings.CODEC_COMPRESS_THRESHOLD_BYTES or None,
+            compression_level=settings.CODEC_COMPRESSION_LEVEL
+        )
+        _codecs[namespace] = codec
+    return codec
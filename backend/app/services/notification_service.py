@@ -31,7 +31,7 @@ async def create_notification(
     await db.commit()
     await db.refresh(notification)
     
-    # Broadcast via WebSocket
+    # Deliver via WebSocket (reaches the user on whichever worker holds their socket)
     await ws_manager.send_personal_message(
         {
             "type": "NEW_NOTIFICATION",
@@ -0,0 +1,387 @@
+"""
+Shared Async Pub/Sub Hub
+
+One Redis pub/sub connection per process, multiplexed across every
+subscriber. Each subscriber gets a bounded queue and its own dispatch task,
+so a slow callback only delays (and eventually drops) its own messages and
+never stalls the reader. The hub reconnects with backoff and resubscribes
+all channels and patterns after a connection loss.
+
+Connection count stays at one and no threads are used, regardless of how
+many subscribers there are.
+
+Usage:
+    hub = get_pubsub_hub()
+
+    async def on_event(channel: str, data: str):
+        ...
+
+    subscription = await hub.subscribe("ecowas:events:meeting_started", on_event)
+    ...
+    await subscription.close()
+"""
+
+import asyncio
+import inspect
+import itertools
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Union
+
+import redis.asyncio as redis_async
+from loguru import logger
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_pool import get_redis_registry
+
+
+SubscriberCallback = Callable[[str, str], Union[None, Awaitable[None]]]
+
+
+class PubSubHubStats(BaseModel):
+    """Snapshot of hub state for monitoring"""
+    connected: bool
+    channels: int
+    patterns: int
+    subscribers: int
+    delivered: int
+    dropped: int
+    reconnects: int
+
+
+class Subscription:
+    """
+    One subscriber's registration on the hub.
+
+    Messages are queued (bounded, oldest dropped when full) and delivered to
+    the callback in order by a dedicated task.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        hub: "PubSubHub",
+        target: str,
+        callback: SubscriberCallback,
+        is_pattern: bool,
+        max_queue: int
+    ):
+        self.id = next(self._ids)
+        self.hub = hub
+        self.target = target
+        self.callback = callback
+        self.is_pattern = is_pattern
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.delivered = 0
+        self.dropped = 0
+        # Loop that owns the queue; offers from other threads must go through it
+        self.loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run(), name=f"pubsub-subscriber-{self.id}")
+
+    def offer(self, channel: str, data: str) -> None:
+        """Queue a message without blocking, dropping the oldest if full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logger.warning(
+                    f"[PUBSUB] Subscriber {self.id} on '{self.target}' is falling behind "
+                    f"({self.dropped} messages dropped)"
+                )
+        self.queue.put_nowait((channel, data))
+
+    async def _run(self) -> None:
+        while True:
+            channel, data = await self.queue.get()
+            try:
+                result = self.callback(channel, data)
+                if inspect.isawaitable(result):
+                    await result
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[PUBSUB] Subscriber {self.id} callback failed on '{channel}': {e}")
+
+    async def close(self) -> None:
+        """Unsubscribe and stop the dispatch task."""
+        await self.hub.unsubscribe(self)
+
+    async def _stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class PubSubHub:
+    """
+    Process-wide Redis pub/sub multiplexer.
+
+    Redis-level SUBSCRIBE/PSUBSCRIBE is issued once per channel or pattern,
+    however many local subscribers share it, and UNSUBSCRIBE when the last
+    one leaves.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis_async.Redis] = None,
+        max_queue: int = 1000,
+        max_backoff: float = 30.0,
+        poll_timeout: float = 1.0
+    ):
+        """
+        Initialize the hub. The connection is opened on first subscribe.
+
+        Args:
+            client: redis.asyncio client (decode_responses=True); built from settings if omitted
+            max_queue: Default per-subscriber queue size
+            max_backoff: Upper bound for the reconnect delay (seconds)
+            poll_timeout: How long each read waits for a message (seconds)
+        """
+        self.client = client or _client_from_settings()
+        self.max_queue = max_queue
+        self.max_backoff = max_backoff
+        self.poll_timeout = poll_timeout
+
+        self._channels: Dict[str, Set[Subscription]] = {}
+        self._patterns: Dict[str, Set[Subscription]] = {}
+        self._pubsub = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._connected = False
+        self._reconnects = 0
+        self._closed_subscriber_totals = {"delivered": 0, "dropped": 0}
+
+    # =========================================================================
+    # SUBSCRIPTIONS
+    # =========================================================================
+
+    async def subscribe(
+        self,
+        channel: str,
+        callback: SubscriberCallback,
+        max_queue: Optional[int] = None
+    ) -> Subscription:
+        """
+        Subscribe a callback to a channel.
+
+        Args:
+            channel: Channel name
+            callback: Called as callback(channel, data); may be async
+            max_queue: Queue size for this subscriber (default: hub setting)
+
+        Returns:
+            Subscription handle (close() to unsubscribe)
+        """
+        return await self._add(channel, callback, is_pattern=False, max_queue=max_queue)
+
+    async def psubscribe(
+        self,
+        pattern: str,
+        callback: SubscriberCallback,
+        max_queue: Optional[int] = None
+    ) -> Subscription:
+        """
+        Subscribe a callback to a glob-style channel pattern.
+
+        Args:
+            pattern: Channel pattern (e.g. "ecowas:events:*")
+            callback: Called as callback(channel, data); may be async
+            max_queue: Queue size for this subscriber (default: hub setting)
+
+        Returns:
+            Subscription handle (close() to unsubscribe)
+        """
+        return await self._add(pattern, callback, is_pattern=True, max_queue=max_queue)
+
+    async def _add(
+        self,
+        target: str,
+        callback: SubscriberCallback,
+        is_pattern: bool,
+        max_queue: Optional[int]
+    ) -> Subscription:
+        registry = self._patterns if is_pattern else self._channels
+        async with self._lock:
+            subscription = Subscription(self, target, callback, is_pattern, max_queue or self.max_queue)
+            first = target not in registry
+            registry.setdefault(target, set()).add(subscription)
+
+            if self._pubsub is None:
+                self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            if first:
+                try:
+                    if is_pattern:
+                        await self._pubsub.psubscribe(target)
+                    else:
+                        await self._pubsub.subscribe(target)
+                    self._connected = True
+                except RedisError as e:
+                    # The reader's reconnect loop resubscribes everything in the registry
+                    logger.warning(f"[PUBSUB] Subscribe to '{target}' deferred until reconnect: {e}")
+                    self._connected = False
+
+            if self._reader_task is None or self._reader_task.done():
+                self._reader_task = asyncio.create_task(self._reader(), name="pubsub-hub-reader")
+
+        logger.debug(f"[PUBSUB] Subscriber {subscription.id} added on '{target}'")
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber; the Redis-level subscription goes with the last one."""
+        registry = self._patterns if subscription.is_pattern else self._channels
+        async with self._lock:
+            subscribers = registry.get(subscription.target)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del registry[subscription.target]
+                if self._pubsub is not None and self._connected:
+                    try:
+                        if subscription.is_pattern:
+                            await self._pubsub.punsubscribe(subscription.target)
+                        else:
+                            await self._pubsub.unsubscribe(subscription.target)
+                    except RedisError as e:
+                        logger.warning(f"[PUBSUB] Unsubscribe from '{subscription.target}' failed: {e}")
+
+        self._closed_subscriber_totals["delivered"] += subscription.delivered
+        self._closed_subscriber_totals["dropped"] += subscription.dropped
+        await subscription._stop()
+
+    # =========================================================================
+    # READER
+    # =========================================================================
+
+    async def _reader(self) -> None:
+        """Read from the shared connection and fan out; reconnect on failure."""
+        backoff = 0.5
+        while True:
+            if not self._channels and not self._patterns:
+                # Nothing to read (a fresh connection isn't opened until a subscribe)
+                await asyncio.sleep(self.poll_timeout)
+                continue
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.poll_timeout
+                )
+                backoff = 0.5
+                if message:
+                    self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._connected = False
+                logger.warning(f"[PUBSUB] Connection lost ({e}); reconnecting in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                await self._reconnect()
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        channel = message.get("channel")
+        data = message.get("data")
+        if message.get("type") == "pmessage":
+            subscribers = self._patterns.get(message.get("pattern"), ())
+        else:
+            subscribers = self._channels.get(channel, ())
+        for subscription in list(subscribers):
+            subscription.offer(channel, data)
+
+    async def _reconnect(self) -> None:
+        """Open a fresh pub/sub connection and resubscribe everything."""
+        async with self._lock:
+            old = self._pubsub
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await old.aclose()
+            except Exception:
+                pass
+            try:
+                if self._channels:
+                    await self._pubsub.subscribe(*self._channels)
+                if self._patterns:
+                    await self._pubsub.psubscribe(*self._patterns)
+                self._connected = True
+                self._reconnects += 1
+                logger.info(
+                    f"[PUBSUB] Reconnected; resubscribed {len(self._channels)} channels, "
+                    f"{len(self._patterns)} patterns"
+                )
+            except RedisError as e:
+                logger.warning(f"[PUBSUB] Resubscribe failed: {e}")
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    def get_stats(self) -> PubSubHubStats:
+        subscribers = [s for subs in (*self._channels.values(), *self._patterns.values()) for s in subs]
+        return PubSubHubStats(
+            connected=self._connected,
+            channels=len(self._channels),
+            patterns=len(self._patterns),
+            subscribers=len(subscribers),
+            delivered=self._closed_subscriber_totals["delivered"] + sum(s.delivered for s in subscribers),
+            dropped=self._closed_subscriber_totals["dropped"] + sum(s.dropped for s in subscribers),
+            reconnects=self._reconnects
+        )
+
+    async def close(self) -> None:
+        """Stop the reader and all subscribers, and close the connection."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
+        for subs in (*self._channels.values(), *self._patterns.values()):
+            for subscription in list(subs):
+                await subscription._stop()
+        self._channels.clear()
+        self._patterns.clear()
+
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+        self._connected = False
+        logger.info("[PUBSUB] Hub closed")
+
+
+def _client_from_settings() -> redis_async.Redis:
+    # The pub/sub connection is checked out of the shared async pool
+    return get_redis_registry().get_async_client(decode_responses=True)
+
+
+# Singleton instance
+_pubsub_hub: Optional[PubSubHub] = None
+
+
+def get_pubsub_hub() -> PubSubHub:
+    """Get or create the process-wide pub/sub hub (in-process when Redis isn't used)"""
+    global _pubsub_hub
+    if _pubsub_hub is None and get_redis_registry().resolve_backend() == "memory":
+        from app.services.inprocess_backend import get_local_pubsub_hub
+        _pubsub_hub = get_local_pubsub_hub()
+    if _pubsub_hub is None:
+        _pubsub_hub = PubSubHub(
+            max_queue=settings.PUBSUB_SUBSCRIBER_QUEUE_SIZE,
+            max_backoff=settings.PUBSUB_RECONNECT_MAX_BACKOFF
+        )
+    return _pubsub_hub
+
+
+async def close_pubsub_hub() -> None:
+    """Close the hub if it was ever created (application shutdown)."""
+    global _pubsub_hub
+    if _pubsub_hub is not None:
+        await _pubsub_hub.close()
+        _pubsub_hub = None
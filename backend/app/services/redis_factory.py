@@ -2,13 +2,22 @@
 Redis Memory Factory
 
 Factory functions to create Redis memory service from configuration.
+
+When the registry resolves to in-process backends (REDIS_BACKEND), the
+in-process memory services are returned instead.
 """
 
 from typing import Optional
 from loguru import logger
 
-from app.services.redis_memory import RedisMemoryService, get_redis_memory
+from app.services.redis_memory import (
+    RedisMemoryService,
+    AsyncRedisMemoryService,
+    get_redis_memory,
+    get_async_redis_memory,
+)
 from app.core.config import get_settings
+from app.core.redis_pool import get_redis_registry
 
 
 def create_redis_memory_from_config() -> Optional[RedisMemoryService]:
@@ -21,6 +30,10 @@ def create_redis_memory_from_config() -> Optional[RedisMemoryService]:
     try:
         settings = get_settings()
 
+        if get_redis_registry().resolve_backend() == "memory":
+            from app.services.inprocess_backend import get_inprocess_memory
+            return get_inprocess_memory()
+
         redis_memory = get_redis_memory(
             host=settings.REDIS_HOST,
             port=settings.REDIS_PORT,
@@ -43,6 +56,37 @@ def create_redis_memory_from_config() -> Optional[RedisMemoryService]:
         return None
 
 
+def create_async_redis_memory_from_config() -> Optional[AsyncRedisMemoryService]:
+    """
+    Create the async Redis memory service from application configuration.
+
+    The client connects lazily, so this does not touch the network.
+
+    Returns:
+        AsyncRedisMemoryService instance or None if creation fails
+    """
+    try:
+        settings = get_settings()
+
+        if get_redis_registry().resolve_backend() == "memory":
+            from app.services.inprocess_backend import get_inprocess_async_memory
+            return get_inprocess_async_memory()
+
+        redis_memory = get_async_redis_memory(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD
+        )
+        redis_memory.default_ttl = settings.REDIS_MEMORY_TTL
+
+        return redis_memory
+
+    except Exception as e:
+        logger.error(f"Failed to create async Redis memory service from config: {e}")
+        return None
+
+
 def test_redis_connection() -> bool:
     """
     Test Redis connection using configuration settings.
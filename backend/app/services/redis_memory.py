@@ -3,14 +3,26 @@ Redis Memory Service
 
 Provides persistent, distributed memory storage for agent conversations using Redis.
 Supports conversation history tracking, session management, and cross-instance state sharing.
+
+Values are serialized with the "memory" namespace codec (see message_codec);
+entries written as plain JSON by older versions are still readable.
 """
 
 import json
 from typing import List, Dict, Optional, Any
 from datetime import timedelta
 import redis
+import redis.asyncio as redis_async
 from loguru import logger
 
+from app.core.redis_pool import build_redis_url, get_redis_registry
+from app.services.message_codec import MessageCodec, get_codec
+
+
+def _text(value: Any) -> Any:
+    """Decode a bytes reply (clients use decode_responses=False for binary payloads)."""
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
 
 class RedisMemoryService:
     """Redis-based memory service for agent conversation persistence"""
@@ -21,7 +33,8 @@ class RedisMemoryService:
         port: int = 6379,
         db: int = 0,
         password: Optional[str] = None,
-        default_ttl: int = 86400  # 24 hours in seconds
+        default_ttl: int = 86400,  # 24 hours in seconds
+        codec: Optional[MessageCodec] = None
     ):
         """
         Initialize Redis memory service.
@@ -32,18 +45,18 @@ class RedisMemoryService:
             db: Redis database number
             password: Redis password (optional)
             default_ttl: Default time-to-live for keys in seconds (default: 24h)
+            codec: Payload codec (default: the "memory" namespace codec)
         """
         self.default_ttl = default_ttl
+        self.codec = codec or get_codec("memory")
+        # Agents whose session index has been backfilled from a SCAN in this process
+        self._indexed_agents: set = set()
 
         try:
-            self.client = redis.Redis(
-                host=host,
-                port=port,
-                db=db,
-                password=password,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_keepalive=True
+            # Shared pool from the registry (one pool per URL across services)
+            self.client = get_redis_registry().get_sync_client(
+                build_redis_url(host, port, db, password),
+                decode_responses=False
             )
             # Test connection
             self.client.ping()
@@ -65,6 +78,59 @@ class RedisMemoryService:
         """
         return f"ecowas:{namespace}:{identifier}"
 
+    def _sessions_index_key(self, agent_id: str) -> str:
+        """
+        Key of the per-agent SET of session IDs with stored history.
+
+        Maintained on every history write so session listing and per-agent
+        cleanup never need a keyspace-wide KEYS.
+        """
+        return self._make_key("index", f"sessions:{agent_id}")
+
+    def _backfill_session_index(self, agent_id: str) -> None:
+        """
+        One-off (per process, per agent) SCAN to index histories written
+        before the session index existed. SCAN is incremental, so unlike KEYS
+        it doesn't block Redis for other clients.
+        """
+        if agent_id in self._indexed_agents:
+            return
+        prefix = self._make_key("history", f"{agent_id}:")
+        session_ids = [_text(key)[len(prefix):] for key in self.client.scan_iter(match=f"{prefix}*", count=500)]
+        if session_ids:
+            self.client.sadd(self._sessions_index_key(agent_id), *session_ids)
+        self._indexed_agents.add(agent_id)
+
+    def _migrate_legacy_history(self, key: str) -> None:
+        """
+        Convert a history stored as one JSON string (pre-list format) into a
+        Redis list in place, preserving its TTL. Safe to race: WATCH aborts if
+        another client migrates or writes the key first.
+
+        Args:
+            key: History key
+        """
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.watch(key)
+                if _text(pipe.type(key)) != "string":
+                    pipe.unwatch()
+                    return
+                raw = pipe.get(key)
+                ttl = pipe.ttl(key)
+                items = json.loads(raw) if raw else []
+
+                pipe.multi()
+                pipe.delete(key)
+                if items:
+                    pipe.rpush(key, *[self.codec.encode(m) for m in items])
+                if ttl and ttl > 0:
+                    pipe.expire(key, ttl)
+                pipe.execute()
+                logger.info(f"Migrated legacy history {key} ({len(items)} messages) to list format")
+        except redis.WatchError:
+            logger.debug(f"History {key} changed during migration; another client handled it")
+
     def save_conversation_history(
         self,
         agent_id: str,
@@ -73,7 +139,10 @@ class RedisMemoryService:
         ttl: Optional[int] = None
     ) -> bool:
         """
-        Save conversation history to Redis.
+        Save (replace) conversation history in Redis.
+
+        History is stored as a Redis list with one codec-encoded message per
+        element, so appends and windowed reads don't touch the whole history.
 
         Args:
             agent_id: Agent identifier
@@ -86,10 +155,18 @@ class RedisMemoryService:
         """
         try:
             key = self._make_key("history", f"{agent_id}:{session_id}")
-            value = json.dumps(history)
             ttl = ttl or self.default_ttl
 
-            self.client.setex(key, ttl, value)
+            # Replace atomically (MULTI/EXEC) so readers never see a half-written list
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(key)
+            if history:
+                pipe.rpush(key, *[self.codec.encode(m) for m in history])
+                pipe.expire(key, ttl)
+                pipe.sadd(self._sessions_index_key(agent_id), session_id)
+            else:
+                pipe.srem(self._sessions_index_key(agent_id), session_id)
+            pipe.execute()
             logger.debug(f"Saved history for {agent_id}:{session_id} (TTL: {ttl}s)")
             return True
         except Exception as e:
@@ -99,7 +176,9 @@ class RedisMemoryService:
     def get_conversation_history(
         self,
         agent_id: str,
-        session_id: str
+        session_id: str,
+        start: int = 0,
+        end: int = -1
     ) -> List[Dict[str, str]]:
         """
         Retrieve conversation history from Redis.
@@ -107,19 +186,27 @@ class RedisMemoryService:
         Args:
             agent_id: Agent identifier
             session_id: Session identifier
+            start: First message index (LRANGE semantics, negative counts from the end)
+            end: Last message index, inclusive (default: -1 = last message)
 
         Returns:
             List of message dictionaries (empty list if not found)
         """
         try:
             key = self._make_key("history", f"{agent_id}:{session_id}")
-            value = self.client.get(key)
-
-            if value is None:
+            try:
+                values = self.client.lrange(key, start, end)
+            except redis.ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                self._migrate_legacy_history(key)
+                values = self.client.lrange(key, start, end)
+
+            if not values:
                 logger.debug(f"No history found for {agent_id}:{session_id}")
                 return []
 
-            history = json.loads(value)
+            history = [self.codec.decode(v) for v in values]
             logger.debug(f"Retrieved {len(history)} messages for {agent_id}:{session_id}")
             return history
         except Exception as e:
@@ -137,6 +224,9 @@ class RedisMemoryService:
         """
         Append a message to conversation history.
 
+        Constant-cost and safe under concurrent writers: RPUSH + LTRIM + EXPIRE
+        run in a single MULTI/EXEC instead of a read-modify-write of the list.
+
         Args:
             agent_id: Agent identifier
             session_id: Session identifier
@@ -147,19 +237,27 @@ class RedisMemoryService:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            # Get current history
-            history = self.get_conversation_history(agent_id, session_id)
-
-            # Append new message
-            history.append(message)
-
-            # Trim if max_history is specified
-            if max_history and len(history) > max_history:
-                history = history[-max_history:]
+        key = self._make_key("history", f"{agent_id}:{session_id}")
+        ttl = ttl or self.default_ttl
+
+        def _append():
+            pipe = self.client.pipeline(transaction=True)
+            pipe.rpush(key, self.codec.encode(message))
+            if max_history:
+                pipe.ltrim(key, -max_history, -1)
+            pipe.expire(key, ttl)
+            pipe.sadd(self._sessions_index_key(agent_id), session_id)
+            pipe.execute()
 
-            # Save updated history
-            return self.save_conversation_history(agent_id, session_id, history, ttl)
+        try:
+            try:
+                _append()
+            except redis.ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                self._migrate_legacy_history(key)
+                _append()
+            return True
         except Exception as e:
             logger.error(f"Failed to append to history: {e}")
             return False
@@ -181,7 +279,10 @@ class RedisMemoryService:
         """
         try:
             key = self._make_key("history", f"{agent_id}:{session_id}")
-            self.client.delete(key)
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(key)
+            pipe.srem(self._sessions_index_key(agent_id), session_id)
+            pipe.execute()
             logger.info(f"Cleared history for {agent_id}:{session_id}")
             return True
         except Exception as e:
@@ -207,7 +308,7 @@ class RedisMemoryService:
         """
         try:
             key = self._make_key("state", agent_id)
-            value = json.dumps(state)
+            value = self.codec.encode(state)
             ttl = ttl or self.default_ttl
 
             self.client.setex(key, ttl, value)
@@ -235,7 +336,7 @@ class RedisMemoryService:
                 logger.debug(f"No state found for {agent_id}")
                 return None
 
-            state = json.loads(value)
+            state = self.codec.decode(value)
             logger.debug(f"Retrieved state for {agent_id}")
             return state
         except Exception as e:
@@ -263,7 +364,7 @@ class RedisMemoryService:
         """
         try:
             redis_key = self._make_key("session", f"{session_id}:{key}")
-            serialized = json.dumps(value)
+            serialized = self.codec.encode(value)
             ttl = ttl or self.default_ttl
 
             self.client.setex(redis_key, ttl, serialized)
@@ -291,7 +392,7 @@ class RedisMemoryService:
             if value is None:
                 return None
 
-            return json.loads(value)
+            return self.codec.decode(value)
         except Exception as e:
             logger.error(f"Failed to get session data: {e}")
             return None
@@ -300,6 +401,9 @@ class RedisMemoryService:
         """
         Get all active session IDs for an agent.
 
+        Reads the per-agent session index; members whose history has expired
+        are pruned in the same pass.
+
         Args:
             agent_id: Agent identifier
 
@@ -307,15 +411,22 @@ class RedisMemoryService:
             List of session IDs
         """
         try:
-            pattern = self._make_key("history", f"{agent_id}:*")
-            keys = self.client.keys(pattern)
+            self._backfill_session_index(agent_id)
+            index_key = self._sessions_index_key(agent_id)
+            candidates = sorted(_text(sid) for sid in self.client.smembers(index_key))
+            if not candidates:
+                return []
 
-            # Extract session IDs from keys
-            sessions = []
-            prefix = self._make_key("history", f"{agent_id}:")
-            for key in keys:
-                session_id = key[len(prefix):]
-                sessions.append(session_id)
+            # One pipelined round trip to check which histories are still alive
+            pipe = self.client.pipeline(transaction=False)
+            for session_id in candidates:
+                pipe.exists(self._make_key("history", f"{agent_id}:{session_id}"))
+            alive = pipe.execute()
+
+            sessions = [sid for sid, exists in zip(candidates, alive) if exists]
+            expired = [sid for sid, exists in zip(candidates, alive) if not exists]
+            if expired:
+                self.client.srem(index_key, *expired)
 
             logger.debug(f"Found {len(sessions)} sessions for {agent_id}")
             return sessions
@@ -382,16 +493,19 @@ class RedisMemoryService:
             Number of keys deleted
         """
         try:
-            patterns = [
-                self._make_key("history", f"{agent_id}:*"),
-                self._make_key("state", agent_id)
+            self._backfill_session_index(agent_id)
+            index_key = self._sessions_index_key(agent_id)
+            keys = [
+                self._make_key("history", f"{agent_id}:{_text(session_id)}")
+                for session_id in self.client.smembers(index_key)
             ]
+            keys.append(self._make_key("state", agent_id))
 
-            deleted = 0
-            for pattern in patterns:
-                keys = self.client.keys(pattern)
-                if keys:
-                    deleted += self.client.delete(*keys)
+            # DEL reports only keys that existed; the index itself isn't counted
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(*keys)
+            pipe.delete(index_key)
+            deleted = pipe.execute()[0]
 
             logger.info(f"Cleared {deleted} keys for agent {agent_id}")
             return deleted
@@ -413,7 +527,7 @@ class RedisMemoryService:
             return False
 
     def close(self):
-        """Close Redis connection"""
+        """Release the client (the shared pool is closed by the registry on shutdown)"""
         try:
             self.client.close()
             logger.info("Redis connection closed")
@@ -421,6 +535,471 @@ class RedisMemoryService:
             logger.error(f"Error closing Redis connection: {e}")
 
 
+class AsyncRedisMemoryService:
+    """
+    Async (redis.asyncio) memory service for use from the event loop.
+
+    Same key layout as RedisMemoryService. Conversation history is a Redis list
+    (one codec-encoded message per element): appends are RPUSH + LTRIM + EXPIRE in one
+    MULTI/EXEC pipeline, and reads can page through LRANGE windows.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        default_ttl: int = 86400,  # 24 hours in seconds
+        client: Optional[redis_async.Redis] = None,
+        codec: Optional[MessageCodec] = None
+    ):
+        """
+        Initialize async Redis memory service.
+
+        The connection is lazy - the first command connects.
+
+        Args:
+            host: Redis server host
+            port: Redis server port
+            db: Redis database number
+            password: Redis password (optional)
+            default_ttl: Default time-to-live for keys in seconds (default: 24h)
+            client: Pre-built redis.asyncio client (optional, overrides host/port;
+                must use decode_responses=False)
+            codec: Payload codec (default: the "memory" namespace codec)
+        """
+        self.default_ttl = default_ttl
+        self.codec = codec or get_codec("memory")
+        self._indexed_agents: set = set()
+        self.client = client or get_redis_registry().get_async_client(
+            build_redis_url(host, port, db, password),
+            decode_responses=False
+        )
+
+    def _make_key(self, namespace: str, identifier: str) -> str:
+        """Create a Redis key with namespace (same layout as the sync service)."""
+        return f"ecowas:{namespace}:{identifier}"
+
+    def _history_key(self, agent_id: str, session_id: str) -> str:
+        return self._make_key("history", f"{agent_id}:{session_id}")
+
+    def _sessions_index_key(self, agent_id: str) -> str:
+        """Per-agent SET of session IDs with stored history (see sync service)."""
+        return self._make_key("index", f"sessions:{agent_id}")
+
+    async def _backfill_session_index(self, agent_id: str) -> None:
+        """One-off SCAN to index histories written before the session index existed."""
+        if agent_id in self._indexed_agents:
+            return
+        prefix = self._make_key("history", f"{agent_id}:")
+        session_ids = [_text(key)[len(prefix):] async for key in self.client.scan_iter(match=f"{prefix}*", count=500)]
+        if session_ids:
+            await self.client.sadd(self._sessions_index_key(agent_id), *session_ids)
+        self._indexed_agents.add(agent_id)
+
+    async def _migrate_legacy_history(self, key: str) -> None:
+        """Convert a pre-list JSON-string history into a list in place (see sync service)."""
+        try:
+            async with self.client.pipeline() as pipe:
+                await pipe.watch(key)
+                if _text(await pipe.type(key)) != "string":
+                    await pipe.unwatch()
+                    return
+                raw = await pipe.get(key)
+                ttl = await pipe.ttl(key)
+                items = json.loads(raw) if raw else []
+
+                pipe.multi()
+                pipe.delete(key)
+                if items:
+                    pipe.rpush(key, *[self.codec.encode(m) for m in items])
+                if ttl and ttl > 0:
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+                logger.info(f"Migrated legacy history {key} ({len(items)} messages) to list format")
+        except redis.WatchError:
+            logger.debug(f"History {key} changed during migration; another client handled it")
+
+    # =========================================================================
+    # CONVERSATION HISTORY
+    # =========================================================================
+
+    async def save_conversation_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        history: List[Dict[str, str]],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Save (replace) conversation history.
+
+        Args:
+            agent_id: Agent identifier
+            session_id: Session identifier
+            history: List of message dictionaries
+            ttl: Time-to-live in seconds (optional)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            key = self._history_key(agent_id, session_id)
+            ttl = ttl or self.default_ttl
+
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if history:
+                    pipe.rpush(key, *[self.codec.encode(m) for m in history])
+                    pipe.expire(key, ttl)
+                    pipe.sadd(self._sessions_index_key(agent_id), session_id)
+                else:
+                    pipe.srem(self._sessions_index_key(agent_id), session_id)
+                await pipe.execute()
+            logger.debug(f"Saved history for {agent_id}:{session_id} (TTL: {ttl}s)")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save conversation history: {e}")
+            return False
+
+    async def append_to_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        message: Dict[str, str],
+        max_history: Optional[int] = None,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Append one message (RPUSH + LTRIM + EXPIRE in a single MULTI/EXEC).
+
+        Args:
+            agent_id: Agent identifier
+            session_id: Session identifier
+            message: Message dictionary with 'role' and 'content'
+            max_history: Maximum number of messages to keep (optional)
+            ttl: Time-to-live in seconds (optional)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return await self.append_many_to_history(agent_id, session_id, [message], max_history, ttl)
+
+    async def append_many_to_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        messages: List[Dict[str, str]],
+        max_history: Optional[int] = None,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Append several messages in one round trip (e.g. a user turn and its reply).
+
+        Args:
+            agent_id: Agent identifier
+            session_id: Session identifier
+            messages: Message dictionaries, oldest first
+            max_history: Maximum number of messages to keep (optional)
+            ttl: Time-to-live in seconds (optional)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not messages:
+            return True
+        key = self._history_key(agent_id, session_id)
+        ttl = ttl or self.default_ttl
+
+        async def _append():
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.rpush(key, *[self.codec.encode(m) for m in messages])
+                if max_history:
+                    pipe.ltrim(key, -max_history, -1)
+                pipe.expire(key, ttl)
+                pipe.sadd(self._sessions_index_key(agent_id), session_id)
+                await pipe.execute()
+
+        try:
+            try:
+                await _append()
+            except redis.ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                await self._migrate_legacy_history(key)
+                await _append()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to append to history: {e}")
+            return False
+
+    async def get_conversation_history(
+        self,
+        agent_id: str,
+        session_id: str,
+        start: int = 0,
+        end: int = -1
+    ) -> List[Dict[str, str]]:
+        """
+        Retrieve conversation history (or an LRANGE slice of it).
+
+        Args:
+            agent_id: Agent identifier
+            session_id: Session identifier
+            start: First message index (negative counts from the end)
+            end: Last message index, inclusive (default: -1 = last message)
+
+        Returns:
+            List of message dictionaries (empty list if not found)
+        """
+        key = self._history_key(agent_id, session_id)
+        try:
+            try:
+                values = await self.client.lrange(key, start, end)
+            except redis.ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                await self._migrate_legacy_history(key)
+                values = await self.client.lrange(key, start, end)
+            return [self.codec.decode(v) for v in values]
+        except Exception as e:
+            logger.error(f"Failed to get conversation history: {e}")
+            return []
+
+    async def get_history_page(
+        self,
+        agent_id: str,
+        session_id: str,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Page backwards through history, newest window first.
+
+        offset=0 returns the latest `limit` messages; offset=limit the window
+        before that, and so on. Messages in each page are in chronological order.
+
+        Args:
+            agent_id: Agent identifier
+            session_id: Session identifier
+            limit: Page size
+            offset: Number of most-recent messages to skip
+
+        Returns:
+            Dict with messages, total, offset, limit and has_more
+        """
+        key = self._history_key(agent_id, session_id)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.llen(key)
+                pipe.lrange(key, -(offset + limit), -(offset + 1))
+                total, values = await pipe.execute()
+        except redis.ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                logger.error(f"Failed to get history page: {e}")
+                return {"messages": [], "total": 0, "offset": offset, "limit": limit, "has_more": False}
+            await self._migrate_legacy_history(key)
+            return await self.get_history_page(agent_id, session_id, limit, offset)
+        except Exception as e:
+            logger.error(f"Failed to get history page: {e}")
+            return {"messages": [], "total": 0, "offset": offset, "limit": limit, "has_more": False}
+
+        # LRANGE clamps a start index before the head to 0, which would re-return
+        # messages from the previous page once offset runs past the total
+        if offset >= total:
+            values = []
+        elif offset + limit > total:
+            values = values[:total - offset]
+
+        return {
+            "messages": [self.codec.decode(v) for v in values],
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "has_more": offset + limit < total
+        }
+
+    async def get_history_length(self, agent_id: str, session_id: str) -> int:
+        """Number of messages stored for a session."""
+        try:
+            return await self.client.llen(self._history_key(agent_id, session_id))
+        except Exception as e:
+            logger.error(f"Failed to get history length: {e}")
+            return 0
+
+    async def clear_conversation_history(self, agent_id: str, session_id: str) -> bool:
+        """Clear conversation history for a session."""
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(self._history_key(agent_id, session_id))
+                pipe.srem(self._sessions_index_key(agent_id), session_id)
+                await pipe.execute()
+            logger.info(f"Cleared history for {agent_id}:{session_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to clear conversation history: {e}")
+            return False
+
+    async def extend_ttl(self, agent_id: str, session_id: str, ttl: Optional[int] = None) -> bool:
+        """Extend the TTL of a conversation history."""
+        try:
+            await self.client.expire(self._history_key(agent_id, session_id), ttl or self.default_ttl)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to extend TTL: {e}")
+            return False
+
+    # =========================================================================
+    # AGENT STATE & SESSION DATA
+    # =========================================================================
+
+    async def save_agent_state(self, agent_id: str, state: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Save agent state."""
+        try:
+            await self.client.setex(self._make_key("state", agent_id), ttl or self.default_ttl, self.codec.encode(state))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save agent state: {e}")
+            return False
+
+    async def get_agent_state(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve agent state (None if not found)."""
+        try:
+            value = await self.client.get(self._make_key("state", agent_id))
+            return self.codec.decode(value)
+        except Exception as e:
+            logger.error(f"Failed to get agent state: {e}")
+            return None
+
+    async def set_session_data(self, session_id: str, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store arbitrary session data (JSON serialized)."""
+        return await self.set_session_data_many(session_id, {key: value}, ttl)
+
+    async def get_session_data(self, session_id: str, key: str) -> Optional[Any]:
+        """Retrieve session data (None if not found)."""
+        return (await self.get_session_data_many(session_id, [key])).get(key)
+
+    async def set_session_data_many(self, session_id: str, values: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Store several session values in one pipelined round trip.
+
+        Args:
+            session_id: Session identifier
+            values: Mapping of data key -> value
+            ttl: Time-to-live in seconds (optional)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not values:
+            return True
+        ttl = ttl or self.default_ttl
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.setex(self._make_key("session", f"{session_id}:{key}"), ttl, self.codec.encode(value))
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to set session data: {e}")
+            return False
+
+    async def get_session_data_many(self, session_id: str, keys: List[str]) -> Dict[str, Any]:
+        """
+        Fetch several session values with one MGET.
+
+        Args:
+            session_id: Session identifier
+            keys: Data keys
+
+        Returns:
+            Mapping of data key -> value (missing keys map to None)
+        """
+        if not keys:
+            return {}
+        try:
+            values = await self.client.mget([self._make_key("session", f"{session_id}:{k}") for k in keys])
+            return {k: self.codec.decode(v) for k, v in zip(keys, values)}
+        except Exception as e:
+            logger.error(f"Failed to get session data: {e}")
+            return {k: None for k in keys}
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    async def get_all_sessions_for_agent(self, agent_id: str) -> List[str]:
+        """Get all session IDs with live history for an agent, pruning expired index entries."""
+        try:
+            await self._backfill_session_index(agent_id)
+            index_key = self._sessions_index_key(agent_id)
+            candidates = sorted(_text(sid) for sid in await self.client.smembers(index_key))
+            if not candidates:
+                return []
+
+            async with self.client.pipeline(transaction=False) as pipe:
+                for session_id in candidates:
+                    pipe.exists(self._history_key(agent_id, session_id))
+                alive = await pipe.execute()
+
+            expired = [sid for sid, exists in zip(candidates, alive) if not exists]
+            if expired:
+                await self.client.srem(index_key, *expired)
+            return [sid for sid, exists in zip(candidates, alive) if exists]
+        except Exception as e:
+            logger.error(f"Failed to get sessions for agent: {e}")
+            return []
+
+    async def clear_all_agent_data(self, agent_id: str) -> int:
+        """Clear all data for an agent (history and state). Returns keys deleted."""
+        try:
+            await self._backfill_session_index(agent_id)
+            index_key = self._sessions_index_key(agent_id)
+            keys = [self._history_key(agent_id, _text(sid)) for sid in await self.client.smembers(index_key)]
+            keys.append(self._make_key("state", agent_id))
+
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(*keys)
+                pipe.delete(index_key)
+                deleted = (await pipe.execute())[0]
+            logger.info(f"Cleared {deleted} keys for agent {agent_id}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Failed to clear agent data: {e}")
+            return 0
+
+    async def get_memory_stats(self) -> Dict[str, Any]:
+        """Get memory usage statistics."""
+        try:
+            info = await self.client.info("memory")
+            return {
+                "used_memory": info.get("used_memory_human", "N/A"),
+                "used_memory_peak": info.get("used_memory_peak_human", "N/A"),
+                "total_keys": await self.client.dbsize(),
+                "connected": True
+            }
+        except Exception as e:
+            logger.error(f"Failed to get memory stats: {e}")
+            return {"connected": False, "error": str(e)}
+
+    async def health_check(self) -> bool:
+        """Check if the Redis connection is healthy."""
+        try:
+            return await self.client.ping()
+        except Exception as e:
+            logger.error(f"Redis health check failed: {e}")
+            return False
+
+    async def close(self):
+        """Release the client (the shared pool is closed by the registry on shutdown)."""
+        try:
+            await self.client.aclose()
+            logger.info("Async Redis connection closed")
+        except Exception as e:
+            logger.error(f"Error closing Redis connection: {e}")
+
+
 # Singleton instance
 _redis_memory = None
 
@@ -452,3 +1031,35 @@ def get_redis_memory(
             password=password
         )
     return _redis_memory
+
+
+_async_redis_memory: Optional[AsyncRedisMemoryService] = None
+
+
+def get_async_redis_memory(
+    host: str = "localhost",
+    port: int = 6379,
+    db: int = 0,
+    password: Optional[str] = None
+) -> AsyncRedisMemoryService:
+    """
+    Get or create the async Redis memory service singleton.
+
+    Args:
+        host: Redis server host
+        port: Redis server port
+        db: Redis database number
+        password: Redis password (optional)
+
+    Returns:
+        AsyncRedisMemoryService: The memory service instance
+    """
+    global _async_redis_memory
+    if _async_redis_memory is None:
+        _async_redis_memory = AsyncRedisMemoryService(
+            host=host,
+            port=port,
+            db=db,
+            password=password
+        )
+    return _async_redis_memory
@@ -9,14 +9,31 @@ Provides a Redis-backed message bus for agent-to-agent communication with:
 
 Redis Key Structure:
 - Queues: ecowas:agent:{agent_id}:queue (LIST)
+- Queue index: ecowas:index:agent_queues (SET of agent IDs with a queue)
 - Channels: ecowas:agent:{agent_id}:channel (PUB/SUB)
 - Message status: ecowas:message:{message_id}:status (HASH)
 - Event streams: ecowas:events:{event_type} (STREAM)
+- Retry schedule: ecowas:retry:schedule (ZSET, score = due time) with
+  payloads in ecowas:retry:payloads (HASH message_id -> payload)
+- Dead letters: ecowas:agent:{agent_id}:dlq (LIST, newest first, bounded)
+- Dead-letter index: ecowas:index:dead_letters (SET of agent IDs)
+- Metrics: ecowas:metrics:agent:{agent_id} (HASH of counters) and
+  ecowas:metrics:agent:{agent_id}:{minute} (HASH, per-minute throughput, 1h TTL)
+
+Backpressure: a full queue raises QueueFullError (a ValueError) carrying a
+retry_after hint, or - with send_message(defer_if_full=True) - the message is
+parked on the retry schedule instead of being dropped. Failed messages are
+retried with exponential backoff up to max_retries, then dead-lettered.
+
+Queue payloads use the "bus" namespace codec (msgpack/zstd envelopes, with
+legacy JSON still readable). Pub/sub events stay JSON text so that
+decode_responses clients and non-Python subscribers can read them.
 """
 
 import json
+import random
 import time
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
 from loguru import logger
@@ -24,6 +41,8 @@ from loguru import logger
 import redis
 from redis.exceptions import RedisError, ConnectionError
 
+from app.services.message_codec import MessageCodec, get_codec
+from app.services.pubsub_hub import Subscription, get_pubsub_hub
 from app.schemas.agent_messages import (
     AgentMessage,
     AgentEvent,
@@ -32,6 +51,119 @@ from app.schemas.agent_messages import (
 )
 
 
+# Atomic batch enqueue: capacity check for the whole batch, then LPUSH,
+# queue-index SADD, status HSET + EXPIRE and the enqueue counters per
+# message. All-or-nothing: if any recipient queue would overflow, nothing is
+# enqueued.
+#
+# KEYS[1] = queue index; then per message: queue key, status key,
+#           metrics key, throughput bucket key
+# ARGV = max_queue_size, status_ttl, status, updated_at, bucket_ttl,
+#        then per message: agent_id, message_id, payload
+# Returns {1, n} on success or {0, index_of_rejected_message, queue_size}
+_SEND_BATCH_LUA = """
+local max_size = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local n = (#KEYS - 1) / 4
+
+local sizes = {}
+for i = 1, n do
+    local queue = KEYS[4 * i - 2]
+    if sizes[queue] == nil then
+        sizes[queue] = redis.call('LLEN', queue)
+    end
+    if sizes[queue] >= max_size then
+        return {0, i, sizes[queue]}
+    end
+    sizes[queue] = sizes[queue] + 1
+end
+
+for i = 1, n do
+    local base = 5 + (i - 1) * 3
+    local agent_id = ARGV[base + 1]
+    local status_key = KEYS[4 * i - 1]
+    redis.call('LPUSH', KEYS[4 * i - 2], ARGV[base + 3])
+    redis.call('SADD', KEYS[1], agent_id)
+    redis.call('HSET', status_key,
+        'message_id', ARGV[base + 2], 'status', ARGV[3],
+        'agent_id', agent_id, 'updated_at', ARGV[4])
+    redis.call('EXPIRE', status_key, ttl)
+    redis.call('HINCRBY', KEYS[4 * i], 'enqueued', 1)
+    redis.call('HINCRBY', KEYS[4 * i + 1], 'enqueued', 1)
+    redis.call('EXPIRE', KEYS[4 * i + 1], ARGV[5])
+end
+return {1, n}
+"""
+
+
+# Claim due retries: every due message gets its score pushed out to a lease
+# deadline, so a worker that dies before re-enqueueing it doesn't lose it
+# (it becomes due again when the lease runs out). Entries whose payload is
+# gone are dropped.
+#
+# KEYS[1] = retry schedule, KEYS[2] = retry payloads
+# ARGV = now, limit, lease_until
+# Returns {next_due_score or '', message_id, payload, ...}
+_CLAIM_RETRIES_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local result = {''}
+for _, message_id in ipairs(due) do
+    local payload = redis.call('HGET', KEYS[2], message_id)
+    if payload then
+        redis.call('ZADD', KEYS[1], ARGV[3], message_id)
+        result[#result + 1] = message_id
+        result[#result + 1] = payload
+    else
+        redis.call('ZREM', KEYS[1], message_id)
+    end
+end
+local head = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if head[2] then
+    result[1] = head[2]
+end
+return result
+"""
+
+# Atomic take of a received message's payload from its status hash: HGET +
+# HDEL, so two workers failing the same message can't both retry it.
+#
+# KEYS[1] = message status hash
+# Returns the payload, or nil if there is none (already taken)
+_TAKE_INFLIGHT_LUA = """
+local payload = redis.call('HGET', KEYS[1], 'payload')
+if payload then
+    redis.call('HDEL', KEYS[1], 'payload')
+end
+return payload
+"""
+
+# Counters kept per agent in the metrics hash (and per-minute buckets)
+METRIC_FIELDS = (
+    "enqueued", "dequeued", "acked", "failed", "retried",
+    "deferred", "dead_lettered", "replayed"
+)
+
+
+class QueueFullError(ValueError):
+    """
+    A recipient queue is at max_queue_size.
+
+    Non-blocking "try later" signal for producers: retry_after is the
+    suggested wait in seconds, estimated from the agent's recent dequeue
+    rate. Subclasses ValueError, which the bus raised before.
+    """
+
+    def __init__(self, agent_id: str, queue_size: int, max_queue_size: int, retry_after: float):
+        super().__init__(
+            f"Queue full for agent '{agent_id}' "
+            f"({queue_size}/{max_queue_size}); retry after {retry_after:.1f}s"
+        )
+        self.agent_id = agent_id
+        self.queue_size = queue_size
+        self.max_queue_size = max_queue_size
+        self.retry_after = retry_after
+
+
 class RedisMessageBus:
     """
     Redis-backed message bus for agent communication.
@@ -41,15 +173,27 @@ class RedisMessageBus:
     - Pub/sub event broadcasting
     - Message status tracking
     - Delivery acknowledgment
+    - Retry with exponential backoff, dead-letter queues and queue metrics
     """
 
+    # Per-minute throughput buckets are kept this long (seconds)
+    THROUGHPUT_BUCKET_TTL = 3600
+    # A claimed retry becomes due again after this long if never re-enqueued
+    RETRY_LEASE_SECONDS = 30.0
+
     def __init__(
         self,
         redis_client: redis.Redis,
         namespace: str = "ecowas",
         default_timeout: int = 30,
         max_queue_size: int = 1000,
-        message_ttl: int = 3600
+        message_ttl: int = 3600,
+        codec: Optional[MessageCodec] = None,
+        max_retries: int = 3,
+        retry_backoff_base: float = 1.0,
+        retry_backoff_max: float = 300.0,
+        dead_letter_max: int = 1000,
+        retry_poll_interval: float = 1.0
     ):
         """
         Initialize the message bus.
@@ -60,12 +204,28 @@ class RedisMessageBus:
             default_timeout: Default timeout for blocking operations (seconds)
             max_queue_size: Maximum messages per agent queue
             message_ttl: Message TTL in seconds (default 1 hour)
+            codec: Queue payload codec (default: the "bus" namespace codec)
+            max_retries: Failed messages are retried this many times, then dead-lettered
+            retry_backoff_base: First retry delay in seconds (doubles per attempt)
+            retry_backoff_max: Upper bound for retry delays and retry_after hints
+            dead_letter_max: Dead letters kept per agent (oldest trimmed)
+            retry_poll_interval: Minimum seconds between retry-schedule polls per process
         """
         self.client = redis_client
+        self.codec = codec or get_codec("bus")
         self.namespace = namespace
         self.default_timeout = default_timeout
         self.max_queue_size = max_queue_size
         self.message_ttl = message_ttl
+        # Set once the queue index has been backfilled from a SCAN in this process
+        self._queue_index_backfilled = False
+        # Script objects run via EVALSHA and reload themselves on NOSCRIPT
+        self._send_script = self.client.register_script(_SEND_BATCH_LUA)
+        self._claim_retries_script = self.client.register_script(_CLAIM_RETRIES_LUA)
+        self._take_inflight_script = self.client.register_script(_TAKE_INFLIGHT_LUA)
+        self._configure_retries(
+            max_retries, retry_backoff_base, retry_backoff_max, dead_letter_max, retry_poll_interval
+        )
 
         logger.info(
             f"RedisMessageBus initialized with namespace '{namespace}', "
@@ -92,64 +252,132 @@ class RedisMessageBus:
         """Generate Redis key for event stream"""
         return f"{self.namespace}:events:{event_type}"
 
+    def _make_queue_index_key(self) -> str:
+        """Generate Redis key for the SET of agent IDs that have a queue"""
+        return f"{self.namespace}:index:agent_queues"
+
+    def _make_dead_letter_key(self, agent_id: str) -> str:
+        """Generate Redis key for agent's dead-letter list"""
+        return f"{self.namespace}:agent:{agent_id}:dlq"
+
+    def _make_dead_letter_index_key(self) -> str:
+        """Generate Redis key for the SET of agent IDs that have dead letters"""
+        return f"{self.namespace}:index:dead_letters"
+
+    def _make_retry_schedule_key(self) -> str:
+        """Generate Redis key for the retry schedule (ZSET scored by due time)"""
+        return f"{self.namespace}:retry:schedule"
+
+    def _make_retry_payload_key(self) -> str:
+        """Generate Redis key for scheduled retry payloads"""
+        return f"{self.namespace}:retry:payloads"
+
+    def _make_metrics_key(self, agent_id: str) -> str:
+        """Generate Redis key for agent's counters"""
+        return f"{self.namespace}:metrics:agent:{agent_id}"
+
+    def _make_throughput_key(self, agent_id: str, minute: int) -> str:
+        """Generate Redis key for agent's per-minute throughput bucket"""
+        return f"{self.namespace}:metrics:agent:{agent_id}:{minute}"
+
+    @staticmethod
+    def _decode(value: Any) -> str:
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
     # =========================================================================
     # Message Queuing (Point-to-Point)
     # =========================================================================
 
-    def send_message(self, message: AgentMessage) -> UUID:
+    def send_message(self, message: AgentMessage, defer_if_full: bool = False) -> UUID:
         """
         Send a message to an agent's queue.
 
-        Uses Redis LIST with LPUSH for FIFO queue semantics.
-        Tracks message status and enforces queue size limits.
+        Uses Redis LIST with LPUSH for FIFO queue semantics. The capacity
+        check, enqueue and status write run atomically in one Lua script
+        (EVALSHA), so max_queue_size holds under concurrent senders.
 
         Args:
             message: AgentMessage to send
+            defer_if_full: If the queue is full, park the message on the retry
+                schedule (enqueued after retry_after) instead of raising
 
         Returns:
             UUID: Message ID
 
         Raises:
             RedisError: If send fails
-            ValueError: If queue is full
+            QueueFullError: If queue is full (and defer_if_full is False)
         """
         try:
-            recipient_id = message.metadata.recipient_id
-            queue_key = self._make_queue_key(recipient_id)
-            message_id = message.metadata.message_id
-
-            # Check queue size
-            current_size = self.client.llen(queue_key)
-            if current_size >= self.max_queue_size:
-                raise ValueError(
-                    f"Queue full for agent '{recipient_id}' "
-                    f"({current_size}/{self.max_queue_size})"
-                )
+            return self.send_many([message])[0]
+        except QueueFullError as e:
+            if not defer_if_full:
+                raise
+            self._schedule_retry(message, e.retry_after, counter="deferred")
+            logger.info(
+                f"Queue for '{e.agent_id}' full, deferred message "
+                f"{message.metadata.message_id} by {e.retry_after:.1f}s"
+            )
+            return message.metadata.message_id
 
-            # Serialize message
-            message_json = json.dumps(message.to_dict())
+    def send_many(self, messages: List[AgentMessage]) -> List[UUID]:
+        """
+        Send a batch of messages, possibly to different agents, in one round trip.
 
-            # Push to queue (LPUSH for FIFO with BRPOP)
-            self.client.lpush(queue_key, message_json)
+        All-or-nothing: if any recipient's queue would exceed max_queue_size,
+        no message in the batch is enqueued.
 
-            # Track message status
-            self._update_message_status(
-                message_id=message_id,
-                status=MessageStatus.DELIVERED,
-                agent_id=recipient_id
-            )
+        Args:
+            messages: Messages to send
 
-            logger.debug(
-                f"Sent message {message_id} to agent '{recipient_id}' "
-                f"(type={message.type}, priority={message.priority})"
-            )
+        Returns:
+            List[UUID]: Message IDs, in input order
 
-            return message_id
+        Raises:
+            RedisError: If send fails
+            QueueFullError: If a recipient queue is full
+        """
+        if not messages:
+            return []
 
+        minute = self._current_minute()
+        keys = [self._make_queue_index_key()]
+        args = [
+            self.max_queue_size,
+            self.message_ttl,
+            MessageStatus.DELIVERED.value,
+            datetime.utcnow().isoformat(),
+            self.THROUGHPUT_BUCKET_TTL
+        ]
+        for message in messages:
+            recipient_id = message.metadata.recipient_id
+            keys += [
+                self._make_queue_key(recipient_id),
+                self._make_message_status_key(message.metadata.message_id),
+                self._make_metrics_key(recipient_id),
+                self._make_throughput_key(recipient_id, minute)
+            ]
+            args += [recipient_id, str(message.metadata.message_id), self.codec.encode(message.to_dict())]
+
+        try:
+            result = self._send_script(keys=keys, args=args)
         except RedisError as e:
-            logger.error(f"Failed to send message {message.metadata.message_id}: {e}")
+            logger.error(f"Failed to send {len(messages)} message(s): {e}")
             raise
 
+        if not result[0]:
+            _, index, size = result
+            raise self._queue_full(messages[index - 1].metadata.recipient_id, size)
+
+        for message in messages:
+            logger.debug(
+                f"Sent message {message.metadata.message_id} to agent "
+                f"'{message.metadata.recipient_id}' "
+                f"(type={message.type}, priority={message.priority})"
+            )
+
+        return [message.metadata.message_id for message in messages]
+
     def receive_message(
         self,
         agent_id: str,
@@ -158,7 +386,9 @@ class RedisMessageBus:
         """
         Receive a message from an agent's queue (blocking).
 
-        Uses Redis BRPOP for blocking pop with timeout.
+        Uses Redis BRPOP for blocking pop with timeout. Due retries are
+        promoted into their queues first, and the BRPOP is cut short when the
+        next scheduled retry falls due before the timeout.
 
         Args:
             agent_id: Agent ID to receive messages for
@@ -173,26 +403,42 @@ class RedisMessageBus:
         try:
             queue_key = self._make_queue_key(agent_id)
             timeout = timeout if timeout is not None else self.default_timeout
-
-            # Blocking pop from queue
-            result = self.client.brpop(queue_key, timeout=timeout)
-
-            if result is None:
-                return None
+            deadline = time.monotonic() + timeout if timeout else None
+
+            first = True
+            while True:
+                wait = self._receive_wait(deadline, first)
+                if wait is None:
+                    return None
+                first = False
+
+                # Blocking pop from queue
+                result = self.client.brpop(queue_key, timeout=wait)
+                if result is not None:
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
 
             # Parse message
-            _, message_json = result
-            message_dict = json.loads(message_json)
+            _, payload = result
 
             # Reconstruct message (determine type from dict)
-            message = self._deserialize_message(message_dict)
-
-            # Update status to processing
-            self._update_message_status(
-                message_id=message.metadata.message_id,
-                status=MessageStatus.PROCESSING,
-                agent_id=agent_id
-            )
+            message = self._deserialize_message(self.codec.decode(payload))
+
+            # Status -> processing; the payload is kept with the status until
+            # acknowledged, so fail_message can retry or dead-letter it
+            pipe = self.client.pipeline(transaction=False)
+            status_key = self._make_message_status_key(message.metadata.message_id)
+            pipe.hset(status_key, mapping={
+                "message_id": str(message.metadata.message_id),
+                "status": MessageStatus.PROCESSING.value,
+                "agent_id": agent_id,
+                "updated_at": datetime.utcnow().isoformat(),
+                "payload": payload
+            })
+            pipe.expire(status_key, self.message_ttl)
+            self._pipe_metrics(pipe, agent_id, dequeued=1)
+            pipe.execute()
 
             logger.debug(
                 f"Agent '{agent_id}' received message {message.metadata.message_id} "
@@ -219,13 +465,12 @@ class RedisMessageBus:
             queue_key = self._make_queue_key(agent_id)
 
             # Get all messages without removing them
-            messages_json = self.client.lrange(queue_key, 0, -1)
+            payloads = self.client.lrange(queue_key, 0, -1)
 
-            messages = []
-            for msg_json in messages_json:
-                message_dict = json.loads(msg_json)
-                message = self._deserialize_message(message_dict)
-                messages.append(message)
+            messages = [
+                self._deserialize_message(self.codec.decode(payload))
+                for payload in payloads
+            ]
 
             logger.debug(f"Agent '{agent_id}' has {len(messages)} pending messages")
 
@@ -291,8 +536,9 @@ class RedisMessageBus:
         """
         Subscribe to an agent's channel for events.
 
-        This is a BLOCKING operation - runs in a loop until interrupted.
-        Consider running in a background thread.
+        This is a BLOCKING operation - runs in a loop until interrupted, on its
+        own Redis connection. From async code prefer subscribe_to_channel_async,
+        which shares the process-wide pub/sub connection.
 
         Args:
             agent_id: Agent ID to subscribe for
@@ -328,6 +574,9 @@ class RedisMessageBus:
         """
         Subscribe to a specific event type.
 
+        BLOCKING, on its own Redis connection; from async code prefer
+        subscribe_to_event_type_async.
+
         Args:
             event_type: Type of event to subscribe to
             callback: Function to call with each event
@@ -354,6 +603,53 @@ class RedisMessageBus:
             logger.error(f"Event subscription failed for '{event_type}': {e}")
             raise
 
+    async def subscribe_to_channel_async(
+        self,
+        agent_id: str,
+        callback: Callable[[AgentEvent], Any]
+    ) -> Subscription:
+        """
+        Subscribe to an agent's channel via the shared pub/sub hub.
+
+        Args:
+            agent_id: Agent ID to subscribe for
+            callback: Called with each event; may be async
+
+        Returns:
+            Subscription handle (await .close() to unsubscribe)
+        """
+        return await get_pubsub_hub().subscribe(
+            self._make_channel_key(agent_id), self._event_dispatcher(callback)
+        )
+
+    async def subscribe_to_event_type_async(
+        self,
+        event_type: str,
+        callback: Callable[[AgentEvent], Any]
+    ) -> Subscription:
+        """
+        Subscribe to an event type via the shared pub/sub hub.
+
+        Args:
+            event_type: Type of event to subscribe to ("*" globs are allowed)
+            callback: Called with each event; may be async
+
+        Returns:
+            Subscription handle (await .close() to unsubscribe)
+        """
+        hub = get_pubsub_hub()
+        channel_key = self._make_event_stream_key(event_type)
+        subscribe = hub.psubscribe if "*" in event_type else hub.subscribe
+        return await subscribe(channel_key, self._event_dispatcher(callback))
+
+    def _event_dispatcher(self, callback: Callable[[AgentEvent], Any]) -> Callable[[str, str], Any]:
+        """Adapt an AgentEvent callback to the hub's (channel, data) signature."""
+        def dispatch(channel: str, data: str):
+            event = self._deserialize_message(json.loads(data))
+            if isinstance(event, AgentEvent):
+                return callback(event)
+        return dispatch
+
     # =========================================================================
     # Message Status Tracking
     # =========================================================================
@@ -373,11 +669,18 @@ class RedisMessageBus:
             RedisError: If acknowledgment fails
         """
         try:
-            self._update_message_status(
-                message_id=message_id,
-                status=MessageStatus.COMPLETED,
-                agent_id=agent_id
-            )
+            status_key = self._make_message_status_key(message_id)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(status_key, mapping={
+                "message_id": str(message_id),
+                "status": MessageStatus.COMPLETED.value,
+                "agent_id": agent_id,
+                "updated_at": datetime.utcnow().isoformat()
+            })
+            pipe.hdel(status_key, "payload")
+            pipe.expire(status_key, self.message_ttl)
+            self._pipe_metrics(pipe, agent_id, acked=1)
+            pipe.execute()
 
             logger.debug(f"Message {message_id} acknowledged by '{agent_id}'")
             return True
@@ -390,15 +693,23 @@ class RedisMessageBus:
         self,
         message_id: UUID,
         agent_id: str,
-        error: str
+        error: str,
+        retry: bool = True
     ) -> bool:
         """
         Mark a message as failed.
 
+        A received message is rescheduled with exponential backoff
+        (retry_backoff_base * 2^(attempt-1), capped at retry_backoff_max)
+        until it has failed max_retries times; then it is moved to the
+        agent's dead-letter queue. Messages whose payload is unknown only get
+        a failed status.
+
         Args:
             message_id: Message ID
             agent_id: Agent that failed to process
             error: Error description
+            retry: False to dead-letter immediately (non-retryable error)
 
         Returns:
             bool: True if marked failed
@@ -407,16 +718,21 @@ class RedisMessageBus:
             RedisError: If update fails
         """
         try:
-            self._update_message_status(
-                message_id=message_id,
-                status=MessageStatus.FAILED,
-                agent_id=agent_id,
-                error=error
-            )
+            message = self._take_inflight(message_id)
+            if message is None:
+                self._update_message_status(
+                    message_id=message_id,
+                    status=MessageStatus.FAILED,
+                    agent_id=agent_id,
+                    error=error
+                )
+                self._record_metrics(agent_id, failed=1)
+                logger.warning(
+                    f"Message {message_id} marked failed by '{agent_id}': {error}"
+                )
+                return True
 
-            logger.warning(
-                f"Message {message_id} marked failed by '{agent_id}': {error}"
-            )
+            self._retry_or_dead_letter(message, agent_id, error, retry)
             return True
 
         except RedisError as e:
@@ -440,9 +756,11 @@ class RedisMessageBus:
             if not status:
                 return None
 
+            # The in-flight payload is binary and internal
             return {
-                k.decode('utf-8'): v.decode('utf-8')
+                self._decode(k): self._decode(v)
                 for k, v in status.items()
+                if self._decode(k) != "payload"
             }
 
         except RedisError as e:
@@ -469,8 +787,498 @@ class RedisMessageBus:
         if error:
             status_data["error"] = error
 
-        self.client.hset(status_key, mapping=status_data)
-        self.client.expire(status_key, self.message_ttl)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(status_key, mapping=status_data)
+        pipe.expire(status_key, self.message_ttl)
+        pipe.execute()
+
+    # =========================================================================
+    # Retries and Dead Letters
+    # =========================================================================
+
+    def _configure_retries(
+        self,
+        max_retries: int,
+        retry_backoff_base: float,
+        retry_backoff_max: float,
+        dead_letter_max: int,
+        retry_poll_interval: float
+    ) -> None:
+        """Set retry/dead-letter settings and the promotion throttle state."""
+        self.max_retries = max_retries
+        self.retry_backoff_base = retry_backoff_base
+        self.retry_backoff_max = retry_backoff_max
+        self.dead_letter_max = dead_letter_max
+        self.retry_poll_interval = retry_poll_interval
+        self._last_promote = 0.0
+        # Wall-clock time of the earliest scheduled retry (None = none known)
+        self._next_retry_at: Optional[float] = None
+
+    def _backoff_delay(self, attempts: int) -> float:
+        """Exponential backoff with +/-10% jitter so retries don't fire in lockstep."""
+        delay = min(self.retry_backoff_base * (2 ** max(attempts - 1, 0)), self.retry_backoff_max)
+        return delay * random.uniform(0.9, 1.1)
+
+    def _queue_full(self, agent_id: str, queue_size: int) -> QueueFullError:
+        """
+        Build the "try later" error for a full queue.
+
+        retry_after is the time the agent needs (at its dequeue rate over the
+        last few minutes) to make room, clamped to
+        [retry_backoff_base, retry_backoff_max]; an agent with no recent
+        dequeues gets retry_backoff_max.
+        """
+        rate = self._dequeue_rate(agent_id)
+        if rate > 0:
+            overflow = max(queue_size - self.max_queue_size + 1, 1)
+            retry_after = min(max(overflow / rate, self.retry_backoff_base), self.retry_backoff_max)
+        else:
+            retry_after = self.retry_backoff_max
+        return QueueFullError(agent_id, queue_size, self.max_queue_size, retry_after)
+
+    def _take_inflight(self, message_id: UUID) -> Optional[AgentMessage]:
+        """
+        Claim the payload of a received, unacknowledged message (kept in its
+        status hash). Only one caller gets it; later ones see None.
+        """
+        payload = self._take_inflight_script(keys=[self._make_message_status_key(message_id)])
+        if not payload:
+            return None
+        return self._deserialize_message(self.codec.decode(payload))
+
+    def _retry_or_dead_letter(
+        self,
+        message: AgentMessage,
+        agent_id: str,
+        error: str,
+        retry: bool
+    ) -> bool:
+        """
+        Count the failed attempt, then reschedule the message or dead-letter it.
+
+        Returns:
+            True if a retry was scheduled, False if the message was dead-lettered
+        """
+        message.metadata.attempts += 1
+        message_id = message.metadata.message_id
+        if retry and message.metadata.attempts <= self.max_retries:
+            delay = self._backoff_delay(message.metadata.attempts)
+            self._schedule_retry(message, delay, error=error)
+            logger.warning(
+                f"Message {message_id} failed in '{agent_id}' "
+                f"(attempt {message.metadata.attempts}/{self.max_retries}), "
+                f"retrying in {delay:.1f}s: {error}"
+            )
+            return True
+
+        self._dead_letter(message, agent_id, error)
+        logger.error(
+            f"Message {message_id} dead-lettered for '{agent_id}' "
+            f"after {message.metadata.attempts} attempt(s): {error}"
+        )
+        return False
+
+    def _schedule_retry(
+        self,
+        message: AgentMessage,
+        delay: float,
+        error: Optional[str] = None,
+        counter: str = "retried"
+    ) -> None:
+        """
+        Park a message on the retry schedule; it is re-sent after `delay` seconds.
+
+        Args:
+            message: Message to re-send (attempts already updated)
+            delay: Seconds until it is due
+            error: Last error, recorded in the status
+            counter: Metric to count it under ("retried" or "deferred")
+        """
+        message_id = str(message.metadata.message_id)
+        agent_id = message.metadata.recipient_id
+        due = time.time() + delay
+        status_key = self._make_message_status_key(message_id)
+        status_data = {
+            "message_id": message_id,
+            "status": MessageStatus.PENDING.value,
+            "agent_id": agent_id,
+            "attempts": message.metadata.attempts,
+            "next_attempt_at": datetime.utcfromtimestamp(due).isoformat(),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        if error:
+            status_data["error"] = error
+
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(self._make_retry_payload_key(), message_id, self.codec.encode(message.to_dict()))
+        pipe.zadd(self._make_retry_schedule_key(), {message_id: due})
+        pipe.hset(status_key, mapping=status_data)
+        pipe.hdel(status_key, "payload")
+        pipe.expire(status_key, self.message_ttl + int(delay))
+        self._pipe_metrics(pipe, agent_id, **{counter: 1})
+        pipe.execute()
+
+        if self._next_retry_at is None or due < self._next_retry_at:
+            self._next_retry_at = due
+
+    def _claim_due_retries(self, limit: int) -> Tuple[List[Tuple[str, AgentMessage]], Optional[float]]:
+        """
+        Lease due retries (see _CLAIM_RETRIES_LUA).
+
+        Returns:
+            ([(message_id, message)], wall-clock time of the next scheduled retry or None)
+        """
+        now = time.time()
+        result = self._claim_retries_script(
+            keys=[self._make_retry_schedule_key(), self._make_retry_payload_key()],
+            args=[now, limit, now + self.RETRY_LEASE_SECONDS]
+        )
+        next_due = float(result[0]) if result[0] else None
+        claimed = [
+            (self._decode(result[i]), self._deserialize_message(self.codec.decode(result[i + 1])))
+            for i in range(1, len(result), 2)
+        ]
+        return claimed, next_due
+
+    def _finish_retry(self, message_id: str) -> None:
+        """Drop a re-sent message from the retry schedule."""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zrem(self._make_retry_schedule_key(), message_id)
+        pipe.hdel(self._make_retry_payload_key(), message_id)
+        pipe.execute()
+
+    def _reschedule_retry(self, message_id: str, delay: float) -> None:
+        """Push a claimed retry back (recipient queue still full)."""
+        self.client.zadd(self._make_retry_schedule_key(), {message_id: time.time() + delay})
+
+    def promote_due_retries(self, limit: int = 100) -> int:
+        """
+        Re-send messages whose retry time has come.
+
+        Safe to run from any number of workers: each due message is leased to
+        one caller. A message whose recipient queue is still full is pushed
+        back by the queue's retry_after instead of being dropped.
+
+        Args:
+            limit: Maximum messages to promote in this call
+
+        Returns:
+            Number of messages re-enqueued
+        """
+        claimed, next_due = self._claim_due_retries(limit)
+        promoted = 0
+        for message_id, message in claimed:
+            try:
+                self.send_many([message])
+            except QueueFullError as e:
+                self._reschedule_retry(message_id, e.retry_after)
+                next_due = min(next_due or float("inf"), time.time() + e.retry_after)
+                continue
+            self._finish_retry(message_id)
+            promoted += 1
+
+        self._next_retry_at = next_due
+        if promoted:
+            logger.debug(f"Promoted {promoted} scheduled retries")
+        return promoted
+
+    def _maybe_promote(self) -> Optional[float]:
+        """
+        Promote due retries at most every retry_poll_interval.
+
+        Returns:
+            Seconds until the next known scheduled retry, or None
+        """
+        now = time.monotonic()
+        if now - self._last_promote >= self.retry_poll_interval:
+            self._last_promote = now
+            try:
+                self.promote_due_retries()
+            except RedisError as e:
+                logger.error(f"Failed to promote scheduled retries: {e}")
+        if self._next_retry_at is None:
+            return None
+        return max(self._next_retry_at - time.time(), 0.0)
+
+    def _receive_wait(self, deadline: Optional[float], first: bool = False) -> Optional[float]:
+        """
+        How long the next blocking read may wait.
+
+        Args:
+            deadline: time.monotonic() deadline, or None to wait forever
+            first: The first read always happens, even if the deadline has passed
+
+        Returns:
+            Seconds to block (0 = forever), or None if the deadline has passed
+        """
+        next_retry = self._maybe_promote()
+        if deadline is None:
+            wait = 0.0
+        else:
+            wait = deadline - time.monotonic()
+            if wait <= 0:
+                if not first:
+                    return None
+                wait = 0.01
+        if next_retry is not None:
+            # Wake up for the next retry, but poll no faster than retry_poll_interval
+            cap = max(next_retry, self.retry_poll_interval)
+            wait = cap if wait == 0 else min(wait, cap)
+        # Sub-millisecond timeouts round to 0, which blocks forever
+        return max(wait, 0.01) if wait else 0
+
+    def _dead_letter_entry(self, message: AgentMessage, agent_id: str, error: str) -> Dict[str, Any]:
+        return {
+            "message_id": str(message.metadata.message_id),
+            "agent_id": agent_id,
+            "error": error,
+            "attempts": message.metadata.attempts,
+            "failed_at": datetime.utcnow().isoformat(),
+            "message": message.to_dict()
+        }
+
+    def _dead_letter(self, message: AgentMessage, agent_id: str, error: str) -> None:
+        """Move a message to the recipient's dead-letter queue (bounded, newest first)."""
+        owner = message.metadata.recipient_id
+        dlq_key = self._make_dead_letter_key(owner)
+        status_key = self._make_message_status_key(message.metadata.message_id)
+
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lpush(dlq_key, self.codec.encode(self._dead_letter_entry(message, agent_id, error)))
+        pipe.ltrim(dlq_key, 0, self.dead_letter_max - 1)
+        pipe.sadd(self._make_dead_letter_index_key(), owner)
+        pipe.hset(status_key, mapping={
+            "message_id": str(message.metadata.message_id),
+            "status": MessageStatus.FAILED.value,
+            "agent_id": agent_id,
+            "error": error,
+            "attempts": message.metadata.attempts,
+            "dead_lettered": 1,
+            "updated_at": datetime.utcnow().isoformat()
+        })
+        pipe.hdel(status_key, "payload")
+        pipe.expire(status_key, self.message_ttl)
+        self._pipe_metrics(pipe, owner, failed=1, dead_lettered=1)
+        pipe.execute()
+
+    def get_dead_letters(self, agent_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Inspect an agent's dead letters, newest first.
+
+        Args:
+            agent_id: Agent ID
+            limit: Maximum entries
+            offset: Entries to skip
+
+        Returns:
+            List of dicts: message_id, agent_id, error, attempts, failed_at, message
+        """
+        try:
+            raw = self.client.lrange(self._make_dead_letter_key(agent_id), offset, offset + limit - 1)
+            return [self.codec.decode(entry) for entry in raw]
+
+        except RedisError as e:
+            logger.error(f"Failed to read dead letters for '{agent_id}': {e}")
+            return []
+
+    def get_dead_letter_count(self, agent_id: str) -> int:
+        """Number of dead letters held for an agent."""
+        try:
+            return self.client.llen(self._make_dead_letter_key(agent_id))
+
+        except RedisError as e:
+            logger.error(f"Failed to count dead letters for '{agent_id}': {e}")
+            return 0
+
+    def _oldest_dead_letters(self, agent_id: str, count: int) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Oldest dead letters first, as (handle for _claim_dead_letter, entry)."""
+        raw = self.client.lrange(self._make_dead_letter_key(agent_id), -count, -1)
+        return [(entry, self.codec.decode(entry)) for entry in reversed(raw)]
+
+    def _claim_dead_letter(self, agent_id: str, handle: Any) -> bool:
+        """Remove a dead letter; False if another replay already took it (LREM is atomic)."""
+        return self.client.lrem(self._make_dead_letter_key(agent_id), -1, handle) > 0
+
+    def _restore_dead_letter(self, agent_id: str, handle: Any) -> None:
+        """Put a claimed dead letter back at the oldest end (its send was refused)."""
+        self.client.rpush(self._make_dead_letter_key(agent_id), handle)
+
+    def replay_dead_letters(self, agent_id: str, count: Optional[int] = None) -> int:
+        """
+        Re-send an agent's dead letters, oldest first, with a fresh retry budget.
+
+        Each entry is claimed (removed) before it is sent, so concurrent
+        replays never send the same dead letter twice. Stops early (putting
+        the refused entry back, leaving the rest in place) once the agent's
+        queue is full.
+
+        Args:
+            agent_id: Agent ID
+            count: Maximum messages to replay (None = all)
+
+        Returns:
+            Number of messages replayed
+
+        Raises:
+            RedisError: If Redis fails
+        """
+        replayed = 0
+        for handle, entry in self._oldest_dead_letters(agent_id, count or self.dead_letter_max):
+            if not entry.get("message"):
+                # Recorded without its payload; nothing to re-send
+                continue
+            if not self._claim_dead_letter(agent_id, handle):
+                # Replayed or purged concurrently
+                continue
+            message = self._deserialize_message(entry["message"])
+            message.metadata.attempts = 0
+            try:
+                self.send_many([message])
+            except QueueFullError:
+                self._restore_dead_letter(agent_id, handle)
+                break
+            replayed += 1
+
+        if replayed:
+            self._record_metrics(agent_id, replayed=replayed)
+            logger.info(f"Replayed {replayed} dead letters for '{agent_id}'")
+        return replayed
+
+    def purge_dead_letters(self, agent_id: str) -> int:
+        """
+        Delete all of an agent's dead letters.
+
+        Returns:
+            Number of entries deleted
+        """
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.llen(self._make_dead_letter_key(agent_id))
+            pipe.delete(self._make_dead_letter_key(agent_id))
+            pipe.srem(self._make_dead_letter_index_key(), agent_id)
+            count = pipe.execute()[0]
+
+            logger.info(f"Purged {count} dead letters for '{agent_id}'")
+            return count
+
+        except RedisError as e:
+            logger.error(f"Failed to purge dead letters for '{agent_id}': {e}")
+            return 0
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    @staticmethod
+    def _current_minute() -> int:
+        return int(time.time() // 60)
+
+    def _pipe_metrics(self, pipe: Any, agent_id: str, **counts: int) -> None:
+        """Queue counter increments (totals and this minute's bucket) on a pipeline."""
+        metrics_key = self._make_metrics_key(agent_id)
+        bucket_key = self._make_throughput_key(agent_id, self._current_minute())
+        for field, amount in counts.items():
+            pipe.hincrby(metrics_key, field, amount)
+            pipe.hincrby(bucket_key, field, amount)
+        pipe.expire(bucket_key, self.THROUGHPUT_BUCKET_TTL)
+
+    def _record_metrics(self, agent_id: str, **counts: int) -> None:
+        """Increment counters in their own round trip (best effort)."""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            self._pipe_metrics(pipe, agent_id, **counts)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to record bus metrics for '{agent_id}': {e}")
+
+    def _read_metrics(self, agent_id: str, window_minutes: int) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Returns:
+            (all-time counters, counters summed over the last window_minutes)
+        """
+        minute = self._current_minute()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(self._make_metrics_key(agent_id))
+        for m in range(minute - window_minutes + 1, minute + 1):
+            pipe.hgetall(self._make_throughput_key(agent_id, m))
+        results = pipe.execute()
+
+        def to_counts(raw: Dict[Any, Any]) -> Dict[str, int]:
+            return {self._decode(k): int(v) for k, v in raw.items()}
+
+        totals = to_counts(results[0])
+        recent: Dict[str, int] = {}
+        for bucket in results[1:]:
+            for field, value in to_counts(bucket).items():
+                recent[field] = recent.get(field, 0) + value
+        return totals, recent
+
+    def _dequeue_rate(self, agent_id: str, window_minutes: int = 5) -> float:
+        """Messages dequeued per second over the last window_minutes (0.0 if unknown)."""
+        try:
+            _, recent = self._read_metrics(agent_id, window_minutes)
+        except RedisError:
+            return 0.0
+        # The current minute is only partly over
+        elapsed = (window_minutes - 1) * 60 + (time.time() % 60)
+        return recent.get("dequeued", 0) / elapsed if elapsed > 0 else 0.0
+
+    def _oldest_enqueued_at(self, agent_id: str) -> Optional[datetime]:
+        """Creation time of the message next in line (the tail of the list)."""
+        payload = self.client.lindex(self._make_queue_key(agent_id), -1)
+        if payload is None:
+            return None
+        return self._deserialize_message(self.codec.decode(payload)).metadata.timestamp
+
+    def get_queue_lag(self, agent_id: str) -> float:
+        """
+        Age in seconds of the oldest message waiting in an agent's queue (0.0 if empty).
+        """
+        try:
+            oldest = self._oldest_enqueued_at(agent_id)
+        except RedisError as e:
+            logger.error(f"Failed to get queue lag for '{agent_id}': {e}")
+            return 0.0
+        except ValueError:
+            # Undecodable legacy payload at the head of the queue: age unknown
+            return 0.0
+        if oldest is None:
+            return 0.0
+        if oldest.tzinfo is not None:
+            oldest = oldest.replace(tzinfo=None) - (oldest.utcoffset() or timedelta(0))
+        return max((datetime.utcnow() - oldest).total_seconds(), 0.0)
+
+    def get_agent_metrics(self, agent_id: str, window_minutes: int = 5) -> Dict[str, Any]:
+        """
+        Queue depth, lag, throughput and failure gauges for one agent.
+
+        Args:
+            agent_id: Agent ID
+            window_minutes: Throughput window (per-minute buckets, max 60)
+
+        Returns:
+            Dictionary with queue_size, lag_seconds, dead_letters, counters
+            (all-time) and throughput_per_minute (averaged over the window)
+        """
+        window_minutes = min(max(window_minutes, 1), self.THROUGHPUT_BUCKET_TTL // 60)
+        try:
+            totals, recent = self._read_metrics(agent_id, window_minutes)
+        except RedisError as e:
+            logger.error(f"Failed to read bus metrics for '{agent_id}': {e}")
+            totals, recent = {}, {}
+
+        return {
+            "agent_id": agent_id,
+            "queue_size": self.get_queue_size(agent_id),
+            "max_queue_size": self.max_queue_size,
+            "lag_seconds": round(self.get_queue_lag(agent_id), 3),
+            "dead_letters": self.get_dead_letter_count(agent_id),
+            "counters": {field: totals.get(field, 0) for field in METRIC_FIELDS},
+            "throughput_per_minute": {
+                field: round(recent.get(field, 0) / window_minutes, 2) for field in METRIC_FIELDS
+            },
+            "window_minutes": window_minutes
+        }
 
     # =========================================================================
     # Utility Methods
@@ -517,8 +1325,11 @@ class RedisMessageBus:
         """
         try:
             queue_key = self._make_queue_key(agent_id)
-            count = self.client.llen(queue_key)
-            self.client.delete(queue_key)
+            pipe = self.client.pipeline(transaction=True)
+            pipe.llen(queue_key)
+            pipe.delete(queue_key)
+            pipe.srem(self._make_queue_index_key(), agent_id)
+            count = pipe.execute()[0]
 
             logger.info(f"Cleared {count} messages from agent '{agent_id}' queue")
             return count
@@ -558,33 +1369,71 @@ class RedisMessageBus:
         except (RedisError, ConnectionError):
             return False
 
+    def _backfill_queue_index(self) -> None:
+        """
+        Index queues created before the queue index existed.
+
+        Runs once per process using SCAN, which walks the keyspace in small
+        batches instead of blocking Redis like KEYS.
+        """
+        if self._queue_index_backfilled:
+            return
+        pattern = self._make_queue_key("*")
+        agent_ids = [
+            self._decode(key).split(':')[2]
+            for key in self.client.scan_iter(match=pattern, count=500)
+        ]
+        if agent_ids:
+            self.client.sadd(self._make_queue_index_key(), *agent_ids)
+        self._queue_index_backfilled = True
+
     def get_bus_stats(self) -> Dict[str, Any]:
         """
         Get message bus statistics.
 
+        Queue lengths, dead-letter counts, the retry backlog (and the health
+        PING) come back in one pipelined round trip over the indexed agents.
+
         Returns:
             Dictionary with bus statistics
         """
         try:
-            # Get all agent queues
-            pattern = f"{self.namespace}:agent:*:queue"
-            queue_keys = self.client.keys(pattern)
-
-            queue_stats = {}
-            total_messages = 0
+            self._backfill_queue_index()
+            agent_ids = sorted(
+                self._decode(a) for a in self.client.smembers(self._make_queue_index_key())
+            )
+            dlq_agent_ids = sorted(
+                self._decode(a) for a in self.client.smembers(self._make_dead_letter_index_key())
+            )
 
-            for key in queue_keys:
-                agent_id = key.decode('utf-8').split(':')[2]
-                size = self.client.llen(key)
-                queue_stats[agent_id] = size
-                total_messages += size
+            pipe = self.client.pipeline(transaction=False)
+            for agent_id in agent_ids:
+                pipe.llen(self._make_queue_key(agent_id))
+            for agent_id in dlq_agent_ids:
+                pipe.llen(self._make_dead_letter_key(agent_id))
+            pipe.zcard(self._make_retry_schedule_key())
+            pipe.ping()
+            results = pipe.execute()
+
+            queue_stats = dict(zip(agent_ids, results[:len(agent_ids)]))
+            dead_letter_stats = {
+                agent_id: count
+                for agent_id, count in zip(dlq_agent_ids, results[len(agent_ids):-2])
+                if count
+            }
 
             return {
-                "total_agents": len(queue_keys),
-                "total_messages": total_messages,
+                "total_agents": len(agent_ids),
+                "total_messages": sum(queue_stats.values()),
                 "queue_stats": queue_stats,
+                "lag_seconds": {
+                    agent_id: round(self.get_queue_lag(agent_id), 3)
+                    for agent_id, size in queue_stats.items() if size
+                },
+                "dead_letter_stats": dead_letter_stats,
+                "retry_scheduled": results[-2],
                 "max_queue_size": self.max_queue_size,
-                "healthy": self.health_check()
+                "healthy": bool(results[-1])
             }
 
         except RedisError as e:
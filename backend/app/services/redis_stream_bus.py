@@ -0,0 +1,857 @@
+"""
+Redis Streams Message Bus
+
+Streams-based implementation of the RedisMessageBus interface:
+- Per-agent streams (XADD with approximate MAXLEN)
+- Consumer groups, so several workers can serve the same agent
+- Batched reads (XREADGROUP COUNT) and batched acknowledgement (XACK + XDEL)
+- Redelivery of messages stuck with a dead consumer (XAUTOCLAIM)
+- At-least-once delivery: a message stays in the group's Pending Entries
+  List (PEL) until it is acknowledged
+
+Message status is derived from the stream and the PEL instead of a status
+hash per message:
+- in the stream, not in the PEL -> delivered (queued, not yet read)
+- in the PEL                     -> processing (read, not yet acknowledged)
+- gone from the stream           -> completed (acknowledged entries are deleted)
+- in the agent's failed stream   -> failed
+- on the retry schedule          -> pending (read from the status hash)
+
+Retries share the list transport's schedule (re-sent with XADD when due);
+the failed stream doubles as the agent's dead-letter queue.
+
+Redis Key Structure:
+- Agent streams: ecowas:agent:{agent_id}:stream (STREAM, one consumer group;
+  the "data" field holds the codec-encoded message)
+- Failed messages / dead letters: ecowas:agent:{agent_id}:failed (STREAM)
+- Message location: ecowas:message:{message_id}:loc (STRING, TTL = message_ttl)
+- Stream index: ecowas:index:agent_queues (SET of agent IDs)
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from uuid import UUID
+from loguru import logger
+
+import redis
+from redis.exceptions import RedisError, ResponseError
+
+from app.schemas.agent_messages import AgentMessage, MessageStatus
+from app.services.message_codec import MessageCodec
+from app.services.redis_message_bus import RedisMessageBus
+
+
+# Atomic batch enqueue onto agent streams: backlog check for the whole batch,
+# then XADD, stream-index SADD, the message location and the enqueue
+# counters per message. All-or-nothing, like the list transport's send script.
+#
+# KEYS[1] = stream index; then per message: stream key, location key,
+#           metrics key, throughput bucket key
+# ARGV = max_queue_size, location_ttl, bucket_ttl,
+#        then per message: agent_id, message_id, payload
+# Returns {1, entry_id...} on success or {0, index_of_rejected_message, stream_length}
+_STREAM_SEND_BATCH_LUA = """
+local max_size = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local n = (#KEYS - 1) / 4
+
+local sizes = {}
+for i = 1, n do
+    local stream = KEYS[4 * i - 2]
+    if sizes[stream] == nil then
+        sizes[stream] = redis.call('XLEN', stream)
+    end
+    if sizes[stream] >= max_size then
+        return {0, i, sizes[stream]}
+    end
+    sizes[stream] = sizes[stream] + 1
+end
+
+local result = {1}
+for i = 1, n do
+    local base = 3 + (i - 1) * 3
+    local agent_id = ARGV[base + 1]
+    local entry_id = redis.call('XADD', KEYS[4 * i - 2], 'MAXLEN', '~', max_size, '*',
+        'message_id', ARGV[base + 2], 'data', ARGV[base + 3])
+    redis.call('SADD', KEYS[1], agent_id)
+    redis.call('SET', KEYS[4 * i - 1],
+        cjson.encode({agent_id = agent_id, entry_id = entry_id}), 'EX', ttl)
+    redis.call('HINCRBY', KEYS[4 * i], 'enqueued', 1)
+    redis.call('HINCRBY', KEYS[4 * i + 1], 'enqueued', 1)
+    redis.call('EXPIRE', KEYS[4 * i + 1], ARGV[3])
+    result[#result + 1] = entry_id
+end
+return result
+"""
+
+
+class RedisStreamMessageBus(RedisMessageBus):
+    """
+    Redis Streams message bus with consumer groups.
+
+    Drop-in replacement for RedisMessageBus (same public methods). Pub/sub
+    event broadcasting is inherited unchanged.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        namespace: str = "ecowas",
+        default_timeout: int = 30,
+        max_queue_size: int = 1000,
+        message_ttl: int = 3600,
+        codec: Optional[MessageCodec] = None,
+        consumer_group: str = "agent-workers",
+        consumer_name: Optional[str] = None,
+        claim_idle_ms: int = 60000,
+        ack_batch_size: int = 50,
+        ack_flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff_base: float = 1.0,
+        retry_backoff_max: float = 300.0,
+        dead_letter_max: int = 1000,
+        retry_poll_interval: float = 1.0
+    ):
+        """
+        Initialize the streams message bus.
+
+        Args:
+            redis_client: Redis client instance
+            namespace: Namespace prefix for all Redis keys
+            default_timeout: Default timeout for blocking reads (seconds)
+            max_queue_size: Maximum unacknowledged messages per agent stream
+            message_ttl: How long message locations (for status lookups) are kept
+            codec: Payload codec (default: the "bus" namespace codec)
+            consumer_group: Consumer group shared by all workers of an agent
+            consumer_name: This worker's consumer name (default: host-pid)
+            claim_idle_ms: Pending messages idle longer than this are reclaimed
+            ack_batch_size: Flush buffered acknowledgements at this many entries
+            ack_flush_interval: ...or when the oldest buffered ack is this old (seconds)
+            max_retries: Failed messages are retried this many times, then dead-lettered
+            retry_backoff_base: First retry delay in seconds (doubles per attempt)
+            retry_backoff_max: Upper bound for retry delays and retry_after hints
+            dead_letter_max: Approximate bound for each agent's failed stream
+            retry_poll_interval: Minimum seconds between retry-schedule polls per process
+        """
+        super().__init__(
+            redis_client=redis_client,
+            namespace=namespace,
+            default_timeout=default_timeout,
+            max_queue_size=max_queue_size,
+            message_ttl=message_ttl,
+            codec=codec,
+            max_retries=max_retries,
+            retry_backoff_base=retry_backoff_base,
+            retry_backoff_max=retry_backoff_max,
+            dead_letter_max=dead_letter_max,
+            retry_poll_interval=retry_poll_interval
+        )
+        self.consumer_group = consumer_group
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.claim_idle_ms = claim_idle_ms
+        self.ack_batch_size = ack_batch_size
+        self.ack_flush_interval = ack_flush_interval
+
+        self._lock = threading.Lock()
+        self._groups_ready: set = set()
+        # message_id -> (agent_id, entry_id) for messages this worker has read
+        self._inflight: Dict[str, Tuple[str, str]] = {}
+        # agent_id -> [(entry_id, message_id)] awaiting a batched XACK
+        self._ack_buffer: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self._ack_buffer_since: Optional[float] = None
+        self._last_claim: Dict[str, float] = {}
+        self._send_script = self.client.register_script(_STREAM_SEND_BATCH_LUA)
+
+    # =========================================================================
+    # Key Generation
+    # =========================================================================
+
+    def _make_queue_key(self, agent_id: str) -> str:
+        """Generate Redis key for agent's message stream"""
+        return f"{self.namespace}:agent:{agent_id}:stream"
+
+    def _make_failed_key(self, agent_id: str) -> str:
+        """Generate Redis key for agent's failed-message stream"""
+        return f"{self.namespace}:agent:{agent_id}:failed"
+
+    def _make_location_key(self, message_id: Any) -> str:
+        """Generate Redis key mapping a message ID to its stream entry"""
+        return f"{self.namespace}:message:{message_id}:loc"
+
+    def _ensure_group(self, agent_id: str) -> None:
+        """Create the agent's stream and consumer group on first use."""
+        if agent_id in self._groups_ready:
+            return
+        try:
+            self.client.xgroup_create(
+                self._make_queue_key(agent_id), self.consumer_group, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._groups_ready.add(agent_id)
+
+    # =========================================================================
+    # Message Queuing (Point-to-Point)
+    # =========================================================================
+
+    def send_many(self, messages: List[AgentMessage]) -> List[UUID]:
+        """
+        Append a batch of messages to their recipients' streams in one round trip.
+
+        The backlog check (XLEN; acknowledged entries are deleted, so it is the
+        unprocessed backlog), XADD, index and message location run atomically
+        in one Lua script. All-or-nothing if any stream is full.
+
+        Args:
+            messages: Messages to send
+
+        Returns:
+            List[UUID]: Message IDs, in input order
+
+        Raises:
+            RedisError: If send fails
+            QueueFullError: If a recipient stream is full
+        """
+        if not messages:
+            return []
+
+        minute = self._current_minute()
+        keys = [self._make_queue_index_key()]
+        args = [self.max_queue_size, self.message_ttl, self.THROUGHPUT_BUCKET_TTL]
+        for message in messages:
+            recipient_id = message.metadata.recipient_id
+            self._ensure_group(recipient_id)
+            keys += [
+                self._make_queue_key(recipient_id),
+                self._make_location_key(message.metadata.message_id),
+                self._make_metrics_key(recipient_id),
+                self._make_throughput_key(recipient_id, minute)
+            ]
+            args += [recipient_id, str(message.metadata.message_id), self.codec.encode(message.to_dict())]
+
+        try:
+            result = self._send_script(keys=keys, args=args)
+        except RedisError as e:
+            logger.error(f"Failed to send {len(messages)} message(s): {e}")
+            raise
+
+        if not result[0]:
+            _, index, size = result
+            raise self._queue_full(messages[index - 1].metadata.recipient_id, size)
+
+        for message in messages:
+            logger.debug(
+                f"Sent message {message.metadata.message_id} to agent "
+                f"'{message.metadata.recipient_id}' "
+                f"(type={message.type}, priority={message.priority})"
+            )
+
+        return [message.metadata.message_id for message in messages]
+
+    def receive_message(
+        self,
+        agent_id: str,
+        timeout: Optional[int] = None
+    ) -> Optional[AgentMessage]:
+        """
+        Receive one message for an agent (blocking).
+
+        Args:
+            agent_id: Agent ID to receive messages for
+            timeout: Timeout in seconds (None = use default)
+
+        Returns:
+            AgentMessage if available, None if timeout
+        """
+        messages = self.receive_messages(agent_id, count=1, timeout=timeout)
+        return messages[0] if messages else None
+
+    def receive_messages(
+        self,
+        agent_id: str,
+        count: int = 10,
+        timeout: Optional[int] = None
+    ) -> List[AgentMessage]:
+        """
+        Receive up to `count` messages for an agent in one XREADGROUP.
+
+        Buffered acknowledgements are flushed first, due retries are
+        promoted, and messages stuck with a dead consumer are reclaimed
+        (XAUTOCLAIM) before reading new ones.
+
+        Args:
+            agent_id: Agent ID to receive messages for
+            count: Maximum messages to return
+            timeout: Block up to this many seconds for new messages (None = default)
+
+        Returns:
+            List of messages (empty on timeout)
+
+        Raises:
+            RedisError: If receive fails
+        """
+        try:
+            self._ensure_group(agent_id)
+            self.flush_acks()
+
+            messages = self._maybe_claim(agent_id, count)
+            if messages:
+                return messages
+
+            timeout = timeout if timeout is not None else self.default_timeout
+            # XREADGROUP block=0 waits forever; a 0 timeout here means "just poll"
+            deadline = time.monotonic() + max(timeout, 0.001)
+
+            first = True
+            while True:
+                wait = self._receive_wait(deadline, first)
+                if wait is None:
+                    return []
+                first = False
+                result = self.client.xreadgroup(
+                    self.consumer_group,
+                    self.consumer_name,
+                    {self._make_queue_key(agent_id): ">"},
+                    count=count,
+                    block=max(int(wait * 1000), 1)
+                )
+                if result:
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    return []
+
+            _, entries = result[0]
+            messages = self._track_entries(agent_id, entries)
+            if messages:
+                self._record_metrics(agent_id, dequeued=len(messages))
+
+            logger.debug(f"Agent '{agent_id}' received {len(messages)} messages")
+            return messages
+
+        except RedisError as e:
+            logger.error(f"Failed to receive message for agent '{agent_id}': {e}")
+            raise
+
+    def _track_entries(self, agent_id: str, entries: List[Any]) -> List[AgentMessage]:
+        """Deserialize stream entries and remember them for acknowledgement."""
+        messages = []
+        for entry_id, fields in entries:
+            if not fields:
+                continue
+            fields = {self._decode(k): v for k, v in fields.items()}
+            message = self._deserialize_message(self.codec.decode(fields["data"]))
+            with self._lock:
+                self._inflight[str(message.metadata.message_id)] = (agent_id, self._decode(entry_id))
+            messages.append(message)
+        return messages
+
+    def _maybe_claim(self, agent_id: str, count: int) -> List[AgentMessage]:
+        """Reclaim stuck messages at most every claim_idle_ms / 2."""
+        now = time.monotonic()
+        if now - self._last_claim.get(agent_id, 0.0) < self.claim_idle_ms / 2000:
+            return []
+        self._last_claim[agent_id] = now
+        return self.claim_stale_messages(agent_id, count=count)
+
+    def claim_stale_messages(self, agent_id: str, count: int = 10) -> List[AgentMessage]:
+        """
+        Take over messages another consumer read but never acknowledged.
+
+        Uses XAUTOCLAIM with claim_idle_ms, so a worker that died
+        mid-processing doesn't strand its messages.
+
+        Args:
+            agent_id: Agent whose stream to inspect
+            count: Maximum messages to claim
+
+        Returns:
+            Claimed messages, now owned by this consumer
+        """
+        try:
+            self._ensure_group(agent_id)
+            stream_key = self._make_queue_key(agent_id)
+            result = self.client.xautoclaim(
+                stream_key,
+                self.consumer_group,
+                self.consumer_name,
+                min_idle_time=self.claim_idle_ms,
+                start_id="0-0",
+                count=count
+            )
+            entries = result[1]
+            # Redis 7 also reports PEL entries whose data was trimmed; drop them
+            deleted = result[2] if len(result) > 2 else []
+            if deleted:
+                self.client.xack(stream_key, self.consumer_group, *deleted)
+
+            messages = self._track_entries(agent_id, entries)
+            if messages:
+                self._record_metrics(agent_id, dequeued=len(messages))
+                logger.warning(f"Reclaimed {len(messages)} stale messages for agent '{agent_id}'")
+            return messages
+
+        except RedisError as e:
+            logger.error(f"Failed to claim stale messages for '{agent_id}': {e}")
+            return []
+
+    def get_pending_messages(self, agent_id: str) -> List[AgentMessage]:
+        """
+        Get all unacknowledged messages for an agent (non-blocking).
+
+        Args:
+            agent_id: Agent ID
+
+        Returns:
+            List of queued and in-flight messages
+        """
+        try:
+            entries = self.client.xrange(self._make_queue_key(agent_id))
+            return [
+                self._deserialize_message(self.codec.decode({self._decode(k): v for k, v in fields.items()}["data"]))
+                for _, fields in entries
+            ]
+
+        except RedisError as e:
+            logger.error(f"Failed to get pending messages for '{agent_id}': {e}")
+            return []
+
+    # =========================================================================
+    # Acknowledgement
+    # =========================================================================
+
+    def _locate(self, message_id: UUID) -> Optional[Tuple[str, str]]:
+        """Find (agent_id, entry_id) for a message, locally or via its location key."""
+        with self._lock:
+            location = self._inflight.get(str(message_id))
+        if location:
+            return location
+        raw = self.client.get(self._make_location_key(message_id))
+        if not raw:
+            return None
+        loc = json.loads(raw)
+        if loc.get("dead_letter"):
+            return None
+        return loc["agent_id"], loc["entry_id"]
+
+    def acknowledge_message(self, message_id: UUID, agent_id: str) -> bool:
+        """
+        Acknowledge that a message has been successfully processed.
+
+        The XACK is buffered and sent in a batch (see flush_acks), so it may
+        show as processing for up to ack_flush_interval.
+
+        Args:
+            message_id: Message ID to acknowledge
+            agent_id: Agent that processed the message
+
+        Returns:
+            bool: True if acknowledged (or queued for acknowledgement)
+        """
+        location = self._locate(message_id)
+        if location is None:
+            logger.warning(f"Cannot acknowledge unknown message {message_id}")
+            return False
+
+        with self._lock:
+            self._inflight.pop(str(message_id), None)
+            self._ack_buffer[location[0]].append((location[1], str(message_id)))
+            if self._ack_buffer_since is None:
+                self._ack_buffer_since = time.monotonic()
+            buffered = sum(len(v) for v in self._ack_buffer.values())
+            due = time.monotonic() - self._ack_buffer_since >= self.ack_flush_interval
+
+        if buffered >= self.ack_batch_size or due:
+            self.flush_acks()
+
+        logger.debug(f"Message {message_id} acknowledged by '{agent_id}'")
+        return True
+
+    def flush_acks(self) -> int:
+        """
+        Send all buffered acknowledgements in one pipeline.
+
+        Each agent gets a single XACK and XDEL for all of its entries. Deleting
+        acknowledged entries keeps XLEN equal to the outstanding backlog.
+
+        Returns:
+            Number of entries acknowledged
+        """
+        with self._lock:
+            if not self._ack_buffer:
+                return 0
+            batch = dict(self._ack_buffer)
+            self._ack_buffer = defaultdict(list)
+            self._ack_buffer_since = None
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for agent_id, items in batch.items():
+                stream_key = self._make_queue_key(agent_id)
+                entry_ids = [entry_id for entry_id, _ in items]
+                pipe.xack(stream_key, self.consumer_group, *entry_ids)
+                pipe.xdel(stream_key, *entry_ids)
+                pipe.delete(*[self._make_location_key(mid) for _, mid in items])
+                self._pipe_metrics(pipe, agent_id, acked=len(items))
+            pipe.execute()
+        except RedisError as e:
+            # Put them back; unflushed acks only mean possible redelivery
+            with self._lock:
+                for agent_id, items in batch.items():
+                    self._ack_buffer[agent_id].extend(items)
+                self._ack_buffer_since = self._ack_buffer_since or time.monotonic()
+            logger.error(f"Failed to flush acknowledgements: {e}")
+            raise
+
+        return sum(len(items) for items in batch.values())
+
+    def fail_message(
+        self,
+        message_id: UUID,
+        agent_id: str,
+        error: str,
+        retry: bool = True
+    ) -> bool:
+        """
+        Mark a message as failed.
+
+        The entry is rescheduled with exponential backoff until it has failed
+        max_retries times, then moved to the agent's failed stream (its
+        dead-letter queue) together with the error. Either way it leaves the
+        agent's stream and PEL; the retry or dead letter is written first, so
+        a crash in between means a duplicate rather than a lost message.
+
+        Args:
+            message_id: Message ID
+            agent_id: Agent that failed to process
+            error: Error description
+            retry: False to dead-letter immediately (non-retryable error)
+
+        Returns:
+            bool: True if marked failed
+        """
+        try:
+            location = self._locate(message_id)
+            if location is None:
+                logger.warning(f"Cannot fail unknown message {message_id}")
+                return False
+            owner, entry_id = location
+            stream_key = self._make_queue_key(owner)
+
+            entries = self.client.xrange(stream_key, min=entry_id, max=entry_id)
+            if entries:
+                data = {self._decode(k): v for k, v in entries[0][1].items()}["data"]
+                message = self._deserialize_message(self.codec.decode(data))
+                retried = self._retry_or_dead_letter(message, agent_id, error, retry)
+            else:
+                # Entry already trimmed: record the failure without a payload
+                self._write_failed_entry(owner, str(message_id), agent_id, error, "{}", 0)
+                retried = False
+
+            pipe = self.client.pipeline(transaction=True)
+            pipe.xack(stream_key, self.consumer_group, entry_id)
+            pipe.xdel(stream_key, entry_id)
+            if retried:
+                # Status comes from the status hash until the retry is re-sent
+                pipe.delete(self._make_location_key(message_id))
+            pipe.execute()
+            with self._lock:
+                self._inflight.pop(str(message_id), None)
+
+            logger.warning(f"Message {message_id} marked failed by '{agent_id}': {error}")
+            return True
+
+        except RedisError as e:
+            logger.error(f"Failed to mark message {message_id} as failed: {e}")
+            raise
+
+    def _write_failed_entry(
+        self,
+        owner: str,
+        message_id: str,
+        agent_id: str,
+        error: str,
+        data: Any,
+        attempts: int
+    ) -> None:
+        """Append to the owner's failed stream and point the message location at it."""
+        failed_entry_id = self.client.xadd(
+            self._make_failed_key(owner),
+            {
+                "message_id": message_id,
+                "data": data,
+                "error": error,
+                "agent_id": agent_id,
+                "attempts": attempts,
+                "failed_at": datetime.utcnow().isoformat()
+            },
+            maxlen=self.dead_letter_max,
+            approximate=True
+        )
+        pipe = self.client.pipeline(transaction=False)
+        pipe.setex(
+            self._make_location_key(message_id),
+            self.message_ttl,
+            json.dumps({
+                "agent_id": owner,
+                "entry_id": self._decode(failed_entry_id),
+                "dead_letter": True
+            })
+        )
+        self._pipe_metrics(pipe, owner, failed=1, dead_lettered=1)
+        pipe.execute()
+
+    def _dead_letter(self, message: AgentMessage, agent_id: str, error: str) -> None:
+        """Dead letters go to the recipient's failed stream."""
+        self._write_failed_entry(
+            message.metadata.recipient_id,
+            str(message.metadata.message_id),
+            agent_id,
+            error,
+            self.codec.encode(message.to_dict()),
+            message.metadata.attempts
+        )
+
+    def _failed_entry_to_dict(self, fields: Dict[Any, Any]) -> Dict[str, Any]:
+        fields = {self._decode(k): v for k, v in fields.items()}
+        return {
+            "message_id": self._decode(fields.get("message_id")),
+            "agent_id": self._decode(fields.get("agent_id")),
+            "error": self._decode(fields.get("error")),
+            "attempts": int(fields.get("attempts") or 0),
+            "failed_at": self._decode(fields.get("failed_at")),
+            "message": self.codec.decode(fields["data"]) if fields.get("data") else {}
+        }
+
+    def get_dead_letters(self, agent_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Inspect an agent's failed stream, newest first."""
+        try:
+            entries = self.client.xrevrange(self._make_failed_key(agent_id), count=offset + limit)
+            return [self._failed_entry_to_dict(fields) for _, fields in entries[offset:]]
+
+        except RedisError as e:
+            logger.error(f"Failed to read dead letters for '{agent_id}': {e}")
+            return []
+
+    def get_dead_letter_count(self, agent_id: str) -> int:
+        try:
+            return self.client.xlen(self._make_failed_key(agent_id))
+
+        except RedisError as e:
+            logger.error(f"Failed to count dead letters for '{agent_id}': {e}")
+            return 0
+
+    def _oldest_dead_letters(self, agent_id: str, count: int) -> List[Tuple[Any, Dict[str, Any]]]:
+        entries = self.client.xrange(self._make_failed_key(agent_id), count=count)
+        return [((entry_id, fields), self._failed_entry_to_dict(fields)) for entry_id, fields in entries]
+
+    def _claim_dead_letter(self, agent_id: str, handle: Any) -> bool:
+        entry_id, _ = handle
+        return self.client.xdel(self._make_failed_key(agent_id), entry_id) > 0
+
+    def _restore_dead_letter(self, agent_id: str, handle: Any) -> None:
+        """Re-append a refused dead letter and point its message location at the new entry."""
+        _, fields = handle
+        fields = {self._decode(k): v for k, v in fields.items()}
+        entry_id = self.client.xadd(
+            self._make_failed_key(agent_id), fields, maxlen=self.dead_letter_max, approximate=True
+        )
+        self.client.setex(
+            self._make_location_key(self._decode(fields.get("message_id"))),
+            self.message_ttl,
+            json.dumps({"agent_id": agent_id, "entry_id": self._decode(entry_id), "dead_letter": True})
+        )
+
+    def purge_dead_letters(self, agent_id: str) -> int:
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.xlen(self._make_failed_key(agent_id))
+            pipe.delete(self._make_failed_key(agent_id))
+            count = pipe.execute()[0]
+
+            logger.info(f"Purged {count} dead letters for '{agent_id}'")
+            return count
+
+        except RedisError as e:
+            logger.error(f"Failed to purge dead letters for '{agent_id}': {e}")
+            return 0
+
+    def _oldest_enqueued_at(self, agent_id: str) -> Optional[datetime]:
+        """Entry IDs start with the XADD time in milliseconds."""
+        entries = self.client.xrange(self._make_queue_key(agent_id), count=1)
+        if not entries:
+            return None
+        return self._entry_time(entries[0][0])
+
+    def _entry_time(self, entry_id: Any) -> datetime:
+        return datetime.utcfromtimestamp(int(self._decode(entry_id).split("-")[0]) / 1000)
+
+    def get_message_status(self, message_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Derive a message's status from its stream entry and the PEL.
+
+        Args:
+            message_id: Message ID
+
+        Returns:
+            Dictionary with status info, or None if not found
+        """
+        try:
+            raw = self.client.get(self._make_location_key(message_id))
+            if not raw:
+                # Waiting on the retry schedule (or unknown)
+                return super().get_message_status(message_id)
+            loc = json.loads(raw)
+            agent_id, entry_id = loc["agent_id"], loc["entry_id"]
+            status = {"message_id": str(message_id), "agent_id": agent_id, "entry_id": entry_id}
+
+            if loc.get("dead_letter"):
+                entries = self.client.xrange(self._make_failed_key(agent_id), min=entry_id, max=entry_id)
+                fields = {self._decode(k): v for k, v in entries[0][1].items()} if entries else {}
+                status.update({
+                    "status": MessageStatus.FAILED.value,
+                    "error": self._decode(fields.get("error")),
+                    "attempts": self._decode(fields.get("attempts")),
+                    "updated_at": self._decode(fields.get("failed_at"))
+                })
+                return status
+
+            stream_key = self._make_queue_key(agent_id)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.xpending_range(stream_key, self.consumer_group, min=entry_id, max=entry_id, count=1)
+            pipe.xrange(stream_key, min=entry_id, max=entry_id)
+            pending, entries = pipe.execute()
+
+            if pending:
+                status.update({
+                    "status": MessageStatus.PROCESSING.value,
+                    "consumer": self._decode(pending[0]["consumer"]),
+                    "delivery_count": pending[0]["times_delivered"],
+                    "idle_ms": pending[0]["time_since_delivered"]
+                })
+            elif entries:
+                status["status"] = MessageStatus.DELIVERED.value
+            else:
+                # Acknowledged entries are deleted from the stream
+                status["status"] = MessageStatus.COMPLETED.value
+            return status
+
+        except RedisError as e:
+            logger.error(f"Failed to get message status for {message_id}: {e}")
+            return None
+
+    # =========================================================================
+    # Utility Methods
+    # =========================================================================
+
+    def clear_agent_queue(self, agent_id: str) -> int:
+        """
+        Clear all messages (and the consumer group) from an agent's stream.
+
+        Args:
+            agent_id: Agent ID
+
+        Returns:
+            Number of messages cleared
+        """
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.xlen(self._make_queue_key(agent_id))
+            pipe.delete(self._make_queue_key(agent_id))
+            pipe.srem(self._make_queue_index_key(), agent_id)
+            count = pipe.execute()[0]
+            self._groups_ready.discard(agent_id)
+
+            logger.info(f"Cleared {count} messages from agent '{agent_id}' stream")
+            return count
+
+        except RedisError as e:
+            logger.error(f"Failed to clear queue for '{agent_id}': {e}")
+            return 0
+
+    def get_queue_size(self, agent_id: str) -> int:
+        """
+        Get the number of unacknowledged messages in an agent's stream.
+
+        Args:
+            agent_id: Agent ID
+
+        Returns:
+            Number of messages in the stream
+        """
+        try:
+            return self.client.xlen(self._make_queue_key(agent_id))
+
+        except RedisError as e:
+            logger.error(f"Failed to get queue size for '{agent_id}': {e}")
+            return 0
+
+    def get_bus_stats(self) -> Dict[str, Any]:
+        """
+        Get message bus statistics.
+
+        Stream lengths, PEL sizes, failed-stream lengths and the oldest entry
+        (for lag) of every indexed agent come back in one pipelined round trip.
+
+        Returns:
+            Dictionary with bus statistics
+        """
+        try:
+            self._backfill_queue_index()
+            agent_ids = sorted(
+                self._decode(a) for a in self.client.smembers(self._make_queue_index_key())
+            )
+
+            pipe = self.client.pipeline(transaction=False)
+            for agent_id in agent_ids:
+                pipe.xlen(self._make_queue_key(agent_id))
+                pipe.xpending(self._make_queue_key(agent_id), self.consumer_group)
+                pipe.xlen(self._make_failed_key(agent_id))
+                pipe.xrange(self._make_queue_key(agent_id), count=1)
+            pipe.zcard(self._make_retry_schedule_key())
+            pipe.ping()
+            results = pipe.execute(raise_on_error=False)
+
+            now = datetime.utcnow()
+            queue_stats, pending_stats, dead_letter_stats, lag = {}, {}, {}, {}
+            for i, agent_id in enumerate(agent_ids):
+                length, pending, failed, oldest = results[4 * i:4 * i + 4]
+                queue_stats[agent_id] = length if isinstance(length, int) else 0
+                # NOGROUP (stream created by another transport) -> nothing pending
+                pending_stats[agent_id] = pending["pending"] if isinstance(pending, dict) else 0
+                if isinstance(failed, int) and failed:
+                    dead_letter_stats[agent_id] = failed
+                if isinstance(oldest, list) and oldest:
+                    lag[agent_id] = round(max((now - self._entry_time(oldest[0][0])).total_seconds(), 0.0), 3)
+
+            return {
+                "transport": "streams",
+                "total_agents": len(agent_ids),
+                "total_messages": sum(queue_stats.values()),
+                "queue_stats": queue_stats,
+                "pending_stats": pending_stats,
+                "lag_seconds": lag,
+                "dead_letter_stats": dead_letter_stats,
+                "retry_scheduled": results[-2] if isinstance(results[-2], int) else 0,
+                "max_queue_size": self.max_queue_size,
+                "healthy": results[-1] is True
+            }
+
+        except RedisError as e:
+            logger.error(f"Failed to get bus stats: {e}")
+            return {
+                "error": str(e),
+                "healthy": False
+            }
+
+    def __repr__(self) -> str:
+        return (
+            f"<RedisStreamMessageBus namespace='{self.namespace}' "
+            f"group='{self.consumer_group}' consumer='{self.consumer_name}'>"
+        )
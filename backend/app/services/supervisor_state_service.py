@@ -5,11 +5,20 @@ Provides centralized state management for the Supervisor Agent.
 Maintains real-time view of all TWG activities, documents, and projects.
 
 Event-driven updates ensure state is always current.
+
+Change feed: every refresh that changes the state bumps a version and
+records an RFC 6902 JSON patch from the previous version. WebSocket
+subscribers get the full snapshot once, then only the patches; each
+carries epoch/version/base_version so a client can detect gaps (and ask
+for a resync, or resume with ?since= after a reconnect).
 """
 
-from typing import Dict, List, Optional
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 from datetime import datetime, UTC
-from uuid import UUID
+from uuid import UUID, uuid4
+import jsonpatch
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
@@ -25,6 +34,19 @@ from app.schemas.supervisor import (
     ProjectSnapshot, TWGSummary, ConflictSnapshot, DependencySnapshot,
     GlobalCalendarResponse, DocumentRegistryResponse, ProjectPipelineResponse
 )
+from app.core.config import settings
+from app.core.ws_framing import Frame
+from app.core.ws_queue import OutboundSocket, SendPolicy
+
+
+def _diff_states(previous: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """RFC 6902 operations turning one state document into the next."""
+    return jsonpatch.make_patch(previous, current).patch
+
+
+def _content(document: Dict[str, Any]) -> Dict[str, Any]:
+    # last_refresh changes on every rebuild; it alone is not a state change
+    return {k: v for k, v in document.items() if k != "last_refresh"}
 
 
 class SupervisorGlobalState:
@@ -43,7 +65,48 @@ class SupervisorGlobalState:
         """Initialize empty state"""
         self._state: Optional[SupervisorStateSnapshot] = None
         self._last_refresh: Optional[datetime] = None
+        self._refresh_lock = asyncio.Lock()
+
+        # Change feed (per process: the epoch changes on restart and differs
+        # between workers, so clients can only resume against the same one)
+        self.epoch = uuid4().hex[:12]
+        self.version = 0
+        self._document: Optional[Dict[str, Any]] = None
+        self._patches: Deque[Tuple[int, Frame]] = deque(maxlen=settings.SUPERVISOR_STATE_PATCH_HISTORY)
+        self._snapshot: Optional[Tuple[int, Frame]] = None
+        self._subscribers: Set[OutboundSocket] = set()
+        self._feed_lock = asyncio.Lock()
+        self._refresher: Optional[asyncio.Task] = None
         logger.info("SupervisorGlobalState initialized")
+
+    def _is_fresh(self, max_age: float) -> bool:
+        return (
+            self._state is not None and self._last_refresh is not None
+            and (datetime.now(UTC) - self._last_refresh).total_seconds() < max_age
+        )
+
+    async def ensure_fresh(self, db: AsyncSession, max_age: Optional[float] = None) -> SupervisorStateSnapshot:
+        """
+        Current state, rebuilt only if older than max_age.
+
+        Concurrent callers share one rebuild instead of each running the
+        full aggregation.
+
+        Args:
+            db: Database session
+            max_age: Seconds a snapshot stays valid (default: SUPERVISOR_STATE_MAX_AGE_SECONDS)
+
+        Returns:
+            State snapshot
+        """
+        max_age = settings.SUPERVISOR_STATE_MAX_AGE_SECONDS if max_age is None else max_age
+        if self._is_fresh(max_age):
+            return self._state
+        async with self._refresh_lock:
+            # Another request may have rebuilt it while we waited
+            if self._is_fresh(max_age):
+                return self._state
+            return await self.refresh_state(db)
     
     async def refresh_state(self, db: AsyncSession) -> SupervisorStateSnapshot:
         """
@@ -268,8 +331,153 @@ class SupervisorGlobalState:
             f"{len(twgs)} TWGs, {len(all_meetings)} meetings, "
             f"{len(all_documents)} documents, {len(all_projects)} projects"
         )
+
+        await self._record_changes(self._state)
         
         return self._state
+
+    # =========================================================================
+    # CHANGE FEED
+    # =========================================================================
+
+    async def _record_changes(self, state: SupervisorStateSnapshot) -> None:
+        """Version the new state and push its patch to subscribers (if it changed)."""
+        document = state.model_dump(mode="json")
+        async with self._feed_lock:
+            previous = self._document
+            if previous is not None and _content(previous) == _content(document):
+                return
+
+            if previous is None or not self._subscribers:
+                # Nobody to patch: a later resume from an older version gets a snapshot
+                self._patches.clear()
+                self._commit(document)
+                return
+
+            # Large states: diff off the event loop. Subscribers joining meanwhile
+            # get the previous version, which this patch then advances.
+            operations = await asyncio.to_thread(_diff_states, previous, document)
+            self._commit(document)
+            frame = Frame({
+                "type": "supervisor_state_patch",
+                "epoch": self.epoch,
+                "version": self.version,
+                "base_version": self.version - 1,
+                "patch": operations
+            })
+            self._patches.append((self.version, frame))
+            for outbound in list(self._subscribers):
+                outbound.send_frame(frame, SendPolicy.NEVER_DROP)
+            logger.info(
+                f"Supervisor state v{self.version}: {len(operations)} patch operations "
+                f"to {len(self._subscribers)} subscribers"
+            )
+
+    def _commit(self, document: Dict[str, Any]) -> None:
+        """Advance the version and its document together (no await in between)."""
+        self.version += 1
+        self._document = document
+        self._snapshot = None
+
+    def _snapshot_frame(self) -> Frame:
+        # Encoded once per version, however many clients (re)subscribe
+        if self._snapshot is None or self._snapshot[0] != self.version:
+            self._snapshot = (self.version, Frame({
+                "type": "supervisor_state_snapshot",
+                "epoch": self.epoch,
+                "version": self.version,
+                "state": self._document
+            }))
+        return self._snapshot[1]
+
+    def send_snapshot(self, outbound: OutboundSocket) -> None:
+        """Queue the full current state on a subscriber's socket (initial sync / resync)."""
+        outbound.send_frame(self._snapshot_frame(), SendPolicy.NEVER_DROP)
+
+    def subscribe(
+        self,
+        outbound: OutboundSocket,
+        since: Optional[int] = None,
+        epoch: Optional[str] = None
+    ) -> bool:
+        """
+        Start pushing state changes to a WebSocket.
+
+        The state must have been loaded (ensure_fresh) first.
+
+        Args:
+            outbound: Subscriber's outbound queue
+            since: Version the client already holds (reconnect)
+            epoch: Epoch that version belongs to
+
+        Returns:
+            True if the client was caught up with patches, False if it got a snapshot
+        """
+        self._subscribers.add(outbound)
+        self._start_refresher()
+        missed = None
+        if epoch == self.epoch and since is not None and 0 < since <= self.version:
+            missed = [frame for version, frame in self._patches if version > since]
+            # Only usable if the history reaches back to the client's version
+            if len(missed) != self.version - since:
+                missed = None
+
+        outbound.send({
+            "type": "supervisor_state_subscribed",
+            "epoch": self.epoch,
+            "version": self.version,
+            "resumed": missed is not None
+        })
+        if missed is None:
+            self.send_snapshot(outbound)
+            return False
+        for frame in missed:
+            outbound.send_frame(frame, SendPolicy.NEVER_DROP)
+        return True
+
+    def unsubscribe(self, outbound: OutboundSocket) -> None:
+        """Stop pushing to a WebSocket."""
+        self._subscribers.discard(outbound)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _start_refresher(self) -> None:
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(
+                self._refresh_while_subscribed(), name="supervisor-state-refresher"
+            )
+
+    async def _refresh_while_subscribed(self) -> None:
+        """
+        Rebuild the state every SUPERVISOR_STATE_MAX_AGE_SECONDS while anyone
+        holds /ws/state, so subscribers see changes within that interval
+        instead of waiting for the scheduled refresh. Stops with the last subscriber.
+        """
+        from app.core.database import get_db_session_context
+
+        interval = settings.SUPERVISOR_STATE_MAX_AGE_SECONDS
+        while self._subscribers:
+            await asyncio.sleep(interval)
+            if not self._subscribers:
+                break
+            try:
+                async with get_db_session_context() as db:
+                    # Skipped if a REST request or the scheduler refreshed it meanwhile
+                    await self.ensure_fresh(db, max_age=interval)
+            except Exception as e:
+                logger.error(f"Supervisor state refresh for subscribers failed: {e}")
+
+    async def close(self) -> None:
+        """Stop the subscriber refresh loop (application shutdown)."""
+        if self._refresher is not None and not self._refresher.done():
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+        self._refresher = None
     
     def get_state(self) -> Optional[SupervisorStateSnapshot]:
         """Get current state snapshot"""
@@ -206,8 +206,10 @@ class VexaService:
     async def analyze_live_chunk(self, meeting_id: str, chunk_text: str, db: AsyncSession):
         """
         Analyze a live transcript chunk for:
-        1. "Hey Martin" / "Secretariat Bot" command triggers
-        2. Real-time conflict detection against KB
+        1. "Hey Martin" / "Secretariat Bot" command triggers (handled immediately)
+        2. Real-time conflict detection and agenda tracking (queued on the
+           LiveAnalysisWorker, which batches chunks per meeting)
+        3. Incremental minutes (folded into the LiveMinutesBuilder draft)
         """
         try:
             logger.info(f"Analyzing live chunk for meeting {meeting_id}...")
@@ -222,63 +224,15 @@ class VexaService:
                 logger.info(f"✓ Detected live command/question: {question}")
                 await self._handle_live_command(meeting_id, question, db)
             
-                    # 2. Live Analysis (Conflict & Agenda)
-                    # try:
-                    #     from app.services.conflict_detector import ConflictDetector
-                    #     detector = ConflictDetector(llm_client=get_llm_service())
-                    #     
-                    #     # Fetch meeting with TWG and Agenda
-                    #     stmt_m = select(Meeting).where(Meeting.id == meeting_id).options(
-                    #         selectinload(Meeting.twg),
-                    #         selectinload(Meeting.agenda)
-                    #     )
-                    #     res_m = await db.execute(stmt_m)
-                    #     meeting = res_m.scalar_one_or_none()
-                    #     
-                    #     if meeting:
-                    #         twg_name = meeting.twg.name if meeting.twg else "General"
-                    #         context = {
-                    #             "twg_name": twg_name,
-                    #             "meeting_title": meeting.title
-                    #         }
-                    #         
-                    #         from app.services.broadcast_service import get_broadcast_service
-                    #         broadcast = get_broadcast_service()
-                    #         
-                    #         # 2a. Live Conflict Detection
-                    #         live_conflict = await detector.detect_live_conflict(chunk_text, context)
-                    #         if live_conflict:
-                    #             logger.warning(f"⚠️ LIVE CONFLICT DETECTED: {live_conflict['reason']}")
-                    #             await broadcast.notify_live_meeting(
-                    #                 meeting_id=meeting_id,
-                    #                 content=f"**POTENTIAL CONFLICT:** {live_conflict['reason']}\n\n*Suggestion:* {live_conflict['suggestion']}",
-                    #                 source="live_conflict_detector"
-                    #             )
-                    #         
-                    #         # 2b. Proactive Agenda Monitoring
-                    #         if meeting.agenda:
-                    #             logger.info(f"Running proactive agenda analysis for {meeting.title}...")
-                    #             agenda_insight = await detector.analyze_live_agenda(
-                    #                 chunk_text=chunk_text,
-                    #                 agenda_content=meeting.agenda.content,
-                    #                 context=context
-                    #             )
-                    #             
-                    #             if agenda_insight and (agenda_insight.get('decisions') or agenda_insight.get('current_focus')):
-                    #                 logger.info(f"✓ New Agenda Insight: {agenda_insight.get('insight_summary')}")
-                    #                 # Send the whole payload for the specialized frontend component
-                    #                 await broadcast.notify_live_meeting(
-                    #                     meeting_id=meeting_id,
-                    #                     content=agenda_insight.get('insight_summary') or "Progress update",
-                    #                     source="agenda_monitor",
-                    #                     # Extra data for the frontend
-                    #                     metadata=agenda_insight
-                    #                 )
-                    # 
-                    # except Exception as ce:
-                    #     logger.error(f"Error in live analysis: {ce}")
-                    #     import traceback
-                    #     logger.error(traceback.format_exc())
+            # 2. Live Analysis (Conflict & Agenda), batched and debounced per meeting
+            if settings.LIVE_ANALYSIS_ENABLED:
+                from app.services.live_analysis_worker import get_live_analysis_worker
+                get_live_analysis_worker().submit(meeting_id, chunk_text)
+
+            # 3. Live minutes draft, consolidated when the meeting ends
+            if settings.LIVE_MINUTES_ENABLED:
+                from app.services.live_minutes_builder import get_live_minutes_builder
+                get_live_minutes_builder().submit(meeting_id, chunk_text)
 
         except Exception as e:
             logger.error(f"Failed to analyze live chunk for meeting {meeting_id}: {e}")
@@ -343,8 +297,14 @@ class VexaService:
                  "attendees_list": "See transcript (Vexa)"
              }
              
-             # Blocking call in thread
-             res = await asyncio.to_thread(synthesizer.synthesize_minutes, transcript_text, minutes_ctx)
+             # The meeting is over: stop its live analysis so no batch runs after minutes
+             from app.services.live_analysis_worker import get_live_analysis_worker
+             await get_live_analysis_worker().end_session(str(meeting.id))
+
+             # Consolidate the live draft if one was built during the meeting,
+             # otherwise full synthesis over the transcript (blocking call in thread)
+             from app.services.live_minutes_builder import build_minutes
+             res = await build_minutes(str(meeting.id), transcript_text, minutes_ctx, synthesizer)
              
              new_minutes = Minutes(
                 meeting_id=meeting.id,
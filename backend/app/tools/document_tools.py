@@ -1,6 +1,7 @@
 import json
 from typing import Optional, List, Dict, Any
 from app.models.models import User
+from loguru import logger
 
 # Tool Definition
 REQUEST_DOCUMENT_APPROVAL_TOOL_DEF = {
@@ -51,7 +52,21 @@ def request_document_approval_tool(
     """
     import uuid
     request_id = str(uuid.uuid4())
-    
+
+    # Register the draft so the approval can be claimed exactly once, from any worker
+    try:
+        from app.core.tracing_context import get_current_trace
+        from app.services.approval_store import get_approval_store
+        trace = get_current_trace()
+        get_approval_store().create(
+            "document",
+            request_id,
+            {"title": title, "document_type": document_type, "file_name": file_name},
+            thread_id=trace.thread_id if trace else None
+        )
+    except Exception as e:
+        logger.warning(f"Could not register document approval {request_id}: {e}")
+
     # We return a specific structure that the Agent Loop will detect and trigger an Interrupt for.
     # The 'document_draft' object contains the payload the frontend needs.
     return json.dumps({
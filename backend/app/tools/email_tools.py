@@ -177,6 +177,10 @@ async def send_email(
         approval_service = get_email_approval_service()
 
         # Create approval request
+        # Index by conversation straight away when running inside a traced chat turn
+        from app.core.tracing_context import get_current_trace
+        trace = get_current_trace()
+
         approval_request = approval_service.create_approval_request(
             to=to_list,
             subject=subject,
@@ -185,7 +189,8 @@ async def send_email(
             cc=cc_list,
             bcc=bcc_list,
             attachments=attachments,
-            context=context
+            context=context,
+            thread_id=trace.thread_id if trace else None
         )
 
         logger.info(f"Email approval request created: {approval_request.request_id}")
@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""
+Capacity / Soak Benchmark for Real-Time Channels
+
+Starts the ASGI app on a local port (uvicorn, no lifespan hooks) with the
+in-process pub/sub and live event log standing in for Redis
+(REDIS_BACKEND=memory), then:
+
+1. Opens N live-meeting WebSocket clients spread over M meetings (plus
+   optional dashboard clients) from separate processes, so client-side work
+   doesn't count against the server's CPU and memory. They still share the
+   machine: if the reported client CPU is high, add --client-processes or
+   cores before trusting the latency figures.
+2. Publishes updates at a fixed rate per meeting through
+   BroadcastService.notify_live_meeting (and dashboard broadcasts through
+   ws_manager.broadcast) for the given duration.
+3. Reports delivery latency percentiles (publish call -> client receive),
+   server memory per connection, server CPU, dropped and late messages,
+   and RSS growth over the run (for long soak runs).
+
+Usage:
+    python scripts/benchmark_realtime.py --clients 1000 --meetings 20 --rate 2 --duration 60
+    python scripts/benchmark_realtime.py --clients 200 --dashboard-clients 200 --duration 1800 --json soak.json
+    python scripts/benchmark_realtime.py --clients 500 --max-p99-ms 250 --max-drop-rate 0.001   # exits 1 on regression
+
+Large runs need a file descriptor limit above the client count (server
+and clients each hold one socket per client); the script raises its soft limit to
+the hard limit.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import time
+import uuid
+from array import array
+from typing import Any, Dict, List, Optional
+
+# Add parent dir to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# In-process stand-ins for Redis pub/sub and the live event streams
+os.environ.setdefault("REDIS_BACKEND", "memory")
+
+BENCHMARK_SOURCE = "benchmark"
+BENCHMARK_BROADCAST = "benchmark_broadcast"
+
+# Delivery channels: meeting updates, and dashboard broadcasts (reach every socket)
+LIVE = "live"
+BROADCAST = "broadcast"
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def raise_fd_limit() -> int:
+    """Raise the open file limit to the hard limit; returns the new soft limit."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        return hard
+    return soft
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # Peak RSS (kilobytes on Linux) where /proc isn't available
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p90/p99/p99.9/max of a list of latencies (ms)."""
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "p99": None, "p999": None, "max": None}
+    ordered = sorted(values)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+    return {
+        "count": len(ordered),
+        "p50": at(0.50),
+        "p90": at(0.90),
+        "p99": at(0.99),
+        "p999": at(0.999),
+        "max": round(ordered[-1], 2)
+    }
+
+
+# =============================================================================
+# CLIENTS (separate processes)
+# =============================================================================
+
+def _decode(raw: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(raw, bytes):
+        # Same codec as the server's msgpack framing (app.core.ws_framing)
+        import ormsgpack
+        return ormsgpack.unpackb(raw)
+    if raw == "pong":
+        return None
+    return json.loads(raw)
+
+
+async def _client(
+    url: str,
+    options: Dict[str, Any],
+    connected: asyncio.Event,
+    gate: asyncio.Semaphore,
+    result: Dict[str, Any]
+) -> None:
+    import websockets
+
+    late_after = options["late_ms"]
+    # Live sockets are on the connection manager too, so they also get dashboard broadcasts
+    seen = {LIVE: set(), BROADCAST: set()}
+    try:
+        async with gate:
+            socket = await websockets.connect(
+                url,
+                open_timeout=options["connect_timeout"],
+                ping_interval=None,
+                max_size=None,
+                compression="deflate" if options["deflate"] else None
+            )
+        async with socket:
+            async for raw in socket:
+                received_at = time.time()
+                message = _decode(raw)
+                if not message:
+                    continue
+                if message.get("type") == "connected":
+                    result["connected"] = True
+                    connected.set()
+                    continue
+                if message.get("type") == BENCHMARK_BROADCAST:
+                    channel, marker = BROADCAST, message
+                elif message.get("source") == BENCHMARK_SOURCE:
+                    channel, marker = LIVE, message.get("metadata") or {}
+                else:
+                    continue
+                stats = result[channel]
+                seq = marker.get("seq")
+                if seq in seen[channel]:
+                    stats["duplicates"] += 1
+                    continue
+                seen[channel].add(seq)
+                latency = (received_at - marker["sent_at"]) * 1000
+                stats["latencies"].append(latency)
+                if latency > late_after:
+                    stats["late"] += 1
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        # Also reached when cancelled at the end of the run
+        for channel, seqs in seen.items():
+            result[channel]["received"] = len(seqs)
+        connected.set()
+
+
+async def _run_clients(plan: List[Dict[str, Any]], options: Dict[str, Any], events, stop_flag) -> List[Dict[str, Any]]:
+    gate = asyncio.Semaphore(options["connect_concurrency"])
+    results = []
+    tasks = []
+    waits = []
+    started = time.monotonic()
+    for entry in plan:
+        result = {"kind": entry["kind"], "meeting_id": entry["meeting_id"], "connected": False, "error": None}
+        for channel in (LIVE, BROADCAST):
+            result[channel] = {"received": 0, "duplicates": 0, "late": 0, "latencies": array("d")}
+        connected = asyncio.Event()
+        results.append(result)
+        waits.append(connected)
+        tasks.append(asyncio.create_task(_client(entry["url"], options, connected, gate, result)))
+
+    # Clients still without a "connected" message by the deadline count as failed
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(connected.wait() for connected in waits)),
+            timeout=options["connect_timeout"] + len(plan) / options["connect_concurrency"]
+        )
+    except asyncio.TimeoutError:
+        pass
+    events.put({
+        "phase": "connected",
+        "connected": sum(1 for r in results if r["connected"]),
+        "live_connected": sum(1 for r in results if r["connected"] and r["kind"] == "live"),
+        "failed": sum(1 for r in results if not r["connected"]),
+        "seconds": round(time.monotonic() - started, 2),
+        "errors": sorted({r["error"] or "no connected message" for r in results if not r["connected"]})[:5]
+    })
+
+    while not stop_flag.is_set():
+        await asyncio.sleep(0.1)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return results
+
+
+def client_process(plan: List[Dict[str, Any]], options: Dict[str, Any], events, stop_flag) -> None:
+    """Entry point of a client process: connect, receive until told to stop, report."""
+    raise_fd_limit()
+    cpu_started = time.process_time()
+    results = asyncio.run(_run_clients(plan, options, events, stop_flag))
+
+    connected = [r for r in results if r["connected"]]
+    summary: Dict[str, Any] = {
+        "phase": "done",
+        "cpu_seconds": time.process_time() - cpu_started,
+        "errors": sorted({r["error"] for r in results if r["error"]})[:5],
+        # (meeting_id, distinct live updates received) per connected live client
+        "live_received": [(r["meeting_id"], r[LIVE]["received"]) for r in connected if r["kind"] == "live"]
+    }
+    for channel in (LIVE, BROADCAST):
+        latencies = array("d")
+        for r in connected:
+            latencies.extend(r[channel]["latencies"])
+        summary[channel] = {
+            "latencies": latencies,
+            "received": sum(r[channel]["received"] for r in connected),
+            "late": sum(r[channel]["late"] for r in connected),
+            "duplicates": sum(r[channel]["duplicates"] for r in connected)
+        }
+    events.put(summary)
+
+
+def merge_client_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the per-process reports of one phase ("connected" or "done")."""
+    merged: Dict[str, Any] = {"errors": sorted({e for r in reports for e in r["errors"]})[:5]}
+    if reports[0]["phase"] == "connected":
+        for key in ("connected", "live_connected", "failed"):
+            merged[key] = sum(r[key] for r in reports)
+        merged["seconds"] = max(r["seconds"] for r in reports)
+        return merged
+
+    merged["cpu_seconds"] = sum(r["cpu_seconds"] for r in reports)
+    merged["live_received"] = [entry for r in reports for entry in r["live_received"]]
+    for channel in (LIVE, BROADCAST):
+        merged[channel] = {
+            "latency_ms": percentiles([latency for r in reports for latency in r[channel]["latencies"]]),
+            **{key: sum(r[channel][key] for r in reports) for key in ("received", "late", "duplicates")}
+        }
+    return merged
+
+
+# =============================================================================
+# SERVER SIDE
+# =============================================================================
+
+async def _publish_live(meeting_id: str, rate: float, until: float, payload: str, counts: Dict[str, int]) -> None:
+    from app.services.broadcast_service import get_broadcast_service
+
+    service = get_broadcast_service()
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / rate
+    next_at = loop.time()
+    while loop.time() < until:
+        counts[meeting_id] += 1
+        await service.notify_live_meeting(
+            meeting_id,
+            payload,
+            source=BENCHMARK_SOURCE,
+            metadata={"seq": counts[meeting_id], "sent_at": time.time()}
+        )
+        # Fixed schedule: a slow publish eats into the next interval, it doesn't shift the timeline
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+
+async def _publish_dashboard(rate: float, until: float, payload: str, counts: Dict[str, int]) -> None:
+    from app.core.ws_manager import ws_manager
+
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / rate
+    next_at = loop.time()
+    while loop.time() < until:
+        counts["dashboard"] += 1
+        await ws_manager.broadcast({
+            "type": BENCHMARK_BROADCAST,
+            "seq": counts["dashboard"],
+            "sent_at": time.time(),
+            "content": payload
+        })
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+
+async def _sample_rss(until: float, interval: float, samples: List[int]) -> None:
+    while time.monotonic() < until:
+        samples.append(rss_bytes())
+        await asyncio.sleep(interval)
+
+
+async def _wait_for_sockets(live: int, dashboard: int, timeout: float) -> None:
+    """Wait until the hub and connection manager hold every connected client."""
+    from app.core.ws_manager import ws_manager
+    from app.services.live_meeting_hub import get_live_meeting_hub
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if get_live_meeting_hub().get_stats().sockets >= live and ws_manager.get_stats().sockets >= live + dashboard:
+            return
+        await asyncio.sleep(0.05)
+
+
+def _await_event(events, timeout: float) -> Dict[str, Any]:
+    try:
+        return events.get(timeout=timeout)
+    except queue.Empty:
+        raise RuntimeError(f"client process did not report within {timeout:.0f}s")
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run one benchmark and collect its report.
+
+    Args:
+        args: Parsed command line options
+
+    Returns:
+        Report dict (see print_report)
+    """
+    import uvicorn
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    from app.core.config import settings
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    raise_fd_limit()
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=args.port, lifespan="off", log_level="warning",
+        ws_ping_interval=None, backlog=max(2048, args.clients + args.dashboard_clients)
+    ))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.02)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    base = f"ws://127.0.0.1:{port}{settings.API_V1_STR}"
+    fmt = f"&format={args.format}" if args.format != "json" else ""
+
+    meetings = [str(uuid.uuid4()) for _ in range(args.meetings)]
+    plan = []
+    for i in range(args.clients):
+        token = create_access_token({"sub": f"benchmark-live-{i}"})
+        meeting_id = meetings[i % len(meetings)]
+        plan.append({"kind": "live", "meeting_id": meeting_id, "url": f"{base}/meetings/{meeting_id}/live?token={token}{fmt}"})
+    for i in range(args.dashboard_clients):
+        token = create_access_token({"sub": f"benchmark-dashboard-{i}"})
+        plan.append({"kind": "dashboard", "meeting_id": None, "url": f"{base}/dashboard/ws?token={token}{fmt}"})
+
+    options = {
+        "late_ms": args.late_ms,
+        "connect_timeout": args.connect_timeout,
+        "connect_concurrency": args.connect_concurrency,
+        "deflate": not args.no_deflate
+    }
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    stop_flag = context.Event()
+
+    rss_idle = rss_bytes()
+    processes = max(1, min(args.client_processes, len(plan)))
+    clients = [
+        context.Process(target=client_process, args=(plan[i::processes], options, events, stop_flag), daemon=True)
+        for i in range(processes)
+    ]
+    for process in clients:
+        process.start()
+    try:
+        connect_timeout = args.connect_timeout + len(plan) / args.connect_concurrency + 60
+        connect = merge_client_reports([
+            await asyncio.to_thread(_await_event, events, connect_timeout) for _ in clients
+        ])
+        await _wait_for_sockets(
+            connect["live_connected"], connect["connected"] - connect["live_connected"], timeout=10.0
+        )
+        rss_connected = rss_bytes()
+        print(f"Connected {connect['connected']}/{len(plan)} clients in {connect['seconds']}s", file=sys.stderr)
+
+        # Publish phase
+        payload = "x" * args.payload_bytes
+        counts: Dict[str, int] = {meeting_id: 0 for meeting_id in meetings}
+        counts["dashboard"] = 0
+        loop = asyncio.get_running_loop()
+        started_wall = time.monotonic()
+        started_cpu = time.process_time()
+        until = loop.time() + args.duration
+        samples: List[int] = []
+        publishers = [asyncio.create_task(_publish_live(m, args.rate, until, payload, counts)) for m in meetings]
+        if args.dashboard_clients and args.dashboard_rate:
+            publishers.append(asyncio.create_task(_publish_dashboard(args.dashboard_rate, until, payload, counts)))
+        sampler = asyncio.create_task(_sample_rss(time.monotonic() + args.duration, args.sample_interval, samples))
+        print(f"Publishing for {args.duration:.0f}s ...", file=sys.stderr)
+        await asyncio.gather(*publishers)
+        publish_seconds = time.monotonic() - started_wall
+        await asyncio.sleep(args.drain)
+        cpu_seconds = time.process_time() - started_cpu
+        wall_seconds = time.monotonic() - started_wall
+        await sampler
+
+        from app.core.ws_manager import ws_manager
+        from app.core.ws_session import get_heartbeat_wheel
+        from app.services.live_meeting_hub import get_live_meeting_hub
+        server_stats = {
+            "live_meetings": get_live_meeting_hub().get_stats().model_dump(),
+            "connections": ws_manager.get_stats().model_dump(),
+            "heartbeats": get_heartbeat_wheel().get_stats().model_dump()
+        }
+
+        stop_flag.set()
+        done = merge_client_reports([await asyncio.to_thread(_await_event, events, 60.0) for _ in clients])
+    finally:
+        stop_flag.set()
+        for process in clients:
+            await asyncio.to_thread(process.join, 10)
+            if process.is_alive():
+                process.terminate()
+        server.should_exit = True
+        await serving
+        await _close_app()
+
+    # Delivery accounting: every connected live client should see every update
+    # of its meeting, and every connected client every dashboard broadcast
+    expected = {
+        LIVE: sum(counts[meeting_id] for meeting_id, _ in done["live_received"]),
+        BROADCAST: counts["dashboard"] * connect["connected"]
+    }
+    published_live = sum(v for k, v in counts.items() if k != "dashboard")
+    connections = max(1, connect["connected"])
+
+    return {
+        "config": {
+            "clients": args.clients,
+            "dashboard_clients": args.dashboard_clients,
+            "meetings": args.meetings,
+            "rate_per_meeting": args.rate,
+            "dashboard_rate": args.dashboard_rate,
+            "duration": args.duration,
+            "payload_bytes": args.payload_bytes,
+            "format": args.format,
+            "deflate": not args.no_deflate,
+            "late_ms": args.late_ms
+        },
+        "connect": {k: connect[k] for k in ("connected", "failed", "seconds", "errors")},
+        "publish": {
+            "live_updates": published_live,
+            "live_rate_achieved": round(published_live / max(publish_seconds, 1e-9), 1),
+            "live_rate_target": args.rate * args.meetings,
+            "dashboard_broadcasts": counts["dashboard"]
+        },
+        "delivery": {
+            channel: {
+                "expected": expected[channel],
+                "received": done[channel]["received"],
+                "dropped": max(0, expected[channel] - done[channel]["received"]),
+                "drop_rate": round(
+                    max(0, expected[channel] - done[channel]["received"]) / expected[channel], 6
+                ) if expected[channel] else 0.0,
+                "late": done[channel]["late"],
+                "duplicates": done[channel]["duplicates"],
+                "latency_ms": done[channel]["latency_ms"]
+            }
+            for channel in (LIVE, BROADCAST)
+        },
+        "client_errors": done["errors"],
+        "server": {
+            "cpu_percent": round(100 * cpu_seconds / wall_seconds, 1),
+            "cpu_seconds": round(cpu_seconds, 2),
+            "rss_idle_mb": round(rss_idle / 2**20, 1),
+            "rss_connected_mb": round(rss_connected / 2**20, 1),
+            "rss_peak_mb": round(max(samples + [rss_connected]) / 2**20, 1),
+            "rss_end_mb": round((samples[-1] if samples else rss_connected) / 2**20, 1),
+            "rss_growth_mb_per_min": round(
+                (samples[-1] - samples[0]) / 2**20 / (publish_seconds / 60), 2
+            ) if len(samples) > 1 and publish_seconds > 0 else 0.0,
+            "kb_per_connection": round((rss_connected - rss_idle) / 1024 / connections, 1),
+            **server_stats
+        },
+        "clients": {
+            "processes": processes,
+            "cpu_percent": round(100 * done["cpu_seconds"] / processes / max(wall_seconds, 1e-9), 1)
+        }
+    }
+
+
+async def _close_app() -> None:
+    """What the app's shutdown hook does for the real-time path (lifespan is off)."""
+    from app.core.ws_manager import ws_manager
+    from app.core.ws_session import close_heartbeat_wheel
+    from app.services.live_meeting_hub import close_live_meeting_hub
+    from app.services.pubsub_hub import close_pubsub_hub
+
+    await close_live_meeting_hub()
+    await ws_manager.close()
+    await close_heartbeat_wheel()
+    await close_pubsub_hub()
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def print_report(report: Dict[str, Any]) -> None:
+    config = report["config"]
+    print("\n--- Real-Time Channel Benchmark ---")
+    print(
+        f"Clients: {config['clients']} live over {config['meetings']} meetings, "
+        f"{config['dashboard_clients']} dashboard | {config['rate_per_meeting']}/s per meeting, "
+        f"{config['payload_bytes']}B payload, {config['format']}{' + deflate' if config['deflate'] else ''}, "
+        f"{config['duration']:.0f}s"
+    )
+    connect = report["connect"]
+    print(f"Connected: {connect['connected']} ({connect['failed']} failed) in {connect['seconds']}s")
+    for error in connect["errors"]:
+        print(f"  connect error: {error}")
+    publish = report["publish"]
+    print(
+        f"Published: {publish['live_updates']} live updates "
+        f"({publish['live_rate_achieved']}/s of {publish['live_rate_target']}/s target), "
+        f"{publish['dashboard_broadcasts']} dashboard broadcasts"
+    )
+
+    for error in report["client_errors"]:
+        print(f"  client error: {error}")
+
+    for channel, delivery in report["delivery"].items():
+        if not delivery["expected"]:
+            continue
+        latency = delivery["latency_ms"]
+        print(f"\n[{channel}] delivered {delivery['received']}/{delivery['expected']} "
+              f"(dropped {delivery['dropped']}, {100 * delivery['drop_rate']:.3f}%), "
+              f"late (> {config['late_ms']}ms) {delivery['late']}, duplicates {delivery['duplicates']}")
+        print(f"  latency ms: p50 {latency['p50']} | p90 {latency['p90']} | p99 {latency['p99']} "
+              f"| p99.9 {latency['p999']} | max {latency['max']}")
+
+    server = report["server"]
+    live = server["live_meetings"]
+    print("\nServer:")
+    print(f"  CPU: {server['cpu_percent']}% ({server['cpu_seconds']}s)")
+    print(f"  RSS: idle {server['rss_idle_mb']}MB, connected {server['rss_connected_mb']}MB, "
+          f"peak {server['rss_peak_mb']}MB, end {server['rss_end_mb']}MB "
+          f"({server['rss_growth_mb_per_min']}MB/min during publishing)")
+    print(f"  Memory per connection: {server['kb_per_connection']}KB")
+    print(f"  Live hub: delivered {live['delivered']}, dropped {live['dropped']}, "
+          f"coalesced {live['coalesced']}, peak queue depth {live['peak_queue_depth']}")
+    clients = report["clients"]
+    # A client process near 100% CPU inflates latencies: add --client-processes
+    print(f"Client processes: {clients['processes']} at {clients['cpu_percent']}% CPU each (average)")
+
+
+def check_thresholds(report: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Threshold violations (empty when the run is within limits)."""
+    failures = []
+    if report["connect"]["failed"]:
+        failures.append(f"{report['connect']['failed']} clients failed to connect")
+    for channel, delivery in report["delivery"].items():
+        p99 = delivery["latency_ms"]["p99"]
+        if args.max_p99_ms is not None and p99 is not None and p99 > args.max_p99_ms:
+            failures.append(f"{channel} p99 latency {p99}ms > {args.max_p99_ms}ms")
+        if args.max_drop_rate is not None and delivery["drop_rate"] > args.max_drop_rate:
+            failures.append(f"{channel} drop rate {delivery['drop_rate']} > {args.max_drop_rate}")
+    if args.max_kb_per_connection is not None and report["server"]["kb_per_connection"] > args.max_kb_per_connection:
+        failures.append(
+            f"{report['server']['kb_per_connection']}KB per connection > {args.max_kb_per_connection}KB"
+        )
+    return failures
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Capacity and soak benchmark for the live meeting and dashboard WebSockets",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=200, help="Live meeting WebSocket clients")
+    parser.add_argument("--meetings", type=int, default=10, help="Meetings the live clients are spread over")
+    parser.add_argument("--rate", type=float, default=2.0, help="Live updates per second per meeting")
+    parser.add_argument("--dashboard-clients", type=int, default=0, help="Dashboard WebSocket clients")
+    parser.add_argument("--dashboard-rate", type=float, default=1.0, help="Dashboard broadcasts per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Publishing time in seconds (long = soak)")
+    parser.add_argument("--payload-bytes", type=int, default=200, help="Size of each update's content")
+    parser.add_argument("--format", choices=("json", "msgpack"), default="json", help="Wire format requested by clients")
+    parser.add_argument("--no-deflate", action="store_true", help="Don't offer permessage-deflate")
+    parser.add_argument("--late-ms", type=float, default=500.0, help="Deliveries slower than this count as late")
+    parser.add_argument("--drain", type=float, default=2.0, help="Seconds to wait for in-flight updates after publishing")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between RSS samples")
+    parser.add_argument("--client-processes", type=int, default=1, help="Processes the clients are spread over")
+    parser.add_argument("--connect-concurrency", type=int, default=100, help="Handshakes in flight at once (per process)")
+    parser.add_argument("--connect-timeout", type=float, default=30.0, help="Per-client handshake timeout")
+    parser.add_argument("--port", type=int, default=0, help="Server port (0 = any free port)")
+    parser.add_argument("--log-level", default="WARNING", help="Server log level")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if p99 delivery latency exceeds this")
+    parser.add_argument("--max-drop-rate", type=float, help="Fail if the dropped fraction exceeds this")
+    parser.add_argument("--max-kb-per-connection", type=float, help="Fail if server memory per connection exceeds this")
+    args = parser.parse_args(argv)
+    if args.clients and args.meetings < 1:
+        parser.error("--meetings must be at least 1")
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    # The WebSocket endpoints print() per connection; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport written to {args.json_path}")
+
+    failures = check_thresholds(report, args)
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures and any(v is not None for v in (args.max_p99_ms, args.max_drop_rate, args.max_kb_per_connection)):
+        print("✅ Within thresholds")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
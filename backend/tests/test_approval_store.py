@@ -0,0 +1,99 @@
+"""
+Tests for the shared approval store and the email approval service on top of it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import pytest
+
+from app.services.approval_store import (
+    ApprovalStateError,
+    ApprovalStore,
+    InProcessApprovalStore,
+)
+from app.services.email_approval_service import EmailApprovalService
+
+
+@pytest.fixture(params=["redis", "inprocess"])
+def store(request):
+    if request.param == "redis":
+        return ApprovalStore(client=fakeredis.FakeRedis(decode_responses=True), ttl=600, decided_ttl=60)
+    return InProcessApprovalStore(ttl=600, decided_ttl=60)
+
+
+def test_indexes_list_pending_per_user_and_thread(store):
+    store.create("email", "r1", {"n": 1}, user_id="u1", thread_id="t1")
+    store.create("email", "r2", {"n": 2}, thread_id="t2")
+    assert store.link("email", "r2", user_id="u1")
+    store.create("email", "r3", {"n": 3}, user_id="u2")
+
+    assert [r["request_id"] for r in store.list_pending("email", user_id="u1")] == ["r2", "r1"]
+    assert [r["request_id"] for r in store.list_pending("email", thread_id="t2")] == ["r2"]
+    assert len(store.list_pending("email")) == 3
+
+    store.transition("email", "r1", expected="pending", new_status="approved", decided_by="u1")
+    assert [r["request_id"] for r in store.list_pending("email", user_id="u1")] == ["r2"]
+    assert store.get("email", "r1")["status"] == "approved"
+    assert not store.link("email", "r1", thread_id="t9")
+
+
+def test_transition_is_exclusive_and_reopenable(store):
+    store.create("email", "r1", {}, user_id="u1")
+
+    def approve(_):
+        try:
+            return store.transition("email", "r1", expected="pending", new_status="approved")
+        except ApprovalStateError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        winners = [r for r in pool.map(approve, range(20)) if r]
+    assert len(winners) == 1
+
+    with pytest.raises(ApprovalStateError, match="already approved"):
+        store.transition("email", "r1", expected="pending", new_status="declined")
+
+    # Sending failed: back to pending and visible again
+    store.transition("email", "r1", expected="approved", new_status="pending")
+    assert [r["request_id"] for r in store.list_pending("email", user_id="u1")] == ["r1"]
+    assert store.transition("email", "missing", expected="pending", new_status="approved") is None
+
+
+def test_email_service_round_trip_across_instances(store):
+    creator = EmailApprovalService(store=store)
+    other_worker = EmailApprovalService(store=store)
+
+    request = creator.create_approval_request(
+        to=["minister@ecowas.int"], subject="Summit brief", body="Attached", thread_id="t1"
+    )
+    assert other_worker.update_approval_request_thread(request.request_id, "t1", user_id="u1")
+
+    pending = other_worker.list_pending_approvals(user_id="u1")
+    assert [p.request_id for p in pending] == [request.request_id]
+    assert pending[0].draft.subject == "Summit brief"
+    assert pending[0].thread_id == "t1"
+
+    decided = other_worker.decide_approval_request(request.request_id, approved=False, decided_by="u1")
+    assert decided.status == "declined"
+    assert creator.get_approval_request(request.request_id) is None
+    assert creator.get_approval_status(request.request_id) == "declined"
+    with pytest.raises(ApprovalStateError):
+        creator.decide_approval_request(request.request_id, approved=True)
+
+
+def test_inprocess_store_sweeps_unlisted_kinds_and_stays_bounded():
+    store = InProcessApprovalStore(ttl=600, decided_ttl=60, max_entries=3)
+    store.create("document", "d1", {"n": 1})
+    store._requests[("document", "d1")] = (store._requests[("document", "d1")][0], 0.0)  # expired
+    store._next_sweep = 0.0
+
+    # Creating any request sweeps expired ones, even of a kind nobody lists
+    store.create("email", "e1", {"n": 1})
+    assert ("document", "d1") not in store._requests
+
+    for n in range(2, 6):
+        store.create("document", f"d{n}", {"n": n})
+    assert len(store._requests) == 3
+    assert store.get("email", "e1") is None
+    assert store.get("document", "d5") is not None
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+import fakeredis
+from fakeredis import aioredis as fake_aioredis
+
+from app.services.message_codec import MessageCodec
+from app.services.redis_memory import AsyncRedisMemoryService, RedisMemoryService
+
+
+@pytest.fixture
+def memory():
+    return AsyncRedisMemoryService(client=fake_aioredis.FakeRedis(decode_responses=False))
+
+
+def _msg(i):
+    return {"role": "user", "content": f"message {i}"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_are_not_lost(memory):
+    await asyncio.gather(*(memory.append_to_history("energy", "s1", _msg(i)) for i in range(50)))
+
+    history = await memory.get_conversation_history("energy", "s1")
+    assert len(history) == 50
+    assert {m["content"] for m in history} == {f"message {i}" for i in range(50)}
+
+
+@pytest.mark.asyncio
+async def test_append_trims_and_sets_ttl(memory):
+    for i in range(10):
+        await memory.append_to_history("energy", "s1", _msg(i), max_history=4, ttl=120)
+
+    history = await memory.get_conversation_history("energy", "s1")
+    assert [m["content"] for m in history] == [f"message {i}" for i in range(6, 10)]
+    assert 0 < await memory.client.ttl("ecowas:history:energy:s1") <= 120
+
+
+@pytest.mark.asyncio
+async def test_history_pages_newest_first(memory):
+    await memory.save_conversation_history("energy", "s1", [_msg(i) for i in range(7)])
+
+    first = await memory.get_history_page("energy", "s1", limit=3)
+    second = await memory.get_history_page("energy", "s1", limit=3, offset=3)
+    last = await memory.get_history_page("energy", "s1", limit=3, offset=6)
+    past_end = await memory.get_history_page("energy", "s1", limit=3, offset=9)
+
+    assert [m["content"] for m in first["messages"]] == ["message 4", "message 5", "message 6"]
+    assert [m["content"] for m in second["messages"]] == ["message 1", "message 2", "message 3"]
+    assert [m["content"] for m in last["messages"]] == ["message 0"]
+    assert first["total"] == 7 and first["has_more"] and not last["has_more"]
+    assert past_end["messages"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_session_data(memory):
+    assert await memory.set_session_data_many("s1", {"tz": "UTC", "prefs": {"lang": "fr"}}, ttl=60)
+
+    values = await memory.get_session_data_many("s1", ["tz", "prefs", "missing"])
+    assert values == {"tz": "UTC", "prefs": {"lang": "fr"}, "missing": None}
+    assert await memory.get_session_data("s1", "tz") == "UTC"
+
+
+@pytest.mark.asyncio
+async def test_legacy_string_history_is_migrated(memory):
+    key = "ecowas:history:energy:s1"
+    await memory.client.setex(key, 300, json.dumps([_msg(0), _msg(1)]))
+
+    assert await memory.append_to_history("energy", "s1", _msg(2))
+
+    history = await memory.get_conversation_history("energy", "s1")
+    assert [m["content"] for m in history] == ["message 0", "message 1", "message 2"]
+    assert await memory.client.type(key) == b"list"
+
+
+def test_sync_service_shares_list_format():
+    service = RedisMemoryService.__new__(RedisMemoryService)
+    service.client = fakeredis.FakeRedis(decode_responses=False)
+    service.default_ttl = 60
+    service._indexed_agents = set()
+    service.codec = MessageCodec()
+
+    service.client.set("ecowas:history:energy:s1", json.dumps([_msg(0)]))
+    assert service.append_to_history("energy", "s1", _msg(1), max_history=5)
+    assert [m["content"] for m in service.get_conversation_history("energy", "s1")] == ["message 0", "message 1"]
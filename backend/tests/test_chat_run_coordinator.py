@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.services.chat_run_coordinator import ChatRunCoordinator, ChatCapacityError
+
+
+@pytest.mark.asyncio
+async def test_same_thread_runs_serialise():
+    coordinator = ChatRunCoordinator(max_concurrent=4, max_queue=4, queue_timeout=5)
+    order = []
+
+    async def run(tag):
+        async with coordinator.run("thread-1"):
+            order.append(f"{tag}-start")
+            await asyncio.sleep(0.05)
+            order.append(f"{tag}-end")
+
+    await asyncio.gather(run("a"), run("b"))
+
+    assert order == ["a-start", "a-end", "b-start", "b-end"]
+
+
+@pytest.mark.asyncio
+async def test_different_threads_run_in_parallel():
+    coordinator = ChatRunCoordinator(max_concurrent=4, max_queue=4, queue_timeout=5)
+    peak = 0
+
+    async def run(thread_id):
+        nonlocal peak
+        async with coordinator.run(thread_id):
+            peak = max(peak, coordinator.get_stats().active)
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(*(run(f"thread-{i}") for i in range(3)))
+
+    assert peak == 3
+    assert coordinator.get_stats().active == 0
+
+
+@pytest.mark.asyncio
+async def test_busy_thread_does_not_block_other_threads_in_queue():
+    coordinator = ChatRunCoordinator(max_concurrent=2, max_queue=4, queue_timeout=5)
+
+    first = coordinator.enqueue("thread-a")
+    second_a = coordinator.enqueue("thread-a")
+    other = coordinator.enqueue("thread-b")
+
+    assert first.granted
+    assert not second_a.granted
+    # thread-b goes ahead of the queued thread-a run because a slot is free
+    assert other.granted
+
+    first.release()
+    assert second_a.granted
+    second_a.release()
+    other.release()
+
+
+@pytest.mark.asyncio
+async def test_queue_full_raises_capacity_error():
+    coordinator = ChatRunCoordinator(max_concurrent=1, max_queue=1, queue_timeout=5, retry_after=7)
+
+    running = coordinator.enqueue("thread-1")
+    queued = coordinator.enqueue("thread-2")
+    assert queued.position() == 1
+    assert coordinator.is_saturated()
+
+    with pytest.raises(ChatCapacityError) as exc:
+        coordinator.enqueue("thread-3")
+
+    assert exc.value.retry_after == 7
+    assert coordinator.get_stats().total_rejected == 1
+
+    running.release()
+    assert queued.granted
+    queued.release()
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_releases_waiter():
+    coordinator = ChatRunCoordinator(max_concurrent=1, max_queue=2, queue_timeout=0.05)
+    running = coordinator.enqueue("thread-1")
+
+    with pytest.raises(ChatCapacityError):
+        await coordinator.acquire("thread-2")
+
+    stats = coordinator.get_stats()
+    assert stats.queued == 0
+    assert stats.total_timed_out == 1
+    running.release()
+
+
+@pytest.mark.asyncio
+async def test_queue_updates_report_position_until_granted():
+    coordinator = ChatRunCoordinator(max_concurrent=1, max_queue=2, queue_timeout=5)
+    running = coordinator.enqueue("thread-1")
+    waiting = coordinator.enqueue("thread-2")
+
+    positions = []
+
+    async def consume():
+        async for position in coordinator.queue_updates(waiting, interval=0.01):
+            positions.append(position)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.05)
+    running.release()
+    await task
+
+    assert positions and set(positions) == {1}
+    assert waiting.granted
+    waiting.release()
@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.agents.fast_router import FastRouter
+
+
+def test_keyword_scores_use_word_boundaries():
+    router = FastRouter(use_embeddings=False)
+
+    scores = router.keyword_scores("What the minister said about solar power")
+
+    assert scores["energy"] == 20  # solar + power
+    # "ai" must not match inside "said"/"about"
+    assert "digital" not in scores
+
+
+def test_confident_single_agent_route():
+    router = FastRouter(use_embeddings=False)
+
+    decision = router.route("Summarise the renewable energy targets for solar and wind")
+
+    assert decision.agents == ["energy"]
+    assert decision.method == "keyword"
+    assert decision.is_confident(0.5)
+
+
+def test_twg_name_is_strong_signal():
+    router = FastRouter(use_embeddings=False)
+
+    decision = router.route("What is the Digital Economy TWG working on?")
+
+    assert decision.agents == ["digital"]
+    assert decision.confidence == 1.0
+
+
+def test_multi_agent_route():
+    router = FastRouter(use_embeddings=False)
+
+    decision = router.route("How does lithium mining affect the electricity grid and renewable power?")
+
+    assert decision.agents[0] == "energy"
+    assert "minerals" in decision.agents
+
+
+def test_scheduling_request_routes_to_supervisor():
+    router = FastRouter(use_embeddings=False)
+
+    decision = router.route("Schedule an energy workshop next Tuesday")
+
+    assert decision.agents == []
+    assert decision.method == "scheduling"
+    assert decision.is_confident(0.99)
+
+
+def test_ambiguous_query_is_not_confident():
+    router = FastRouter(use_embeddings=False)
+
+    decision = router.route("Hello, what can you help me with?")
+
+    assert decision.agents == []
+    assert not decision.is_confident(0.1)
+
+
+def test_weak_match_with_noise_is_not_confident():
+    router = FastRouter(use_embeddings=False)
+
+    # One primary energy keyword plus secondary noise from another domain
+    decision = router.route("Any update on power tariffs and the budget?")
+
+    assert decision.agents == ["energy"]
+    assert not decision.is_confident(0.5)
+
+
+def test_embedding_classifier_fills_in_when_keywords_are_silent():
+    router = FastRouter(use_embeddings=True)
+
+    def fake_embed(texts):
+        # Map exemplars to one-hot vectors per agent, and the query to "protocol"
+        from app.agents.fast_router import AGENT_EXEMPLARS
+        agent_ids = list(AGENT_EXEMPLARS.keys())
+        vectors = []
+        for text in texts:
+            owner = next((a for a, ex in AGENT_EXEMPLARS.items() if text in ex), "protocol")
+            vectors.append([1.0 if a == owner else 0.0 for a in agent_ids])
+        return vectors
+
+    with patch.object(router, "_embed", side_effect=fake_embed):
+        decision = router.route("Where do the heads of state sit at the plenary?")
+
+    assert decision.agents == ["protocol"]
+    assert decision.method == "embedding"
+    assert decision.is_confident(0.5)
+
+
+def test_embedding_failure_falls_back_to_keywords():
+    router = FastRouter(use_embeddings=True)
+
+    with patch.object(router, "_embed", side_effect=RuntimeError("no embeddings")):
+        decision = router.route("Hello there")
+
+    assert decision.method == "none"
+    assert decision.confidence == 0.0
+
+
+@pytest.mark.asyncio
+async def test_aroute_embeds_off_the_event_loop():
+    router = FastRouter(use_embeddings=True)
+    loop_thread = threading.get_ident()
+    embed_threads = []
+
+    def fake_embed(texts):
+        embed_threads.append(threading.get_ident())
+        raise RuntimeError("no embeddings")
+
+    with patch.object(router, "_embed", side_effect=fake_embed):
+        decision = await router.aroute("Hello there")
+
+    assert decision.method == "none"
+    assert embed_threads and loop_thread not in embed_threads
+
+
+@pytest.mark.asyncio
+async def test_route_query_node_skips_intent_parser_when_confident():
+    from app.agents.langgraph_nodes import route_query_node
+
+    parser = MagicMock()
+    state = {"query": "Summarise the renewable energy targets for solar and wind", "context": None}
+
+    with patch("app.agents.intent_parser.get_intent_parser", return_value=parser):
+        result = await route_query_node(state)
+
+    parser.parse_directive.assert_not_called()
+    assert result["relevant_agents"] == ["energy"]
+    assert result["delegation_type"] == "single"
+    assert result["routing_method"] == "keyword"
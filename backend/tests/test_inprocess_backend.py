@@ -0,0 +1,133 @@
+"""
+Tests for the in-process (no Redis) bus, memory, cache and pub/sub backends.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.cache import CacheService
+from app.core.redis_pool import RedisPoolRegistry
+from app.schemas.agent_messages import create_agent_event, create_delegation_request
+from app.services.inprocess_backend import (
+    InProcessAsyncMemoryService,
+    InProcessMemoryService,
+    InProcessMessageBus,
+    LocalPubSubHub,
+    TTLStore,
+)
+
+
+def _delegation(recipient="energy"):
+    return create_delegation_request("supervisor", recipient, "Summarise the ministerial outcomes")
+
+
+def test_ttl_store_expires_and_evicts_least_recently_used():
+    store = TTLStore(max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")  # "b" is now least recently used
+    store.set("c", 3)
+    assert store.get("b") is None
+    assert store.get("a") == 1 and store.get("c") == 3
+    assert store.evictions == 1
+
+    store.set("short", "x", ttl=1)
+    with patch("app.services.inprocess_backend.time.monotonic", return_value=time.monotonic() + 2):
+        assert store.get("short") is None
+
+
+def test_bus_send_receive_and_all_or_nothing_capacity():
+    bus = InProcessMessageBus(max_queue_size=2, default_timeout=1, hub=LocalPubSubHub())
+    first, second = _delegation(), _delegation()
+    bus.send_many([first, second])
+
+    with pytest.raises(ValueError, match="Queue full for agent 'energy'"):
+        bus.send_many([_delegation("trade"), _delegation("energy")])
+    # The rejected batch left the other recipient's queue untouched
+    assert bus.get_queue_size("trade") == 0
+
+    received = bus.receive_message("energy")
+    assert received.metadata.message_id == first.metadata.message_id
+    assert received is not first
+    assert bus.get_message_status(first.metadata.message_id)["status"] == "processing"
+
+    bus.acknowledge_message(first.metadata.message_id, "energy")
+    assert bus.get_message_status(first.metadata.message_id)["status"] == "completed"
+    assert bus.get_bus_stats()["queue_stats"] == {"energy": 1}
+
+
+def test_bus_receive_blocks_until_a_message_arrives():
+    bus = InProcessMessageBus(hub=LocalPubSubHub())
+    message = _delegation()
+    threading.Timer(0.05, bus.send_message, args=(message,)).start()
+
+    received = bus.receive_message("energy", timeout=2)
+    assert received.metadata.message_id == message.metadata.message_id
+    assert bus.receive_message("energy", timeout=0.05) is None
+
+
+async def test_bus_events_reach_async_subscribers():
+    hub = LocalPubSubHub()
+    bus = InProcessMessageBus(hub=hub)
+    received = asyncio.Queue()
+
+    subscription = await bus.subscribe_to_event_type_async("meeting_*", received.put_nowait)
+    event = create_agent_event("supervisor", "meeting_started", {"meeting_id": "m-1"})
+
+    # Published from a worker thread, delivered on the subscriber's loop
+    count = await asyncio.to_thread(bus.publish_event, event)
+    assert count == 1
+    delivered = await asyncio.wait_for(received.get(), timeout=1)
+    assert delivered.data == {"meeting_id": "m-1"}
+
+    await subscription.close()
+    assert hub.get_stats().subscribers == 0
+
+
+async def test_memory_history_windows_and_isolation():
+    memory = InProcessMemoryService()
+    async_memory = InProcessAsyncMemoryService(memory)
+
+    messages = [{"role": "user", "content": str(i)} for i in range(5)]
+    await async_memory.append_many_to_history("energy", "s1", messages, max_history=4)
+    assert [m["content"] for m in memory.get_conversation_history("energy", "s1")] == ["1", "2", "3", "4"]
+    assert [m["content"] for m in memory.get_conversation_history("energy", "s1", -2, -1)] == ["3", "4"]
+
+    page = await async_memory.get_history_page("energy", "s1", limit=3, offset=3)
+    assert [m["content"] for m in page["messages"]] == ["1"]
+    assert page["total"] == 4 and page["has_more"] is False
+
+    history = memory.get_conversation_history("energy", "s1")
+    history[0]["content"] = "mutated"
+    assert memory.get_conversation_history("energy", "s1")[0]["content"] == "1"
+
+    memory.save_agent_state("energy", {"step": 1})
+    assert memory.get_all_sessions_for_agent("energy") == ["s1"]
+    assert memory.clear_all_agent_data("energy") == 2
+    assert memory.get_all_sessions_for_agent("energy") == []
+
+
+async def test_cache_and_registry_select_inprocess_without_redis():
+    registry = RedisPoolRegistry()
+    with patch("app.core.redis_pool.settings.REDIS_BACKEND", "auto"), \
+         patch("app.core.redis_pool.settings.REDIS_URL", None), \
+         patch("app.core.redis_pool.settings.REDIS_HOST", ""):
+        assert registry.resolve_backend() == "memory"
+
+    # A configured Redis is kept even when it's unreachable (no ping, no fallback)
+    configured = RedisPoolRegistry()
+    with patch("app.core.redis_pool.settings.REDIS_BACKEND", "auto"), \
+         patch("app.core.redis_pool.settings.REDIS_URL", None), \
+         patch("app.core.redis_pool.settings.REDIS_HOST", "redis.invalid"), \
+         patch.object(configured, "get_sync_client", side_effect=AssertionError("pinged")):
+        assert configured.resolve_backend() == "redis"
+
+    cache = CacheService()
+    with patch("app.core.cache.get_redis_registry", return_value=registry):
+        await cache.connect()
+    await cache.set("dashboard", {"meetings": 3}, ttl=60)
+    assert await cache.get("dashboard") == {"meetings": 3}
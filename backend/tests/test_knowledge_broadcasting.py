@@ -9,7 +9,7 @@ from app.models.models import Document
 
 @pytest.fixture
 def mock_redis():
-    with patch('app.services.broadcast_service.redis.Redis') as mock:
+    with patch('app.services.broadcast_service.get_redis_registry') as mock:
         yield mock
 
 @pytest.fixture
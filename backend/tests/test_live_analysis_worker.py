@@ -0,0 +1,132 @@
+"""
+Tests for batched, debounced live transcript analysis.
+"""
+
+import asyncio
+
+from app.services.live_analysis_worker import LiveAnalysisWorker, LiveMeetingContext
+
+
+class FakeDetector:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.conflict_calls = []
+        self.agenda_calls = []
+
+    async def detect_live_conflict(self, chunk_text, context):
+        self.conflict_calls.append(chunk_text)
+        await asyncio.sleep(self.delay)
+        return {"reason": f"conflict in {chunk_text!r}", "suggestion": "check"}
+
+    async def analyze_live_agenda(self, chunk_text, agenda_content, context):
+        self.agenda_calls.append(chunk_text)
+        await asyncio.sleep(self.delay)
+        return {"current_focus": "Item 1", "insight_summary": "On item 1"}
+
+
+def _worker(detector, **kwargs):
+    loads = []
+    published = []
+
+    async def load(meeting_id):
+        loads.append(meeting_id)
+        return LiveMeetingContext(
+            meeting_id=meeting_id, meeting_title="Energy TWG", twg_name="Energy", agenda_content="1. Grid"
+        )
+
+    async def notify(**kwargs):
+        published.append(kwargs)
+
+    options = {"debounce": 0.05, "max_wait": 1.0, "max_batches_per_hour": 60}
+    options.update(kwargs)
+    worker = LiveAnalysisWorker(detector=detector, context_loader=load, notify=notify, **options)
+    return worker, loads, published
+
+
+async def test_chunks_are_batched_after_a_quiet_period():
+    detector = FakeDetector()
+    worker, loads, published = _worker(detector)
+
+    for i in range(5):
+        worker.submit("m1", f"line {i}")
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.15)
+
+    # One batch, two LLM calls, one context load
+    assert detector.conflict_calls == ["line 0\nline 1\nline 2\nline 3\nline 4"]
+    assert len(detector.agenda_calls) == 1
+    assert loads == ["m1"]
+    assert [p["source"] for p in published] == ["live_conflict_detector", "agenda_monitor"]
+
+    worker.submit("m1", "line 5")
+    await asyncio.sleep(0.15)
+    assert detector.conflict_calls[-1] == "line 5"
+    assert loads == ["m1"]
+    assert worker.get_stats().batches == 2
+    await worker.close()
+
+
+async def test_max_wait_bounds_latency_while_chunks_keep_arriving():
+    detector = FakeDetector()
+    worker, _, _ = _worker(detector, debounce=0.05, max_wait=0.1)
+
+    for i in range(10):
+        worker.submit("m1", f"line {i}")
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.1)
+
+    assert len(detector.conflict_calls) >= 2
+    assert "\n".join(detector.conflict_calls) == "\n".join(f"line {i}" for i in range(10))
+    await worker.close()
+
+
+async def test_superseded_analysis_is_cancelled_and_its_text_carried_forward():
+    detector = FakeDetector(delay=0.2)
+    worker, _, published = _worker(detector)
+
+    worker.submit("m1", "first")
+    await asyncio.sleep(0.08)
+    assert detector.conflict_calls == ["first"]
+
+    await worker.request_insight("m1", "latest transcript")
+
+    assert detector.conflict_calls == ["first", "first\nlatest transcript"]
+    # Only the surviving analysis is published
+    assert [p["metadata"]["reason"] for p in published if p["source"] == "live_conflict_detector"] == [
+        "conflict in 'first\\nlatest transcript'"
+    ]
+    assert worker.get_stats().cancelled == 1
+    await worker.close()
+
+
+async def test_hourly_budget_caps_analyses():
+    detector = FakeDetector()
+    worker, _, _ = _worker(detector, max_batches_per_hour=2)
+
+    for i in range(4):
+        worker.submit("m1", f"line {i}")
+        await asyncio.sleep(0.1)
+
+    assert detector.conflict_calls == ["line 0", "line 1"]
+    stats = worker.get_stats()
+    assert stats.batches == 2 and stats.llm_calls == 4 and stats.over_budget == 2
+    # Over-budget text is held for the next allowed batch, not dropped
+    assert worker.sessions["m1"]._buffer == ["line 2", "line 3"]
+    await worker.close()
+
+
+async def test_sessions_are_independent_per_meeting():
+    detector = FakeDetector()
+    worker, loads, published = _worker(detector)
+
+    worker.submit("m1", "a")
+    worker.submit("m2", "b")
+    await asyncio.sleep(0.15)
+
+    assert sorted(detector.conflict_calls) == ["a", "b"]
+    assert sorted(loads) == ["m1", "m2"]
+    assert {p["meeting_id"] for p in published} == {"m1", "m2"}
+
+    await worker.end_session("m1")
+    assert list(worker.sessions) == ["m2"]
+    await worker.close()
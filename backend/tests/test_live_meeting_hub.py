@@ -0,0 +1,191 @@
+"""
+Tests for live meeting fan-out: per-meeting rooms, resumable history and slow sockets.
+"""
+
+import asyncio
+import json
+
+import fakeredis
+import pytest
+
+from app.services.inprocess_backend import LocalPubSubHub, get_local_pubsub_hub
+from app.services.live_meeting_hub import (
+    LiveEventPublisher,
+    LiveMeetingHub,
+    LiveSocket,
+    LocalLiveEventLog,
+    get_local_live_event_log,
+    live_channel,
+    live_stream_key,
+    parse_event_id,
+)
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.sent = []
+        self.delay = delay
+
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+
+def _update(meeting_id, n):
+    return json.dumps({"type": "live_meeting_update", "meeting_id": meeting_id, "content": f"u{n}"})
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+async def test_each_meeting_room_has_its_own_subscription():
+    pubsub = LocalPubSubHub()
+    hub = LiveMeetingHub(pubsub_hub=pubsub, event_log=LocalLiveEventLog())
+    plenary = [FakeWebSocket() for _ in range(3)]
+    side_room = FakeWebSocket()
+
+    sockets = [LiveSocket(ws, "plenary") for ws in plenary] + [LiveSocket(side_room, "energy-twg")]
+    for live in sockets:
+        await hub.join(live)
+
+    # One upstream subscription per room however many sockets are watching
+    assert pubsub.get_stats().subscribers == 2
+
+    pubsub.publish(live_channel("plenary"), _update("plenary", 1))
+    pubsub.publish(live_channel("other-meeting"), _update("other-meeting", 2))
+    await _drain()
+
+    assert all([m["content"] for m in ws.sent] == ["u1"] for ws in plenary)
+    assert side_room.sent == []
+    stats = hub.get_stats()
+    assert stats.rooms == 2 and stats.sockets == 4
+    assert stats.received == 1 and stats.delivered == 3
+
+    for live in sockets[:3]:
+        await hub.leave(live)
+    assert pubsub.get_stats().subscribers == 1
+    await hub.leave(sockets[3])
+    assert pubsub.get_stats().subscribers == 0
+
+
+@pytest.fixture(params=["redis", "inprocess"])
+def live_backend(request):
+    """(publisher, hub) pair sharing one event history and one pub/sub hub."""
+    if request.param == "redis":
+        pubsub = LocalPubSubHub()
+        server = fakeredis.FakeServer()
+        publisher = LiveEventPublisher(fakeredis.FakeRedis(server=server), max_events=100, max_age=0)
+        hub = LiveMeetingHub(
+            pubsub_hub=pubsub,
+            history_client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+        )
+        # fakeredis PUBLISH doesn't reach the local hub: forward the frames it would carry
+        original = publisher.publish
+
+        def publish(meeting_id, payload):
+            event_id = original(meeting_id, payload)
+            frame = dict(payload, event_id=event_id)
+            pubsub.publish(live_channel(meeting_id), json.dumps(frame))
+            return event_id
+
+        publisher.publish = publish
+        return publisher, hub
+
+    # Single-node mode publishes to the process-wide log and local hub
+    log = get_local_live_event_log()
+    log._events.pop("plenary", None)
+    hub = LiveMeetingHub(pubsub_hub=get_local_pubsub_hub(), event_log=log)
+    return LiveEventPublisher(None), hub
+
+
+async def test_reconnect_replays_only_missed_events(live_backend):
+    publisher, hub = live_backend
+    ids = [publisher.publish("plenary", {"content": f"u{n}"}) for n in range(5)]
+    assert ids == sorted(ids, key=parse_event_id)
+
+    ws = FakeWebSocket()
+    live = LiveSocket(ws, "plenary")
+    resume = await hub.join(live, last_event_id=ids[2])
+    publisher.publish("plenary", {"content": "u5"})
+    await _drain()
+
+    assert [m["content"] for m in ws.sent] == ["u3", "u4", "u5"]
+    assert [m["event_id"] for m in ws.sent[:2]] == ids[3:]
+    assert resume["replayed"] == 2 and not resume["truncated"]
+
+    # Fresh connect gets the most recent N
+    fresh_ws = FakeWebSocket()
+    await hub.join(LiveSocket(fresh_ws, "plenary"), replay=2)
+    await _drain()
+    assert [m["content"] for m in fresh_ws.sent] == ["u4", "u5"]
+    await hub.close()
+
+
+async def test_live_frames_during_replay_are_not_duplicated():
+    event_log = LocalLiveEventLog()
+    first = event_log.append("plenary", json.dumps({"content": "u0"}))
+    second = event_log.append("plenary", json.dumps({"content": "u1"}))
+
+    ws = FakeWebSocket()
+    live = LiveSocket(ws, "plenary")
+    live.hold()
+    # Published after the subscription opened but already in the replayed history
+    live.deliver(json.dumps({"content": "u1", "event_id": second}), event_id=second)
+    live.send_text(json.dumps({"content": "u0", "event_id": first}))
+    live.send_text(json.dumps({"content": "u1", "event_id": second}))
+    live.release(second)
+    await _drain()
+
+    assert [m["content"] for m in ws.sent] == ["u0", "u1"]
+    await live.close()
+
+
+async def test_history_is_trimmed_by_count_and_flags_truncated_resume():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    publisher = LiveEventPublisher(client, max_events=3, max_age=0)
+    ids = [publisher.publish("plenary", {"content": f"u{n}"}) for n in range(200)]
+
+    stream = client.xrange(live_stream_key("plenary"))
+    # MAXLEN ~ trims approximately; it never keeps less than asked for
+    assert 3 <= len(stream) < 200
+    assert stream[-1][0] == ids[-1]
+    assert json.loads(stream[-1][1]["data"]) == {"content": "u199"}
+    assert client.ttl(live_stream_key("plenary")) > 0
+
+    log = LocalLiveEventLog(max_events=3)
+    log_ids = [log.append("plenary", json.dumps({"n": n})) for n in range(10)]
+    events, oldest = log.read("plenary", after=log_ids[0])
+    assert [i for i, _ in events] == log_ids[-3:]
+    assert oldest == log_ids[-3]
+
+    hub = LiveMeetingHub(pubsub_hub=LocalPubSubHub(), event_log=log)
+    live = LiveSocket(FakeWebSocket(), "plenary")
+    resume = await hub.join(live, last_event_id=log_ids[0])
+    assert resume["truncated"] and resume["replayed"] == 3
+    await hub.close()
+
+
+async def test_slow_socket_drops_its_own_oldest_updates():
+    pubsub = LocalPubSubHub()
+    hub = LiveMeetingHub(pubsub_hub=pubsub, event_log=LocalLiveEventLog())
+    fast_ws, slow_ws = FakeWebSocket(), FakeWebSocket(delay=0.05)
+    fast = LiveSocket(fast_ws, "plenary", max_queue=2)
+    slow = LiveSocket(slow_ws, "plenary", max_queue=2)
+    await hub.join(fast)
+    await hub.join(slow)
+
+    for n in range(5):
+        pubsub.publish(live_channel("plenary"), _update("plenary", n))
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0.3)
+
+    assert [m["content"] for m in fast_ws.sent] == ["u0", "u1", "u2", "u3", "u4"]
+    assert slow.dropped > 0
+    # The newest update always gets through
+    assert slow_ws.sent[-1]["content"] == "u4"
+
+    await hub.close()
+    assert hub.get_stats().sockets == 0
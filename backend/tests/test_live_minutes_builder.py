@@ -0,0 +1,158 @@
+"""
+Tests for incremental live minutes: segment folds, draft merging and the final consolidation.
+"""
+
+import asyncio
+import json
+
+from app.services.live_minutes_builder import LiveMinutesBuilder, LiveMinutesDraft, merge_fold
+
+
+class FakeFoldLLM:
+    """Turns each segment's "DECISION:" / "ACTION:" lines into a fold response."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def chat(self, prompt, max_tokens=None):
+        self.prompts.append(prompt)
+        segment = prompt.split("NEW TRANSCRIPT SEGMENT:\n", 1)[1].split("\n\nUpdate the draft", 1)[0]
+        update = {"sections": [], "decisions": [], "action_items": []}
+        for line in segment.splitlines():
+            if line.startswith("DECISION:"):
+                update["decisions"].append(line[len("DECISION:"):].strip())
+            elif line.startswith("ACTION:"):
+                owner, task = line[len("ACTION:"):].split("|")
+                update["action_items"].append({"owner": owner.strip(), "task": task.strip()})
+            elif line.startswith("TOPIC:"):
+                title, summary = line[len("TOPIC:"):].split("|")
+                update["sections"].append({"title": title.strip(), "summary": summary.strip()})
+        return "```json\n" + json.dumps(update) + "\n```"
+
+
+class FakeConsolidationLLM:
+    def __init__(self, fail=False):
+        self.prompts = []
+        self.fail = fail
+
+    def chat(self, prompt, max_tokens=None):
+        self.prompts.append(prompt)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return "# Minutes: consolidated"
+
+
+def _builder(**kwargs):
+    store = {}
+    published = []
+
+    async def store_get(key):
+        return store.get(key)
+
+    async def store_set(key, value, ttl):
+        store[key] = json.loads(json.dumps(value))
+
+    async def notify(meeting_id, stream, snapshot):
+        published.append((meeting_id, stream, snapshot))
+
+    options = {
+        "fold_llm": FakeFoldLLM(),
+        "consolidation_llm": FakeConsolidationLLM(),
+        "segment_chars": 60,
+        "debounce": 0.05,
+        "min_coverage": 0.6,
+    }
+    options.update(kwargs)
+    builder = LiveMinutesBuilder(store_get=store_get, store_set=store_set, notify=notify, **options)
+    return builder, store, published
+
+
+def test_merge_fold_updates_sections_and_dedupes():
+    draft = LiveMinutesDraft(meeting_id="m1")
+    merge_fold(draft, {
+        "sections": [{"title": "Grid Financing", "summary": "Opened."}],
+        "decisions": ["Adopt the WAPP roadmap"],
+        "action_items": [{"owner": "Secretariat", "task": "Circulate the roadmap"}],
+    })
+    merge_fold(draft, {
+        "sections": [{"title": "grid financing", "summary": "Opened and agreed."}, {"title": "AOB", "summary": "None."}],
+        "decisions": ["Adopt the WAPP roadmap", "Meet again in May"],
+        "action_items": [{"owner": "Secretariat", "task": "Circulate the roadmap"}, {"task": "Book venue"}],
+    })
+
+    assert [(s.title, s.summary) for s in draft.sections] == [
+        ("Grid Financing", "Opened and agreed."), ("AOB", "None.")
+    ]
+    assert draft.decisions == ["Adopt the WAPP roadmap", "Meet again in May"]
+    assert [(a.owner, a.task) for a in draft.action_items] == [
+        ("Secretariat", "Circulate the roadmap"), ("TBD", "Book venue")
+    ]
+
+
+async def test_chunks_fold_by_segment_and_publish_the_draft():
+    builder, store, published = _builder()
+    fold_llm = builder.fold_llm
+
+    builder.submit("m1", "TOPIC: Grid | Ministers opened the session.")
+    builder.submit("m1", "DECISION: Adopt the WAPP roadmap")
+    await asyncio.sleep(0.02)
+    # The segment size was reached: folded without waiting for the debounce
+    assert len(fold_llm.prompts) == 1
+
+    builder.submit("m1", "ACTION: Secretariat | Circulate the roadmap")
+    await asyncio.sleep(0.1)
+    assert len(fold_llm.prompts) == 2
+    # Each fold sends the draft so far, not the transcript so far
+    assert "Adopt the WAPP roadmap" in fold_llm.prompts[1]
+    assert "TOPIC: Grid" not in fold_llm.prompts[1]
+
+    draft = LiveMinutesDraft(**store["live_minutes:m1"])
+    assert draft.folds == 2
+    assert draft.decisions == ["Adopt the WAPP roadmap"]
+    assert [a.task for a in draft.action_items] == ["Circulate the roadmap"]
+    assert [(m, s) for m, s, _ in published] == [("m1", "minutes"), ("m1", "minutes")]
+    assert published[-1][2]["action_items"][0]["owner"] == "Secretariat"
+    await builder.close()
+
+
+async def test_finalize_folds_the_tail_and_consolidates_the_draft():
+    builder, _, _ = _builder(debounce=10.0)
+    lines = ["TOPIC: Grid | Opened.", "DECISION: Adopt the roadmap", "ACTION: Secretariat | Circulate it"]
+    for line in lines:
+        builder.submit("m1", line)
+
+    result = await builder.finalize("m1", {"meeting_title": "Energy TWG"}, "\n".join(lines))
+
+    assert result["content"] == "# Minutes: consolidated"
+    assert result["metadata"]["source"] == "live_minutes"
+    assert result["metadata"]["key_decisions"] == ["Adopt the roadmap"]
+    consolidation_prompt = builder.consolidation_llm.prompts[0]
+    assert "Circulate it" in consolidation_prompt and "Energy TWG" in consolidation_prompt
+    assert builder.sessions == {}
+
+
+async def test_finalize_on_another_worker_uses_the_cached_draft():
+    builder, store, _ = _builder()
+    builder.submit("m1", "DECISION: Adopt the roadmap and publish it this week")
+    builder.submit("m1", "ACTION: Secretariat | Circulate the roadmap")
+    await asyncio.sleep(0.1)
+
+    other, _, _ = _builder(consolidation_llm=FakeConsolidationLLM(fail=True))
+    other._store_get = builder._store_get
+    result = await other.finalize("m1", {"meeting_title": "Energy TWG"}, "x" * 100)
+
+    # Consolidation failed: the draft is rendered directly instead
+    assert result["metadata"]["consolidated"] is False
+    assert "Adopt the roadmap and publish it this week" in result["content"]
+    assert "**Secretariat**: Circulate the roadmap" in result["content"]
+    await builder.close()
+
+
+async def test_finalize_falls_back_when_draft_does_not_cover_transcript():
+    builder, _, _ = _builder()
+    builder.submit("m1", "DECISION: Adopt the roadmap and publish it this week")
+    await asyncio.sleep(0.1)
+
+    assert await builder.finalize("m1", {}, "x" * 1000) is None
+    assert await builder.finalize("unknown", {}, "x" * 1000) is None
+    assert builder.get_stats().fallbacks == 2
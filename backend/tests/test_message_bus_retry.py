@@ -0,0 +1,163 @@
+"""
+Tests for message bus backpressure: retries with backoff, dead letters and queue metrics.
+"""
+
+import time
+
+import fakeredis
+import pytest
+
+from app.schemas.agent_messages import MessageStatus, create_delegation_request
+from app.services.inprocess_backend import InProcessMessageBus, LocalPubSubHub
+from app.services.redis_message_bus import QueueFullError, RedisMessageBus
+from app.services.redis_stream_bus import RedisStreamMessageBus
+
+RETRY_SETTINGS = dict(
+    max_queue_size=2,
+    default_timeout=1,
+    max_retries=1,
+    retry_backoff_base=0.01,
+    retry_backoff_max=0.05,
+    retry_poll_interval=0
+)
+
+
+def _request(recipient="energy", i=0):
+    return create_delegation_request("supervisor", recipient, f"q{i}")
+
+
+@pytest.fixture(params=["list", "streams", "inprocess"])
+def bus(request):
+    if request.param == "list":
+        return RedisMessageBus(fakeredis.FakeRedis(), **RETRY_SETTINGS)
+    if request.param == "streams":
+        return RedisStreamMessageBus(fakeredis.FakeRedis(), consumer_name="w1", **RETRY_SETTINGS)
+    return InProcessMessageBus(hub=LocalPubSubHub(), **RETRY_SETTINGS)
+
+
+def test_failed_message_is_retried_then_dead_lettered(bus):
+    message_id = bus.send_message(_request())
+    bus.receive_message("energy")
+
+    assert bus.fail_message(message_id, "energy", "LLM timeout")
+    status = bus.get_message_status(message_id)
+    assert status["status"] == MessageStatus.PENDING.value
+    assert status["error"] == "LLM timeout"
+
+    # Promoted back into the queue once the backoff has passed
+    retried = bus.receive_message("energy", timeout=1)
+    assert retried.metadata.message_id == message_id
+    assert retried.metadata.attempts == 1
+
+    bus.fail_message(message_id, "energy", "LLM timeout again")
+    assert bus.get_message_status(message_id)["status"] == MessageStatus.FAILED.value
+    [letter] = bus.get_dead_letters("energy")
+    assert letter["message_id"] == str(message_id)
+    assert letter["error"] == "LLM timeout again"
+    assert letter["attempts"] == 2
+
+    # Replay re-sends with a fresh retry budget
+    assert bus.replay_dead_letters("energy") == 1
+    assert bus.get_dead_letter_count("energy") == 0
+    replayed = bus.receive_message("energy", timeout=1)
+    assert replayed.metadata.message_id == message_id
+    assert replayed.metadata.attempts == 0
+
+
+def test_non_retryable_failures_skip_the_schedule_and_can_be_purged(bus):
+    message_id = bus.send_message(_request())
+    bus.receive_message("energy")
+
+    bus.fail_message(message_id, "energy", "invalid payload", retry=False)
+    stats = bus.get_bus_stats()
+    assert stats["dead_letter_stats"] == {"energy": 1}
+    assert stats["retry_scheduled"] == 0
+
+    assert bus.purge_dead_letters("energy") == 1
+    assert bus.get_dead_letters("energy") == []
+
+
+def test_full_queue_signals_retry_after_or_defers(bus):
+    bus.send_many([_request(i=0), _request(i=1)])
+
+    with pytest.raises(QueueFullError) as excinfo:
+        bus.send_message(_request(i=2))
+    assert excinfo.value.agent_id == "energy"
+    # No dequeues yet, so the hint is the backoff ceiling
+    assert excinfo.value.retry_after == pytest.approx(0.05)
+
+    deferred = _request(i=3)
+    assert bus.send_message(deferred, defer_if_full=True) == deferred.metadata.message_id
+    assert bus.get_message_status(deferred.metadata.message_id)["status"] == MessageStatus.PENDING.value
+
+    # Drain (streams count unacknowledged entries towards capacity)
+    received = []
+    for _ in range(3):
+        message = bus.receive_message("energy", timeout=1)
+        bus.acknowledge_message(message.metadata.message_id, "energy")
+        if hasattr(bus, "flush_acks"):
+            bus.flush_acks()
+        received.append(message)
+    assert received[-1].metadata.message_id == deferred.metadata.message_id
+    assert bus.get_agent_metrics("energy")["counters"]["deferred"] == 1
+
+
+def test_agent_metrics_report_lag_and_throughput(bus):
+    first = bus.send_message(_request(i=0))
+    bus.send_message(_request(i=1))
+    time.sleep(0.02)
+
+    metrics = bus.get_agent_metrics("energy")
+    assert metrics["queue_size"] == 2
+    assert metrics["lag_seconds"] >= 0.02
+
+    bus.receive_message("energy")
+    bus.acknowledge_message(first, "energy")
+    if hasattr(bus, "flush_acks"):
+        bus.flush_acks()
+
+    metrics = bus.get_agent_metrics("energy", window_minutes=1)
+    assert metrics["counters"]["enqueued"] == 2
+    assert metrics["counters"]["dequeued"] == 1
+    assert metrics["counters"]["acked"] == 1
+    assert metrics["throughput_per_minute"]["enqueued"] == 2
+    assert bus.get_bus_stats()["queue_stats"] == {"energy": 1}
+
+
+def test_due_retries_are_leased_to_one_worker():
+    server = fakeredis.FakeServer()
+    first = RedisMessageBus(fakeredis.FakeRedis(server=server), **RETRY_SETTINGS)
+    second = RedisMessageBus(fakeredis.FakeRedis(server=server), **RETRY_SETTINGS)
+
+    message_id = first.send_message(_request())
+    first.receive_message("energy")
+    first.fail_message(message_id, "energy", "flaky tool")
+    time.sleep(0.06)
+
+    claimed, _ = first._claim_due_retries(limit=10)
+    assert [mid for mid, _ in claimed] == [str(message_id)]
+    # Leased: the other worker doesn't get it while the first re-sends it
+    assert second.promote_due_retries() == 0
+    assert first.promote_due_retries() == 0
+    first._finish_retry(str(message_id))
+    assert first.get_bus_stats()["retry_scheduled"] == 0
+
+
+def test_dead_letters_are_claimed_once_and_put_back_when_the_queue_is_full(bus):
+    ids = [bus.send_message(_request(i=i)) for i in range(2)]
+    for message_id in ids:
+        bus.receive_message("energy")
+        bus.fail_message(message_id, "energy", "bad input", retry=False)
+    if hasattr(bus, "flush_acks"):
+        bus.flush_acks()
+
+    # A concurrent replay read the same entries; only one claim wins
+    [(handle, _), _] = bus._oldest_dead_letters("energy", 2)
+    assert bus._claim_dead_letter("energy", handle)
+    assert not bus._claim_dead_letter("energy", handle)
+    bus._restore_dead_letter("energy", handle)
+
+    bus.send_many([_request(i=2), _request(i=3)])
+    assert bus.replay_dead_letters("energy") == 0
+    assert bus.get_dead_letter_count("energy") == 2
+    assert bus.get_dead_letters("energy")[-1]["message_id"] == str(ids[0])
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import fakeredis
+
+from app.services.redis_message_bus import RedisMessageBus
+from app.services.redis_stream_bus import RedisStreamMessageBus
+from app.schemas.agent_messages import MessageStatus, create_delegation_request
+
+
+def _request(recipient, i=0):
+    return create_delegation_request("supervisor", recipient, f"q{i}")
+
+
+@pytest.fixture(params=["list", "streams"])
+def bus(request):
+    client = fakeredis.FakeRedis()
+    if request.param == "list":
+        return RedisMessageBus(client, max_queue_size=5)
+    return RedisStreamMessageBus(client, max_queue_size=5, consumer_name="w1")
+
+
+def test_send_many_is_one_round_trip(bus):
+    # Warm-up loads the script (first EVALSHA -> NOSCRIPT -> SCRIPT LOAD)
+    bus.send_many([_request("energy"), _request("minerals")])
+    messages = [_request("energy", 1), _request("minerals", 2), _request("energy", 3)]
+
+    calls = []
+    original = bus.client.execute_command
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    bus.client.execute_command = counting
+    ids = bus.send_many(messages)
+
+    assert ids == [m.metadata.message_id for m in messages]
+    assert calls == ["EVALSHA"]
+    assert bus.get_queue_size("energy") == 3
+    assert bus.get_queue_size("minerals") == 2
+    assert bus.get_message_status(ids[1])["status"] == MessageStatus.DELIVERED.value
+
+
+def test_send_many_is_all_or_nothing(bus):
+    bus.send_many([_request("energy", i) for i in range(4)])
+
+    with pytest.raises(ValueError, match="Queue full for agent 'energy'"):
+        bus.send_many([_request("minerals"), _request("energy", 4), _request("energy", 5)])
+
+    assert bus.get_queue_size("energy") == 4
+    assert bus.get_queue_size("minerals") == 0
+
+
+def test_capacity_holds_under_concurrent_senders(bus):
+    def send(i):
+        try:
+            bus.send_message(_request("energy", i))
+            return True
+        except ValueError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(send, range(40)))
+
+    assert sum(results) == 5
+    assert bus.get_queue_size("energy") == 5
@@ -0,0 +1,60 @@
+import json
+
+import fakeredis
+import pytest
+
+from app.services.message_codec import MessageCodec, CodecError, ENVELOPE_MAGIC, FLAG_ZSTD
+from app.services.redis_message_bus import RedisMessageBus
+from app.schemas.agent_messages import DelegationRequest, create_delegation_request
+
+
+@pytest.mark.parametrize("encoding", ["msgpack", "orjson", "json"])
+def test_round_trip(encoding):
+    codec = MessageCodec(encoding=encoding)
+    value = {"role": "user", "content": "hello", "n": 3, "nested": [1, None, True]}
+
+    payload = codec.encode(value)
+
+    assert payload[0] == ENVELOPE_MAGIC
+    assert codec.decode(payload) == value
+
+
+def test_large_payloads_are_compressed():
+    codec = MessageCodec(compress_threshold=256)
+    value = {"content": "energy corridor " * 200}
+
+    payload = codec.encode(value)
+
+    assert payload[3] & FLAG_ZSTD
+    assert len(payload) < len(json.dumps(value)) / 5
+    assert MessageCodec.decode(payload) == value
+
+
+def test_legacy_json_is_readable():
+    legacy = json.dumps({"role": "assistant", "content": "old"})
+
+    assert MessageCodec.decode(legacy) == {"role": "assistant", "content": "old"}
+    assert MessageCodec.decode(legacy.encode("utf-8")) == {"role": "assistant", "content": "old"}
+
+
+def test_newer_envelope_version_is_rejected():
+    payload = bytearray(MessageCodec().encode({"a": 1}))
+    payload[1] = 99
+
+    with pytest.raises(CodecError):
+        MessageCodec.decode(bytes(payload))
+
+
+def test_bus_reads_messages_queued_as_json_before_upgrade():
+    client = fakeredis.FakeRedis()
+    bus = RedisMessageBus(client, codec=MessageCodec(encoding="msgpack"))
+    old = create_delegation_request("supervisor", "energy", "queued before upgrade")
+    client.lpush(bus._make_queue_key("energy"), json.dumps(old.to_dict()))
+    new_id = bus.send_message(create_delegation_request("supervisor", "energy", "queued after"))
+
+    first = bus.receive_message("energy", timeout=1)
+    second = bus.receive_message("energy", timeout=1)
+
+    assert isinstance(first, DelegationRequest)
+    assert first.query == "queued before upgrade"
+    assert second.metadata.message_id == new_id
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+import fakeredis
+from fakeredis import aioredis as fake_aioredis
+from unittest.mock import patch
+
+from app.services.pubsub_hub import PubSubHub
+from app.services.redis_message_bus import RedisMessageBus
+from app.schemas.agent_messages import AgentEvent, MessageMetadata
+
+
+@pytest.fixture
+async def hub():
+    hub = PubSubHub(client=fake_aioredis.FakeRedis(decode_responses=True), poll_timeout=0.01)
+    yield hub
+    await hub.close()
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def test_subscribers_share_one_connection(hub):
+    received = {"a": [], "b": [], "pattern": []}
+
+    await hub.subscribe("events:one", lambda ch, data: received["a"].append(data))
+
+    async def async_callback(channel, data):
+        received["b"].append(data)
+
+    await hub.subscribe("events:one", async_callback)
+    await hub.psubscribe("events:*", lambda ch, data: received["pattern"].append(ch))
+
+    await hub.client.publish("events:one", "hello")
+    await hub.client.publish("events:two", "other")
+    await _wait_for(lambda: len(received["pattern"]) == 2 and received["a"] and received["b"])
+
+    assert received["a"] == ["hello"] and received["b"] == ["hello"]
+    assert sorted(received["pattern"]) == ["events:one", "events:two"]
+    stats = hub.get_stats()
+    assert (stats.channels, stats.patterns, stats.subscribers) == (1, 1, 3)
+    # One shared pub/sub object for every subscriber
+    assert hub._pubsub.connection is not None
+
+
+async def test_slow_subscriber_drops_oldest_without_blocking_others(hub):
+    gate = asyncio.Event()
+    slow_seen, fast_seen = [], []
+
+    async def slow(channel, data):
+        await gate.wait()
+        slow_seen.append(data)
+
+    await hub.subscribe("feed", slow, max_queue=2)
+    await hub.subscribe("feed", lambda ch, data: fast_seen.append(data))
+
+    for i in range(6):
+        await hub.client.publish("feed", str(i))
+    await _wait_for(lambda: len(fast_seen) == 6)
+
+    gate.set()
+    await _wait_for(lambda: len(slow_seen) == 3)
+    # First message was already being processed; of the rest only the newest two survive
+    assert slow_seen == ["0", "4", "5"]
+    assert hub.get_stats().dropped == 3
+
+
+async def test_last_unsubscribe_releases_channel(hub):
+    seen = []
+    first = await hub.subscribe("feed", lambda ch, data: seen.append(data))
+    second = await hub.subscribe("feed", lambda ch, data: None)
+
+    await first.close()
+    assert hub.get_stats().channels == 1
+    await second.close()
+    assert hub.get_stats().channels == 0
+
+    await hub.client.publish("feed", "ignored")
+    await asyncio.sleep(0.05)
+    assert seen == []
+
+
+async def test_reconnect_resubscribes(hub):
+    seen = []
+    await hub.subscribe("feed", lambda ch, data: seen.append(data))
+
+    # Simulate a dropped connection: the next read fails
+    original = hub._pubsub
+    async def broken(**kwargs):
+        raise ConnectionError("connection reset")
+    original.get_message = broken
+
+    await _wait_for(lambda: hub.get_stats().reconnects == 1)
+    await hub.client.publish("feed", "after reconnect")
+    await _wait_for(lambda: seen == ["after reconnect"])
+
+
+async def test_message_bus_async_subscription_uses_hub():
+    server = fakeredis.FakeServer()
+    hub = PubSubHub(client=fake_aioredis.FakeRedis(server=server, decode_responses=True), poll_timeout=0.01)
+    bus = RedisMessageBus(fakeredis.FakeRedis(server=server))
+    events = []
+
+    with patch("app.services.redis_message_bus.get_pubsub_hub", return_value=hub):
+        subscription = await bus.subscribe_to_event_type_async("meeting_*", events.append)
+
+    bus.publish_event(AgentEvent(
+        metadata=MessageMetadata(sender_id="supervisor", recipient_id="broadcast"),
+        payload={"event_type": "meeting_started", "data": {"id": 1}}
+    ))
+    await _wait_for(lambda: len(events) == 1)
+
+    assert events[0].event_type == "meeting_started"
+    await subscription.close()
+    await hub.close()
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.agents.langgraph_base_agent import LangGraphBaseAgent
+from app.agents.langgraph_supervisor import LangGraphSupervisor
+
+
+def _make_supervisor(agents):
+    """Build a supervisor shell with mocked TWG agents (skips LLM/tool setup)."""
+    supervisor = LangGraphSupervisor.__new__(LangGraphSupervisor)
+    supervisor._twg_agents = agents
+    return supervisor
+
+
+def _make_agent(agent_id, delay=0.0):
+    agent = MagicMock()
+    calls = []
+
+    async def retrieve_context(query):
+        calls.append(query)
+        await asyncio.sleep(delay)
+        return {"query": query, "namespace": f"twg-{agent_id}", "context": {"retrieved_docs": agent_id}, "citations": []}
+
+    agent.retrieve_context = retrieve_context
+    agent.calls = calls
+    return agent
+
+
+def _routed(agents):
+    async def fake_route(state):
+        state["relevant_agents"] = agents
+        return state
+    return fake_route
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_kept_when_routing_agrees():
+    energy = _make_agent("energy")
+    supervisor = _make_supervisor({"energy": energy, "minerals": _make_agent("minerals")})
+    state = {"query": "What are the solar energy targets?", "context": None}
+
+    with patch("app.agents.langgraph_supervisor.route_query_node", side_effect=_routed(["energy"])):
+        result = await supervisor._route_with_prefetch(state)
+
+    assert energy.calls == ["What are the solar energy targets?"]
+    assert list(result["prefetched_context"].keys()) == ["energy"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_runs_concurrently_with_routing():
+    energy = _make_agent("energy", delay=0.2)
+    supervisor = _make_supervisor({"energy": energy})
+    state = {"query": "What are the solar energy targets?", "context": None}
+
+    async def slow_route(state):
+        await asyncio.sleep(0.2)
+        state["relevant_agents"] = ["energy"]
+        return state
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with patch("app.agents.langgraph_supervisor.route_query_node", side_effect=slow_route):
+        result = await supervisor._route_with_prefetch(state)
+
+    # Sequential would be ~0.4s
+    assert loop.time() - started < 0.35
+    assert "energy" in result["prefetched_context"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_discarded_on_misprediction():
+    supervisor = _make_supervisor({"energy": _make_agent("energy", delay=1.0), "digital": _make_agent("digital")})
+    state = {"query": "What are the solar energy targets?", "context": None}
+
+    with patch("app.agents.langgraph_supervisor.route_query_node", side_effect=_routed(["digital"])):
+        result = await supervisor._route_with_prefetch(state)
+
+    assert result["prefetched_context"] is None
+
+
+@pytest.mark.asyncio
+async def test_prefetch_uses_twg_context_for_prediction():
+    minerals = _make_agent("minerals")
+    supervisor = _make_supervisor({"minerals": minerals})
+    state = {"query": "Give me an update", "context": {"twg_id": "twg-uuid"}}
+
+    with patch("app.agents.utils.get_agent_id_by_twg_id", return_value="minerals"), \
+         patch("app.agents.langgraph_supervisor.route_query_node", side_effect=_routed(["minerals"])):
+        result = await supervisor._route_with_prefetch(state)
+
+    assert minerals.calls == ["Give me an update"]
+    assert "minerals" in result["prefetched_context"]
+
+
+@pytest.mark.asyncio
+async def test_process_query_node_skips_search_with_prefetched_context():
+    agent = LangGraphBaseAgent.__new__(LangGraphBaseAgent)
+    agent.agent_id = "energy"
+    agent.twg_id = "energy"
+    agent.kb = MagicMock()
+
+    prefetched = {
+        "query": "solar",
+        "namespace": "twg-energy",
+        "context": {"retrieved_docs": "[plan.pdf]\nSolar plan", "source": "twg-energy"},
+        "citations": [{"source": "plan.pdf", "page": 1, "relevance": 0.9}],
+    }
+    state = {"query": "solar", "context": None, "citations": None, "prefetched_context": prefetched}
+
+    result = await agent._process_query_node(state)
+
+    agent.kb.search.assert_not_called()
+    assert result["context"]["retrieved_docs"].startswith("[plan.pdf]")
+    assert result["citations"][0]["source"] == "plan.pdf"
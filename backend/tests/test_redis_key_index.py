@@ -0,0 +1,86 @@
+import json
+
+import pytest
+import fakeredis
+from fakeredis import aioredis as fake_aioredis
+
+from app.services.message_codec import MessageCodec
+from app.services.redis_memory import AsyncRedisMemoryService, RedisMemoryService
+from app.services.redis_message_bus import RedisMessageBus
+from app.schemas.agent_messages import create_delegation_request
+
+
+class _NoKeysRedis(fakeredis.FakeRedis):
+    """Fake client that fails loudly if anything still uses KEYS."""
+
+    def keys(self, *args, **kwargs):
+        raise AssertionError("KEYS must not be used")
+
+
+def _sync_memory(client):
+    service = RedisMemoryService.__new__(RedisMemoryService)
+    service.client = client
+    service.default_ttl = 60
+    service._indexed_agents = set()
+    service.codec = MessageCodec()
+    return service
+
+
+def test_sessions_listed_from_index_and_expired_entries_pruned():
+    client = _NoKeysRedis(decode_responses=False)
+    memory = _sync_memory(client)
+
+    memory.append_to_history("energy", "s1", {"role": "user", "content": "hi"})
+    memory.save_conversation_history("energy", "s2", [{"role": "user", "content": "hello"}])
+    memory.append_to_history("minerals", "s9", {"role": "user", "content": "other agent"})
+
+    # Simulate s2 expiring: its index entry is stale until the next listing
+    client.delete("ecowas:history:energy:s2")
+
+    assert memory.get_all_sessions_for_agent("energy") == ["s1"]
+    assert client.smembers("ecowas:index:sessions:energy") == {b"s1"}
+
+
+def test_legacy_histories_are_backfilled_by_scan():
+    client = _NoKeysRedis(decode_responses=False)
+    client.set("ecowas:history:energy:old", json.dumps([{"role": "user", "content": "legacy"}]))
+    memory = _sync_memory(client)
+
+    memory.append_to_history("energy", "new", {"role": "user", "content": "hi"})
+
+    assert memory.get_all_sessions_for_agent("energy") == ["new", "old"]
+    assert memory.clear_all_agent_data("energy") == 2
+    assert not client.exists("ecowas:index:sessions:energy")
+
+
+@pytest.mark.asyncio
+async def test_async_memory_uses_the_same_index():
+    memory = AsyncRedisMemoryService(client=fake_aioredis.FakeRedis(decode_responses=False))
+
+    await memory.append_to_history("energy", "s1", {"role": "user", "content": "hi"})
+    await memory.append_to_history("energy", "s2", {"role": "user", "content": "hi"})
+    await memory.clear_conversation_history("energy", "s2")
+
+    assert await memory.get_all_sessions_for_agent("energy") == ["s1"]
+    await memory.save_agent_state("energy", {"step": 1})
+    assert await memory.clear_all_agent_data("energy") == 2
+
+
+def test_bus_stats_use_index_and_backfill_existing_queues():
+    client = _NoKeysRedis()
+    # A queue written before the index existed
+    client.lpush("ecowas:agent:legacy:queue", "{}")
+    bus = RedisMessageBus(client)
+
+    for _ in range(3):
+        bus.send_message(create_delegation_request("supervisor", "energy", "status?"))
+    bus.send_message(create_delegation_request("supervisor", "minerals", "status?"))
+
+    stats = bus.get_bus_stats()
+
+    assert stats["queue_stats"] == {"energy": 3, "legacy": 1, "minerals": 1}
+    assert stats["total_messages"] == 5
+    assert stats["healthy"] is True
+
+    bus.clear_agent_queue("energy")
+    assert "energy" not in bus.get_bus_stats()["queue_stats"]
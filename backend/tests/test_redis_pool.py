@@ -0,0 +1,91 @@
+"""
+Tests for the shared Redis connection pool registry.
+"""
+
+from unittest.mock import patch
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from app.core.redis_pool import RedisPoolRegistry, build_redis_url
+
+
+@pytest.fixture
+def registry():
+    server = fakeredis.FakeServer()
+    return RedisPoolRegistry(
+        max_connections=3,
+        pool_timeout=0.2,
+        health_check_interval=0,
+        sync_connection_class=fakeredis.FakeRedisConnection,
+        async_connection_class=fakeredis.aioredis.FakeAsyncRedisConnection,
+        connection_kwargs={"server": server}
+    )
+
+
+def test_build_redis_url_omits_missing_password():
+    url = build_redis_url(host="cache", port=6380, db=2, password="")
+    assert url == "redis://cache:6380/2"
+    assert build_redis_url(host="cache", port=6380, db=2, password="s3cret") == "redis://:s3cret@cache:6380/2"
+
+
+async def test_clients_share_one_pool_per_url_and_mode(registry):
+    a = registry.get_async_client(decode_responses=True)
+    b = registry.get_async_client(decode_responses=True)
+    assert a.connection_pool is b.connection_pool
+    assert registry.get_async_client().connection_pool is not a.connection_pool
+
+    s1 = registry.get_sync_client()
+    s2 = registry.get_sync_client()
+    assert s1.connection_pool is s2.connection_pool
+
+    await a.set("k", "v")
+    assert s1.get("k") == b"v"
+
+
+def test_sync_pool_is_bounded_and_reports_usage(registry):
+    pool = registry.get_sync_pool()
+    held = [pool.get_connection("PING") for _ in range(3)]
+
+    stats = registry.get_stats()
+    assert stats["pools"][0]["in_use"] == 3
+    assert stats["total_in_use"] == 3
+
+    with pytest.raises(Exception):
+        pool.get_connection("PING")
+
+    for conn in held:
+        pool.release(conn)
+    stats = registry.get_stats()
+    assert stats["pools"][0]["in_use"] == 0
+    assert stats["pools"][0]["idle"] == 3
+
+
+async def test_initialize_health_check_and_close(registry):
+    with patch("app.core.redis_pool.settings.REDIS_BACKEND", "redis"):
+        assert await registry.initialize() is True
+    health = await registry.health_check()
+    assert health["healthy"] is True
+
+    stats = registry.get_stats()
+    assert {p["mode"] for p in stats["pools"]} == {"sync", "async"}
+    assert stats["last_health_check"]["healthy"] is True
+
+    await registry.close()
+    assert registry.get_stats()["pools"] == []
+
+
+async def test_health_check_reports_unreachable_redis():
+    registry = RedisPoolRegistry(
+        pool_timeout=0.2, health_check_interval=0,
+        connection_kwargs={"socket_connect_timeout": 0.2}
+    )
+
+    # Nothing listens on port 1
+    with patch("app.core.redis_pool.build_redis_url", return_value="redis://127.0.0.1:1/0"):
+        health = await registry.health_check()
+
+    assert health["healthy"] is False
+    assert "error" in health
+    await registry.close()
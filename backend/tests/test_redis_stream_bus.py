@@ -0,0 +1,104 @@
+import time
+
+import pytest
+import fakeredis
+
+from app.services.redis_stream_bus import RedisStreamMessageBus
+from app.schemas.agent_messages import MessageStatus, create_delegation_request
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _bus(server, consumer, **kwargs):
+    return RedisStreamMessageBus(
+        fakeredis.FakeRedis(server=server),
+        consumer_name=consumer,
+        default_timeout=0,
+        **kwargs
+    )
+
+
+def _send(bus, n, recipient="energy"):
+    return [bus.send_message(create_delegation_request("supervisor", recipient, f"q{i}")) for i in range(n)]
+
+
+def test_batch_receive_and_batched_ack(server):
+    bus = _bus(server, "w1", ack_batch_size=3, ack_flush_interval=60)
+    ids = _send(bus, 3)
+
+    messages = bus.receive_messages("energy", count=10)
+    assert [m.metadata.message_id for m in messages] == ids
+    assert bus.get_message_status(ids[0])["status"] == MessageStatus.PROCESSING.value
+
+    bus.acknowledge_message(ids[0], "energy")
+    bus.acknowledge_message(ids[1], "energy")
+    # Still buffered below the batch size
+    assert bus.get_bus_stats()["pending_stats"]["energy"] == 3
+
+    bus.acknowledge_message(ids[2], "energy")
+    stats = bus.get_bus_stats()
+    assert stats["pending_stats"]["energy"] == 0
+    assert stats["queue_stats"]["energy"] == 0
+    assert bus.get_message_status(ids[0]) is None
+
+
+def test_status_is_derived_from_stream_and_pel(server):
+    bus = _bus(server, "w1")
+    queued, read = _send(bus, 2)
+
+    assert bus.get_message_status(queued)["status"] == MessageStatus.DELIVERED.value
+    bus.receive_messages("energy", count=1)
+    status = bus.get_message_status(queued)
+    assert status["status"] == MessageStatus.PROCESSING.value
+    assert status["consumer"] == "w1"
+    assert bus.get_message_status(read)["status"] == MessageStatus.DELIVERED.value
+
+
+def test_workers_in_a_group_share_the_stream(server):
+    first, second = _bus(server, "w1"), _bus(server, "w2")
+    _send(first, 4)
+
+    a = first.receive_messages("energy", count=2)
+    b = second.receive_messages("energy", count=10)
+
+    assert len(a) == 2 and len(b) == 2
+    assert not {m.metadata.message_id for m in a} & {m.metadata.message_id for m in b}
+
+
+def test_stuck_messages_are_reclaimed_by_another_worker(server):
+    crashed = _bus(server, "w1", claim_idle_ms=10)
+    rescuer = _bus(server, "w2", claim_idle_ms=10)
+    [message_id] = _send(crashed, 1)
+
+    assert crashed.receive_message("energy") is not None
+    time.sleep(0.03)
+
+    reclaimed = rescuer.receive_message("energy")
+    assert reclaimed.metadata.message_id == message_id
+    status = rescuer.get_message_status(message_id)
+    assert status["consumer"] == "w2"
+    assert status["delivery_count"] == 2
+
+
+def test_failed_messages_move_to_failed_stream(server):
+    bus = _bus(server, "w1", max_retries=0)
+    [message_id] = _send(bus, 1)
+    bus.receive_message("energy")
+
+    assert bus.fail_message(message_id, "energy", "tool crashed")
+
+    status = bus.get_message_status(message_id)
+    assert status["status"] == MessageStatus.FAILED.value
+    assert status["error"] == "tool crashed"
+    assert bus.get_queue_size("energy") == 0
+
+
+def test_capacity_is_enforced(server):
+    bus = _bus(server, "w1", max_queue_size=2)
+    _send(bus, 2)
+
+    with pytest.raises(ValueError):
+        _send(bus, 1)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock, patch
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.agents.langgraph_supervisor import LangGraphSupervisor
+from app.agents.tracing import TraceStore
+from app.agents import tracing
+
+
+class _StreamingLLM:
+    """Fake LLM service whose stream_chat yields a fixed token sequence."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def stream_chat(self, prompt, system_prompt=None, **kwargs):
+        for token in self.tokens:
+            yield token
+
+
+def _make_agent(agent_id, delay):
+    agent = MagicMock()
+
+    async def chat(query, user_timezone=None, prefetched_context=None):
+        await asyncio.sleep(delay)
+        return {"response": f"{agent_id} answer", "citations": [{"source": f"{agent_id}.pdf", "page": 1}]}
+
+    agent.chat = chat
+    return agent
+
+
+def _make_supervisor():
+    supervisor = LangGraphSupervisor.__new__(LangGraphSupervisor)
+    supervisor._twg_agents = {
+        "energy": _make_agent("energy", delay=0.05),
+        "minerals": _make_agent("minerals", delay=0.01),
+    }
+    supervisor.session_id = "test"
+    supervisor.memory = MemorySaver()
+    supervisor.compiled_graph = None
+
+    supervisor_agent = MagicMock()
+    supervisor_agent.llm = _StreamingLLM(["Executive ", "Summary: ", "all good."])
+    supervisor_agent.system_prompt = "You are the supervisor."
+
+    async def supervisor_chat(prompt, **kwargs):
+        return {"response": "NO CONFLICT", "citations": []}
+
+    supervisor_agent.chat = supervisor_chat
+    supervisor.supervisor_agent = supervisor_agent
+    supervisor.build_graph()
+    return supervisor
+
+
+async def _route_to_both(state):
+    state["relevant_agents"] = ["energy", "minerals"]
+    state["delegation_type"] = "multiple"
+    state["requires_synthesis"] = True
+    return state
+
+
+@pytest.mark.asyncio
+async def test_stream_surfaces_partials_then_synthesis_tokens():
+    supervisor = _make_supervisor()
+
+    with patch("app.agents.langgraph_supervisor.route_query_node", side_effect=_route_to_both), \
+         patch.object(tracing, "_trace_store", TraceStore(persist=False)):
+        events = [e async for e in supervisor.stream_chat("How do mining and energy interact?", thread_id="t1")]
+
+    types = [e["type"] for e in events]
+    partials = [e for e in events if e["type"] == "agent_partial"]
+    deltas = [e["delta"] for e in events if e["type"] == "synthesis_delta"]
+    final = next(e for e in events if e["type"] == "final_response")
+
+    # Dispatch is concurrent, so the faster agent is surfaced first
+    assert [p["agent_id"] for p in partials] == ["minerals", "energy"]
+    assert "".join(deltas) == "Executive Summary: all good."
+    # Partials arrive before any synthesis token, and tokens before the final response
+    assert types.index("agent_partial") < types.index("synthesis_delta") < types.index("final_response")
+    assert final["content"]["response"] == "Executive Summary: all good."
+    assert {c["source"] for c in final["content"]["citations"]} == {"energy.pdf", "minerals.pdf"}
+
+
+@pytest.mark.asyncio
+async def test_non_streaming_chat_still_returns_synthesis():
+    supervisor = _make_supervisor()
+
+    with patch("app.agents.langgraph_supervisor.route_query_node", side_effect=_route_to_both), \
+         patch.object(tracing, "_trace_store", TraceStore(persist=False)):
+        result = await supervisor.chat("How do mining and energy interact?", thread_id="t2")
+
+    assert result["response"] == "Executive Summary: all good."
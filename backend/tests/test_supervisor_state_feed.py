@@ -0,0 +1,218 @@
+"""
+Tests for the supervisor state change feed: versioned snapshots and JSON-patch diffs.
+"""
+
+import asyncio
+import json
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, UTC
+
+import jsonpatch
+from unittest.mock import patch
+
+from app.core.ws_queue import OutboundSocket
+from app.schemas.supervisor import SupervisorStateSnapshot, TWGSummary
+from app.services import supervisor_state_service
+from app.services.supervisor_state_service import SupervisorGlobalState
+
+
+TWG_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        pass
+
+
+def _state(meetings: int, projects: int = 0) -> SupervisorStateSnapshot:
+    return SupervisorStateSnapshot(
+        calendar=[],
+        documents=[],
+        projects=[],
+        twg_summaries={str(TWG_ID): TWGSummary(
+            twg_id=TWG_ID, twg_name="Energy", pillar="energy_infrastructure", status="active",
+            total_meetings=meetings, upcoming_meetings=meetings, completed_meetings=0,
+            total_documents=0, total_projects=projects, active_conflicts=0
+        )},
+        active_conflicts=[],
+        last_refresh=datetime.now(UTC),
+        total_twgs=1,
+        total_meetings=meetings,
+        total_documents=0,
+        total_projects=projects
+    )
+
+
+async def _drain():
+    await asyncio.sleep(0.02)
+
+
+async def test_subscriber_gets_snapshot_then_patches_that_rebuild_the_state():
+    service = SupervisorGlobalState()
+    await service._record_changes(_state(meetings=1))
+    ws = FakeWebSocket()
+    out = OutboundSocket(ws)
+
+    assert service.subscribe(out) is False
+    await service._record_changes(_state(meetings=1))  # only last_refresh changed
+    await service._record_changes(_state(meetings=2))
+    await service._record_changes(_state(meetings=2, projects=3))
+    await _drain()
+
+    types = [m["type"] for m in ws.sent]
+    assert types == [
+        "supervisor_state_subscribed", "supervisor_state_snapshot",
+        "supervisor_state_patch", "supervisor_state_patch"
+    ]
+    snapshot, patches = ws.sent[1], ws.sent[2:]
+    assert snapshot["version"] == 1
+    assert [(p["base_version"], p["version"]) for p in patches] == [(1, 2), (2, 3)]
+
+    # A client applying the patches in order holds exactly the server's state
+    document = snapshot["state"]
+    for frame in patches:
+        document = jsonpatch.apply_patch(document, frame["patch"])
+    assert document == service._document
+    assert document["twg_summaries"][str(TWG_ID)]["total_projects"] == 3
+    await out.close()
+    await service.close()
+
+
+async def test_subscriber_joining_during_a_diff_gets_the_previous_version_then_its_patch():
+    service = SupervisorGlobalState()
+    await service._record_changes(_state(meetings=1))
+    first = OutboundSocket(FakeWebSocket())
+    service.subscribe(first)
+
+    diffing, release = threading.Event(), threading.Event()
+    diff_states = supervisor_state_service._diff_states
+
+    def blocked_diff(previous, current):
+        diffing.set()
+        release.wait(1.0)
+        return diff_states(previous, current)
+
+    with patch.object(supervisor_state_service, "_diff_states", side_effect=blocked_diff):
+        change = asyncio.create_task(service._record_changes(_state(meetings=2)))
+        await asyncio.to_thread(diffing.wait, 1.0)
+        ws = FakeWebSocket()
+        out = OutboundSocket(ws)
+        assert service.subscribe(out) is False
+        release.set()
+        await change
+    await _drain()
+
+    snapshot, frame = ws.sent[1], ws.sent[2]
+    assert (snapshot["version"], frame["base_version"], frame["version"]) == (1, 1, 2)
+    assert snapshot["state"]["total_meetings"] == 1
+    assert jsonpatch.apply_patch(snapshot["state"], frame["patch"]) == service._document
+    # Later snapshots carry the new state
+    assert service._snapshot_frame().message["state"]["total_meetings"] == 2
+    await first.close()
+    await out.close()
+    await service.close()
+
+
+async def test_reconnect_resumes_with_missed_patches_or_falls_back_to_snapshot():
+    service = SupervisorGlobalState()
+    await service._record_changes(_state(meetings=1))
+    first = OutboundSocket(FakeWebSocket())
+    service.subscribe(first)
+    for meetings in (2, 3, 4):
+        await service._record_changes(_state(meetings=meetings))
+    await first.close()
+    service.unsubscribe(first)
+
+    ws = FakeWebSocket()
+    out = OutboundSocket(ws)
+    assert service.subscribe(out, since=2, epoch=service.epoch) is True
+    await _drain()
+    assert ws.sent[0] == {
+        "type": "supervisor_state_subscribed", "epoch": service.epoch, "version": 4, "resumed": True
+    }
+    assert [m["version"] for m in ws.sent[1:]] == [3, 4]
+
+    # Another worker/restart (different epoch): full snapshot
+    other = FakeWebSocket()
+    other_out = OutboundSocket(other)
+    assert service.subscribe(other_out, since=2, epoch="elsewhere") is False
+    await _drain()
+    assert other.sent[1]["type"] == "supervisor_state_snapshot"
+    await out.close()
+    await other_out.close()
+    await service.close()
+
+
+async def test_versions_advance_without_subscribers_but_no_patches_are_kept():
+    service = SupervisorGlobalState()
+    await service._record_changes(_state(meetings=1))
+    await service._record_changes(_state(meetings=2))
+    assert service.version == 2 and len(service._patches) == 0
+
+    ws = FakeWebSocket()
+    out = OutboundSocket(ws)
+    assert service.subscribe(out, since=1, epoch=service.epoch) is False
+    await out.close()
+    await service.close()
+
+
+async def test_ensure_fresh_shares_one_rebuild():
+    service = SupervisorGlobalState()
+    calls = []
+
+    async def refresh_state(db):
+        calls.append(db)
+        await asyncio.sleep(0.02)
+        service._state = _state(meetings=1)
+        service._last_refresh = service._state.last_refresh
+        return service._state
+
+    service.refresh_state = refresh_state
+    results = await asyncio.gather(*(service.ensure_fresh(db=None, max_age=30) for _ in range(5)))
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+    service._last_refresh = datetime.now(UTC) - timedelta(seconds=60)
+    await service.ensure_fresh(db=None, max_age=30)
+    assert len(calls) == 2
+
+
+async def test_subscribers_get_changes_without_waiting_for_the_scheduled_refresh():
+    service = SupervisorGlobalState()
+    await service._record_changes(_state(meetings=1))
+    meetings = iter([2, 3, 4, 5, 6])
+
+    async def refresh_state(db):
+        service._state = _state(meetings=next(meetings))
+        service._last_refresh = service._state.last_refresh
+        await service._record_changes(service._state)
+        return service._state
+
+    @asynccontextmanager
+    async def session_context():
+        yield None
+
+    service.refresh_state = refresh_state
+    ws = FakeWebSocket()
+    out = OutboundSocket(ws)
+    with patch("app.services.supervisor_state_service.settings.SUPERVISOR_STATE_MAX_AGE_SECONDS", 0.03), \
+         patch("app.core.database.get_db_session_context", session_context):
+        service.subscribe(out)
+        await asyncio.sleep(0.1)
+        assert service.version >= 2
+        assert "supervisor_state_patch" in [m["type"] for m in ws.sent]
+
+        # The loop stops with the last subscriber
+        service.unsubscribe(out)
+        await asyncio.sleep(0.05)
+        assert service._refresher.done()
+    await service.close()
+    await out.close()
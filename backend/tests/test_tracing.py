@@ -0,0 +1,110 @@
+import asyncio
+from typing import TypedDict
+
+import pytest
+from unittest.mock import patch
+from langgraph.graph import StateGraph, END
+
+from app.agents import tracing
+from app.agents.tracing import (
+    TraceStore, traced_node, traced_turn, span, record_token_usage, get_current_trace
+)
+
+
+@pytest.fixture(autouse=True)
+def memory_only_store():
+    """Keep traces in-process (no Redis) for these tests."""
+    with patch.object(tracing, "_trace_store", TraceStore(persist=False)):
+        yield
+
+
+class _State(TypedDict):
+    value: int
+
+
+def _build_graph():
+    async def step_one(state):
+        with span("step_one.llm", kind="llm"):
+            # Token usage is recorded from worker threads (asyncio.to_thread copies context)
+            await asyncio.to_thread(record_token_usage, 12, 5)
+        return {"value": state["value"] + 1}
+
+    def step_two(state):
+        return {"value": state["value"] * 2}
+
+    workflow = StateGraph(_State)
+    workflow.add_node("step_one", traced_node("step_one", step_one))
+    workflow.add_node("step_two", traced_node("step_two", step_two))
+    workflow.set_entry_point("step_one")
+    workflow.add_edge("step_one", "step_two")
+    workflow.add_edge("step_two", END)
+    return workflow.compile()
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_through_langgraph_nodes():
+    graph = _build_graph()
+
+    async with traced_turn("thread-1", name="turn") as trace:
+        result = await graph.ainvoke({"value": 1})
+
+    assert result["value"] == 4
+    by_name = {s.name: s for s in trace.spans}
+    assert set(by_name) == {"turn", "step_one", "step_one.llm", "step_two"}
+    assert by_name["step_one"].parent_id == trace.root.span_id
+    assert by_name["step_one.llm"].parent_id == by_name["step_one"].span_id
+    assert by_name["step_one.llm"].attributes["prompt_tokens"] == 12
+    assert all(s.status == "ok" and s.duration_ms is not None for s in trace.spans)
+    assert trace.token_totals()["total_tokens"] == 17
+    assert get_current_trace() is None
+
+
+@pytest.mark.asyncio
+async def test_drain_returns_finished_spans_incrementally():
+    async with traced_turn("thread-1") as trace:
+        with span("first"):
+            pass
+        assert [s.name for s in trace.drain()] == ["first"]
+        with span("second"):
+            pass
+
+    assert [s.name for s in trace.drain()] == ["second", "run"]
+
+
+@pytest.mark.asyncio
+async def test_failed_span_records_error_and_turn_is_stored():
+    with pytest.raises(ValueError):
+        async with traced_turn("thread-2") as trace:
+            with span("broken", kind="tool"):
+                raise ValueError("boom")
+
+    broken = next(s for s in trace.spans if s.name == "broken")
+    assert broken.status == "error"
+    assert broken.error == "boom"
+
+    stored = await tracing.get_trace_store().get_trace("thread-2")
+    assert stored["trace_id"] == trace.trace_id
+    assert stored["status"] == "error"
+    assert [row["depth"] for row in stored["spans"]] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_store_keeps_recent_turns_per_thread():
+    store = tracing.get_trace_store()
+    store.max_turns = 2
+
+    ids = []
+    for _ in range(3):
+        async with traced_turn("thread-3") as trace:
+            pass
+        ids.append(trace.trace_id)
+
+    traces = await store.list_traces("thread-3")
+    assert [t["trace_id"] for t in traces] == ids[1:]
+    assert (await store.get_trace("thread-3", ids[1]))["trace_id"] == ids[1]
+
+
+def test_span_is_noop_outside_a_trace():
+    with span("orphan") as current:
+        record_token_usage(1, 1)
+    assert current is None
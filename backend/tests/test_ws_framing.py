@@ -0,0 +1,101 @@
+"""
+Tests for WebSocket framing negotiation, encode-once frames and live state deltas.
+"""
+
+import asyncio
+import json
+
+import ormsgpack
+
+from app.core.ws_framing import (
+    FRAMING_JSON,
+    FRAMING_MSGPACK,
+    DeltaFrame,
+    Frame,
+    apply_delta,
+    diff_snapshot,
+    negotiate_framing,
+)
+from app.core.ws_queue import OutboundSocket, SendPolicy
+from app.services.live_meeting_hub import LiveEventPublisher
+
+
+class RecordingWebSocket:
+    def __init__(self, subprotocols=()):
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        self.frames.append(ormsgpack.unpackb(data))
+
+    async def close(self, code=1000):
+        pass
+
+
+def test_snapshot_deltas_carry_only_what_changed():
+    agenda = [{"id": i, "title": f"Item {i}", "status": "pending", "notes": "x" * 200} for i in range(10)]
+    before = {"lines": [f"Speaker {i}: point {i}" for i in range(50)], "items": agenda, "focus": 1}
+    after = {
+        "lines": before["lines"] + ["Chair: next item"],
+        "items": [dict(item, status="discussed") if item["id"] == 1 else item for item in agenda[1:]]
+        + [{"id": 10, "title": "AOB"}],
+        "focus": 2
+    }
+
+    delta = diff_snapshot(before, after)
+    assert delta["append"] == {"lines": ["Chair: next item"]}
+    assert delta["items"]["items"]["upsert"] == [{"id": 1, "status": "discussed"}, {"id": 10, "title": "AOB"}]
+    assert delta["items"]["items"]["remove"] == [0]
+    assert delta["set"] == {"focus": 2}
+    assert apply_delta(before, delta) == after
+    assert len(json.dumps(delta)) < len(json.dumps(after)) / 10
+
+    # Reordering survives the round trip; a full rewrite isn't worth a delta
+    reordered = dict(after, items=list(reversed(after["items"])))
+    assert apply_delta(after, diff_snapshot(after, reordered)) == reordered
+    assert diff_snapshot({"lines": ["a"]}, {"lines": ["b", "c"]}) is None
+
+
+def test_framing_negotiation_prefers_msgpack_subprotocol():
+    assert negotiate_framing(RecordingWebSocket(["ecowas.v1.json", "ecowas.v1.msgpack"])) == (
+        FRAMING_MSGPACK, "ecowas.v1.msgpack"
+    )
+    assert negotiate_framing(RecordingWebSocket(), "msgpack") == (FRAMING_MSGPACK, None)
+    assert negotiate_framing(RecordingWebSocket()) == (FRAMING_JSON, None)
+
+
+async def test_frames_are_encoded_once_and_deltas_sent_only_to_clients_in_sync():
+    publisher = LiveEventPublisher(None)
+    sent = []
+    publisher.publish = lambda meeting_id, payload: sent.append(payload) or str(len(sent))
+
+    publisher.publish_snapshot("m1", "transcript", {"lines": ["a" * 100]})
+    assert publisher.publish_snapshot("m1", "transcript", {"lines": ["a" * 100]}) is None
+    publisher.publish_snapshot("m1", "transcript", {"lines": ["a" * 100, "b"]})
+    first, second = [DeltaFrame.from_message(payload) for payload in sent]
+    assert first.delta is None and second.base_version == first.version
+
+    in_sync, late = RecordingWebSocket(), RecordingWebSocket()
+    in_sync_out = OutboundSocket(in_sync, framing=FRAMING_MSGPACK)
+    late_out = OutboundSocket(late)
+    in_sync_out.send_frame(first, SendPolicy.COALESCE, "live_state:m1:transcript")
+    await asyncio.sleep(0.01)
+    in_sync_out.send_frame(second, SendPolicy.COALESCE, "live_state:m1:transcript")
+    # Joined late: never saw the base version
+    late_out.send_frame(second, SendPolicy.COALESCE, "live_state:m1:transcript")
+    await asyncio.sleep(0.01)
+
+    assert in_sync.frames[0]["snapshot"] == {"lines": ["a" * 100]}
+    assert in_sync.frames[1]["delta"] == {"append": {"lines": ["b"]}} and "snapshot" not in in_sync.frames[1]
+    assert late.frames == [second.full.message]
+    assert in_sync_out.get_stats().deltas == 1
+
+    # One Frame shared by many sockets is encoded once per framing
+    frame = Frame({"type": "live_meeting_update", "content": "x"})
+    assert frame.encode(FRAMING_MSGPACK) is frame.encode(FRAMING_MSGPACK)
+    assert frame.encode(FRAMING_JSON) is frame.encode(FRAMING_JSON)
+    await in_sync_out.close()
+    await late_out.close()
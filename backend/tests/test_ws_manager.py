@@ -0,0 +1,114 @@
+"""
+Tests for cross-worker WebSocket delivery, concurrent sends and dead-socket eviction.
+"""
+
+import asyncio
+import json
+
+import fakeredis
+from fakeredis import aioredis as fake_aioredis
+
+from app.core.ws_manager import ConnectionManager
+from app.services.inprocess_backend import LocalPubSubHub
+from app.services.pubsub_hub import PubSubHub
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0, broken: bool = False):
+        self.sent = []
+        self.delay = delay
+        self.broken = broken
+        self.closed = False
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, text):
+        if self.broken:
+            raise RuntimeError("connection closed")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def test_messages_reach_users_and_topics_on_other_workers():
+    hub = LocalPubSubHub()
+    worker_a, worker_b = ConnectionManager(pubsub_hub=hub), ConnectionManager(pubsub_hub=hub)
+    alice_a, alice_b, bob = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await worker_a.connect(alice_a, "alice")
+    await worker_b.connect(alice_b, "alice", topics=["meeting:1"])
+    await worker_b.connect(bob, "bob")
+
+    # Sent from worker A, which has no socket for bob
+    await worker_a.send_personal_message({"type": "NEW_NOTIFICATION"}, "bob")
+    await worker_a.publish_topic({"type": "minutes_ready"}, "meeting:1")
+    await worker_a.broadcast({"type": "conflict_resolved"})
+    await _wait_for(lambda: len(bob.sent) == 2 and len(alice_a.sent) == 1 and len(alice_b.sent) == 2)
+
+    assert [m["type"] for m in bob.sent] == ["NEW_NOTIFICATION", "conflict_resolved"]
+    assert [m["type"] for m in alice_b.sent] == ["minutes_ready", "conflict_resolved"]
+    assert alice_a.sent == [{"type": "conflict_resolved"}]
+
+    worker_b.disconnect(alice_b, "alice")
+    assert worker_b.topics == {}
+    await worker_a.close()
+    await worker_b.close()
+
+
+async def test_slow_and_broken_sockets_are_evicted_without_delaying_others():
+    manager = ConnectionManager(pubsub_hub=LocalPubSubHub(), send_timeout=0.05)
+    fast = [FakeWebSocket() for _ in range(3)]
+    slow, broken = FakeWebSocket(delay=1.0), FakeWebSocket(broken=True)
+    for i, ws in enumerate(fast + [slow, broken]):
+        await manager.connect(ws, f"user{i}")
+
+    started = asyncio.get_running_loop().time()
+    queued = await manager.deliver_local({"all": True, "text": json.dumps({"type": "ping"})})
+    # Delivery only queues: the sender never waits for a client
+    assert asyncio.get_running_loop().time() - started < 0.01
+    assert queued == 5
+
+    await _wait_for(lambda: manager.get_stats().evicted == 2)
+    assert all(ws.sent == [{"type": "ping"}] for ws in fast)
+    assert slow.closed and broken.closed
+    stats = manager.get_stats()
+    assert stats.sockets == 3 and stats.delivered == 3
+
+    # The endpoint's own cleanup after eviction is a no-op
+    manager.disconnect(slow, "user3")
+    await manager.close()
+
+
+async def test_delivery_over_redis_between_workers():
+    server = fakeredis.FakeServer()
+    hubs = [
+        PubSubHub(client=fake_aioredis.FakeRedis(server=server, decode_responses=True), poll_timeout=0.01)
+        for _ in range(2)
+    ]
+    publisher = fake_aioredis.FakeRedis(server=server, decode_responses=True)
+    worker_a = ConnectionManager(pubsub_hub=hubs[0], redis_client=publisher)
+    worker_b = ConnectionManager(pubsub_hub=hubs[1], redis_client=publisher)
+    ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+    await worker_a.connect(ws_a, "u1")
+    await worker_b.connect(ws_b, "u2")
+    await asyncio.sleep(0.05)
+
+    await worker_a.send_personal_message({"type": "NEW_NOTIFICATION", "data": {"id": "n1"}}, "u2")
+    await _wait_for(lambda: ws_b.sent)
+
+    assert ws_b.sent == [{"type": "NEW_NOTIFICATION", "data": {"id": "n1"}}]
+    assert ws_a.sent == []
+    for manager in (worker_a, worker_b):
+        await manager.close()
+    for hub in hubs:
+        await hub.close()
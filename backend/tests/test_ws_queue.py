@@ -0,0 +1,86 @@
+"""
+Tests for per-connection WebSocket outbound queues and their send policies.
+"""
+
+import asyncio
+import json
+
+from app.core.ws_queue import OutboundSocket, SendPolicy, classify_message
+
+
+class GatedWebSocket:
+    """Holds every send until the test opens the gate."""
+
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.closed = False
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+async def _flush(ws):
+    ws.gate.set()
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+def test_policies_follow_message_type_and_source():
+    assert classify_message({"type": "supervisor_state_updated"}) == (
+        SendPolicy.COALESCE, "supervisor_state_updated:"
+    )
+    assert classify_message({"type": "live_meeting_update", "source": "agenda_monitor", "meeting_id": "m1"}) == (
+        SendPolicy.COALESCE, "live_meeting_update:agenda_monitor:m1"
+    )
+    assert classify_message({"type": "live_meeting_update", "source": "live_insight"})[0] == SendPolicy.DROP_OLDEST
+    assert classify_message({"type": "email_approval_required"})[0] == SendPolicy.NEVER_DROP
+    assert classify_message({"type": "NEW_NOTIFICATION"})[0] == SendPolicy.NEVER_DROP
+
+
+async def test_slow_client_gets_latest_state_and_every_approval():
+    ws = GatedWebSocket()
+    out = OutboundSocket(ws, max_queue=3, send_timeout=5)
+    await asyncio.sleep(0)
+    # The writer has taken the first frame and is blocked sending it
+    out.send({"type": "live_meeting_update", "source": "live_insight", "content": "i0"})
+    await asyncio.sleep(0)
+
+    for n in range(10):
+        out.send({"type": "supervisor_state_updated", "version": n})
+        out.send({"type": "live_meeting_update", "source": "live_insight", "content": f"i{n + 1}"})
+        out.send({"type": "approval_required", "request_id": f"r{n}"})
+
+    stats = out.get_stats()
+    # Producers never waited; droppable messages stayed within the bound
+    assert stats.depth <= 3 + 10 and stats.coalesced > 0 and stats.dropped > 0
+
+    await _flush(ws)
+    states = [m["version"] for m in ws.sent if m["type"] == "supervisor_state_updated"]
+    insights = [m["content"] for m in ws.sent if m.get("source") == "live_insight"]
+    approvals = [m["request_id"] for m in ws.sent if m["type"] == "approval_required"]
+    assert states == [9]
+    assert insights[0] == "i0" and insights[-1] == "i10" and len(insights) <= 4
+    assert approvals == [f"r{n}" for n in range(10)]
+    assert out.get_stats().depth == 0
+    await out.close()
+
+
+async def test_too_many_undelivered_approvals_disconnect_the_client():
+    ws = GatedWebSocket()
+    closed = []
+
+    async def on_close(outbound):
+        closed.append(outbound)
+
+    out = OutboundSocket(ws, never_drop_limit=2, on_close=on_close)
+    for n in range(4):
+        out.send({"type": "approval_required", "request_id": f"r{n}"})
+    await asyncio.sleep(0.01)
+
+    assert out.closed and ws.closed
+    assert closed == [out]
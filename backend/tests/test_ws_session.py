@@ -0,0 +1,132 @@
+"""
+Tests for authenticated WebSocket sessions: the token cache, re-auth and the shared heartbeat wheel.
+"""
+
+import asyncio
+import json
+import time
+
+from fastapi import WebSocketDisconnect
+
+from app.core.ws_queue import OutboundSocket
+from app.core.ws_session import (
+    CLOSE_CLIENT_GONE,
+    CLOSE_TOKEN_EXPIRED,
+    AuthenticatedSocket,
+    HeartbeatWheel,
+    SocketIdentity,
+    authenticate_token,
+    clear_auth_cache,
+)
+from app.utils.security import create_access_token
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+        self.closed_with = None
+
+    async def send_text(self, text):
+        self.sent.append(text if text == "pong" else json.loads(text))
+
+    async def receive_text(self):
+        text = await self.incoming.get()
+        if text is None:
+            raise WebSocketDisconnect(code=1000)
+        return text
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = (code, reason)
+
+    def types(self):
+        return [m if isinstance(m, str) else m["type"] for m in self.sent]
+
+
+def _session(identity, wheel):
+    ws = FakeWebSocket()
+    out = OutboundSocket(ws, name="test")
+    return ws, out, AuthenticatedSocket(ws, identity, out, wheel=wheel)
+
+
+def test_token_is_verified_once_and_cached():
+    clear_auth_cache()
+    token = create_access_token({"sub": "user-1"})
+
+    first = authenticate_token(token)
+    assert first is not None and first.user_id == "user-1"
+    assert first.expires_at > time.time()
+    assert authenticate_token(token) is first
+    assert authenticate_token("not-a-jwt") is None
+    assert authenticate_token(None) is None
+    clear_auth_cache()
+
+
+async def test_one_wheel_heartbeats_every_socket_and_handles_messages():
+    wheel = HeartbeatWheel(interval=0.05, tick=0.01)
+    sessions = [_session(SocketIdentity(user_id=f"u{i}"), wheel) for i in range(3)]
+    received = []
+
+    async def on_message(text):
+        received.append(text)
+
+    tasks = [asyncio.create_task(session.serve(on_message)) for _, _, session in sessions]
+    ws, _, _ = sessions[0]
+    ws.incoming.put_nowait("ping")
+    ws.incoming.put_nowait('{"type": "live_command"}')
+    await asyncio.sleep(0.18)
+
+    assert wheel.get_stats().sockets == 3
+    for socket, _, _ in sessions:
+        assert socket.types().count("heartbeat") >= 2
+    assert "pong" in ws.types()
+    assert received == ['{"type": "live_command"}']
+
+    for socket, _, _ in sessions:
+        socket.incoming.put_nowait(None)
+    assert await asyncio.gather(*tasks) == [None, None, None]
+    assert wheel.get_stats().sockets == 0
+    for _, out, _ in sessions:
+        await out.close()
+    await wheel.close()
+
+
+async def test_expired_token_closes_with_4401_unless_reauthenticated():
+    clear_auth_cache()
+    wheel = HeartbeatWheel(interval=10.0, tick=0.01)
+    ws, out, session = _session(SocketIdentity(user_id="user-1", expires_at=time.time() + 0.05), wheel)
+    task = asyncio.create_task(session.serve())
+
+    # Re-auth as the same user pushes the deadline out
+    ws.incoming.put_nowait(json.dumps({"type": "auth", "token": create_access_token({"sub": "user-1"})}))
+    await asyncio.sleep(0.1)
+    assert not task.done()
+    assert ws.types()[-1] == "auth_ok"
+
+    # Another user's token is refused and the session keeps its identity
+    ws.incoming.put_nowait(json.dumps({"type": "auth", "token": create_access_token({"sub": "user-2"})}))
+    await asyncio.sleep(0.02)
+    assert ws.types()[-1] == "auth_failed"
+    assert session.user_id == "user-1"
+
+    session.identity = SocketIdentity(user_id="user-1", expires_at=time.time() + 0.03)
+    wheel.reschedule(session)
+    assert await asyncio.wait_for(task, 1.0) == CLOSE_TOKEN_EXPIRED
+    await asyncio.sleep(0.01)
+    assert ws.closed_with == (CLOSE_TOKEN_EXPIRED, "token expired")
+    assert wheel.get_stats().expired == 1
+    await out.close()
+    await wheel.close()
+    clear_auth_cache()
+
+
+async def test_socket_whose_writer_gave_up_is_closed():
+    wheel = HeartbeatWheel(interval=0.03, tick=0.01)
+    ws, out, session = _session(None, wheel)
+    task = asyncio.create_task(session.serve())
+    await asyncio.sleep(0.01)
+
+    await out.close()
+    assert await asyncio.wait_for(task, 1.0) == CLOSE_CLIENT_GONE
+    assert wheel.get_stats().dead == 1
+    await wheel.close()